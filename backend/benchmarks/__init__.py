@@ -0,0 +1 @@
+"""Local performance benchmarks (run against the in-memory Cosmos container)."""
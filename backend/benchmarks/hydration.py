@@ -0,0 +1,98 @@
+"""
+Hydration Benchmark
+
+Measures the CPU spent turning a page of raw Cosmos DB documents into models,
+comparing per-document validation (the previous behaviour), batched
+TypeAdapter validation and trusted hydration.
+
+Usage (from backend/):
+    python -m benchmarks.hydration --page-size 50 --days 7 --rounds 200
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from models.documents import ItineraryDocument, TripDocument
+from repositories.hydration import Hydrator
+
+
+def itinerary_page(page_size: int, days: int) -> list[dict[str, Any]]:
+    """Raw itinerary documents shaped like generated itineraries."""
+    activities = [
+        {
+            "time": f"{9 + slot}:00",
+            "title": f"Activity {slot}",
+            "description": "Guided walk through the old town with a local historian",
+            "location": {"name": "Old Town", "lat": 38.71, "lng": -9.14},
+            "cost": {"amount": 25.0, "currency": "EUR"},
+            "tags": ["family", "outdoor", "walking"],
+        }
+        for slot in range(6)
+    ]
+    return [
+        ItineraryDocument(
+            pk="itinerary_trip_1",
+            trip_id="trip_1",
+            title=f"Plan {index}",
+            days=[{"day": day, "date": "2026-07-01", "activities": activities} for day in range(days)],
+            generation_params={"model": "gpt", "temperature": 0.7},
+        ).model_dump(mode="json")
+        | {"_etag": '"0000"', "_ts": 1_700_000_000}
+        for index in range(page_size)
+    ]
+
+
+def trip_page(page_size: int) -> list[dict[str, Any]]:
+    """Raw trip documents with an embedded itinerary and expenses."""
+    return [
+        TripDocument(
+            pk="trip_user_1",
+            title=f"Trip {index}",
+            organizer_user_id="user_1",
+            itinerary={"days": [{"day": day, "activities": ["museum", "lunch", "beach"]} for day in range(7)]},
+            expenses=[{"amount": 12.5, "label": "Snacks", "paid_by": "user_1"} for _ in range(20)],
+        ).model_dump(mode="json")
+        | {"_etag": '"0000"', "_ts": 1_700_000_000}
+        for index in range(page_size)
+    ]
+
+
+def measure(build: Callable[[type, list[dict[str, Any]]], Any], model_class: type, page: list, rounds: int) -> float:
+    """Mean CPU time of hydrating one page, in microseconds."""
+    build(model_class, page)
+    started = time.process_time()
+    for _ in range(rounds):
+        build(model_class, page)
+    return (time.process_time() - started) / rounds * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    trusted = Hydrator(trusted=True)
+    validating = Hydrator(trusted=False)
+
+    print(f"CPU per list request of {args.page_size} documents (microseconds)\n")
+    print(f"{'model':<20}{'per-document':>14}{'batched':>12}{'trusted':>12}{'saved':>10}")
+    for model_class, page in (
+        (ItineraryDocument, itinerary_page(args.page_size, args.days)),
+        (TripDocument, trip_page(args.page_size)),
+    ):
+        per_document = measure(lambda model, raws: [model(**raw) for raw in raws], model_class, page, args.rounds)
+        batched = measure(validating.many, model_class, page, args.rounds)
+        fast = measure(trusted.many, model_class, page, args.rounds)
+        assert validating.many(model_class, page) == trusted.many(model_class, page)
+        print(
+            f"{model_class.__name__:<20}{per_document:>14.0f}{batched:>12.0f}{fast:>12.0f}"
+            f"{(1 - fast / per_document) * 100:>9.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Service Stack Benchmark
+
+Drives the service layer against the in-memory Cosmos container and reports
+throughput, latency percentiles and the request charge of every repository
+operation. Needs no emulator or network.
+
+Usage (from backend/):
+    python -m benchmarks.service_stack --users 200 --requests 2000 --concurrency 32 --latency-ms 2
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from core.security import get_or_create_user
+from models.documents import UserDocument
+from models.schemas import FamilyCreate, PollCreate, PollOption, PollVote, TripCreate
+from repositories.cosmos_repository import cosmos_repo
+from repositories.memory_container import MemoryContainer
+from repositories.metrics import repository_metrics
+from repositories.query_stats import query_log
+from services.collaboration_service import get_collaboration_service
+from services.family_service import get_family_service
+from services.trip_service import get_trip_service
+
+
+class Fixture:
+    """Seeded users and the trips and polls they can act on."""
+
+    def __init__(self) -> None:
+        self.users: list[UserDocument] = []
+        self.trips: dict[str, list[str]] = {}
+        self.polls: dict[str, list[tuple[str, str, list[str]]]] = {}
+
+
+async def seed(users: int, trips_per_user: int) -> Fixture:
+    """Create users, one family each, trips and one poll per trip."""
+    fixture = Fixture()
+    trip_service = get_trip_service()
+    collaboration_service = get_collaboration_service()
+
+    for index in range(users):
+        user = await get_or_create_user({"sub": f"bench-{index}", "email": f"user{index}@example.com", "name": "User"})
+        await get_family_service().create_family(FamilyCreate(name=f"Family {index}"), user)
+        fixture.users.append(user)
+        fixture.trips[user.id] = []
+        fixture.polls[user.id] = []
+
+        for number in range(trips_per_user):
+            trip = await trip_service.create_trip(TripCreate(title=f"Trip {number}", destination="Lisbon"), user)
+            fixture.trips[user.id].append(trip.id)
+            poll = await collaboration_service.create_poll(
+                PollCreate(
+                    trip_id=trip.id,
+                    title="Where to stay?",
+                    options=[PollOption(text="Hotel"), PollOption(text="Rental"), PollOption(text="Camping")],
+                ),
+                user,
+            )
+            fixture.polls[user.id].append((poll.id, trip.id, [option["id"] for option in poll.options]))
+
+    return fixture
+
+
+def scenarios(fixture: Fixture) -> dict[str, Callable[[UserDocument], Awaitable[Any]]]:
+    """Request mix, each scenario standing in for one API call."""
+    trip_service = get_trip_service()
+    family_service = get_family_service()
+    collaboration_service = get_collaboration_service()
+
+    async def sign_in(user: UserDocument) -> Any:
+        return await get_or_create_user({"sub": user.entra_id, "email": user.email, "name": user.name})
+
+    async def list_trips(user: UserDocument) -> Any:
+        return await trip_service.get_user_trips_page(user.id)
+
+    async def get_trip(user: UserDocument) -> Any:
+        return await trip_service.get_trip(random.choice(fixture.trips[user.id]))
+
+    async def list_families(user: UserDocument) -> Any:
+        return await family_service.get_user_family_summaries(user.id)
+
+    async def list_members(user: UserDocument) -> Any:
+        return await family_service.get_members_of_families(user.family_ids)
+
+    async def list_polls(user: UserDocument) -> Any:
+        return await collaboration_service.get_trip_poll_summaries(random.choice(fixture.trips[user.id]), user.id)
+
+    async def vote(user: UserDocument) -> Any:
+        poll_id, trip_id, option_ids = random.choice(fixture.polls[user.id])
+        voter = random.choice(fixture.users)
+        vote = PollVote(option_ids=[random.choice(option_ids)])
+        return await collaboration_service.vote_on_poll(poll_id, vote, voter, trip_id=trip_id)
+
+    return {
+        "sign_in": sign_in,
+        "list_trips": list_trips,
+        "get_trip": get_trip,
+        "list_families": list_families,
+        "list_members": list_members,
+        "list_polls": list_polls,
+        "vote": vote,
+    }
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def run(requests: int, concurrency: int, fixture: Fixture) -> tuple[float, dict[str, list[float]]]:
+    """Run the request mix and collect per-scenario latencies (ms)."""
+    mix = scenarios(fixture)
+    names = list(mix)
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(random.choice(names))
+
+    async def worker() -> None:
+        while not queue.empty():
+            name = queue.get_nowait()
+            started = time.perf_counter()
+            await mix[name](random.choice(fixture.users))
+            latencies[name].append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies
+
+
+def report(elapsed: float, latencies: dict[str, list[float]]) -> None:
+    """Print throughput, latency percentiles and per-operation RU."""
+    total = sum(len(samples) for samples in latencies.values())
+    print(f"\n{total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s)\n")
+    print(f"{'scenario':<16}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, samples in sorted(latencies.items()):
+        if samples:
+            print(
+                f"{name:<16}{len(samples):>8}{statistics.fmean(samples):>10.2f}"
+                f"{percentile(samples, 0.5):>10.2f}{percentile(samples, 0.95):>10.2f}"
+            )
+
+    snapshot = repository_metrics.snapshot()
+    print(f"\n{'operation':<28}{'count':>8}{'RU':>12}{'avg RU':>10}{'fan-out':>10}{'coalesced':>10}{'errors':>8}")
+    for name, stats in snapshot["operations"].items():
+        print(
+            f"{name:<28}{stats['count']:>8}{stats['request_charge']:>12.2f}"
+            f"{stats['avg_request_charge']:>10.2f}{stats['cross_partition']:>10}{stats['coalesced']:>10}"
+            f"{stats['errors']:>8}"
+        )
+
+    print(f"\n{'query shape (top 5 by RU)':<88}{'count':>8}{'RU':>12}{'pages':>8}")
+    for row in query_log.top(limit=5)["queries"]:
+        print(f"{row['query'][:86]:<88}{row['count']:>8}{row['request_charge']:>12.2f}{row['avg_pages']:>8.1f}")
+
+    if cosmos_repo.document_cache:
+        print(f"\ndocument cache: {cosmos_repo.document_cache.stats()}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--trips-per-user", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated round trip per Cosmos call")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Keep per-call log output out of the measurements
+    logging.basicConfig(level=logging.WARNING)
+    random.seed(args.seed)
+    container = MemoryContainer(latency_ms=args.latency_ms)
+    cosmos_repo.use_container(container)
+
+    fixture = await seed(args.users, args.trips_per_user)
+    print(f"Seeded {len(container)} documents for {args.users} users")
+
+    repository_metrics.reset()
+    query_log.reset()
+    if cosmos_repo.document_cache:
+        cosmos_repo.document_cache.reset_stats()
+    elapsed, latencies = await run(args.requests, args.concurrency, fixture)
+    report(elapsed, latencies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
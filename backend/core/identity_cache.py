@@ -0,0 +1,107 @@
+"""
+Identity Cache
+
+Per-instance cache of the user document behind a token subject (the oid/sub
+claim). Every authenticated request resolves its user, so the resolved
+document is kept for a short TTL and repeat requests skip Cosmos DB entirely.
+
+Writes to a user document made through this instance invalidate its entry;
+writes made elsewhere become visible once the TTL runs out.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+from models.documents import UserDocument
+
+
+class IdentityCache:
+    """Size-bounded LRU of user documents by token subject, held for a short TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[UserDocument, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_environment(cls) -> "IdentityCache | None":
+        """
+        Build the cache from AUTH_IDENTITY_CACHE_MAX_ENTRIES and AUTH_IDENTITY_CACHE_TTL_SECONDS.
+
+        Returns:
+            The cache, or None when disabled (max entries of 0)
+        """
+        max_entries = int(os.environ.get("AUTH_IDENTITY_CACHE_MAX_ENTRIES", "1000"))
+        ttl_seconds = float(os.environ.get("AUTH_IDENTITY_CACHE_TTL_SECONDS", "60"))
+        if max_entries <= 0:
+            return None
+        return cls(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, subject: str) -> UserDocument | None:
+        """
+        Get the user resolved for a token subject.
+
+        Returns:
+            A copy of the user, or None if not cached or expired
+        """
+        entry = self._entries.get(subject)
+        if entry is None or time.monotonic() >= entry[1]:
+            if entry is not None:
+                del self._entries[subject]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(subject)
+        self.hits += 1
+        return entry[0].model_copy(deep=True)
+
+    def put(self, subject: str, user: UserDocument) -> None:
+        """Store the user resolved for a token subject."""
+        self._entries[subject] = (user.model_copy(deep=True), time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, subject: str) -> None:
+        """Drop the user of a token subject."""
+        if self._entries.pop(subject, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        """Zero the counters (entries are kept)."""
+        self.hits = self.misses = self.invalidations = self.evictions = 0
+
+
+# Singleton instance (None when disabled)
+identity_cache = IdentityCache.from_environment()
+
+
+def forget_user(user: UserDocument) -> None:
+    """Invalidate the cached identity of a user whose document was just written."""
+    if identity_cache:
+        identity_cache.invalidate(user.entra_id)
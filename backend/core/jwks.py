@@ -0,0 +1,193 @@
+"""
+JWKS Provider
+
+Async resolution of Entra ID token signing keys. The key set is fetched with
+httpx on the event loop, indexed by kid, and served from memory:
+
+- Once the set is older than the refresh interval it is refreshed in the
+  background while the current keys keep being served, so signing key
+  rotation never stalls a request.
+- A token signed with an unknown kid (a key rotated in since the last fetch)
+  triggers an immediate refresh.
+- Once keys are loaded, refreshes of either kind start at most once per
+  minimum refresh interval after the last attempt, successful or not, so a
+  failing identity provider is not hammered by every request.
+- Concurrent refreshes share one HTTP request.
+- When a refresh fails, the last key set that was fetched successfully stays
+  in use.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any
+
+import httpx
+import jwt
+
+logger = logging.getLogger(__name__)
+
+# Refresh the key set in the background once it is this old (seconds)
+DEFAULT_REFRESH_INTERVAL = 6 * 60 * 60
+
+# Minimum time between refresh attempts once keys are loaded (seconds)
+DEFAULT_MIN_REFRESH_INTERVAL = 60
+
+DEFAULT_TIMEOUT = 5.0
+
+
+class JwksProvider:
+    """Async, kid-indexed signing key cache with background refresh."""
+
+    def __init__(
+        self,
+        jwks_url: str,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL,
+        timeout: float = DEFAULT_TIMEOUT,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """
+        Args:
+            jwks_url: URL of the JWKS document
+            refresh_interval: Age (seconds) after which keys are refreshed in the background
+            min_refresh_interval: Minimum seconds between refresh attempts once keys are loaded
+            timeout: HTTP timeout (seconds)
+            transport: Optional httpx transport (tests serve a local key set through it)
+        """
+        self.jwks_url = jwks_url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._transport = transport
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._fetched_at: float | None = None
+        self._attempted_at: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self.fetches = 0
+        self.failures = 0
+        self.last_error: str | None = None
+
+    @classmethod
+    def for_tenant(cls, tenant_id: str) -> "JwksProvider":
+        """Build the provider for an Entra ID tenant's v2.0 signing keys."""
+        return cls(
+            f"https://login.microsoftonline.com/{tenant_id}/discovery/v2.0/keys",
+            refresh_interval=float(os.environ.get("AUTH_JWKS_REFRESH_SECONDS", str(DEFAULT_REFRESH_INTERVAL))),
+        )
+
+    async def get_signing_key(self, kid: str | None) -> jwt.PyJWK:
+        """
+        Get the signing key a token header refers to.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            The signing key
+
+        Raises:
+            jwt.PyJWKClientError: If no key with that ID is known, even after a refresh
+        """
+        if not self._keys:
+            await self._refresh_or_keep()
+        elif self._is_stale() and self._may_refresh():
+            self._start_refresh()
+
+        key = self._keys.get(kid) if kid else None
+        if key is None and kid and self._may_refresh():
+            # A key rotated in since the last fetch
+            await self._refresh_or_keep()
+            key = self._keys.get(kid)
+
+        if key is None:
+            raise jwt.PyJWKClientError(f"Unable to find a signing key that matches: {kid!r}")
+        return key
+
+    async def refresh(self) -> dict[str, jwt.PyJWK]:
+        """
+        Fetch the key set now, joining a refresh already in flight.
+
+        Returns:
+            Signing keys by kid
+
+        Raises:
+            httpx.HTTPError: If the key set could not be fetched
+            jwt.PyJWKClientError: If the response holds no usable signing keys
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._fetch())
+        return await asyncio.shield(self._refresh_task)
+
+    async def _refresh_or_keep(self) -> None:
+        """Refresh, falling back to the last known good keys on failure."""
+        try:
+            await self.refresh()
+        except Exception as e:
+            if not self._keys:
+                raise
+            logger.warning(f"JWKS refresh failed, keeping {len(self._keys)} last known good keys: {e}")
+
+    def _start_refresh(self) -> None:
+        """Refresh in the background; failures keep the current keys."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.ensure_future(self._fetch())
+        self._refresh_task.add_done_callback(_log_background_failure)
+
+    def _is_stale(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self.refresh_interval
+
+    def _may_refresh(self) -> bool:
+        return self._attempted_at is None or time.monotonic() - self._attempted_at >= self.min_refresh_interval
+
+    async def _fetch(self) -> dict[str, jwt.PyJWK]:
+        self._attempted_at = time.monotonic()
+        self.fetches += 1
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout, transport=self._transport) as client:
+                response = await client.get(self.jwks_url)
+                response.raise_for_status()
+                keys = _signing_keys(response.json())
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        self.last_error = None
+        logger.info(f"Fetched {len(keys)} JWKS signing keys")
+        return keys
+
+    def stats(self) -> dict[str, Any]:
+        """Key set state for the metrics endpoint."""
+        return {
+            "keys": len(self._keys),
+            "age_seconds": round(time.monotonic() - self._fetched_at, 1) if self._fetched_at is not None else None,
+            "refresh_interval_seconds": self.refresh_interval,
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+def _signing_keys(document: dict[str, Any]) -> dict[str, jwt.PyJWK]:
+    """Index the usable signing keys of a JWKS document by kid."""
+    keys = {}
+    for data in document.get("keys", []):
+        if data.get("use", "sig") != "sig" or "kid" not in data:
+            continue
+        try:
+            keys[data["kid"]] = jwt.PyJWK(data)
+        except jwt.PyJWKError as e:
+            logger.debug(f"Skipping unusable JWKS key {data.get('kid')}: {e}")
+    if not keys:
+        raise jwt.PyJWKClientError("The JWKS endpoint did not return any usable signing keys")
+    return keys
+
+
+def _log_background_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background JWKS refresh failed, keeping last known good keys: {task.exception()}")
@@ -9,27 +9,33 @@ from typing import Any
 
 import azure.functions as func
 import jwt
-from jwt import PyJWKClient
+from azure.cosmos import exceptions
 
+from core.identity_cache import identity_cache
+from core.jwks import JwksProvider
+from core.token_cache import TokenCache
 from models.documents import UserDocument
 from repositories.cosmos_repository import cosmos_repo
+from repositories.request_scope import current_request_scope
 
 logger = logging.getLogger(__name__)
 
-# Cache JWKS client
-_jwks_client: PyJWKClient | None = None
+# Cache JWKS provider
+_jwks_provider: JwksProvider | None = None
 
+# Claims of validated tokens, keyed by token hash (None when disabled)
+token_cache = TokenCache.from_environment()
 
-def get_jwks_client() -> PyJWKClient:
-    """Get cached JWKS client for token validation."""
-    global _jwks_client
-    if _jwks_client is None:
+
+def get_jwks_provider() -> JwksProvider:
+    """Get cached JWKS provider for token validation."""
+    global _jwks_provider
+    if _jwks_provider is None:
         import os
 
         tenant_id = os.environ.get("ENTRA_TENANT_ID", "vedid.onmicrosoft.com")
-        jwks_url = f"https://login.microsoftonline.com/{tenant_id}/discovery/v2.0/keys"
-        _jwks_client = PyJWKClient(jwks_url, cache_keys=True)
-    return _jwks_client
+        _jwks_provider = JwksProvider.for_tenant(tenant_id)
+    return _jwks_provider
 
 
 def extract_token(req: func.HttpRequest) -> str | None:
@@ -52,6 +58,9 @@ async def validate_token(token: str) -> dict[str, Any] | None:
     """
     Validate JWT token and return claims.
 
+    A token that passed validation before is answered from the token cache
+    until shortly before it expires, skipping signature verification.
+
     Args:
         token: JWT token string
 
@@ -60,10 +69,15 @@ async def validate_token(token: str) -> dict[str, Any] | None:
     """
     import os
 
+    if token_cache:
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached
+
     try:
-        # Get signing key from JWKS
-        jwks_client = get_jwks_client()
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
+        # Get signing key from JWKS (served from memory, refreshed without blocking)
+        kid = jwt.get_unverified_header(token).get("kid")
+        signing_key = await get_jwks_provider().get_signing_key(kid)
 
         # Get configuration
         client_id = os.environ.get("ENTRA_CLIENT_ID")
@@ -79,6 +93,8 @@ async def validate_token(token: str) -> dict[str, Any] | None:
             options={"verify_exp": True},
         )
 
+        if token_cache:
+            token_cache.put(token, claims)
         return claims
 
     except jwt.ExpiredSignatureError:
@@ -96,6 +112,9 @@ async def get_or_create_user(claims: dict[str, Any]) -> UserDocument:
     """
     Get existing user or create new one from token claims.
 
+    The user is served from the identity cache when this instance resolved
+    the same subject recently; otherwise it is point-read by its Entra ID.
+
     Args:
         claims: Validated JWT token claims
 
@@ -110,23 +129,55 @@ async def get_or_create_user(claims: dict[str, Any]) -> UserDocument:
     if not entra_id:
         raise ValueError("Token missing user identifier (sub or oid)")
 
-    # Try to find existing user by Entra ID
+    cached = identity_cache.get(entra_id) if identity_cache else None
+    if cached is not None and cached.email == email and cached.name == name:
+        return cached
+
+    user = cached or await _find_user(entra_id)
+
+    if user and (user.email != email or user.name != name):
+        # Update name/email if changed. The cached copy may predate writes made on
+        # other instances (e.g. a family join), so the replace is conditional and
+        # re-reads the user when its ETag is out of date.
+        def apply_claims(current: UserDocument) -> bool:
+            if current.email == email and current.name == name:
+                return False
+            current.email = email
+            current.name = name
+            return True
+
+        user = await cosmos_repo.read_modify_write(user, apply_claims)
+
+    if not user:
+        user = await _create_user(entra_id, email, name)
+
+    if identity_cache:
+        identity_cache.put(entra_id, user)
+    return user
+
+
+async def _find_user(entra_id: str) -> UserDocument | None:
+    """Find a user by Entra ID: a point read, or a lookup for accounts with a random ID."""
+    user = await cosmos_repo.get_by_id(entra_id, f"user_{entra_id}", UserDocument)
+    if user:
+        return user
+
+    # Accounts created before users were keyed by Entra ID have a random ID in the same partition
     query = "SELECT * FROM c WHERE c.entity_type = 'user' AND c.entra_id = @entraId"
     users = await cosmos_repo.query(
-        query=query, parameters=[{"name": "@entraId", "value": entra_id}], model_class=UserDocument
+        query=query,
+        parameters=[{"name": "@entraId", "value": entra_id}],
+        model_class=UserDocument,
+        partition_key=f"user_{entra_id}",
+        max_items=1,
     )
+    return users[0] if users else None
 
-    if users:
-        user = users[0]
-        # Update name/email if changed
-        if user.email != email or user.name != name:
-            user.email = email
-            user.name = name
-            user = await cosmos_repo.update(user)
-        return user
 
-    # Create new user
+async def _create_user(entra_id: str, email: str, name: str) -> UserDocument:
+    """Create a user keyed by Entra ID so members can be point-read by ID."""
     user = UserDocument(
+        id=entra_id,
         pk=f"user_{entra_id}",
         entra_id=entra_id,
         email=email,
@@ -135,7 +186,15 @@ async def get_or_create_user(claims: dict[str, Any]) -> UserDocument:
     )
 
     logger.info(f"Creating new user: {email}")
-    return await cosmos_repo.create(user)
+    try:
+        return await cosmos_repo.create(user)
+    except exceptions.CosmosResourceExistsError:
+        # A concurrent first request created it
+        existing = await cosmos_repo.get_by_id(entra_id, user.pk, UserDocument)
+        if existing is None:
+            # ... and it was deleted again before we could read it
+            return await cosmos_repo.create(user)
+        return existing
 
 
 async def get_user_from_request(req: func.HttpRequest) -> UserDocument | None:
@@ -143,6 +202,8 @@ async def get_user_from_request(req: func.HttpRequest) -> UserDocument | None:
     Extract and validate user from HTTP request.
 
     This is the main authentication function used by all protected endpoints.
+    The user is kept in the request scope, so later calls while serving the
+    same request (and current_user()) return it without re-validating.
 
     Args:
         req: Azure Functions HTTP request
@@ -150,6 +211,10 @@ async def get_user_from_request(req: func.HttpRequest) -> UserDocument | None:
     Returns:
         UserDocument if authenticated, None otherwise
     """
+    scope = current_request_scope()
+    if scope and scope.user:
+        return scope.user
+
     token = extract_token(req)
     if not token:
         logger.debug("No authorization token provided")
@@ -161,11 +226,15 @@ async def get_user_from_request(req: func.HttpRequest) -> UserDocument | None:
         return None
 
     try:
-        return await get_or_create_user(claims)
+        user = await get_or_create_user(claims)
     except Exception as e:
         logger.exception(f"Failed to get/create user: {e}")
         return None
 
+    if scope:
+        scope.user = user
+    return user
+
 
 def require_auth(
     req: func.HttpRequest,
@@ -0,0 +1,50 @@
+"""
+Request Telemetry
+
+Per-invocation Cosmos DB usage summaries and request scopes for function handlers.
+"""
+
+import functools
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from repositories.metrics import begin_request_summary, end_request_summary
+from repositories.request_scope import begin_request_scope, end_request_scope
+
+# Response header carrying the RU consumed while serving an HTTP request
+REQUEST_CHARGE_RESPONSE_HEADER = "X-Cosmos-Request-Charge"
+
+
+def track_cosmos_usage(handler: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Collect a Cosmos DB usage summary for each invocation of a function handler.
+
+    The summary is logged when the invocation finishes and, for HTTP handlers,
+    the total RU is returned in the X-Cosmos-Request-Charge header. Each
+    invocation also runs in its own request scope, so repeat reads of a
+    document are served from the scope's identity map.
+
+    Args:
+        handler: Async function handler (HTTP, queue or timer trigger)
+
+    Returns:
+        Wrapped handler
+    """
+
+    @functools.wraps(handler)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = begin_request_summary(handler.__name__)
+        try:
+            scope_token = begin_request_scope(handler.__name__)
+            try:
+                result = await handler(*args, **kwargs)
+            finally:
+                end_request_scope(scope_token)
+        finally:
+            summary = end_request_summary(token)
+
+        if summary is not None and summary.operation_count and hasattr(result, "headers"):
+            result.headers[REQUEST_CHARGE_RESPONSE_HEADER] = f"{summary.request_charge:.2f}"
+        return result
+
+    return wrapper
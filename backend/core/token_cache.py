@@ -0,0 +1,110 @@
+"""
+Token Cache
+
+Per-instance cache of validated bearer tokens. A browser tab sends the same
+access token with every request until it expires, so the claims decoded by the
+first full signature and claim check are kept, keyed by a SHA-256 of the
+token, and served until shortly before the token's exp. Only successfully
+validated tokens are stored; rejected tokens are always re-checked.
+"""
+
+import copy
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class TokenCache:
+    """Size-bounded LRU of validated token claims, held until shortly before exp."""
+
+    def __init__(self, max_entries: int, expiry_margin_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.expiry_margin_seconds = expiry_margin_seconds
+        self._entries: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_environment(cls) -> "TokenCache | None":
+        """
+        Build the cache from AUTH_TOKEN_CACHE_MAX_ENTRIES and AUTH_TOKEN_CACHE_EXPIRY_MARGIN_SECONDS.
+
+        Returns:
+            The cache, or None when disabled (max entries of 0)
+        """
+        max_entries = int(os.environ.get("AUTH_TOKEN_CACHE_MAX_ENTRIES", "1000"))
+        expiry_margin_seconds = float(os.environ.get("AUTH_TOKEN_CACHE_EXPIRY_MARGIN_SECONDS", "30"))
+        if max_entries <= 0:
+            return None
+        return cls(max_entries=max_entries, expiry_margin_seconds=expiry_margin_seconds)
+
+    @staticmethod
+    def key(token: str) -> str:
+        """Cache key of a token (the raw token is never stored)."""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """
+        Get the claims of a previously validated token.
+
+        Returns:
+            A copy of the claims, or None if not cached or close to expiry
+        """
+        key = self.key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        claims, valid_until = entry
+        if time.time() >= valid_until:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(claims)
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        """Store the claims of a token that passed validation (tokens without exp are not cached)."""
+        exp = claims.get("exp")
+        if not isinstance(exp, int | float):
+            return
+        valid_until = exp - self.expiry_margin_seconds
+        if valid_until <= time.time():
+            return
+
+        key = self.key(token)
+        self._entries[key] = (copy.deepcopy(claims), valid_until)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "expiry_margin_seconds": self.expiry_margin_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        """Zero the counters (entries are kept)."""
+        self.hits = self.misses = self.expirations = self.evictions = 0
@@ -0,0 +1,150 @@
+"""
+Warm-up Module
+
+Moves one-time connection setup off the first user request of a new
+instance: opening the Cosmos DB client, loading account and container
+metadata and the partition routing map, and fetching the Entra ID signing
+keys. Runs once per process, from the warm-up trigger (Premium and Dedicated
+plans) or the first health probe (Consumption plan), and records how long
+each step took.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from core.security import get_jwks_provider
+from repositories.cosmos_repository import cosmos_repo
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupStep:
+    """Outcome of one warm-up step."""
+
+    def __init__(self, name: str, status: str, duration_ms: float, detail: str = "") -> None:
+        self.name = name
+        self.status = status
+        self.duration_ms = duration_ms
+        self.detail = detail
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "name": self.name,
+            "status": self.status,
+            "duration_ms": round(self.duration_ms, 2),
+            "detail": self.detail,
+        }
+
+
+class WarmupReport:
+    """Steps of one warm-up run."""
+
+    def __init__(self, trigger: str) -> None:
+        self.trigger = trigger
+        self.started_at = datetime.now(UTC)
+        self.steps: list[WarmupStep] = []
+
+    @property
+    def ok(self) -> bool:
+        """Whether every step succeeded."""
+        return all(step.status == "ok" for step in self.steps)
+
+    @property
+    def duration_ms(self) -> float:
+        """Total time across steps."""
+        return sum(step.duration_ms for step in self.steps)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "status": "warm" if self.ok else "degraded",
+            "duration_ms": round(self.duration_ms, 2),
+            "steps": [step.to_dict() for step in self.steps],
+        }
+
+
+async def _warm_cosmos(report: WarmupReport) -> None:
+    started = time.perf_counter()
+    try:
+        for name, duration_ms, detail in await cosmos_repo.warm_up():
+            report.steps.append(WarmupStep(name, "ok", duration_ms, detail))
+    except Exception as e:
+        logger.warning(f"Cosmos DB warm-up failed: {e}")
+        report.steps.append(WarmupStep("cosmos_db", "failed", (time.perf_counter() - started) * 1000, str(e)))
+
+
+async def _warm_jwks(report: WarmupReport) -> None:
+    started = time.perf_counter()
+    try:
+        keys = await get_jwks_provider().refresh()
+        detail = f"{len(keys)} signing keys"
+        report.steps.append(WarmupStep("jwks", "ok", (time.perf_counter() - started) * 1000, detail))
+    except Exception as e:
+        logger.warning(f"JWKS warm-up failed: {e}")
+        report.steps.append(WarmupStep("jwks", "failed", (time.perf_counter() - started) * 1000, str(e)))
+
+
+async def run_warmup(trigger: str) -> WarmupReport:
+    """
+    Run every warm-up step. Steps are independent, so they run concurrently.
+
+    Args:
+        trigger: What started the warm-up (for the report)
+
+    Returns:
+        Report with the outcome and duration of each step
+    """
+    report = WarmupReport(trigger)
+    await asyncio.gather(_warm_cosmos(report), _warm_jwks(report))
+    logger.info(f"Warm-up ({trigger}) finished in {report.duration_ms:.0f} ms: {report.to_dict()['steps']}")
+    return report
+
+
+class Warmup:
+    """Runs the warm-up once per process and keeps its report."""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task[WarmupReport] | None = None
+
+    def start(self, trigger: str) -> asyncio.Task:
+        """
+        Start the warm-up in the background unless it already ran or is running.
+
+        A run with failed steps is retried by the next call.
+
+        Args:
+            trigger: What started the warm-up
+
+        Returns:
+            Task resolving to the report
+        """
+        if self._task is not None and not self._task.done():
+            return self._task
+        if self._task is not None and not self._task.cancelled() and self._task.result().ok:
+            return self._task
+
+        # A fresh context, so the run's Cosmos usage and request scope are not the caller's
+        self._task = asyncio.get_running_loop().create_task(run_warmup(trigger), context=contextvars.Context())
+        return self._task
+
+    async def ensure(self, trigger: str) -> WarmupReport:
+        """Warm up if needed and wait for the report."""
+        return await asyncio.shield(self.start(trigger))
+
+    @property
+    def report(self) -> WarmupReport | None:
+        """Report of the last finished run, if any."""
+        if self._task is None or not self._task.done() or self._task.cancelled():
+            return None
+        return self._task.result()
+
+
+# Singleton instance
+warmup = Warmup()
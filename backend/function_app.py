@@ -12,7 +12,11 @@ import azure.functions as func
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
+# Import Cosmos DB blueprints
+from functions.cosmos.change_feed import bp as change_feed_bp
+
 # Import HTTP blueprints
+from functions.http.admin import bp as admin_bp
 from functions.http.assistant import bp as assistant_bp
 from functions.http.auth import bp as auth_bp
 from functions.http.collaboration import bp as collaboration_bp
@@ -28,6 +32,7 @@ from functions.queue.notification_sender import bp as notification_queue_bp
 
 # Import Timer blueprints
 from functions.timer.cleanup import bp as cleanup_bp
+from functions.timer.partition_migration import bp as partition_migration_bp
 
 # Create function app with anonymous auth level (we handle auth ourselves)
 app = func.FunctionApp(http_auth_level=func.AuthLevel.ANONYMOUS)
@@ -41,6 +46,9 @@ app.register_blueprint(itineraries_bp)
 app.register_blueprint(collaboration_bp)
 app.register_blueprint(assistant_bp)
 app.register_blueprint(signalr_bp)
+app.register_blueprint(admin_bp)
 app.register_blueprint(itinerary_queue_bp)
 app.register_blueprint(notification_queue_bp)
 app.register_blueprint(cleanup_bp)
+app.register_blueprint(change_feed_bp)
+app.register_blueprint(partition_migration_bp)
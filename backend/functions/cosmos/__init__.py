@@ -0,0 +1,11 @@
+"""
+Cosmos DB Functions Module
+
+Azure Functions Cosmos DB triggers fed by the container's change feed.
+"""
+
+from functions.cosmos.change_feed import bp as change_feed_bp
+
+__all__ = [
+    "change_feed_bp",
+]
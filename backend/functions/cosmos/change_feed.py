@@ -0,0 +1,42 @@
+"""
+Change Feed Function
+
+Runs write side effects off the request path. The Cosmos DB trigger's change
+feed processor keeps its leases in the leases container and polls the feed on
+the host, so the function is only invoked when there are changes to handle.
+"""
+
+import logging
+
+import azure.functions as func
+
+from core.telemetry import track_cosmos_usage
+from services.change_handlers import side_effects
+
+bp = func.Blueprint()
+logger = logging.getLogger(__name__)
+
+# How long an idle lease waits before polling the feed again (milliseconds); also the
+# worst-case delay of a side effect, at about one RU per poll and physical partition
+FEED_POLL_DELAY_MS = 1000
+
+
+@bp.cosmos_db_trigger(
+    arg_name="documents",
+    connection="COSMOS_DB_CONNECTION",
+    database_name="%COSMOS_DB_NAME%",
+    container_name="%COSMOS_DB_CONTAINER%",
+    lease_container_name="leases",
+    feed_poll_delay=FEED_POLL_DELAY_MS,
+    max_items_per_invocation=100,
+)
+@track_cosmos_usage
+async def process_change_feed(documents: func.DocumentList) -> None:
+    """
+    Dispatch a batch of changed documents to their handlers.
+    """
+    try:
+        await side_effects.dispatch(document.to_dict() for document in documents)
+    except Exception as e:
+        logger.exception(f"Error processing change feed: {e}")
+        raise
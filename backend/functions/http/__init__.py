@@ -4,6 +4,7 @@ HTTP Functions Module
 Azure Functions HTTP triggers for the Pathfinder API.
 """
 
+from functions.http.admin import bp as admin_bp
 from functions.http.assistant import bp as assistant_bp
 from functions.http.auth import bp as auth_bp
 from functions.http.collaboration import bp as collaboration_bp
@@ -22,4 +23,5 @@ __all__ = [
     "collaboration_bp",
     "assistant_bp",
     "signalr_bp",
+    "admin_bp",
 ]
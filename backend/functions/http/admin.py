@@ -0,0 +1,148 @@
+"""
+Admin HTTP Functions
+
+Operational endpoints for the platform team. Protected by the function host's
+admin (master) key rather than user authentication.
+"""
+
+import logging
+
+import azure.functions as func
+
+from core.errors import APIError, ErrorCode, error_response, success_response
+from core.identity_cache import identity_cache
+from core.security import get_jwks_provider, token_cache
+from repositories.cosmos_repository import cosmos_repo
+from repositories.metrics import repository_metrics
+from repositories.query_stats import SORT_KEYS, query_log
+from services.llm.cache import prompt_cache
+
+bp = func.Blueprint()
+logger = logging.getLogger(__name__)
+
+
+@bp.route(route="ops/cosmos/metrics", methods=["GET"], auth_level=func.AuthLevel.ADMIN)
+async def get_cosmos_metrics(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Get Cosmos DB usage aggregated by repository operation.
+
+    Aggregates are per function host instance and cover the time since the
+    instance started or the last reset. Includes document cache counters when
+    the cache is enabled.
+
+    Query params:
+    - reset: "true" to clear the aggregates after reading them
+    """
+    try:
+        snapshot = repository_metrics.snapshot()
+        cache = cosmos_repo.document_cache
+        if cache:
+            snapshot["document_cache"] = cache.stats()
+
+        if req.params.get("reset", "").lower() == "true":
+            repository_metrics.reset()
+            if cache:
+                cache.reset_stats()
+            logger.info("Cosmos metrics reset")
+
+        return success_response(snapshot)
+
+    except Exception as e:
+        logger.exception(f"Error reading Cosmos metrics: {e}")
+        return error_response(
+            APIError(code=ErrorCode.INTERNAL_ERROR, message="Failed to read metrics"), status_code=500
+        )
+
+
+@bp.route(route="ops/cosmos/queries", methods=["GET"], auth_level=func.AuthLevel.ADMIN)
+async def get_cosmos_query_report(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Get the most expensive query shapes.
+
+    Queries are grouped by operation and fingerprint (the query text with its
+    literals stripped). Statistics are per function host instance.
+
+    Query params:
+    - limit: Number of shapes to return (default 20, max 200)
+    - sort: request_charge (default), avg_request_charge, count, avg_latency_ms, max_latency_ms or pages
+    - reset: "true" to clear the statistics after reading them
+    """
+    try:
+        try:
+            limit = min(max(int(req.params.get("limit", "20")), 1), 200)
+        except ValueError:
+            raise APIError(code=ErrorCode.VALIDATION_ERROR, message="limit must be an integer") from None
+
+        sort = req.params.get("sort", "request_charge")
+        if sort not in SORT_KEYS:
+            raise APIError(code=ErrorCode.VALIDATION_ERROR, message=f"sort must be one of: {', '.join(SORT_KEYS)}")
+
+        report = query_log.top(limit=limit, sort=sort)
+
+        if req.params.get("reset", "").lower() == "true":
+            query_log.reset()
+            logger.info("Cosmos query statistics reset")
+
+        return success_response(report)
+
+    except APIError as e:
+        return error_response(e, status_code=400)
+    except Exception as e:
+        logger.exception(f"Error reading Cosmos query report: {e}")
+        return error_response(
+            APIError(code=ErrorCode.INTERNAL_ERROR, message="Failed to read query report"), status_code=500
+        )
+
+
+@bp.route(route="ops/auth/metrics", methods=["GET"], auth_level=func.AuthLevel.ADMIN)
+async def get_auth_metrics(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Get validated-token and identity cache counters and JWKS key set state for this function host instance.
+
+    Query params:
+    - reset: "true" to zero the counters after reading them
+    """
+    try:
+        snapshot = {
+            "token_cache": token_cache.stats() if token_cache else None,
+            "identity_cache": identity_cache.stats() if identity_cache else None,
+            "jwks": get_jwks_provider().stats(),
+        }
+
+        if req.params.get("reset", "").lower() == "true":
+            for cache in (token_cache, identity_cache):
+                if cache:
+                    cache.reset_stats()
+            logger.info("Auth metrics reset")
+
+        return success_response(snapshot)
+
+    except Exception as e:
+        logger.exception(f"Error reading auth metrics: {e}")
+        return error_response(
+            APIError(code=ErrorCode.INTERNAL_ERROR, message="Failed to read auth metrics"), status_code=500
+        )
+
+
+@bp.route(route="ops/llm/metrics", methods=["GET"], auth_level=func.AuthLevel.ADMIN)
+async def get_llm_metrics(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Get prompt cache counters (hits, misses, tokens and cost saved) for this function host instance.
+
+    Query params:
+    - reset: "true" to zero the counters after reading them
+    """
+    try:
+        snapshot = {"prompt_cache": prompt_cache.stats() if prompt_cache else None}
+
+        if req.params.get("reset", "").lower() == "true" and prompt_cache:
+            prompt_cache.reset_stats()
+            logger.info("LLM metrics reset")
+
+        return success_response(snapshot)
+
+    except Exception as e:
+        logger.exception(f"Error reading LLM metrics: {e}")
+        return error_response(
+            APIError(code=ErrorCode.INTERNAL_ERROR, message="Failed to read LLM metrics"), status_code=500
+        )
@@ -10,6 +10,7 @@ import azure.functions as func
 
 from core.errors import APIError, ErrorCode, error_response, success_response
 from core.security import get_user_from_request
+from core.telemetry import track_cosmos_usage
 from models.schemas import (
     AssistantRequest,
     MessageResponse,
@@ -29,6 +30,7 @@ async def require_auth(req: func.HttpRequest):
 
 
 @bp.route(route="assistant/message", methods=["POST"])
+@track_cosmos_usage
 async def send_message(req: func.HttpRequest) -> func.HttpResponse:
     """
     Send a message to the AI assistant.
@@ -63,39 +65,42 @@ async def send_message(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="assistant/conversation", methods=["GET"])
+@track_cosmos_usage
 async def get_conversation(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get conversation history with the assistant.
 
     Query params:
     - trip_id: Optional filter by trip
-    - limit: Max messages (default 50)
-    - offset: Pagination offset
+    - limit: Page size (default 50)
+    - cursor: next_cursor from the previous page
     """
     try:
         user = await require_auth(req)
 
         trip_id = req.params.get("trip_id")
         limit = int(req.params.get("limit", "50"))
-        offset = int(req.params.get("offset", "0"))
+        cursor = req.params.get("cursor")
 
         service = get_assistant_service()
-        messages = await service.get_conversation(user_id=user.id, trip_id=trip_id, limit=limit, offset=offset)
+        page = await service.get_conversation(user_id=user.id, trip_id=trip_id, limit=limit, cursor=cursor)
 
-        message_responses = [MessageResponse.from_document(m) for m in messages]
+        message_responses = [MessageResponse.from_document(m) for m in page.items]
 
         return success_response(
             {
                 "items": [m.model_dump() for m in message_responses],
-                "total": len(messages),
                 "limit": limit,
-                "offset": offset,
+                "next_cursor": page.next_cursor,
+                "has_more": page.has_more,
             }
         )
 
     except APIError as e:
         status = 401 if e.code == ErrorCode.AUTHENTICATION_ERROR else 400
         return error_response(e, status_code=status)
+    except ValueError as e:
+        return error_response(APIError(code=ErrorCode.VALIDATION_ERROR, message=str(e)), status_code=400)
     except Exception:
         logger.exception("Error getting conversation")
         return error_response(
@@ -104,6 +109,7 @@ async def get_conversation(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="assistant/conversation", methods=["DELETE"])
+@track_cosmos_usage
 async def clear_conversation(req: func.HttpRequest) -> func.HttpResponse:
     """
     Clear conversation history with the assistant.
@@ -132,6 +138,7 @@ async def clear_conversation(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/assistant/suggest", methods=["POST"])
+@track_cosmos_usage
 async def get_suggestions(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get AI suggestions for a specific trip context.
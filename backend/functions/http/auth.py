@@ -11,9 +11,12 @@ import azure.functions as func
 
 from core.config import get_settings
 from core.errors import APIError, ErrorCode, error_response, success_response
+from core.identity_cache import forget_user
 from core.security import get_user_from_request, validate_token
+from core.telemetry import track_cosmos_usage
+from models.documents import UserDocument
 from models.schemas import UserResponse
-from repositories.cosmos_repository import cosmos_repo
+from repositories.cosmos_repository import PatchOperation, cosmos_repo
 
 bp = func.Blueprint()
 logger = logging.getLogger(__name__)
@@ -25,6 +28,7 @@ def utc_now() -> datetime:
 
 
 @bp.route(route="auth/me", methods=["GET"])
+@track_cosmos_usage
 async def get_current_user(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get the current authenticated user's profile.
@@ -53,6 +57,7 @@ async def get_current_user(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="auth/validate", methods=["POST"])
+@track_cosmos_usage
 async def validate_auth_token(req: func.HttpRequest) -> func.HttpResponse:
     """
     Validate an authentication token.
@@ -92,6 +97,7 @@ async def validate_auth_token(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="auth/refresh", methods=["POST"])
+@track_cosmos_usage
 async def refresh_token_info(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get information about token refresh.
@@ -120,6 +126,7 @@ async def refresh_token_info(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="auth/logout", methods=["POST"])
+@track_cosmos_usage
 async def logout(req: func.HttpRequest) -> func.HttpResponse:
     """
     Log out the current user.
@@ -133,9 +140,10 @@ async def logout(req: func.HttpRequest) -> func.HttpResponse:
         if user:
             logger.info(f"User logged out: {user.id}")
 
-            # Update last_login timestamp
-            user.updated_at = utc_now()
-            await cosmos_repo.update(user)
+            # Update last_login timestamp; only the timestamp is written, so a
+            # cached copy of the user cannot overwrite changes made elsewhere
+            await cosmos_repo.patch(user.id, user.pk, [PatchOperation.set("/updated_at", utc_now())], UserDocument)
+            forget_user(user)
 
         return success_response({"message": "Logged out successfully"})
 
@@ -146,6 +154,7 @@ async def logout(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="auth/config", methods=["GET"])
+@track_cosmos_usage
 async def get_auth_config(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get public authentication configuration.
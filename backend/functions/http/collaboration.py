@@ -10,6 +10,7 @@ import azure.functions as func
 
 from core.errors import APIError, ErrorCode, error_response, success_response
 from core.security import get_user_from_request
+from core.telemetry import track_cosmos_usage
 from models.schemas import (
     PollCreate,
     PollResponse,
@@ -31,6 +32,7 @@ async def require_auth(req: func.HttpRequest):
 
 
 @bp.route(route="trips/{trip_id}/polls", methods=["GET"])
+@track_cosmos_usage
 async def list_polls(req: func.HttpRequest) -> func.HttpResponse:
     """
     List all polls for a trip.
@@ -54,8 +56,8 @@ async def list_polls(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        # user_has_access is sync: (trip, user_id)
-        if not trip_service.user_has_access(trip, user.id):
+        # Check access
+        if not await trip_service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
@@ -63,13 +65,9 @@ async def list_polls(req: func.HttpRequest) -> func.HttpResponse:
         # Get polls
         status_filter = req.params.get("status")
         collab_service = get_collaboration_service()
-        polls = await collab_service.get_trip_polls(trip_id)
+        polls = await collab_service.get_trip_poll_summaries(trip_id, user.id, status=status_filter)
 
-        # Filter by status if requested
-        if status_filter:
-            polls = [p for p in polls if p.status == status_filter]
-
-        poll_responses = [PollResponse.from_document(p, user.id) for p in polls]
+        poll_responses = [PollResponse.from_summary(p) for p in polls]
 
         return success_response({"items": [p.model_dump() for p in poll_responses], "total": len(polls)})
 
@@ -82,6 +80,7 @@ async def list_polls(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/polls", methods=["POST"])
+@track_cosmos_usage
 async def create_poll(req: func.HttpRequest) -> func.HttpResponse:
     """
     Create a new poll for a trip.
@@ -109,7 +108,7 @@ async def create_poll(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        if not trip_service.user_has_access(trip, user.id):
+        if not await trip_service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
@@ -130,6 +129,7 @@ async def create_poll(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/polls/{poll_id}", methods=["GET"])
+@track_cosmos_usage
 async def get_poll(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get a specific poll.
@@ -151,14 +151,14 @@ async def get_poll(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        if not trip_service.user_has_access(trip, user.id):
+        if not await trip_service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
 
         # Get poll
         collab_service = get_collaboration_service()
-        poll = await collab_service.get_poll(poll_id)
+        poll = await collab_service.get_poll(poll_id, trip_id)
 
         if not poll or poll.trip_id != trip_id:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Poll not found"), status_code=404)
@@ -175,6 +175,7 @@ async def get_poll(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/polls/{poll_id}/vote", methods=["POST"])
+@track_cosmos_usage
 async def vote_on_poll(req: func.HttpRequest) -> func.HttpResponse:
     """
     Cast a vote on a poll.
@@ -201,14 +202,14 @@ async def vote_on_poll(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        if not trip_service.user_has_access(trip, user.id):
+        if not await trip_service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
 
-        # Cast vote — service expects (poll_id, vote: PollVote, user: UserDocument)
+        # Cast vote — service expects (poll_id, vote: PollVote, user: UserDocument, trip_id)
         collab_service = get_collaboration_service()
-        poll = await collab_service.vote_on_poll(poll_id=poll_id, vote=vote_data, user=user)
+        poll = await collab_service.vote_on_poll(poll_id=poll_id, vote=vote_data, user=user, trip_id=trip_id)
 
         if not poll:
             return error_response(
@@ -227,6 +228,7 @@ async def vote_on_poll(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/polls/{poll_id}/close", methods=["POST"])
+@track_cosmos_usage
 async def close_poll(req: func.HttpRequest) -> func.HttpResponse:
     """
     Close a poll.
@@ -252,7 +254,7 @@ async def close_poll(req: func.HttpRequest) -> func.HttpResponse:
 
         # Get poll to check creator
         collab_service = get_collaboration_service()
-        poll = await collab_service.get_poll(poll_id)
+        poll = await collab_service.get_poll(poll_id, trip_id)
 
         if not poll or poll.trip_id != trip_id:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Poll not found"), status_code=404)
@@ -269,8 +271,8 @@ async def close_poll(req: func.HttpRequest) -> func.HttpResponse:
                 status_code=403,
             )
 
-        # Close poll — service expects (poll_id, user)
-        closed_poll = await collab_service.close_poll(poll_id=poll_id, user=user)
+        # Close poll — service expects (poll_id, user, trip_id)
+        closed_poll = await collab_service.close_poll(poll_id=poll_id, user=user, trip_id=trip_id)
 
         if not closed_poll:
             return error_response(
@@ -289,6 +291,7 @@ async def close_poll(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/consensus", methods=["GET"])
+@track_cosmos_usage
 async def get_consensus(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get AI-analyzed consensus status for a trip's polls.
@@ -309,7 +312,7 @@ async def get_consensus(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        if not trip_service.user_has_access(trip, user.id):
+        if not await trip_service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
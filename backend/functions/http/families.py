@@ -10,6 +10,7 @@ import azure.functions as func
 
 from core.errors import APIError, ErrorCode, error_response, success_response
 from core.security import get_user_from_request
+from core.telemetry import track_cosmos_usage
 from models.schemas import (
     FamilyCreate,
     FamilyInviteRequest,
@@ -32,6 +33,7 @@ async def require_auth(req: func.HttpRequest):
 
 
 @bp.route(route="families", methods=["GET"])
+@track_cosmos_usage
 async def list_families(req: func.HttpRequest) -> func.HttpResponse:
     """
     List families the current user belongs to.
@@ -40,9 +42,9 @@ async def list_families(req: func.HttpRequest) -> func.HttpResponse:
         user = await require_auth(req)
 
         service = get_family_service()
-        families = await service.get_user_families(user.id)
+        families = await service.get_user_family_summaries(user.id)
 
-        family_responses = [FamilyResponse.from_document(f) for f in families]
+        family_responses = [FamilyResponse.from_summary(f) for f in families]
 
         return success_response({"items": [f.model_dump() for f in family_responses], "total": len(families)})
 
@@ -56,6 +58,7 @@ async def list_families(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="families", methods=["POST"])
+@track_cosmos_usage
 async def create_family(req: func.HttpRequest) -> func.HttpResponse:
     """
     Create a new family.
@@ -84,6 +87,7 @@ async def create_family(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="families/{family_id}", methods=["GET"])
+@track_cosmos_usage
 async def get_family(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get a specific family by ID.
@@ -121,6 +125,7 @@ async def get_family(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="families/{family_id}", methods=["PUT", "PATCH"])
+@track_cosmos_usage
 async def update_family(req: func.HttpRequest) -> func.HttpResponse:
     """
     Update a family.
@@ -161,6 +166,7 @@ async def update_family(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="families/{family_id}/members", methods=["GET"])
+@track_cosmos_usage
 async def get_family_members(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get all members of a family.
@@ -208,6 +214,7 @@ async def get_family_members(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="families/{family_id}/invite", methods=["POST"])
+@track_cosmos_usage
 async def invite_member(req: func.HttpRequest) -> func.HttpResponse:
     """
     Invite a new member to the family.
@@ -258,6 +265,7 @@ async def invite_member(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="invitations/{invitation_id}/accept", methods=["POST"])
+@track_cosmos_usage
 async def accept_invitation(req: func.HttpRequest) -> func.HttpResponse:
     """
     Accept a family invitation.
@@ -296,6 +304,7 @@ async def accept_invitation(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="invitations/{invitation_id}/decline", methods=["POST"])
+@track_cosmos_usage
 async def decline_invitation(req: func.HttpRequest) -> func.HttpResponse:
     """
     Decline a family invitation.
@@ -322,6 +331,7 @@ async def decline_invitation(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="families/{family_id}/members/{member_id}", methods=["DELETE"])
+@track_cosmos_usage
 async def remove_member(req: func.HttpRequest) -> func.HttpResponse:
     """
     Remove a member from the family.
@@ -361,6 +371,7 @@ async def remove_member(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="invitations", methods=["GET"])
+@track_cosmos_usage
 async def get_pending_invitations(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get pending invitations for the current user.
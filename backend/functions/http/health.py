@@ -4,11 +4,15 @@ Health Check HTTP Function
 Provides health endpoints for Azure Functions monitoring.
 """
 
+import json
 from datetime import UTC, datetime
 
 import azure.functions as func
+from azure.functions.warmup import WarmUpContext
 
 from core.config import get_settings
+from core.telemetry import track_cosmos_usage
+from core.warmup import warmup
 from repositories.cosmos_repository import cosmos_repo
 from services.llm.client import llm_client
 
@@ -21,18 +25,22 @@ def utc_now() -> datetime:
 
 
 @bp.route(route="health", methods=["GET"])
+@track_cosmos_usage
 async def health_check(req: func.HttpRequest) -> func.HttpResponse:
     """
     Basic health check endpoint.
 
-    Returns 200 if the function app is running.
+    Returns 200 if the function app is running. The first probe of a new
+    instance also starts the warm-up in the background.
     """
+    warmup.start("health_probe")
     return func.HttpResponse(
         body='{"status": "healthy", "service": "pathfinder-api"}', status_code=200, mimetype="application/json"
     )
 
 
 @bp.route(route="health/ready", methods=["GET"])
+@track_cosmos_usage
 async def readiness_check(req: func.HttpRequest) -> func.HttpResponse:
     """
     Readiness check - verifies all dependencies are available.
@@ -75,17 +83,19 @@ async def readiness_check(req: func.HttpRequest) -> func.HttpResponse:
         checks["checks"]["openai"] = {"status": "unhealthy", "details": str(e)}
         all_healthy = False
 
+    # Connection setup timings (informational; does not affect readiness)
+    checks["warmup"] = (await warmup.ensure("readiness_probe")).to_dict()
+
     # Set overall status
     checks["status"] = "healthy" if all_healthy else "unhealthy"
 
-    import json
-
     return func.HttpResponse(
         body=json.dumps(checks), status_code=200 if all_healthy else 503, mimetype="application/json"
     )
 
 
 @bp.route(route="health/live", methods=["GET"])
+@track_cosmos_usage
 async def liveness_check(req: func.HttpRequest) -> func.HttpResponse:
     """
     Liveness check - basic check that the process is alive.
@@ -93,3 +103,27 @@ async def liveness_check(req: func.HttpRequest) -> func.HttpResponse:
     Used by Azure to determine if the container should be restarted.
     """
     return func.HttpResponse(body='{"status": "alive"}', status_code=200, mimetype="application/json")
+
+
+@bp.route(route="health/warmup", methods=["GET"])
+@track_cosmos_usage
+async def warmup_check(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Warm the instance up if it has not been yet and report how long each step took.
+
+    Steps: Cosmos DB client, container metadata, partition routing map and the
+    Entra ID signing keys. Returns 503 while any step is failing.
+    """
+    report = await warmup.ensure("warmup_endpoint")
+
+    return func.HttpResponse(
+        body=json.dumps(report.to_dict()), status_code=200 if report.ok else 503, mimetype="application/json"
+    )
+
+
+@bp.warm_up_trigger(arg_name="warmup_context")
+async def warm_up_instance(warmup_context: WarmUpContext) -> None:
+    """
+    Warm-up trigger, invoked on new instances before they receive traffic (Premium and Dedicated plans).
+    """
+    await warmup.ensure("warmup_trigger")
@@ -11,6 +11,7 @@ import azure.functions as func
 
 from core.errors import APIError, ErrorCode, error_response, success_response
 from core.security import get_user_from_request
+from core.telemetry import track_cosmos_usage
 from models.schemas import (
     ItineraryGenerateRequest,
     ItineraryResponse,
@@ -31,6 +32,7 @@ async def require_auth(req: func.HttpRequest):
 
 
 @bp.route(route="trips/{trip_id}/itinerary", methods=["GET"])
+@track_cosmos_usage
 async def get_itinerary(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get the current itinerary for a trip.
@@ -51,8 +53,8 @@ async def get_itinerary(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        # user_has_access is sync: (trip, user_id)
-        if not trip_service.user_has_access(trip, user.id):
+        # Check access
+        if not await trip_service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
@@ -78,11 +80,12 @@ async def get_itinerary(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/itinerary/generate", methods=["POST"])
+@track_cosmos_usage
 async def generate_itinerary(req: func.HttpRequest) -> func.HttpResponse:
     """
     Generate a new AI-powered itinerary for a trip.
 
-    Body: ItineraryGenerateRequest (optional preferences)
+    Body: ItineraryGenerateRequest (optional preferences; fresh=true to skip the prompt cache)
     """
     try:
         user = await require_auth(req)
@@ -95,11 +98,13 @@ async def generate_itinerary(req: func.HttpRequest) -> func.HttpResponse:
 
         # Parse optional preferences
         preferences = {}
+        fresh = False
         try:
             body = req.get_json()
             if body:
                 gen_request = ItineraryGenerateRequest(**body)
-                preferences = gen_request.model_dump(exclude_unset=True)
+                preferences = gen_request.model_dump(exclude_unset=True, exclude={"fresh"})
+                fresh = gen_request.fresh
         except (ValueError, json.JSONDecodeError):
             pass  # No preferences provided
 
@@ -110,7 +115,7 @@ async def generate_itinerary(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        if not trip_service.user_has_access(trip, user.id):
+        if not await trip_service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
@@ -118,7 +123,7 @@ async def generate_itinerary(req: func.HttpRequest) -> func.HttpResponse:
         # Generate itinerary — service expects (trip_id, preferences, user)
         itinerary_service = get_itinerary_service()
         itinerary = await itinerary_service.generate_itinerary(
-            trip_id=trip_id, preferences=preferences if preferences else None, user=user
+            trip_id=trip_id, preferences=preferences if preferences else None, user=user, fresh=fresh
         )
 
         if not itinerary:
@@ -143,6 +148,7 @@ async def generate_itinerary(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/itinerary/approve", methods=["POST"])
+@track_cosmos_usage
 async def approve_itinerary(req: func.HttpRequest) -> func.HttpResponse:
     """
     Approve the current itinerary.
@@ -202,6 +208,7 @@ async def approve_itinerary(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/itinerary", methods=["PUT", "PATCH"])
+@track_cosmos_usage
 async def update_itinerary(req: func.HttpRequest) -> func.HttpResponse:
     """
     Update the itinerary with manual changes.
@@ -264,11 +271,14 @@ async def update_itinerary(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/itinerary/regenerate", methods=["POST"])
+@track_cosmos_usage
 async def regenerate_itinerary(req: func.HttpRequest) -> func.HttpResponse:
     """
     Regenerate the itinerary with new preferences or feedback.
 
-    Body: ItineraryGenerateRequest with feedback
+    Body: ItineraryGenerateRequest with feedback. A regenerate always calls the
+    model (fresh=false to accept a cached response); a double-clicked regenerate
+    still shares the call already in progress.
     """
     try:
         user = await require_auth(req)
@@ -283,6 +293,7 @@ async def regenerate_itinerary(req: func.HttpRequest) -> func.HttpResponse:
         body = req.get_json()
         feedback = body.get("feedback", "")
         preferences = body.get("preferences", {})
+        fresh = bool(body.get("fresh", True))
 
         # Verify trip access
         trip_service = get_trip_service()
@@ -291,7 +302,7 @@ async def regenerate_itinerary(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        if not trip_service.user_has_access(trip, user.id):
+        if not await trip_service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
@@ -303,7 +314,7 @@ async def regenerate_itinerary(req: func.HttpRequest) -> func.HttpResponse:
         # Regenerate itinerary — service expects (trip_id, preferences, user)
         itinerary_service = get_itinerary_service()
         itinerary = await itinerary_service.generate_itinerary(
-            trip_id=trip_id, preferences=preferences if preferences else None, user=user
+            trip_id=trip_id, preferences=preferences if preferences else None, user=user, fresh=fresh
         )
 
         if not itinerary:
@@ -12,6 +12,7 @@ import azure.functions as func
 
 from core.errors import APIError, ErrorCode, error_response, success_response
 from core.security import get_user_from_request
+from core.telemetry import track_cosmos_usage
 from services.realtime_service import get_realtime_service
 
 bp = func.Blueprint()
@@ -32,6 +33,7 @@ async def require_auth(req: func.HttpRequest):
 
 
 @bp.route(route="signalr/negotiate", methods=["POST"])
+@track_cosmos_usage
 async def negotiate(req: func.HttpRequest) -> func.HttpResponse:
     """
     Negotiate SignalR connection.
@@ -61,6 +63,7 @@ async def negotiate(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="signalr/groups/{group_name}/join", methods=["POST"])
+@track_cosmos_usage
 async def join_group(req: func.HttpRequest) -> func.HttpResponse:
     """
     Join a SignalR group.
@@ -95,6 +98,7 @@ async def join_group(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="signalr/groups/{group_name}/leave", methods=["POST"])
+@track_cosmos_usage
 async def leave_group(req: func.HttpRequest) -> func.HttpResponse:
     """
     Leave a SignalR group.
@@ -127,6 +131,7 @@ async def leave_group(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="signalr/send", methods=["POST"])
+@track_cosmos_usage
 async def send_message_to_group(req: func.HttpRequest) -> func.HttpResponse:
     """
     Send a message to a group.
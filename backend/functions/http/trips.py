@@ -10,6 +10,7 @@ import azure.functions as func
 
 from core.errors import APIError, ErrorCode, error_response, success_response
 from core.security import get_user_from_request
+from core.telemetry import track_cosmos_usage
 from models.schemas import (
     TripCreate,
     TripResponse,
@@ -31,6 +32,7 @@ async def require_auth(req: func.HttpRequest):
 
 
 @bp.route(route="trips", methods=["GET"])
+@track_cosmos_usage
 async def list_trips(req: func.HttpRequest) -> func.HttpResponse:
     """
     List trips for the current user.
@@ -38,8 +40,8 @@ async def list_trips(req: func.HttpRequest) -> func.HttpResponse:
     Query params:
     - family_id: Filter by family
     - status: Filter by status (planning, active, completed, cancelled)
-    - limit: Max results (default 50)
-    - offset: Pagination offset
+    - limit: Page size (default 50)
+    - cursor: next_cursor from the previous page
     """
     try:
         user = await require_auth(req)
@@ -47,38 +49,38 @@ async def list_trips(req: func.HttpRequest) -> func.HttpResponse:
         family_id = req.params.get("family_id")
         status = req.params.get("status")
         limit = int(req.params.get("limit", "50"))
-        offset = int(req.params.get("offset", "0"))
+        cursor = req.params.get("cursor")
 
         service = get_trip_service()
 
         if family_id:
-            trips = await service.get_family_trips(family_id)
+            page = await service.get_family_trips_page(family_id, status=status, limit=limit, cursor=cursor)
         else:
-            trips = await service.get_user_trips(user.id)
-
-        # Apply filters
-        if status:
-            trips = [t for t in trips if t.status == status]
-
-        # Paginate
-        total = len(trips)
-        trips = trips[offset : offset + limit]
+            page = await service.get_user_trips_page(user.id, status=status, limit=limit, cursor=cursor)
 
         # Convert to response
-        trip_responses = [TripResponse.from_document(t) for t in trips]
+        trip_responses = [TripResponse.from_document(t) for t in page.items]
 
         return success_response(
-            {"items": [t.model_dump() for t in trip_responses], "total": total, "limit": limit, "offset": offset}
+            {
+                "items": [t.model_dump() for t in trip_responses],
+                "limit": limit,
+                "next_cursor": page.next_cursor,
+                "has_more": page.has_more,
+            }
         )
 
     except APIError as e:
         return error_response(e, status_code=401 if e.code == ErrorCode.AUTHENTICATION_ERROR else 400)
+    except ValueError as e:
+        return error_response(APIError(code=ErrorCode.VALIDATION_ERROR, message=str(e)), status_code=400)
     except Exception:
         logger.exception("Error listing trips")
         return error_response(APIError(code=ErrorCode.INTERNAL_ERROR, message="Failed to list trips"), status_code=500)
 
 
 @bp.route(route="trips", methods=["POST"])
+@track_cosmos_usage
 async def create_trip(req: func.HttpRequest) -> func.HttpResponse:
     """
     Create a new trip.
@@ -106,6 +108,7 @@ async def create_trip(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}", methods=["GET"])
+@track_cosmos_usage
 async def get_trip(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get a specific trip by ID.
@@ -125,8 +128,8 @@ async def get_trip(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        # Check access — user_has_access is sync: (trip, user_id)
-        if not service.user_has_access(trip, user.id):
+        # Check access
+        if not await service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
@@ -143,6 +146,7 @@ async def get_trip(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}", methods=["PUT", "PATCH"])
+@track_cosmos_usage
 async def update_trip(req: func.HttpRequest) -> func.HttpResponse:
     """
     Update a trip.
@@ -181,6 +185,7 @@ async def update_trip(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}", methods=["DELETE"])
+@track_cosmos_usage
 async def delete_trip(req: func.HttpRequest) -> func.HttpResponse:
     """
     Delete a trip.
@@ -215,6 +220,7 @@ async def delete_trip(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @bp.route(route="trips/{trip_id}/members", methods=["GET"])
+@track_cosmos_usage
 async def get_trip_members(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get all members participating in a trip.
@@ -236,8 +242,8 @@ async def get_trip_members(req: func.HttpRequest) -> func.HttpResponse:
         if not trip:
             return error_response(APIError(code=ErrorCode.NOT_FOUND, message="Trip not found"), status_code=404)
 
-        # Check access — user_has_access is sync: (trip, user_id)
-        if not service.user_has_access(trip, user.id):
+        # Check access
+        if not await service.user_has_access(trip, user.id):
             return error_response(
                 APIError(code=ErrorCode.AUTHORIZATION_ERROR, message="Access denied"), status_code=403
             )
@@ -247,18 +253,7 @@ async def get_trip_members(req: func.HttpRequest) -> func.HttpResponse:
 
         family_service = get_family_service()
 
-        all_members = []
-        for family_id in trip.participating_family_ids:
-            members = await family_service.get_family_members(family_id)
-            all_members.extend(members)
-
-        # Deduplicate by user ID
-        seen_ids = set()
-        unique_members = []
-        for member in all_members:
-            if member.id not in seen_ids:
-                seen_ids.add(member.id)
-                unique_members.append(member)
+        unique_members = await family_service.get_members_of_families(trip.participating_family_ids)
 
         member_responses = [UserResponse.from_document(m) for m in unique_members]
 
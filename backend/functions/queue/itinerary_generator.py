@@ -10,6 +10,7 @@ from datetime import UTC, datetime
 
 import azure.functions as func
 
+from core.telemetry import track_cosmos_usage
 from services.itinerary_service import get_itinerary_service
 from services.notification_service import NotificationType, get_notification_service
 from services.realtime_service import RealtimeEvents, get_realtime_service
@@ -24,6 +25,7 @@ def utc_now() -> datetime:
 
 
 @bp.queue_trigger(arg_name="msg", queue_name="itinerary-requests", connection="AZURE_STORAGE_CONNECTION_STRING")
+@track_cosmos_usage
 async def process_itinerary_request(msg: func.QueueMessage) -> None:
     """
     Process an itinerary generation request from the queue.
@@ -32,7 +34,8 @@ async def process_itinerary_request(msg: func.QueueMessage) -> None:
     {
         "trip_id": "uuid",
         "preferences": {...},
-        "requested_by": "user_id"
+        "requested_by": "user_id",
+        "fresh": false
     }
     """
     try:
@@ -43,6 +46,7 @@ async def process_itinerary_request(msg: func.QueueMessage) -> None:
         trip_id = request.get("trip_id")
         preferences = request.get("preferences", {})
         requested_by = request.get("requested_by")
+        fresh = bool(request.get("fresh", False))
 
         if not trip_id:
             logger.error("Invalid message: missing trip_id")
@@ -63,7 +67,7 @@ async def process_itinerary_request(msg: func.QueueMessage) -> None:
         # Generate itinerary
         itinerary_service = get_itinerary_service()
         itinerary = await itinerary_service.generate_itinerary(
-            trip_id=trip_id, preferences=preferences if preferences else None
+            trip_id=trip_id, preferences=preferences if preferences else None, fresh=fresh
         )
 
         if itinerary:
@@ -85,11 +89,8 @@ async def process_itinerary_request(msg: func.QueueMessage) -> None:
 
             family_service = get_family_service()
 
-            member_ids = set()
-            for family_id in trip.participating_family_ids:
-                members = await family_service.get_family_members(family_id)
-                for member in members:
-                    member_ids.add(member.id)
+            members = await family_service.get_members_of_families(trip.participating_family_ids)
+            member_ids = {member.id for member in members}
 
             # Send notifications (excluding requester)
             for member_id in member_ids:
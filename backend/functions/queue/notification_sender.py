@@ -10,6 +10,7 @@ from datetime import UTC, datetime
 
 import azure.functions as func
 
+from core.telemetry import track_cosmos_usage
 from services.notification_service import NotificationType, get_notification_service
 from services.realtime_service import RealtimeEvents, get_realtime_service
 
@@ -23,6 +24,7 @@ def utc_now() -> datetime:
 
 
 @bp.queue_trigger(arg_name="msg", queue_name="notifications", connection="AZURE_STORAGE_CONNECTION_STRING")
+@track_cosmos_usage
 async def process_notification(msg: func.QueueMessage) -> None:
     """
     Process a notification request from the queue.
@@ -105,6 +107,7 @@ async def process_notification(msg: func.QueueMessage) -> None:
 
 
 @bp.queue_trigger(arg_name="msg", queue_name="realtime-messages", connection="AZURE_STORAGE_CONNECTION_STRING")
+@track_cosmos_usage
 async def process_realtime_message(msg: func.QueueMessage) -> None:
     """
     Process a real-time message request from the queue.
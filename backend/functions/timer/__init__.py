@@ -5,7 +5,9 @@ Azure Functions timer triggers for scheduled tasks.
 """
 
 from functions.timer.cleanup import bp as cleanup_bp
+from functions.timer.partition_migration import bp as partition_migration_bp
 
 __all__ = [
     "cleanup_bp",
+    "partition_migration_bp",
 ]
@@ -2,6 +2,10 @@
 Cleanup Timer Function
 
 Scheduled tasks for data cleanup and maintenance.
+
+Read notifications, invitations and assistant messages expire through
+per-document TTL (repositories/expiry.py), so the cleanup sweep only deletes
+documents written before the repository started stamping ttl.
 """
 
 import logging
@@ -9,31 +13,68 @@ from datetime import UTC, datetime, timedelta
 
 import azure.functions as func
 
+from core.telemetry import track_cosmos_usage
 from models.documents import PollDocument
-from repositories.cosmos_repository import cosmos_repo
+from repositories.cosmos_repository import BatchOperation, cosmos_repo
+from repositories.expiry import INVITATION_GRACE_DAYS, MESSAGE_RETENTION_DAYS, READ_NOTIFICATION_RETENTION_DAYS
 
 bp = func.Blueprint()
 logger = logging.getLogger(__name__)
 
+# Deletes are queued while streaming results and flushed in chunks of this size
+DELETE_CHUNK_SIZE = 100
+
 
 def utc_now() -> datetime:
     """Get current UTC time (timezone-aware)."""
     return datetime.now(UTC)
 
 
+async def delete_matching(query: str, parameters: list[dict]) -> int:
+    """
+    Delete every document matched by a query that projects id and pk.
+
+    Args:
+        query: Query selecting c.id and c.pk
+        parameters: Query parameters
+
+    Returns:
+        Number of documents deleted
+    """
+    deleted = 0
+    pending: list[BatchOperation] = []
+
+    async def flush() -> None:
+        nonlocal deleted
+        results = await cosmos_repo.bulk(pending)
+        deleted += sum(1 for result in results if result.ok)
+        pending.clear()
+
+    async for row in cosmos_repo.iter_query(query, parameters=parameters):
+        pending.append(BatchOperation.delete(row["id"], row["pk"]))
+        if len(pending) >= DELETE_CHUNK_SIZE:
+            await flush()
+
+    if pending:
+        await flush()
+
+    return deleted
+
+
 @bp.timer_trigger(
-    schedule="0 0 2 * * *",  # Run at 2 AM UTC daily
+    schedule="0 0 2 * * 0",  # Run at 2 AM UTC on Sundays; TTL handles everything written since
     arg_name="timer",
     run_on_startup=False,
 )
+@track_cosmos_usage
 async def cleanup_expired_data(timer: func.TimerRequest) -> None:
     """
-    Clean up expired data from the database.
+    Clean up expired data written without a ttl.
 
     Tasks:
-    1. Delete expired invitations (older than 7 days)
-    2. Delete old read notifications (older than 30 days)
-    3. Clean up orphaned messages (optional)
+    1. Delete invitations past their expiry grace period
+    2. Delete old read notifications (read more than 30 days ago)
+    3. Delete old assistant conversation messages (older than 90 days)
     """
     logger.info("Starting scheduled cleanup task")
 
@@ -42,53 +83,46 @@ async def cleanup_expired_data(timer: func.TimerRequest) -> None:
         stats = {"expired_invitations": 0, "old_notifications": 0, "orphaned_messages": 0}
 
         # 1. Delete expired invitations
-        invitation_cutoff = (now - timedelta(days=7)).isoformat()
+        invitation_cutoff = (now - timedelta(days=INVITATION_GRACE_DAYS)).isoformat()
         expired_invitations_query = """
             SELECT c.id, c.pk FROM c
             WHERE c.entity_type = 'invitation'
-            AND c.status = 'pending'
+            AND NOT IS_DEFINED(c.ttl)
             AND c.expires_at < @cutoff
         """
         params = [{"name": "@cutoff", "value": invitation_cutoff}]
 
-        expired_invitations = await cosmos_repo.query(expired_invitations_query, parameters=params)
-        for inv in expired_invitations:
-            await cosmos_repo.delete(inv["id"], inv["pk"])
-            stats["expired_invitations"] += 1
+        stats["expired_invitations"] = await delete_matching(expired_invitations_query, params)
 
         logger.info(f"Deleted {stats['expired_invitations']} expired invitations")
 
         # 2. Delete old read notifications
-        notification_cutoff = (now - timedelta(days=30)).isoformat()
+        notification_cutoff = (now - timedelta(days=READ_NOTIFICATION_RETENTION_DAYS)).isoformat()
         old_notifications_query = """
             SELECT c.id, c.pk FROM c
             WHERE c.entity_type = 'notification'
+            AND NOT IS_DEFINED(c.ttl)
             AND c.is_read = true
             AND c.read_at < @cutoff
         """
         params = [{"name": "@cutoff", "value": notification_cutoff}]
 
-        old_notifications = await cosmos_repo.query(old_notifications_query, parameters=params)
-        for notif in old_notifications:
-            await cosmos_repo.delete(notif["id"], notif["pk"])
-            stats["old_notifications"] += 1
+        stats["old_notifications"] = await delete_matching(old_notifications_query, params)
 
         logger.info(f"Deleted {stats['old_notifications']} old notifications")
 
-        # 3. Clean up orphaned assistant messages (older than 90 days)
-        message_cutoff = (now - timedelta(days=90)).isoformat()
+        # 3. Delete old assistant conversation messages
+        message_cutoff = (now - timedelta(days=MESSAGE_RETENTION_DAYS)).isoformat()
         old_messages_query = """
             SELECT c.id, c.pk FROM c
             WHERE c.entity_type = 'message'
+            AND NOT IS_DEFINED(c.ttl)
             AND c.message_type IN ('user', 'assistant')
             AND c.created_at < @cutoff
         """
         params = [{"name": "@cutoff", "value": message_cutoff}]
 
-        old_messages = await cosmos_repo.query(old_messages_query, parameters=params)
-        for msg in old_messages:
-            await cosmos_repo.delete(msg["id"], msg["pk"])
-            stats["orphaned_messages"] += 1
+        stats["orphaned_messages"] = await delete_matching(old_messages_query, params)
 
         logger.info(f"Deleted {stats['orphaned_messages']} old messages")
 
@@ -107,6 +141,7 @@ async def cleanup_expired_data(timer: func.TimerRequest) -> None:
     arg_name="timer",
     run_on_startup=False,
 )
+@track_cosmos_usage
 async def close_expired_polls(timer: func.TimerRequest) -> None:
     """
     Close polls that have passed their expiration time.
@@ -125,30 +160,14 @@ async def close_expired_polls(timer: func.TimerRequest) -> None:
         """
         params = [{"name": "@now", "value": now.isoformat()}]
 
-        expired_polls = await cosmos_repo.query(expired_polls_query, parameters=params, model_class=PollDocument)
         closed_count = 0
 
-        for poll in expired_polls:
+        async for poll in cosmos_repo.iter_query(expired_polls_query, parameters=params, model_class=PollDocument):
             poll.status = "closed"
+            # The pollClosed push is sent from the change feed (services/change_handlers.py)
             await cosmos_repo.update(poll)
             closed_count += 1
 
-            # Send real-time notification
-            from services.realtime_service import RealtimeEvents, get_realtime_service
-
-            realtime_service = get_realtime_service()
-
-            await realtime_service.send_to_group(
-                group_name=poll.trip_id,
-                target=RealtimeEvents.POLL_CLOSED,
-                data={
-                    "poll_id": poll.id,
-                    "trip_id": poll.trip_id,
-                    "title": poll.title,
-                    "closed_reason": "expired",
-                },
-            )
-
         if closed_count > 0:
             logger.info(f"Closed {closed_count} expired polls")
 
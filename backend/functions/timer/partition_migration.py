@@ -0,0 +1,42 @@
+"""
+Partition Migration Timer Function
+
+Moves trip-scoped documents from their legacy partition keys into their trip's
+partition a budgeted batch at a time (repositories/partition_migration.py).
+"""
+
+import logging
+
+import azure.functions as func
+
+from core.telemetry import track_cosmos_usage
+from repositories.cosmos_repository import cosmos_repo
+from repositories.partition_migration import PartitionMigration
+
+bp = func.Blueprint()
+logger = logging.getLogger(__name__)
+
+migration = PartitionMigration.from_environment()
+
+
+@bp.timer_trigger(
+    schedule="0 */10 * * * *",  # Every 10 minutes
+    arg_name="timer",
+    run_on_startup=False,
+)
+@track_cosmos_usage
+async def migrate_partitions(timer: func.TimerRequest) -> None:
+    """
+    Move the next batches of legacy documents, within the per-run RU budget.
+    """
+    # Dual reads are switched off once the migration is done; nothing left to do
+    if not cosmos_repo.dual_read:
+        return
+
+    try:
+        run = await migration.run_once()
+        if run.complete:
+            logger.info("Partition migration complete; COSMOS_PARTITION_DUAL_READ can be set to false")
+    except Exception as e:
+        logger.exception(f"Error running partition migration: {e}")
+        raise
@@ -1,16 +1,22 @@
 """Models module initialization."""
 
+from models.aggregates import GroupCount, NotificationCount, PollStatusCount
 from models.documents import (
     BaseDocument,
     FamilyDocument,
     InvitationDocument,
     ItineraryDocument,
+    LeaseDocument,
+    MembershipDocument,
     MessageDocument,
     NotificationDocument,
+    PartitionKeyIndexDocument,
     PollDocument,
+    PromptCacheDocument,
     TripDocument,
     UserDocument,
 )
+from models.projections import FamilySummary, PollSummary, Projection, TripSummary
 from models.schemas import (
     AssistantRequest,
     FamilyCreate,
@@ -41,6 +47,19 @@ __all__ = [
     "InvitationDocument",
     "ItineraryDocument",
     "NotificationDocument",
+    "PartitionKeyIndexDocument",
+    "LeaseDocument",
+    "MembershipDocument",
+    "PromptCacheDocument",
+    # Projections
+    "Projection",
+    "TripSummary",
+    "PollSummary",
+    "FamilySummary",
+    # Aggregates
+    "GroupCount",
+    "PollStatusCount",
+    "NotificationCount",
     # Schemas
     "TripCreate",
     "TripUpdate",
@@ -0,0 +1,66 @@
+"""
+Aggregate Models
+
+Typed rows of GROUP BY queries. Each model declares its group keys as fields
+and is fetched with CosmosRepository.count_by, which selects one row per
+distinct combination of keys with the number of matching documents, so
+summaries are counted in Cosmos DB instead of from loaded documents.
+"""
+
+from typing import ClassVar
+
+from pydantic import BaseModel
+
+
+class GroupCount(BaseModel):
+    """
+    Base class for GROUP BY count rows.
+
+    Every field other than `count` is a group key, selected and grouped as the
+    document property of the same name unless it is listed in `expressions`,
+    which maps field names to SQL expressions over the document alias `c`.
+    A key whose expression is undefined for a group is missing from its row,
+    so key fields should have defaults.
+    """
+
+    count: int = 0
+
+    expressions: ClassVar[dict[str, str]] = {}
+
+    @classmethod
+    def group_keys(cls) -> list[str]:
+        """Names of the group key fields."""
+        return [name for name in cls.model_fields if name != "count"]
+
+    @classmethod
+    def group_expressions(cls) -> list[str]:
+        """SQL expressions of the group keys, in field order."""
+        return [cls.expressions.get(name, f"c.{name}") for name in cls.group_keys()]
+
+    @classmethod
+    def select_list(cls) -> str:
+        """
+        Build the SELECT list for this row type.
+
+        Returns:
+            Group keys plus the count, e.g. "c.status AS status, COUNT(1) AS count"
+        """
+        keys = zip(cls.group_keys(), cls.group_expressions(), strict=True)
+        columns = [f"{expression} AS {name}" for name, expression in keys]
+        return ", ".join([*columns, "COUNT(1) AS count"])
+
+
+class PollStatusCount(GroupCount):
+    """Polls of a trip per status, split by whether a closed poll produced a clear winner."""
+
+    status: str | None = None
+    decided: bool | None = None
+
+    expressions: ClassVar[dict[str, str]] = {"decided": "c.result.is_tie = false"}
+
+
+class NotificationCount(GroupCount):
+    """A user's notifications per type and read state."""
+
+    notification_type: str | None = None
+    is_read: bool = False
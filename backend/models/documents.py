@@ -27,6 +27,15 @@ class BaseDocument(BaseModel):
     updated_at: datetime = Field(default_factory=utc_now)
     version: int = Field(default=1)
 
+    # Seconds Cosmos DB keeps the document after its last write; set by the repository (repositories/expiry.py)
+    ttl: int | None = Field(default=None)
+
+    # Version the partition migration copied the document at (repositories/partition_migration.py)
+    moved_version: int | None = Field(default=None)
+
+    # Server-assigned concurrency token; read back from Cosmos but never written
+    etag: str | None = Field(default=None, alias="_etag", exclude=True)
+
     model_config = {
         "json_encoders": {datetime: lambda v: v.isoformat()},
         "populate_by_name": True,
@@ -218,3 +227,47 @@ class NotificationDocument(BaseDocument):
     is_read: bool = Field(default=False, description="Read status")
     read_at: datetime | None = Field(default=None, description="When read")
     metadata: dict[str, Any] = Field(default_factory=dict, description="Additional data")
+
+
+class PartitionKeyIndexDocument(BaseDocument):
+    """Compact routing entry mapping a document ID to the partition key it lives in."""
+
+    entity_type: Literal["pk_index"] = "pk_index"
+
+    target_id: str = Field(..., description="Indexed document ID")
+    target_entity_type: str = Field(..., description="Indexed document type")
+    target_pk: str = Field(..., description="Partition key of the indexed document")
+
+
+class MembershipDocument(BaseDocument):
+    """Families and trips a user belongs to, for authorization (id is the user ID, pk membership_{user_id})."""
+
+    entity_type: Literal["membership"] = "membership"
+
+    user_id: str = Field(..., description="User the index belongs to")
+    family_ids: list[str] = Field(default_factory=list, description="Families the user is a member of")
+    trip_ids: list[str] = Field(
+        default_factory=list, description="Trips the user organizes or whose families they are in"
+    )
+
+
+class PromptCacheDocument(BaseDocument):
+    """Cached LLM response for one normalised prompt (id is the prompt key, pk prompt_cache_{key})."""
+
+    entity_type: Literal["prompt_cache"] = "prompt_cache"
+
+    model: str = Field(..., description="Model that produced the response")
+    content: str = Field(..., description="Response text")
+    tokens_used: int = Field(default=0, description="Tokens the original request used")
+    cost: float = Field(default=0.0, description="Cost of the original request")
+    expires_at: datetime = Field(..., description="When the entry stops being served")
+
+
+class LeaseDocument(BaseDocument):
+    """Change feed checkpoint for one processor (id and pk are lease_{processor})."""
+
+    entity_type: Literal["lease"] = "lease"
+
+    processor: str = Field(..., description="Change feed processor name")
+    continuation: str | None = Field(default=None, description="Change feed position after the last handled page")
+    changes_handled: int = Field(default=0, description="Changes dispatched since the lease was created")
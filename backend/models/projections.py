@@ -0,0 +1,105 @@
+"""
+Projection Models
+
+Read-only subsets of Cosmos DB documents for list endpoints. Each projection
+declares the fields it needs and is fetched with an explicit SELECT list, so
+large fields (itineraries, expenses, voter maps, member lists) never leave the
+database when only a summary is shown.
+"""
+
+from datetime import datetime
+from typing import Any, ClassVar, Literal
+
+from pydantic import BaseModel, Field
+
+
+class Projection(BaseModel):
+    """
+    Base class for projection models.
+
+    Every field is selected as the document property of the same name unless
+    it is listed in `expressions`, which maps field names to SQL expressions
+    over the document alias `c` (e.g. computed counts). Expressions may refer
+    to query parameters, which the caller then supplies.
+    """
+
+    id: str
+    entity_type: str
+
+    expressions: ClassVar[dict[str, str]] = {}
+
+    @classmethod
+    def select_list(cls) -> str:
+        """
+        Build the SELECT list for this projection.
+
+        Returns:
+            Comma-separated projections, e.g. "c.id, c.title, ARRAY_LENGTH(c.votes) AS vote_count"
+        """
+        columns = []
+        for name in cls.model_fields:
+            expression = cls.expressions.get(name)
+            columns.append(f"{expression} AS {name}" if expression else f"c.{name}")
+        return ", ".join(columns)
+
+
+class TripSummary(Projection):
+    """Trip fields shown in trip lists (no itinerary or expenses)."""
+
+    entity_type: Literal["trip"] = "trip"
+
+    title: str
+    description: str | None = None
+    destination: str | None = None
+    start_date: datetime | None = None
+    end_date: datetime | None = None
+    status: str = "planning"
+    budget: float | None = None
+    currency: str = "USD"
+    organizer_user_id: str
+    participating_family_ids: list[str] = Field(default_factory=list)
+    created_at: datetime
+    updated_at: datetime
+
+
+class PollSummary(Projection):
+    """
+    Poll fields shown in poll lists, with the voter map reduced to counts.
+
+    Queries selecting this projection must supply @userId (the viewing user).
+    """
+
+    entity_type: Literal["poll"] = "poll"
+
+    trip_id: str
+    creator_id: str
+    title: str
+    description: str | None = None
+    poll_type: str = "single_choice"
+    options: list[dict[str, Any]] = Field(default_factory=list)
+    vote_count: int = 0
+    user_voted: bool = False
+    status: str = "active"
+    expires_at: datetime | None = None
+    created_at: datetime
+
+    expressions: ClassVar[dict[str, str]] = {
+        "vote_count": "ARRAY_LENGTH(ObjectToArray(c.votes))",
+        "user_voted": "IS_DEFINED(c.votes[@userId])",
+    }
+
+
+class FamilySummary(Projection):
+    """Family fields shown in family lists (member count instead of member IDs)."""
+
+    entity_type: Literal["family"] = "family"
+
+    name: str
+    description: str | None = None
+    admin_user_id: str
+    member_count: int = 0
+    created_at: datetime
+
+    expressions: ClassVar[dict[str, str]] = {
+        "member_count": "ARRAY_LENGTH(c.member_ids)",
+    }
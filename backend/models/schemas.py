@@ -21,6 +21,7 @@ if TYPE_CHECKING:
         TripDocument,
         UserDocument,
     )
+    from models.projections import FamilySummary, PollSummary, TripSummary
 
 # ============================================================================
 # User Schemas
@@ -138,6 +139,18 @@ class FamilyResponse(BaseModel):
             created_at=doc.created_at,
         )
 
+    @classmethod
+    def from_summary(cls, summary: FamilySummary) -> FamilyResponse:
+        """Create from a FamilySummary projection."""
+        return cls(
+            id=summary.id,
+            name=summary.name,
+            description=summary.description,
+            admin_user_id=summary.admin_user_id,
+            member_count=summary.member_count,
+            created_at=summary.created_at,
+        )
+
 
 class FamilyInviteRequest(BaseModel):
     """Schema for inviting a family member."""
@@ -195,8 +208,8 @@ class TripResponse(BaseModel):
     updated_at: datetime
 
     @classmethod
-    def from_document(cls, doc: TripDocument) -> TripResponse:
-        """Create from TripDocument."""
+    def from_document(cls, doc: TripDocument | TripSummary) -> TripResponse:
+        """Create from a TripDocument or TripSummary projection."""
         return cls(
             id=doc.id,
             title=doc.title,
@@ -280,6 +293,24 @@ class PollResponse(BaseModel):
             created_at=doc.created_at,
         )
 
+    @classmethod
+    def from_summary(cls, summary: PollSummary) -> PollResponse:
+        """Create from a PollSummary projection (vote counts are computed in the query)."""
+        return cls(
+            id=summary.id,
+            trip_id=summary.trip_id,
+            creator_id=summary.creator_id,
+            title=summary.title,
+            description=summary.description,
+            poll_type=summary.poll_type,
+            options=summary.options,
+            vote_count=summary.vote_count,
+            user_voted=summary.user_voted,
+            status=summary.status,
+            expires_at=summary.expires_at,
+            created_at=summary.created_at,
+        )
+
 
 # ============================================================================
 # Message Schemas
@@ -344,6 +375,7 @@ class ItineraryGenerateRequest(BaseModel):
     budget_per_day: float | None = None
     activity_level: str = Field(default="moderate")  # relaxed, moderate, active
     interests: list[str] = Field(default_factory=list)
+    fresh: bool = Field(default=False)  # Skip the prompt cache
 
 
 class ItineraryResponse(BaseModel):
@@ -1,5 +1,21 @@
 """Repositories module initialization."""
 
-from repositories.cosmos_repository import CosmosRepository, cosmos_repo
+from repositories.cosmos_repository import (
+    BatchOperation,
+    BulkResult,
+    ConcurrencyConflictError,
+    CosmosRepository,
+    PatchOperation,
+    QueryPage,
+    cosmos_repo,
+)
 
-__all__ = ["CosmosRepository", "cosmos_repo"]
+__all__ = [
+    "BatchOperation",
+    "BulkResult",
+    "ConcurrencyConflictError",
+    "CosmosRepository",
+    "PatchOperation",
+    "QueryPage",
+    "cosmos_repo",
+]
@@ -0,0 +1,213 @@
+"""
+Change Feed Processor
+
+Consumes the container's change feed and dispatches each changed document to
+the handlers registered for its entity_type, so side effects (realtime pushes,
+notifications, derived read models) run after the write has committed rather
+than inside the request that made it.
+
+In the function app the Azure Functions Cosmos DB trigger reads the feed and
+keeps its own leases; it hands each batch to dispatch. run_once reads the feed
+itself, for hosts without the trigger such as the in-memory container.
+
+When reading the feed itself, progress is checkpointed in a lease document stored in the container itself
+(id and pk lease_{processor}), written with an ETag precondition so two runs
+that overlap cannot move the checkpoint backwards. Every page read is
+checkpointed, whether or not it held changes with a handler, so a run of
+unhandled changes is never read twice. A new lease starts at the current end
+of the feed rather than replaying the container's history. Lease writes show
+up in the feed too; a page holding nothing but the processor's own lease does
+not move the checkpoint, so an idle processor reads but never writes.
+
+Handlers see the latest version of a document, not every intermediate write,
+and deletes are not delivered. A failing handler is logged and the page is
+still checkpointed: handlers must tolerate occasional missed or repeated
+deliveries, as with the Azure Functions Cosmos DB trigger. Copies written by
+the partition migration are skipped until they are next written: a document
+that only moved partitions has not changed.
+"""
+
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+from azure.cosmos import exceptions
+
+from models.documents import BaseDocument, LeaseDocument
+from repositories.cosmos_repository import ConcurrencyConflictError, cosmos_repo, entity_type_of
+from repositories.hydration import hydrator
+from repositories.partitioning import is_partition_move
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T", bound=BaseDocument)
+
+Handler = Callable[[Any], Awaitable[None]]
+
+# Changes read per round trip
+DEFAULT_PAGE_SIZE = 100
+
+# Upper bound on pages handled per run_once call
+DEFAULT_MAX_PAGES = 50
+
+
+class ChangeFeedRun:
+    """Outcome of one ChangeFeedProcessor.run_once call."""
+
+    def __init__(self) -> None:
+        self.pages = 0
+        self.changes = 0
+        self.handled = 0
+        self.failed = 0
+        self.checkpointed = False
+        self.duration_ms = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "pages": self.pages,
+            "changes": self.changes,
+            "handled": self.handled,
+            "failed": self.failed,
+            "checkpointed": self.checkpointed,
+            "duration_ms": round(self.duration_ms, 2),
+        }
+
+
+class ChangeFeedProcessor:
+    """Reads the change feed from a checkpoint and dispatches changes to typed handlers."""
+
+    def __init__(self, name: str, page_size: int = DEFAULT_PAGE_SIZE, max_pages: int = DEFAULT_MAX_PAGES) -> None:
+        self.name = name
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._handlers: dict[str, list[tuple[type[BaseDocument], Handler]]] = {}
+
+    @property
+    def lease_id(self) -> str:
+        """ID (and partition key) of this processor's lease document."""
+        return f"lease_{self.name}"
+
+    def handler(self, model_class: type[T]) -> Callable[[Handler], Handler]:
+        """
+        Register a handler for changes to one document type.
+
+        Usage:
+            @processor.handler(PollDocument)
+            async def on_poll_changed(poll: PollDocument) -> None: ...
+
+        Args:
+            model_class: Document model; its entity_type selects the changes delivered
+
+        Returns:
+            Decorator registering the handler
+        """
+
+        def register(handler: Handler) -> Handler:
+            self._handlers.setdefault(entity_type_of(model_class), []).append((model_class, handler))
+            return handler
+
+        return register
+
+    @property
+    def entity_types(self) -> list[str]:
+        """Entity types with at least one handler."""
+        return sorted(self._handlers)
+
+    async def run_once(self) -> ChangeFeedRun:
+        """
+        Handle the changes made since the last checkpoint.
+
+        Returns:
+            Counts for the run
+        """
+        run = ChangeFeedRun()
+        started = time.perf_counter()
+
+        lease = await cosmos_repo.get_by_id(self.lease_id, self.lease_id, LeaseDocument)
+        if lease is None:
+            lease = LeaseDocument(id=self.lease_id, pk=self.lease_id, processor=self.name)
+
+        continuation = lease.continuation
+        try:
+            while run.pages < self.max_pages:
+                changes, continuation = await cosmos_repo.read_change_feed(continuation, self.page_size)
+                if not changes:
+                    # A new lease records where the feed ends now, so later changes are not missed
+                    if lease.continuation is None and continuation:
+                        lease.continuation = continuation
+                        lease = await self._checkpoint(lease)
+                        run.checkpointed = True
+                    break
+                run.pages += 1
+                run.changes += len(changes)
+
+                dispatched = 0
+                for change in changes:
+                    dispatched += await self._dispatch(change, run)
+
+                # Re-reading our own last lease write is harmless; saving past it would write again
+                if all(change.get("id") == self.lease_id for change in changes):
+                    continue
+
+                lease.continuation = continuation
+                lease.changes_handled += dispatched
+                lease = await self._checkpoint(lease)
+                run.checkpointed = True
+        except ConcurrencyConflictError:
+            logger.warning(f"Change feed lease {self.lease_id} was advanced by another run; stopping")
+        finally:
+            run.duration_ms = (time.perf_counter() - started) * 1000
+
+        if run.changes:
+            logger.info(f"Change feed {self.name}: {run.to_dict()}")
+        return run
+
+    async def dispatch(self, changes: Iterable[dict[str, Any]]) -> ChangeFeedRun:
+        """
+        Handle a batch of changes delivered by the Cosmos DB trigger.
+
+        The trigger checkpoints its own leases, so nothing is written here.
+
+        Args:
+            changes: Changed documents as read from the feed
+
+        Returns:
+            Counts for the batch
+        """
+        run = ChangeFeedRun()
+        started = time.perf_counter()
+        run.pages = 1
+        for change in changes:
+            run.changes += 1
+            await self._dispatch(change, run)
+        run.duration_ms = (time.perf_counter() - started) * 1000
+
+        if run.changes:
+            logger.info(f"Change feed {self.name}: {run.to_dict()}")
+        return run
+
+    async def _dispatch(self, change: dict[str, Any], run: ChangeFeedRun) -> int:
+        """Deliver one change to its handlers; returns 1 if any handler was registered for it."""
+        handlers = self._handlers.get(change.get("entity_type", ""))
+        if not handlers or is_partition_move(change):
+            return 0
+
+        for model_class, handler in handlers:
+            try:
+                await handler(hydrator.one(model_class, change))
+                run.handled += 1
+            except Exception as e:
+                run.failed += 1
+                logger.exception(f"Change feed handler {handler.__name__} failed for {change.get('id')}: {e}")
+        return 1
+
+    async def _checkpoint(self, lease: LeaseDocument) -> LeaseDocument:
+        """Persist the lease; a lease that changed since it was read raises ConcurrencyConflictError."""
+        if lease.etag is None:
+            try:
+                return await cosmos_repo.create(lease)
+            except exceptions.CosmosResourceExistsError as e:
+                raise ConcurrencyConflictError(f"Lease {lease.id} was created concurrently") from e
+        lease.touch()
+        return await cosmos_repo.update(lease, conditional=True)
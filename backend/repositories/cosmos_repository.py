@@ -5,18 +5,251 @@ Unified data access layer for all Cosmos DB operations.
 Uses a single container with partition keys for efficient querying.
 """
 
+import asyncio
+import base64
+import binascii
+import json
 import logging
 import os
-from typing import Any, Optional, TypeVar
+import random
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, Optional, TypeVar, cast
 
+from azure.core import MatchConditions
 from azure.cosmos import exceptions
 from azure.cosmos.aio import CosmosClient
+from azure.cosmos.documents import ConnectionPolicy, RetryOptions
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
 
-from models.documents import BaseDocument
+from models.aggregates import GroupCount
+from models.documents import BaseDocument, PartitionKeyIndexDocument, utc_now
+from repositories.document_cache import DocumentCache
+from repositories.expiry import document_ttl, patch_ttl
+from repositories.hydration import hydrator
+from repositories.memory_container import MemoryContainer
+from repositories.metrics import ChargeRecorder, repository_metrics
+from repositories.query_stats import query_log
+from repositories.request_scope import RequestScope, current_request_scope
+from repositories.single_flight import SingleFlight
+from repositories.throttling import throttle_policy
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T", bound=BaseDocument)
 
+# Read results: full documents or projections (models.projections)
+M = TypeVar("M", bound=BaseModel)
+
+# Group count rows (models.aggregates)
+G = TypeVar("G", bound=GroupCount)
+
+# Results of SDK calls run through _execute
+R = TypeVar("R")
+
+# COSMOS_DB_URL value selecting the in-process container (local benchmarks only)
+MEMORY_CONTAINER_URL = "memory://"
+
+# Entity types whose partition key cannot be derived from the document ID alone.
+# A compact pk_index entry is maintained for these so by-ID lookups stay point reads.
+ROUTED_ENTITY_TYPES = frozenset({"user", "family", "trip", "poll", "itinerary"})
+
+# Upper bound on the in-process ID -> partition key memo
+PK_CACHE_MAX_ENTRIES = 10_000
+
+# Cosmos DB limit on operations in one transactional batch
+MAX_BATCH_OPERATIONS = 100
+
+# Default number of in-flight requests for bulk operations
+DEFAULT_BULK_CONCURRENCY = 10
+
+BATCH_OPERATION_KINDS = frozenset({"create", "upsert", "replace", "delete"})
+
+# Cosmos DB allows 10 operations per patch; two are reserved for the version bump
+MAX_PATCH_OPERATIONS = 8
+
+# Attempts for array removals whose element shifted under a concurrent write
+PATCH_ARRAY_ATTEMPTS = 3
+
+# Optimistic concurrency: attempts and full-jitter backoff bounds (seconds) on conflict
+CONFLICT_MAX_ATTEMPTS = 5
+CONFLICT_BACKOFF_BASE = 0.02
+CONFLICT_BACKOFF_MAX = 0.5
+
+
+# Outcomes callers handle as results (missing, duplicate, precondition) rather than failures
+EXPECTED_STATUS_CODES = frozenset({404, 409, 412})
+
+
+class ConcurrencyConflictError(Exception):
+    """A conditional write lost to a concurrent change (HTTP 412)."""
+
+
+def pk_index_id(entity_type: str, doc_id: str) -> str:
+    """Build the ID (and partition key) of the routing entry for a document."""
+    return f"pkindex_{entity_type}_{doc_id}"
+
+
+def operation_name(verb: str, entity_type: str | None = None) -> str:
+    """Build the metrics name of a repository operation (e.g. "read.trip")."""
+    return f"{verb}.{entity_type}" if entity_type else verb
+
+
+def entity_type_of(model_class: type[BaseModel]) -> str:
+    """Get the entity_type discriminator declared by a document or projection model."""
+    return cast(str, model_class.model_fields["entity_type"].default)
+
+
+def patch_path(*segments: str | int) -> str:
+    """Build a JSON Pointer path for a patch operation, escaping each segment."""
+    return "".join("/" + str(segment).replace("~", "~0").replace("/", "~1") for segment in segments)
+
+
+def sql_literal(value: Any) -> str:
+    """Render a value as a Cosmos DB SQL literal (for filter predicates, which take no parameters)."""
+    return json.dumps(to_jsonable_python(value))
+
+
+def encode_cursor(continuation_token: str | None) -> str | None:
+    """Wrap a Cosmos continuation token in an opaque, URL-safe cursor."""
+    if not continuation_token:
+        return None
+    return base64.urlsafe_b64encode(continuation_token.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Unwrap a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor was not issued by this API
+    """
+    try:
+        return base64.b64decode(cursor.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+class QueryPage:
+    """One page of query results plus the cursor for the next page."""
+
+    def __init__(self, items: list[Any], next_cursor: str | None = None) -> None:
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_more(self) -> bool:
+        """Whether another page can be requested with next_cursor."""
+        return self.next_cursor is not None
+
+
+class PatchOperation:
+    """A single partial-update operation for CosmosRepository.patch."""
+
+    def __init__(self, op: str, path: str, value: Any = None) -> None:
+        self.op = op
+        self.path = path
+        self.value = value
+
+    @classmethod
+    def set(cls, path: str, value: Any) -> "PatchOperation":
+        """Set a field, creating it if missing."""
+        return cls("set", path, value)
+
+    @classmethod
+    def incr(cls, path: str, value: int | float = 1) -> "PatchOperation":
+        """Increment a numeric field server-side."""
+        return cls("incr", path, value)
+
+    @classmethod
+    def add(cls, path: str, value: Any) -> "PatchOperation":
+        """Add a field or insert into an array (use an index or "-" to append)."""
+        return cls("add", path, value)
+
+    @classmethod
+    def remove(cls, path: str) -> "PatchOperation":
+        """Remove a field or an array element."""
+        return cls("remove", path)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to the SDK patch operation format."""
+        operation = {"op": self.op, "path": self.path}
+        if self.op != "remove":
+            operation["value"] = to_jsonable_python(self.value)
+        return operation
+
+
+class BatchOperation:
+    """A single write to run through execute_batch or bulk."""
+
+    def __init__(
+        self,
+        kind: str,
+        partition_key: str,
+        document: BaseDocument | None = None,
+        doc_id: str | None = None,
+        entity_type: str | None = None,
+    ) -> None:
+        if kind not in BATCH_OPERATION_KINDS:
+            raise ValueError(f"Unsupported batch operation: {kind}")
+        if document is None and kind != "delete":
+            raise ValueError(f"A document is required for {kind} operations")
+
+        if doc_id is None:
+            if document is None:
+                raise ValueError("A doc_id is required for delete operations without a document")
+            doc_id = document.id
+
+        self.kind = kind
+        self.partition_key = partition_key
+        self.document = document
+        self.doc_id = doc_id
+        self.entity_type = entity_type if entity_type is not None else getattr(document, "entity_type", None)
+
+    @property
+    def written(self) -> BaseDocument:
+        """The document written by a create, upsert or replace."""
+        if self.document is None:
+            raise ValueError(f"{self.kind} operations write no document")
+        return self.document
+
+    @classmethod
+    def create(cls, document: BaseDocument) -> "BatchOperation":
+        """Create a new document."""
+        return cls("create", document.pk, document=document)
+
+    @classmethod
+    def upsert(cls, document: BaseDocument) -> "BatchOperation":
+        """Create or replace a document."""
+        return cls("upsert", document.pk, document=document)
+
+    @classmethod
+    def replace(cls, document: BaseDocument) -> "BatchOperation":
+        """Replace an existing document (same semantics as update)."""
+        return cls("replace", document.pk, document=document)
+
+    @classmethod
+    def delete(cls, doc_id: str, partition_key: str, entity_type: str | None = None) -> "BatchOperation":
+        """Delete a document."""
+        return cls("delete", partition_key, doc_id=doc_id, entity_type=entity_type)
+
+
+class BulkResult:
+    """Outcome of one operation in a bulk request."""
+
+    def __init__(
+        self, operation: BatchOperation, document: BaseDocument | None = None, error: Exception | None = None
+    ) -> None:
+        self.operation = operation
+        self.document = document
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded."""
+        return self.error is None
+
 
 class CosmosRepository:
     """
@@ -28,14 +261,31 @@ class CosmosRepository:
 
     _instance: Optional["CosmosRepository"] = None
     _client: CosmosClient | None = None
-    _container = None
+    _container: Any = None
+    _pk_cache: OrderedDict[tuple[str, str], str]
+    _document_cache: DocumentCache | None
+    _flights: SingleFlight
+
+    # Whether trip-scoped documents may still be at their legacy partition keys
+    # (repositories/partitioning.py); turn off with COSMOS_PARTITION_DUAL_READ=false
+    # once the partition migration reports that nothing is left to move
+    dual_read: bool
 
-    def __new__(cls):
+    def __new__(cls) -> "CosmosRepository":
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._pk_cache = OrderedDict()
+            cls._instance._document_cache = DocumentCache.from_environment()
+            cls._instance._flights = SingleFlight()
+            cls._instance.dual_read = os.environ.get("COSMOS_PARTITION_DUAL_READ", "true").lower() != "false"
         return cls._instance
 
-    async def _get_container(self):
+    @property
+    def document_cache(self) -> DocumentCache | None:
+        """The read-through document cache, or None when disabled."""
+        return self._document_cache
+
+    async def _get_container(self) -> Any:
         """Get or create Cosmos DB container client."""
         if self._container is not None:
             return self._container
@@ -44,10 +294,18 @@ class CosmosRepository:
             cosmos_url = os.environ.get("COSMOS_DB_URL")
             cosmos_key = os.environ.get("COSMOS_DB_KEY")
 
+            if cosmos_url == MEMORY_CONTAINER_URL:
+                self.use_container(MemoryContainer())
+                logger.warning("Using the in-memory Cosmos DB container; data is not persisted")
+                return self._container
+
             if not cosmos_url or not cosmos_key:
                 raise ValueError("COSMOS_DB_URL and COSMOS_DB_KEY must be set")
 
-            self._client = CosmosClient(url=cosmos_url, credential=cosmos_key)
+            # Throttled requests are retried by throttle_policy so every retry is accounted for
+            connection_policy = ConnectionPolicy()
+            connection_policy.RetryOptions = RetryOptions(max_retry_attempt_count=0)
+            self._client = CosmosClient(url=cosmos_url, credential=cosmos_key, connection_policy=connection_policy)
 
         database_name = os.environ.get("COSMOS_DB_DATABASE", "pathfinder")
         container_name = os.environ.get("COSMOS_DB_CONTAINER", "entities")
@@ -57,6 +315,103 @@ class CosmosRepository:
 
         return self._container
 
+    async def warm_up(self) -> list[tuple[str, float, str]]:
+        """
+        Open the client and load container metadata ahead of the first request.
+
+        Without this, the first request on a new instance pays for client
+        construction, the account and container metadata reads and partition
+        key range discovery on top of its own work.
+
+        Returns:
+            (step, duration in ms, detail) for each step, in order
+        """
+        steps = []
+
+        started = time.perf_counter()
+        container = await self._get_container()
+        steps.append(("cosmos_client", (time.perf_counter() - started) * 1000, "client opened"))
+
+        started = time.perf_counter()
+        properties = await container.read()
+        steps.append(("container_metadata", (time.perf_counter() - started) * 1000, f"container {properties['id']}"))
+
+        started = time.perf_counter()
+        ranges = [feed_range async for feed_range in container.read_feed_ranges()]
+        steps.append(("partition_routing", (time.perf_counter() - started) * 1000, f"{len(ranges)} feed ranges"))
+
+        return steps
+
+    def use_container(self, container: Any) -> None:
+        """
+        Bind the repository to a container client, e.g. a MemoryContainer for benchmarks.
+
+        Args:
+            container: Object implementing the azure.cosmos.aio ContainerProxy methods the repository uses
+        """
+        self._container = container
+        self._pk_cache.clear()
+        if self._document_cache:
+            self._document_cache.clear()
+
+    async def _execute(
+        self,
+        operation: str,
+        call: Callable[[ChargeRecorder], Awaitable[R]],
+        cross_partition: bool = False,
+        query: str | None = None,
+    ) -> R:
+        """
+        Run one SDK call under the throttling policy and record its cost.
+
+        Args:
+            operation: Operation name for metrics
+            call: Performs the call, passing the recorder to the SDK as response_hook
+            cross_partition: Whether the call fans out across partitions
+            query: Query text, for queries (recorded per fingerprint in the query log)
+
+        Returns:
+            Result of the call
+        """
+        recorder = ChargeRecorder()
+        started = time.perf_counter()
+        succeeded = False
+        failed = False
+
+        try:
+            result = await throttle_policy.run(lambda: call(recorder), on_throttle=recorder.note_throttle)
+            succeeded = True
+            return result
+        except exceptions.CosmosHttpResponseError as e:
+            failed = e.status_code not in EXPECTED_STATUS_CODES
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            items = recorder.item_count if recorder.item_count is not None else int(succeeded)
+            latency_ms = (time.perf_counter() - started) * 1000
+            repository_metrics.record(
+                operation,
+                request_charge=recorder.request_charge,
+                latency_ms=latency_ms,
+                items=items,
+                cross_partition=cross_partition,
+                throttled=recorder.throttled,
+                failed=failed,
+            )
+            if query is not None:
+                query_log.record(
+                    operation,
+                    query,
+                    request_charge=recorder.request_charge,
+                    latency_ms=latency_ms,
+                    pages=recorder.pages,
+                    items=items,
+                    cross_partition=cross_partition,
+                    failed=failed,
+                )
+
     async def create(self, document: T) -> T:
         """
         Create a new document in Cosmos DB.
@@ -68,12 +423,17 @@ class CosmosRepository:
             Created document with server-generated fields
         """
         container = await self._get_container()
-        doc_dict = document.model_dump(mode="json")
+        doc_dict = self._serialize(document)
 
         try:
-            result = await container.create_item(body=doc_dict)
+            result = await self._execute(
+                operation_name("create", document.entity_type),
+                lambda hook: container.create_item(body=doc_dict, response_hook=hook),
+            )
             logger.info(f"Created {document.entity_type} document: {document.id}")
-            return type(document)(**result)
+            await self._register_partition_key(document)
+            self._note_write(result)
+            return hydrator.echo(document, result)
         except exceptions.CosmosResourceExistsError:
             logger.warning(f"Document already exists: {document.id}")
             raise
@@ -85,6 +445,11 @@ class CosmosRepository:
         """
         Get a document by ID and partition key.
 
+        Documents already loaded by the current request are served from its
+        identity map. Other reads go through the document cache when it is
+        enabled: fresh entries are served from memory and stale ones are
+        revalidated with their ETag.
+
         Args:
             doc_id: Document ID
             partition_key: Partition key value
@@ -93,22 +458,306 @@ class CosmosRepository:
         Returns:
             Document if found, None otherwise
         """
+        scope = current_request_scope()
+        loaded = scope.lookup(doc_id, partition_key) if scope else None
+        if loaded is not None:
+            return hydrator.one(model_class, loaded)
+
+        cache = self._document_cache
+        key = (doc_id, partition_key)
+        entry = cache.lookup(key) if cache else None
+
+        if cache is not None and entry is not None and cache.is_fresh(entry):
+            cache.hits += 1
+            return self._loaded(model_class, cache.document(entry), scope)
+
+        options = {}
+        if cache is not None and entry is not None and entry.etag:
+            # The server answers 304 with no body while our copy is still current
+            options = {"etag": entry.etag, "match_condition": MatchConditions.IfModified}
+            cache.revalidations += 1
+        elif cache:
+            cache.misses += 1
+
         container = await self._get_container()
+        operation = operation_name("read", entity_type_of(model_class))
 
         try:
-            result = await container.read_item(item=doc_id, partition_key=partition_key)
-            return model_class(**result)
+            # Concurrent reads of the same document share one request
+            result = await self._flights.run(
+                operation,
+                (doc_id, partition_key, options.get("etag")),
+                lambda: self._execute(
+                    operation,
+                    lambda hook: container.read_item(
+                        item=doc_id, partition_key=partition_key, response_hook=hook, **options
+                    ),
+                ),
+            )
+            if cache is not None and entry is not None and not result:
+                cache.not_modified += 1
+                cache.confirm(entry)
+                return self._loaded(model_class, cache.document(entry), scope)
+            if cache:
+                cache.put(key, result)
+            return self._loaded(model_class, result, scope)
         except exceptions.CosmosResourceNotFoundError:
+            self._note_stale(doc_id, partition_key)
             return None
         except Exception as e:
             logger.exception(f"Failed to get document {doc_id}: {e}")
             raise
 
+    async def find_by_id(self, doc_id: str, model_class: type[T], partition_key: str | None = None) -> T | None:
+        """
+        Get a document by ID when the caller may not know its partition key.
+
+        The partition key is resolved through the in-process memo and the pk_index
+        routing entries, so the lookup stays a point read instead of a cross-partition query.
+
+        Args:
+            doc_id: Document ID
+            model_class: Pydantic model class to deserialize into
+            partition_key: Partition key, if the caller can derive it
+
+        Returns:
+            Document if found, None otherwise
+        """
+        if partition_key:
+            return await self.get_by_id(doc_id, partition_key, model_class)
+
+        entity_type = entity_type_of(model_class)
+        key = (entity_type, doc_id)
+        scope = current_request_scope()
+        resolved = scope.locate(entity_type, doc_id) if scope else None
+        remembered = resolved is not None or key in self._pk_cache
+        if resolved is None:
+            resolved = await self.resolve_partition_key(entity_type, doc_id)
+        if resolved is None:
+            return None
+
+        document = await self.get_by_id(doc_id, resolved, model_class)
+        if document is None and remembered:
+            # The remembered route may predate a partition move made elsewhere; only the
+            # memo is dropped, as the pk_index entry may already point at the new copy
+            self._pk_cache.pop(key, None)
+            current = await self.resolve_partition_key(entity_type, doc_id)
+            if current is not None and current != resolved:
+                document = await self.get_by_id(doc_id, current, model_class)
+        return document
+
+    async def get_by_id_or_legacy(
+        self, doc_id: str, partition_key: str, model_class: type[T], legacy_partition_key: str | None = None
+    ) -> T | None:
+        """
+        Get a document at its current partition key, or at its legacy one while dual reads are on.
+
+        Args:
+            doc_id: Document ID
+            partition_key: Current partition key
+            model_class: Pydantic model class to deserialize into
+            legacy_partition_key: Pre-migration partition key; None to resolve it through the pk_index
+
+        Returns:
+            Document if found, None otherwise
+        """
+        document = await self.get_by_id(doc_id, partition_key, model_class)
+        if document is not None or not self.dual_read:
+            return document
+        if legacy_partition_key is not None:
+            return await self.get_by_id(doc_id, legacy_partition_key, model_class)
+        return await self.find_by_id(doc_id, model_class)
+
+    def partition_scope(self, partition_key: str) -> str | None:
+        """
+        Partition key to scope a query over migrated documents to.
+
+        Returns:
+            The partition key, or None (all partitions) while dual reads are on and
+            some of the documents may still be at their legacy keys
+        """
+        return None if self.dual_read else partition_key
+
+    async def get_many(self, keys: list[tuple[str, str]], model_class: type[T]) -> list[T]:
+        """
+        Get several documents by ID and partition key in one read-many call.
+
+        Documents already loaded by the current request and fresh document cache
+        entries are served from memory; everything else is fetched with a single
+        batched point read instead of an IN query.
+
+        Args:
+            keys: (document ID, partition key) pairs
+            model_class: Pydantic model class to deserialize into
+
+        Returns:
+            Found documents in the order of their keys (missing ones are omitted)
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return []
+
+        cache = self._document_cache
+        scope = current_request_scope()
+        found: dict[tuple[str, str], dict[str, Any]] = {}
+        missing = []
+        for key in keys:
+            loaded = scope.lookup(*key) if scope else None
+            if loaded is not None:
+                found[key] = loaded
+                continue
+            entry = cache.lookup(key) if cache else None
+            if cache is not None and entry is not None and cache.is_fresh(entry):
+                cache.hits += 1
+                found[key] = cache.document(entry)
+            else:
+                if cache:
+                    cache.misses += 1
+                missing.append(key)
+
+        if missing:
+            container = await self._get_container()
+            try:
+                results = await self._execute(
+                    operation_name("read_many", entity_type_of(model_class)),
+                    lambda hook: container.read_items(items=missing, response_hook=hook),
+                )
+            except Exception as e:
+                logger.exception(f"Failed to read {len(missing)} documents: {e}")
+                raise
+
+            for result in results:
+                key = (result["id"], result["pk"])
+                found[key] = result
+                if cache:
+                    cache.put(key, result)
+                if scope:
+                    scope.remember(result)
+
+        return [hydrator.one(model_class, found[key]) for key in keys if key in found]
+
+    async def resolve_partition_key(self, entity_type: str, doc_id: str) -> str | None:
+        """
+        Resolve the partition key of a document from its ID.
+
+        Checks the in-process memo first, then the document's pk_index entry. Documents
+        written before the index existed are located once with a projected query and
+        the index is backfilled so later lookups are point reads.
+
+        Args:
+            entity_type: Entity type of the document
+            doc_id: Document ID
+
+        Returns:
+            Partition key if the document exists, None otherwise
+        """
+        key = (entity_type, doc_id)
+        cached = self._pk_cache.get(key)
+        if cached is not None:
+            self._pk_cache.move_to_end(key)
+            return cached
+
+        container = await self._get_container()
+        index_id = pk_index_id(entity_type, doc_id)
+        partition_key: str
+
+        try:
+            entry = await self._execute(
+                "read.pk_index",
+                lambda hook: container.read_item(item=index_id, partition_key=index_id, response_hook=hook),
+            )
+            partition_key = entry["target_pk"]
+        except exceptions.CosmosResourceNotFoundError:
+            rows = await self.query(
+                query="SELECT VALUE c.pk FROM c WHERE c.entity_type = @entityType AND c.id = @id",
+                parameters=[{"name": "@entityType", "value": entity_type}, {"name": "@id", "value": doc_id}],
+                max_items=1,
+            )
+            if not rows:
+                return None
+            partition_key = rows[0]
+            await self._write_partition_key_index(entity_type, doc_id, partition_key)
+
+        self._remember_partition_key(key, partition_key)
+        return partition_key
+
+    def _remember_partition_key(self, key: tuple[str, str], partition_key: str) -> None:
+        """Store a resolved partition key in the bounded memo."""
+        self._pk_cache[key] = partition_key
+        self._pk_cache.move_to_end(key)
+        while len(self._pk_cache) > PK_CACHE_MAX_ENTRIES:
+            self._pk_cache.popitem(last=False)
+
+    async def _register_partition_key(self, document: BaseDocument) -> None:
+        """Record the partition key of a newly written routed document."""
+        if document.entity_type not in ROUTED_ENTITY_TYPES:
+            return
+
+        key = (document.entity_type, document.id)
+        if self._pk_cache.get(key) == document.pk:
+            return
+
+        await self._write_partition_key_index(document.entity_type, document.id, document.pk)
+        self._remember_partition_key(key, document.pk)
+
+    async def _write_partition_key_index(self, entity_type: str, doc_id: str, partition_key: str) -> None:
+        """Upsert the pk_index entry for a document (best effort)."""
+        container = await self._get_container()
+        index_id = pk_index_id(entity_type, doc_id)
+        entry = PartitionKeyIndexDocument(
+            id=index_id, pk=index_id, target_id=doc_id, target_entity_type=entity_type, target_pk=partition_key
+        )
+
+        try:
+            await self._execute(
+                "upsert.pk_index",
+                lambda hook: container.upsert_item(body=entry.model_dump(mode="json"), response_hook=hook),
+            )
+        except Exception as e:
+            # Lookups fall back to a query and backfill, so a missed index write is not fatal
+            logger.warning(f"Failed to write pk_index for {entity_type} {doc_id}: {e}")
+
+    async def _forget_partition_key(self, entity_type: str, doc_id: str) -> None:
+        """Drop the memo and pk_index entry for a removed document (best effort)."""
+        self._pk_cache.pop((entity_type, doc_id), None)
+
+        container = await self._get_container()
+        index_id = pk_index_id(entity_type, doc_id)
+
+        try:
+            await self._execute(
+                "delete.pk_index",
+                lambda hook: container.delete_item(item=index_id, partition_key=index_id, response_hook=hook),
+            )
+        except exceptions.CosmosResourceNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to delete pk_index for {entity_type} {doc_id}: {e}")
+
+    def _query_options(
+        self, query: str, parameters: list[dict[str, Any]] | None, partition_key: str | None, max_item_count: int | None
+    ) -> dict[str, Any]:
+        """Build SDK query options, scoping to a partition when one is given."""
+        query_options: dict[str, Any] = {
+            "query": query,
+            "parameters": parameters or [],
+        }
+
+        if max_item_count is not None:
+            query_options["max_item_count"] = max_item_count
+
+        if partition_key:
+            query_options["partition_key"] = partition_key
+        else:
+            query_options["enable_cross_partition_query"] = True
+
+        return query_options
+
     async def query(
         self,
         query: str,
         parameters: list[dict[str, Any]] | None = None,
-        model_class: type[T] | None = None,
+        model_class: type[M] | None = None,
         partition_key: str | None = None,
         max_items: int = 100,
     ) -> list[Any]:
@@ -118,7 +767,7 @@ class CosmosRepository:
         Args:
             query: Cosmos DB SQL query
             parameters: Query parameters
-            model_class: Optional model class to deserialize results
+            model_class: Optional document or projection model to deserialize results into
             partition_key: Optional partition key to scope query
             max_items: Maximum items to return
 
@@ -126,106 +775,715 @@ class CosmosRepository:
             List of documents (as model instances or dicts)
         """
         container = await self._get_container()
-        items = []
+        query_options = self._query_options(query, parameters, partition_key, max_items)
 
-        query_options = {
-            "query": query,
-            "parameters": parameters or [],
-            "max_item_count": max_items,
-        }
+        operation = operation_name("query", entity_type_of(model_class) if model_class else None)
 
-        if partition_key:
-            query_options["partition_key"] = partition_key
-        else:
-            query_options["enable_cross_partition_query"] = True
+        async def run(hook: ChargeRecorder) -> list[Any]:
+            items = []
+            async for item in container.query_items(**query_options, response_hook=hook):
+                items.append(item)
+
+                if len(items) >= max_items:
+                    break
+            return items
 
         try:
-            async for item in container.query_items(**query_options):
-                if model_class:
-                    items.append(model_class(**item))
-                else:
+            # Concurrent identical queries share one request; each caller hydrates its own copy
+            raw_items = await self._flights.run(
+                operation,
+                (query, json.dumps(to_jsonable_python(parameters or []), sort_keys=True), partition_key, max_items),
+                lambda: self._execute(operation, run, cross_partition=not partition_key, query=query),
+            )
+            self._remember_documents(raw_items)
+            return hydrator.many(model_class, raw_items) if model_class else raw_items
+        except Exception as e:
+            logger.exception(f"Query failed: {e}")
+            raise
+
+    async def _fetch_page(
+        self,
+        operation: str,
+        query_options: dict[str, Any],
+        continuation_token: str | None,
+        skip_empty: bool = True,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Fetch one page of raw query results.
+
+        Cross-partition queries can yield empty pages; unless skip_empty is False
+        they are skipped so an empty page is only returned when results are exhausted.
+
+        Returns:
+            Raw items and the continuation token for the following page
+        """
+        container = await self._get_container()
+
+        async def run(hook: ChargeRecorder) -> tuple[list[dict[str, Any]], str | None]:
+            pager = container.query_items(**query_options, response_hook=hook).by_page(continuation_token)
+            items = []
+            async for page in pager:
+                async for item in page:
                     items.append(item)
+                if items or not skip_empty:
+                    break
+            return items, pager.continuation_token
 
-                if len(items) >= max_items:
+        return await self._execute(
+            operation, run, cross_partition="partition_key" not in query_options, query=query_options["query"]
+        )
+
+    async def query_page(
+        self,
+        query: str,
+        parameters: list[dict[str, Any]] | None = None,
+        model_class: type[M] | None = None,
+        partition_key: str | None = None,
+        page_size: int = 50,
+        cursor: str | None = None,
+    ) -> QueryPage:
+        """
+        Fetch a single page of query results.
+
+        Unlike query, the cost of a page does not depend on how deep it is: the
+        continuation token resumes the query where the previous page stopped.
+
+        Args:
+            query: Cosmos DB SQL query
+            parameters: Query parameters
+            model_class: Optional document or projection model to deserialize results into
+            partition_key: Optional partition key to scope query
+            page_size: Maximum items in the page
+            cursor: Cursor returned as next_cursor by the previous page
+
+        Returns:
+            QueryPage with the items and the cursor for the next page (None when exhausted)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        continuation_token = decode_cursor(cursor) if cursor else None
+        query_options = self._query_options(query, parameters, partition_key, page_size)
+        operation = operation_name("query_page", entity_type_of(model_class) if model_class else None)
+
+        try:
+            raw_items, next_token = await self._fetch_page(operation, query_options, continuation_token)
+            items = hydrator.many(model_class, raw_items) if model_class else raw_items
+            return QueryPage(items=items, next_cursor=encode_cursor(next_token))
+        except Exception as e:
+            logger.exception(f"Paged query failed: {e}")
+            raise
+
+    async def iter_query(
+        self,
+        query: str,
+        parameters: list[dict[str, Any]] | None = None,
+        model_class: type[M] | None = None,
+        partition_key: str | None = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[Any]:
+        """
+        Stream query results page by page.
+
+        Only one page is held in memory at a time and there is no item cap, so this
+        is the right call for maintenance jobs that must process an unbounded backlog.
+
+        Args:
+            query: Cosmos DB SQL query
+            parameters: Query parameters
+            model_class: Optional document or projection model to deserialize each result into
+            partition_key: Optional partition key to scope query
+            page_size: Items fetched per round trip
+
+        Yields:
+            Documents (as model instances or dicts)
+        """
+        query_options = self._query_options(query, parameters, partition_key, page_size)
+        operation = operation_name("iter_query", entity_type_of(model_class) if model_class else None)
+        continuation_token = None
+
+        try:
+            while True:
+                # Each page is fetched (and throttle-retried) on its own, resuming from the last token
+                items, continuation_token = await self._fetch_page(
+                    operation, query_options, continuation_token, skip_empty=False
+                )
+                for item in items:
+                    yield hydrator.one(model_class, item) if model_class else item
+                if not continuation_token:
                     break
+        except Exception as e:
+            logger.exception(f"Streaming query failed: {e}")
+            raise
 
-            return items
+    async def read_change_feed(
+        self, continuation: str | None = None, page_size: int = 100
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Read the next page of the container's change feed.
+
+        The feed carries the latest version of every document created or replaced
+        since the continuation token (deletes are not included).
+
+        Args:
+            continuation: Token returned by the previous call (None starts from now)
+            page_size: Maximum changes returned
+
+        Returns:
+            Raw changed documents in write order, and the token to resume after them
+        """
+        container = await self._get_container()
+        position = {"continuation": continuation} if continuation else {"start_time": "Now"}
+
+        async def run(hook: ChargeRecorder) -> tuple[list[dict[str, Any]], str | None]:
+            pager = container.query_items_change_feed(
+                **position, max_item_count=page_size, response_hook=hook
+            ).by_page()
+            items = []
+            async for page in pager:
+                async for item in page:
+                    items.append(item)
+                break
+            return items, pager.continuation_token or continuation
+
+        try:
+            return await self._execute("read.change_feed", run, cross_partition=True)
         except Exception as e:
-            logger.exception(f"Query failed: {e}")
+            logger.exception(f"Change feed read failed: {e}")
             raise
 
-    async def update(self, document: T) -> T:
+    async def update(self, document: T, conditional: bool = False) -> T:
         """
         Update an existing document (full replacement).
 
         Args:
             document: Document with updated fields
+            conditional: Only replace if the stored document still has document.etag
 
         Returns:
             Updated document
+
+        Raises:
+            ConcurrencyConflictError: If conditional and the document changed since it was read
         """
         container = await self._get_container()
 
         # Update timestamp and version
         document.touch()
-        doc_dict = document.model_dump(mode="json")
+        doc_dict = self._serialize(document)
+
+        options = {}
+        if conditional and document.etag:
+            options = {"etag": document.etag, "match_condition": MatchConditions.IfNotModified}
 
         try:
-            result = await container.replace_item(item=doc_dict["id"], body=doc_dict)
+            result = await self._execute(
+                operation_name("replace", document.entity_type),
+                lambda hook: container.replace_item(item=doc_dict["id"], body=doc_dict, response_hook=hook, **options),
+            )
             logger.info(f"Updated {document.entity_type} document: {document.id}")
-            return type(document)(**result)
+            self._note_write(result)
+            return hydrator.echo(document, result)
         except exceptions.CosmosResourceNotFoundError:
             logger.warning(f"Document not found for update: {document.id}")
+            self._note_stale(document.id, document.pk)
             raise
+        except exceptions.CosmosAccessConditionFailedError as e:
+            logger.info(f"Conditional update lost to a concurrent write: {document.id}")
+            # Our copy is stale; the retry must re-read from the store
+            self._note_stale(document.id, document.pk)
+            raise ConcurrencyConflictError(f"Document {document.id} was modified concurrently") from e
         except Exception as e:
             logger.exception(f"Failed to update document: {e}")
             raise
 
-    async def upsert(self, document: T) -> T:
+    async def patch(
+        self,
+        doc_id: str,
+        partition_key: str,
+        operations: list[PatchOperation],
+        model_class: type[T],
+        filter_predicate: str | None = None,
+        etag: str | None = None,
+        missing_ok: bool = False,
+    ) -> T | None:
+        """
+        Apply a partial update to a document.
+
+        Only the listed operations travel over the wire; version and updated_at
+        are bumped server-side in the same request (updated_at unless the
+        operations set it themselves).
+
+        Args:
+            doc_id: Document ID
+            partition_key: Partition key value
+            operations: Patch operations to apply
+            model_class: Pydantic model class to deserialize into
+            filter_predicate: Optional condition ("FROM c WHERE ...") the document must match
+            etag: Optional ETag the stored document must still have
+            missing_ok: The document is expected to be missing at times (not logged as a warning)
+
+        Returns:
+            Updated document, or None if it does not exist
+
+        Raises:
+            ValueError: If there are no operations or too many
+            ConcurrencyConflictError: If the predicate or ETag condition did not hold
+        """
+        if not operations:
+            raise ValueError("A patch needs at least one operation")
+        if len(operations) > MAX_PATCH_OPERATIONS:
+            raise ValueError(f"A patch is limited to {MAX_PATCH_OPERATIONS} operations")
+
+        # Patches that set the fields an expiry rule depends on also set the ttl
+        entity_type = entity_type_of(model_class)
+        ttl = patch_ttl(entity_type, {op.path[1:]: op.value for op in operations if op.op == "set"})
+        if ttl is not None:
+            if len(operations) == MAX_PATCH_OPERATIONS:
+                raise ValueError(f"A patch that sets a ttl is limited to {MAX_PATCH_OPERATIONS - 1} operations")
+            operations = [*operations, PatchOperation.set("/ttl", ttl)]
+
+        container = await self._get_container()
+        patch_operations = [op.to_dict() for op in operations] + [PatchOperation.incr("/version").to_dict()]
+        if not any(op.path == "/updated_at" for op in operations):
+            patch_operations.append(PatchOperation.set("/updated_at", utc_now()).to_dict())
+
+        options = {}
+        if etag:
+            options = {"etag": etag, "match_condition": MatchConditions.IfNotModified}
+
+        try:
+            result = await self._execute(
+                operation_name("patch", entity_type),
+                lambda hook: container.patch_item(
+                    item=doc_id,
+                    partition_key=partition_key,
+                    patch_operations=patch_operations,
+                    filter_predicate=filter_predicate,
+                    response_hook=hook,
+                    **options,
+                ),
+            )
+            logger.info(f"Patched document: {doc_id}")
+            self._note_write(result)
+            return hydrator.one(model_class, result)
+        except exceptions.CosmosResourceNotFoundError:
+            if missing_ok:
+                logger.debug(f"Document not found for patch: {doc_id}")
+            else:
+                logger.warning(f"Document not found for patch: {doc_id}")
+            self._note_stale(doc_id, partition_key)
+            return None
+        except exceptions.CosmosAccessConditionFailedError as e:
+            logger.info(f"Patch precondition not met for document: {doc_id}")
+            self._note_stale(doc_id, partition_key)
+            raise ConcurrencyConflictError(f"Document {doc_id} did not match the patch condition") from e
+        except Exception as e:
+            logger.exception(f"Failed to patch document: {e}")
+            raise
+
+    async def patch_array_add(
+        self,
+        document: T,
+        field: str,
+        value: Any,
+        operations: list[PatchOperation] | None = None,
+        missing_ok: bool = False,
+    ) -> T | None:
+        """
+        Append a value to an array field unless it is already present.
+
+        Args:
+            document: Current copy of the document
+            field: Top-level array field name
+            value: Value to append
+            operations: Extra operations applied only if the value is appended
+            missing_ok: The document is expected to be missing at times (not logged as a warning)
+
+        Returns:
+            Updated document, or None if the value was already present or the document does not exist
+        """
+        predicate = f"FROM c WHERE NOT ARRAY_CONTAINS(c.{field}, {sql_literal(value)})"
+        ops = [PatchOperation.add(patch_path(field, "-"), value), *(operations or [])]
+
+        try:
+            return await self.patch(
+                document.id, document.pk, ops, type(document), filter_predicate=predicate, missing_ok=missing_ok
+            )
+        except ConcurrencyConflictError:
+            return None
+
+    async def patch_array_remove(
+        self, document: T, field: str, value: Any, operations: list[PatchOperation] | None = None
+    ) -> T | None:
+        """
+        Remove a value from an array field.
+
+        The element is removed by index, guarded by a predicate that it is still at
+        that index; if a concurrent write shifted it the document is re-read and retried.
+
+        Args:
+            document: Current copy of the document
+            field: Top-level array field name
+            value: Value to remove
+            operations: Extra operations applied only if the value is removed
+
+        Returns:
+            Updated document, or None if the value was not present
+        """
+        current = document
+        for _ in range(PATCH_ARRAY_ATTEMPTS):
+            values = getattr(current, field)
+            if value not in values:
+                return None
+
+            index = values.index(value)
+            predicate = f"FROM c WHERE c.{field}[{index}] = {sql_literal(value)}"
+            ops = [PatchOperation.remove(patch_path(field, index)), *(operations or [])]
+
+            try:
+                return await self.patch(current.id, current.pk, ops, type(current), filter_predicate=predicate)
+            except ConcurrencyConflictError:
+                reread = await self.get_by_id(current.id, current.pk, type(current))
+                if reread is None:
+                    return None
+                current = reread
+
+        raise ConcurrencyConflictError(f"Could not remove {value} from {field} of {document.id} under contention")
+
+    async def retry_on_conflict(
+        self, operation: Callable[[], Awaitable[R]], max_attempts: int = CONFLICT_MAX_ATTEMPTS
+    ) -> R:
+        """
+        Run an optimistic-concurrency operation, retrying when it loses a race.
+
+        The operation must re-read whatever it writes on every call. Retries back off
+        exponentially with full jitter so a burst of writers spreads out instead of
+        colliding again in lockstep.
+
+        Args:
+            operation: Coroutine factory that raises ConcurrencyConflictError on conflict
+            max_attempts: Attempts before the conflict is surfaced
+
+        Returns:
+            Result of the first attempt that does not conflict
+
+        Raises:
+            ConcurrencyConflictError: If every attempt conflicted
+        """
+        for attempt in range(max_attempts):
+            try:
+                return await operation()
+            except ConcurrencyConflictError:
+                if attempt == max_attempts - 1:
+                    logger.warning(f"Giving up after {max_attempts} conflicting attempts")
+                    raise
+                await asyncio.sleep(random.uniform(0, min(CONFLICT_BACKOFF_MAX, CONFLICT_BACKOFF_BASE * 2**attempt)))
+        raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+
+    async def read_modify_write(
+        self, document: T, mutate: Callable[[T], bool | None], max_attempts: int = CONFLICT_MAX_ATTEMPTS
+    ) -> T | None:
+        """
+        Apply a change with a conditional replace, reloading and retrying on conflict.
+
+        Args:
+            document: Current copy of the document (re-read after each conflict)
+            mutate: Applies the change in place; returns False to skip the write
+            max_attempts: Attempts before the conflict is surfaced
+
+        Returns:
+            Updated document (unchanged if mutate skipped the write), or None if it was deleted
+
+        Raises:
+            ConcurrencyConflictError: If every attempt conflicted
+        """
+        current: T | None = document
+
+        async def attempt() -> T | None:
+            nonlocal current
+            if current is None:
+                current = await self.get_by_id(document.id, document.pk, type(document))
+                if current is None:
+                    return None
+
+            candidate, current = current, None
+            if mutate(candidate) is False:
+                return candidate
+            return await self.update(candidate, conditional=True)
+
+        return await self.retry_on_conflict(attempt, max_attempts=max_attempts)
+
+    async def upsert(self, document: T, etag: str | None = None) -> T:
         """
         Create or update a document.
 
         Args:
             document: Document to upsert
+            etag: Only replace the stored document if it still has this ETag
 
         Returns:
             Upserted document
+
+        Raises:
+            ConcurrencyConflictError: If an etag was given and the stored document changed since
         """
         container = await self._get_container()
-        doc_dict = document.model_dump(mode="json")
+        doc_dict = self._serialize(document)
+        options = {"etag": etag, "match_condition": MatchConditions.IfNotModified} if etag else {}
 
         try:
-            result = await container.upsert_item(body=doc_dict)
+            result = await self._execute(
+                operation_name("upsert", document.entity_type),
+                lambda hook: container.upsert_item(body=doc_dict, response_hook=hook, **options),
+            )
             logger.info(f"Upserted {document.entity_type} document: {document.id}")
-            return type(document)(**result)
+            await self._register_partition_key(document)
+            self._note_write(result)
+            return hydrator.echo(document, result)
+        except exceptions.CosmosAccessConditionFailedError as e:
+            self._note_stale(document.id, document.pk)
+            raise ConcurrencyConflictError(f"Document {document.id} was modified concurrently") from e
         except Exception as e:
             logger.exception(f"Failed to upsert document: {e}")
             raise
 
-    async def delete(self, doc_id: str, partition_key: str) -> bool:
+    async def delete(
+        self, doc_id: str, partition_key: str, entity_type: str | None = None, etag: str | None = None
+    ) -> bool:
         """
         Delete a document.
 
         Args:
             doc_id: Document ID
             partition_key: Partition key value
+            entity_type: Entity type, so routed documents also drop their pk_index entry
+            etag: Only delete if the document still has this ETag
 
         Returns:
             True if deleted, False if not found
+
+        Raises:
+            ConcurrencyConflictError: If an etag was given and the document changed since
         """
         container = await self._get_container()
+        options = {"etag": etag, "match_condition": MatchConditions.IfNotModified} if etag else {}
 
         try:
-            await container.delete_item(item=doc_id, partition_key=partition_key)
+            await self._execute(
+                operation_name("delete", entity_type),
+                lambda hook: container.delete_item(
+                    item=doc_id, partition_key=partition_key, response_hook=hook, **options
+                ),
+            )
             logger.info(f"Deleted document: {doc_id}")
+            self._note_stale(doc_id, partition_key)
+            if entity_type in ROUTED_ENTITY_TYPES:
+                await self._forget_partition_key(entity_type, doc_id)
             return True
         except exceptions.CosmosResourceNotFoundError:
             logger.warning(f"Document not found for deletion: {doc_id}")
+            self._note_stale(doc_id, partition_key)
             return False
+        except exceptions.CosmosAccessConditionFailedError as e:
+            self._note_stale(doc_id, partition_key)
+            raise ConcurrencyConflictError(f"Document {doc_id} was modified concurrently") from e
         except Exception as e:
             logger.exception(f"Failed to delete document: {e}")
             raise
 
+    async def execute_batch(self, partition_key: str, operations: list[BatchOperation]) -> list[BaseDocument | None]:
+        """
+        Run writes against one logical partition as a transactional batch.
+
+        The operations commit together or not at all, in a single round trip.
+
+        Args:
+            partition_key: Partition key shared by every operation
+            operations: Operations to run, in order
+
+        Returns:
+            Per-operation results in order: the written document, or None for deletes
+
+        Raises:
+            ValueError: If the batch is empty, too large, or spans partitions
+            CosmosBatchOperationError: If an operation failed (nothing was committed)
+        """
+        if not operations:
+            raise ValueError("A batch needs at least one operation")
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise ValueError(f"A batch is limited to {MAX_BATCH_OPERATIONS} operations")
+        if any(op.partition_key != partition_key for op in operations):
+            raise ValueError(f"All batch operations must target partition {partition_key}")
+
+        container = await self._get_container()
+        batch = [self._batch_entry(op) for op in operations]
+
+        try:
+            responses = await self._execute(
+                "batch",
+                lambda hook: container.execute_item_batch(
+                    batch_operations=batch, partition_key=partition_key, response_hook=hook
+                ),
+            )
+        except exceptions.CosmosBatchOperationError as e:
+            logger.warning(f"Batch in partition {partition_key} failed at operation {e.error_index}: {e}")
+            raise
+        except Exception as e:
+            logger.exception(f"Failed to execute batch: {e}")
+            raise
+
+        logger.info(f"Executed batch of {len(operations)} operations in partition {partition_key}")
+
+        results = []
+        for op, response in zip(operations, responses, strict=True):
+            results.append(await self._finish_write(op, response.get("resourceBody")))
+        return results
+
+    async def bulk(
+        self, operations: list[BatchOperation], concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> list[BulkResult]:
+        """
+        Run independent writes, possibly across partitions, with bounded concurrency.
+
+        There is no atomicity: each operation succeeds or fails on its own and
+        failures are reported per item instead of being raised.
+
+        Args:
+            operations: Operations to run
+            concurrency: Maximum requests in flight
+
+        Returns:
+            One BulkResult per operation, in order
+        """
+        if concurrency < 1:
+            raise ValueError("Bulk concurrency must be at least 1")
+
+        container = await self._get_container()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(op: BatchOperation) -> BulkResult:
+            async with semaphore:
+                try:
+                    return BulkResult(op, document=await self._execute_operation(container, op))
+                except Exception as e:
+                    return BulkResult(op, error=e)
+
+        results = await asyncio.gather(*(run(op) for op in operations))
+
+        failed = sum(1 for result in results if not result.ok)
+        if failed:
+            logger.warning(f"Bulk request: {failed} of {len(operations)} operations failed")
+        return list(results)
+
+    def _batch_entry(self, op: BatchOperation) -> tuple[str, tuple[Any, ...]]:
+        """Build the SDK batch tuple for an operation."""
+        if op.kind == "delete":
+            return ("delete", (op.doc_id,))
+
+        body = self._operation_body(op)
+        if op.kind == "replace":
+            return ("replace", (op.doc_id, body))
+        return (op.kind, (body,))
+
+    def _operation_body(self, op: BatchOperation) -> dict[str, Any]:
+        """Serialize the document of a write operation."""
+        if op.kind == "replace":
+            op.written.touch()
+        return self._serialize(op.written)
+
+    @staticmethod
+    def _serialize(document: BaseDocument) -> dict[str, Any]:
+        """Serialize a document for a full write, stamping its ttl from the expiry rules."""
+        body = document.model_dump(mode="json")
+        document.ttl = document_ttl(document.entity_type, body)
+        if document.ttl is None:
+            body.pop("ttl", None)
+        else:
+            body["ttl"] = document.ttl
+        return body
+
+    async def _execute_operation(self, container: Any, op: BatchOperation) -> BaseDocument | None:
+        """Run a single operation outside of a batch."""
+        operation = operation_name(op.kind, op.entity_type)
+
+        if op.kind == "delete":
+            await self._execute(
+                operation,
+                lambda hook: container.delete_item(item=op.doc_id, partition_key=op.partition_key, response_hook=hook),
+            )
+            return await self._finish_write(op, None)
+
+        body = self._operation_body(op)
+
+        async def write(hook: ChargeRecorder) -> dict[str, Any]:
+            result: dict[str, Any]
+            if op.kind == "create":
+                result = await container.create_item(body=body, response_hook=hook)
+            elif op.kind == "upsert":
+                result = await container.upsert_item(body=body, response_hook=hook)
+            else:
+                result = await container.replace_item(item=op.doc_id, body=body, response_hook=hook)
+            return result
+
+        return await self._finish_write(op, await self._execute(operation, write))
+
+    async def _finish_write(self, op: BatchOperation, result: dict[str, Any] | None) -> BaseDocument | None:
+        """Keep partition routing and the document cache in sync after an operation and hydrate its result."""
+        if op.kind == "delete":
+            self._note_stale(op.doc_id, op.partition_key)
+            if op.entity_type in ROUTED_ENTITY_TYPES:
+                await self._forget_partition_key(op.entity_type, op.doc_id)
+            return None
+
+        if op.kind in ("create", "upsert"):
+            await self._register_partition_key(op.written)
+        if result:
+            self._note_write(result)
+        else:
+            self._note_stale(op.written.id, op.partition_key)
+        return hydrator.echo(op.written, result)
+
+    def _note_write(self, result: dict[str, Any]) -> None:
+        """
+        Account for a document this instance just wrote.
+
+        Refreshes its cached copy and starts a new read generation, so reads
+        issued from now on do not join flights that may predate the write.
+        """
+        self._flights.advance()
+        if self._document_cache:
+            self._document_cache.refresh((result["id"], result["pk"]), result)
+        scope = current_request_scope()
+        if scope:
+            scope.remember(result)
+
+    def _note_stale(self, doc_id: str, partition_key: str) -> None:
+        """Account for a document that was deleted or changed elsewhere (drop copies of it)."""
+        self._flights.advance()
+        if self._document_cache:
+            self._document_cache.invalidate((doc_id, partition_key))
+        scope = current_request_scope()
+        if scope:
+            scope.forget(doc_id, partition_key)
+
+    @staticmethod
+    def _loaded(model_class: type[T], document: dict[str, Any], scope: RequestScope | None) -> T:
+        """Hydrate a point-read document, recording it in the request's identity map."""
+        if scope:
+            scope.remember(document)
+        return hydrator.one(model_class, document)
+
+    @staticmethod
+    def _remember_documents(rows: list[Any]) -> None:
+        """Record the full documents among query results in the request's identity map (projections are skipped)."""
+        scope = current_request_scope()
+        if scope is None:
+            return
+        for row in rows:
+            if isinstance(row, dict) and "_etag" in row and "id" in row and "pk" in row:
+                scope.remember(row)
+
     async def count(
         self, query: str, parameters: list[dict[str, Any]] | None = None, partition_key: str | None = None
     ) -> int:
@@ -241,26 +1499,113 @@ class CosmosRepository:
             Count of matching documents
         """
         container = await self._get_container()
+        query_options = self._query_options(query, parameters, partition_key, None)
 
-        query_options = {
-            "query": query,
-            "parameters": parameters or [],
-        }
-
-        if partition_key:
-            query_options["partition_key"] = partition_key
-        else:
-            query_options["enable_cross_partition_query"] = True
+        async def run(hook: ChargeRecorder) -> int:
+            async for item in container.query_items(**query_options, response_hook=hook):
+                # SELECT VALUE COUNT(1) returns a bare number, SELECT COUNT(1) a document with a $1 field
+                return item if isinstance(item, int) else item.get("$1", 0)
+            return 0
 
         try:
-            async for item in container.query_items(**query_options):
-                # Count query returns a single document with $1 field
-                return item.get("$1", 0)
-            return 0
+            return await self._execute("count", run, cross_partition=not partition_key, query=query)
         except Exception as e:
             logger.exception(f"Count query failed: {e}")
             raise
 
+    async def count_by(
+        self,
+        model_class: type[G],
+        where: str,
+        parameters: list[dict[str, Any]] | None = None,
+        partition_keys: list[str] | None = None,
+    ) -> list[G]:
+        """
+        Count documents per group, server-side.
+
+        The SDK only runs GROUP BY within one partition, so the query runs once per
+        partition key (concurrently) and rows with equal keys are summed.
+
+        Args:
+            model_class: Row type, declaring the group keys (models.aggregates)
+            where: WHERE condition over the document alias c
+            parameters: Query parameters
+            partition_keys: Partitions to count in
+
+        Returns:
+            One row per distinct combination of group keys
+
+        Raises:
+            ValueError: If no partition keys were given
+        """
+        if not partition_keys:
+            raise ValueError("GROUP BY queries need at least one partition key")
+
+        query = (
+            f"SELECT {model_class.select_list()} FROM c WHERE {where} "
+            f"GROUP BY {', '.join(model_class.group_expressions())}"
+        )
+        container = await self._get_container()
+
+        async def run_in(partition_key: str) -> list[dict[str, Any]]:
+            query_options = self._query_options(query, parameters, partition_key, None)
+
+            async def run(hook: ChargeRecorder) -> list[dict[str, Any]]:
+                return [row async for row in container.query_items(**query_options, response_hook=hook)]
+
+            return await self._execute("count_by", run, query=query)
+
+        try:
+            pages = await asyncio.gather(*(run_in(partition_key) for partition_key in dict.fromkeys(partition_keys)))
+        except Exception as e:
+            logger.exception(f"Group count query failed: {e}")
+            raise
+
+        keys = model_class.group_keys()
+        merged: dict[tuple, G] = {}
+        for row in (row for page in pages for row in page):
+            group = model_class.model_validate(row)
+            key = tuple(getattr(group, name) for name in keys)
+            if key in merged:
+                merged[key].count += group.count
+            else:
+                merged[key] = group
+        return list(merged.values())
+
+    async def distinct_values(
+        self,
+        expression: str,
+        where: str,
+        parameters: list[dict[str, Any]] | None = None,
+        partition_key: str | None = None,
+        join: str = "",
+    ) -> list[Any]:
+        """
+        Get the distinct values of an expression over matching documents, server-side.
+
+        Args:
+            expression: SQL expression to collect (e.g. "c.status", or "v.k" with a join)
+            where: WHERE condition
+            parameters: Query parameters
+            partition_key: Optional partition key to scope the query
+            join: Optional JOIN clause (e.g. "JOIN v IN ObjectToArray(c.votes)")
+
+        Returns:
+            Distinct values, in no particular order
+        """
+        query = f"SELECT DISTINCT VALUE {expression} FROM c {join} WHERE {where}"
+        container = await self._get_container()
+        query_options = self._query_options(query, parameters, partition_key, None)
+
+        async def run(hook: ChargeRecorder) -> list[Any]:
+            return [value async for value in container.query_items(**query_options, response_hook=hook)]
+
+        try:
+            return await self._execute("distinct", run, cross_partition=not partition_key, query=query)
+        except Exception as e:
+            logger.exception(f"Distinct query failed: {e}")
+            raise
+
     async def query_by_type(
         self,
         entity_type: str,
@@ -293,12 +1638,15 @@ class CosmosRepository:
 
         return await self.query(query=query, parameters=params, model_class=model_class, max_items=max_items)
 
-    async def close(self):
+    async def close(self) -> None:
         """Close the Cosmos DB connection."""
         if self._client:
             await self._client.close()
             self._client = None
             self._container = None
+            self._pk_cache.clear()
+            if self._document_cache:
+                self._document_cache.clear()
             logger.info("Cosmos DB connection closed")
 
 
@@ -0,0 +1,120 @@
+"""
+Document Cache
+
+Per-instance read-through cache of point-read documents, keyed by
+(id, partition key). Entries are served from memory for a short TTL; after
+that they are revalidated against Cosmos DB with their ETag, which costs a
+conditional read but no document transfer or re-validation when unchanged.
+
+Every function host instance has its own cache. Writes made through this
+instance update or evict the entry immediately; writes made elsewhere become
+visible once the entry's TTL runs out.
+"""
+
+import copy
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+CacheKey = tuple[str, str]
+
+
+class CacheEntry:
+    """A cached raw document and when it was last confirmed current."""
+
+    def __init__(self, document: dict[str, Any], validated_at: float) -> None:
+        self.document = document
+        self.validated_at = validated_at
+
+    @property
+    def etag(self) -> str | None:
+        """ETag of the cached version."""
+        return self.document.get("_etag")
+
+
+class DocumentCache:
+    """Size-bounded LRU of raw documents with a freshness TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_environment(cls) -> "DocumentCache | None":
+        """
+        Build the cache from COSMOS_CACHE_MAX_ENTRIES and COSMOS_CACHE_TTL_SECONDS.
+
+        Returns:
+            The cache, or None when disabled (max entries of 0)
+        """
+        max_entries = int(os.environ.get("COSMOS_CACHE_MAX_ENTRIES", "1000"))
+        ttl_seconds = float(os.environ.get("COSMOS_CACHE_TTL_SECONDS", "5"))
+        if max_entries <= 0:
+            return None
+        return cls(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def lookup(self, key: CacheKey) -> CacheEntry | None:
+        """Get the entry for a key (fresh or not), marking it recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether an entry can be served without revalidation."""
+        return time.monotonic() - entry.validated_at < self.ttl_seconds
+
+    def document(self, entry: CacheEntry) -> dict[str, Any]:
+        """Copy of a cached document that the caller is free to mutate."""
+        return copy.deepcopy(entry.document)
+
+    def put(self, key: CacheKey, document: dict[str, Any]) -> None:
+        """Store the current version of a document."""
+        self._entries[key] = CacheEntry(copy.deepcopy(document), time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def refresh(self, key: CacheKey, document: dict[str, Any]) -> None:
+        """Replace a cached document with a newer version written by this instance (no-op if not cached)."""
+        if key in self._entries:
+            self.put(key, document)
+
+    def confirm(self, entry: CacheEntry) -> None:
+        """Restart an entry's TTL after the store confirmed it is unchanged."""
+        entry.validated_at = time.monotonic()
+
+    def invalidate(self, key: CacheKey) -> None:
+        """Drop a document from the cache."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every document."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        lookups = self.hits + self.misses + self.revalidations
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.not_modified) / lookups, 3) if lookups else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        """Zero the counters (entries are kept)."""
+        self.hits = self.misses = self.revalidations = self.not_modified = self.evictions = 0
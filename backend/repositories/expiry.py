@@ -0,0 +1,94 @@
+"""
+Document Expiry
+
+Retention rules for documents that Cosmos DB deletes by itself through
+per-document time to live. The container has TTL enabled without a default
+(defaultTtl: -1), so only documents carrying a ttl expire: ttl seconds after
+their last write, deleted in the background from spare throughput.
+
+The repository stamps ttl from these rules on every full write and on patches
+that set the fields a rule depends on, so services never compute it.
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from models.documents import utc_now
+
+# Item-level ttl meaning "never expire" (clears a ttl set by an earlier write)
+NEVER_EXPIRE = -1
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Retention periods
+READ_NOTIFICATION_RETENTION_DAYS = 30
+INVITATION_GRACE_DAYS = 7
+MESSAGE_RETENTION_DAYS = 90
+
+
+class ExpiryRule:
+    """How long documents of one entity type live after a write."""
+
+    def __init__(self, depends_on: tuple[str, ...], ttl: Callable[[dict[str, Any]], int | None]) -> None:
+        """
+        Args:
+            depends_on: Top-level fields the ttl is computed from
+            ttl: Computes the ttl in seconds from those fields; None to never expire
+        """
+        self.depends_on = depends_on
+        self.ttl = ttl
+
+
+def _seconds_until(moment: datetime | str) -> int:
+    if isinstance(moment, str):
+        moment = datetime.fromisoformat(moment)
+    return max(1, int((moment - utc_now()).total_seconds()))
+
+
+def _invitation_ttl(fields: dict[str, Any]) -> int:
+    # Kept for a grace period past expiry, whatever its status
+    return _seconds_until(fields["expires_at"]) + INVITATION_GRACE_DAYS * DAY_SECONDS
+
+
+EXPIRY_RULES: dict[str, ExpiryRule] = {
+    "notification": ExpiryRule(
+        ("is_read",), lambda fields: READ_NOTIFICATION_RETENTION_DAYS * DAY_SECONDS if fields["is_read"] else None
+    ),
+    "invitation": ExpiryRule(("expires_at",), _invitation_ttl),
+    "message": ExpiryRule((), lambda fields: MESSAGE_RETENTION_DAYS * DAY_SECONDS),
+    "prompt_cache": ExpiryRule(("expires_at",), lambda fields: _seconds_until(fields["expires_at"])),
+}
+
+
+def document_ttl(entity_type: str, document: dict[str, Any]) -> int | None:
+    """
+    Get the ttl a document should be written with.
+
+    Args:
+        entity_type: Entity type of the document
+        document: Serialized document
+
+    Returns:
+        ttl in seconds, or None when the document never expires
+    """
+    rule = EXPIRY_RULES.get(entity_type)
+    return rule.ttl(document) if rule else None
+
+
+def patch_ttl(entity_type: str, values: dict[str, Any]) -> int | None:
+    """
+    Get the ttl a patch should set, from the values it sets.
+
+    Args:
+        entity_type: Entity type of the patched document
+        values: Top-level fields set by the patch
+
+    Returns:
+        ttl in seconds (NEVER_EXPIRE to clear one), or None when the patch leaves the ttl alone
+    """
+    rule = EXPIRY_RULES.get(entity_type)
+    if rule is None or not rule.depends_on or not all(field in values for field in rule.depends_on):
+        return None
+    ttl = rule.ttl(values)
+    return NEVER_EXPIRE if ttl is None else ttl
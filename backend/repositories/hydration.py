@@ -0,0 +1,183 @@
+"""
+Document Hydration
+
+Builds models from raw Cosmos DB documents. Everything in the container was
+written from a validated model, so in trusted mode (the default) reads skip
+pydantic validation: JSON-native values are taken as they are, only the
+conversions JSON cannot carry (ISO datetimes, integral floats) are applied,
+and the model is assembled directly, as model_construct would. Nested lists
+and dicts, such as ItineraryDocument.days, are not walked at all.
+
+Models with field types the fast path does not know how to convert are
+always validated. Set COSMOS_TRUSTED_HYDRATION=false to validate everything,
+e.g. while migrating documents written by other tools.
+"""
+
+import os
+import types
+import typing
+from datetime import datetime
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+
+M = TypeVar("M", bound=BaseModel)
+
+# Field types whose JSON form is already the Python value
+_PASSTHROUGH_TYPES = (str, int, bool, list, dict, typing.Any)
+
+
+def _parse_datetime(value: Any) -> Any:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _to_float(value: Any) -> Any:
+    return float(value) if isinstance(value, int) and not isinstance(value, bool) else value
+
+
+def _converter(annotation: Any) -> Any:
+    """
+    Get the conversion a JSON value of a field needs.
+
+    Returns:
+        None for pass-through fields, a callable for convertible ones, or False
+        when the field type needs full validation
+    """
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        members = [member for member in typing.get_args(annotation) if member is not type(None)]
+        return _converter(members[0]) if len(members) == 1 else False
+    if origin is typing.Literal:
+        return None
+    if origin in (list, dict):
+        return None
+    if annotation is datetime:
+        return _parse_datetime
+    if annotation is float:
+        return _to_float
+    if annotation in _PASSTHROUGH_TYPES:
+        return None
+    return False
+
+
+class FieldPlan:
+    """How to build one model class from raw documents without validation."""
+
+    def __init__(self, model_class: type[BaseModel]) -> None:
+        # (field name, document key, converter, default, default factory) per field
+        self.fields: list[tuple[str, str, Any, Any, Any]] = []
+        self.trusted = True
+
+        for name, field in model_class.model_fields.items():
+            converter = _converter(field.annotation)
+            if converter is False:
+                self.trusted = False
+                return
+            self.fields.append((name, field.alias or name, converter, field.default, field.default_factory))
+
+
+class Hydrator:
+    """Builds document and projection models from raw query and read results."""
+
+    def __init__(self, trusted: bool | None = None) -> None:
+        self.trusted = (
+            trusted
+            if trusted is not None
+            else os.environ.get("COSMOS_TRUSTED_HYDRATION", "true").lower() not in ("false", "0", "no")
+        )
+        self._plans: dict[type[BaseModel], FieldPlan] = {}
+        self._list_adapters: dict[type[BaseModel], TypeAdapter[list[Any]]] = {}
+
+    def _plan(self, model_class: type[BaseModel]) -> FieldPlan:
+        plan = self._plans.get(model_class)
+        if plan is None:
+            plan = self._plans[model_class] = FieldPlan(model_class)
+        return plan
+
+    def one(self, model_class: type[M], raw: dict[str, Any]) -> M:
+        """
+        Build a model from one raw document.
+
+        Args:
+            model_class: Document or projection model
+            raw: Document as returned by Cosmos DB
+
+        Returns:
+            Model instance
+        """
+        plan = self._plan(model_class)
+        if not (self.trusted and plan.trusted):
+            return model_class.model_validate(raw)
+
+        values = {}
+        fields_set = set()
+        for name, key, convert, default, default_factory in plan.fields:
+            if key in raw:
+                value = raw[key]
+                values[name] = convert(value) if convert is not None else value
+                fields_set.add(name)
+            elif default_factory is not None:
+                values[name] = default_factory()
+            elif default is PydanticUndefined:
+                # A required field is missing: let validation report it
+                return model_class.model_validate(raw)
+            else:
+                values[name] = default
+
+        # Same state model_construct produces, without its per-call overhead
+        instance = model_class.__new__(model_class)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+    def many(self, model_class: type[M], raws: list[dict[str, Any]]) -> list[M]:
+        """
+        Build models from a page of raw documents.
+
+        Untrusted pages are validated in one batched TypeAdapter call rather than
+        one model call per document.
+
+        Args:
+            model_class: Document or projection model
+            raws: Documents as returned by Cosmos DB
+
+        Returns:
+            Model instances in order
+        """
+        plan = self._plan(model_class)
+        if self.trusted and plan.trusted:
+            return [self.one(model_class, raw) for raw in raws]
+
+        adapter = self._list_adapters.get(model_class)
+        if adapter is None:
+            # list[model_class], spelled out since the element type is only known at runtime
+            list_type: Any = types.GenericAlias(list, (model_class,))
+            adapter = self._list_adapters[model_class] = TypeAdapter(list_type)
+        return adapter.validate_python(raws)
+
+    def echo(self, document: M, result: dict[str, Any] | None) -> M:
+        """
+        Build the result of a write from the document that was sent.
+
+        Create, replace and upsert store the body unchanged apart from system
+        properties, so the sent (already validated) document is reused with
+        the new ETag instead of re-validating the echoed body.
+
+        Args:
+            document: Document that was written
+            result: Body returned by Cosmos DB
+
+        Returns:
+            Copy of the document carrying the stored ETag (a shallow copy:
+            nested lists and dicts are shared with the sent document)
+        """
+        if not self.trusted or not result:
+            return type(document).model_validate(result) if result else document
+        return document.model_copy(update={"etag": result.get("_etag")})
+
+
+# Singleton instance
+hydrator = Hydrator()
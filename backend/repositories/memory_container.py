@@ -0,0 +1,732 @@
+"""
+In-Memory Cosmos Container
+
+Drop-in, in-process stand-in for an azure.cosmos.aio ContainerProxy, for local
+benchmarks of the full service stack without the emulator or a network.
+Selected with COSMOS_DB_URL=memory:// or installed explicitly through
+CosmosRepository.use_container().
+
+Mirrors the behaviour the repository depends on: logical partitions with
+per-partition ID uniqueness, system properties (_etag, _ts), ETag and
+filter-predicate preconditions, partial document patches, transactional
+batches, paged queries with continuation tokens, a latest-version change
+feed, per-document ttl expiry, and the SDK's exception types. Every call
+reports a synthetic request charge through response_hook, so repository
+metrics read the same way they do against Cosmos DB.
+
+The RU model is an approximation of published Cosmos DB costs, good for
+comparing access patterns with each other, not for capacity planning.
+"""
+
+import asyncio
+import copy
+import heapq
+import json
+import time
+import uuid
+import zlib
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from azure.core import MatchConditions
+from azure.cosmos import exceptions
+
+from repositories.memory_sql import QuerySyntaxError, bind_parameters, parse_predicate, parse_query
+from repositories.metrics import ITEM_COUNT_HEADER, REQUEST_CHARGE_HEADER
+
+# Synthetic request charges (RU), per KB of document where noted
+READ_CHARGE_PER_KB = 1.0
+CREATE_CHARGE_PER_KB = 5.5
+REPLACE_CHARGE_PER_KB = 10.0
+DELETE_CHARGE = 5.5
+NOT_FOUND_CHARGE = 1.0
+NOT_MODIFIED_CHARGE = 1.0
+QUERY_BASE_CHARGE = 2.3
+QUERY_SCAN_CHARGE = 0.02
+QUERY_RESULT_CHARGE_PER_KB = 0.3
+
+# Physical partitions logical partitions are hashed onto (fan-out queries pay per partition)
+DEFAULT_PHYSICAL_PARTITIONS = 4
+
+DEFAULT_PAGE_SIZE = 100
+
+SESSION_TOKEN_HEADER = "x-ms-session-token"
+
+# SDK response hook: called with the response headers and the result of each call
+ResponseHook = Callable[[Any, Any], None]
+
+
+def _document_kb(document: Any) -> float:
+    """Serialized size of a document in KB (at least 1, as Cosmos rounds up)."""
+    return max(1.0, len(json.dumps(document, separators=(",", ":"))) / 1024)
+
+
+def _expires_at(document: dict[str, Any]) -> float | None:
+    """When a stored document's ttl runs out (None if it does not expire)."""
+    ttl = document.get("ttl")
+    if not isinstance(ttl, int) or isinstance(ttl, bool) or ttl <= 0:
+        return None
+    return float(document["_ts"] + ttl)
+
+
+def _error(
+    error_class: type[exceptions.CosmosHttpResponseError], status_code: int, message: str, charge: float
+) -> exceptions.CosmosHttpResponseError:
+    error = error_class(status_code=status_code, message=message)
+    error.headers = {REQUEST_CHARGE_HEADER: f"{charge:.2f}"}
+    return error
+
+
+def _bad_request(message: str) -> exceptions.CosmosHttpResponseError:
+    return _error(exceptions.CosmosHttpResponseError, 400, message, NOT_FOUND_CHARGE)
+
+
+def _pointer(path: str) -> list[str]:
+    """Split a JSON Pointer into unescaped segments."""
+    if not path.startswith("/"):
+        raise _bad_request(f"Invalid patch path {path!r}")
+    return [segment.replace("~1", "/").replace("~0", "~") for segment in path[1:].split("/")]
+
+
+def _array_index(array: list[Any], segment: str, allow_end: bool = False) -> int:
+    if allow_end and segment == "-":
+        return len(array)
+    if not segment.isdigit():
+        raise _bad_request(f"Invalid array index {segment!r}")
+    index = int(segment)
+    if index > len(array) or (index == len(array) and not allow_end):
+        raise _bad_request(f"Array index {index} is out of range")
+    return index
+
+
+def _apply_patch(document: dict[str, Any], operation: dict[str, Any]) -> None:
+    """Apply one patch operation in place, with Cosmos DB semantics."""
+    op = operation.get("op")
+    segments = _pointer(operation.get("path", ""))
+    parent: Any = document
+    for segment in segments[:-1]:
+        if isinstance(parent, dict) and segment in parent:
+            parent = parent[segment]
+        elif isinstance(parent, list):
+            parent = parent[_array_index(parent, segment)]
+        else:
+            raise _bad_request(f"Patch path {operation['path']} does not exist")
+
+    key = segments[-1]
+    value = copy.deepcopy(operation.get("value"))
+
+    if isinstance(parent, list):
+        if op == "add":
+            parent.insert(_array_index(parent, key, allow_end=True), value)
+            return
+        index = _array_index(parent, key)
+        if op == "remove":
+            del parent[index]
+        elif op in ("set", "replace"):
+            parent[index] = value
+        elif op == "incr":
+            parent[index] = _increment(parent[index], value)
+        else:
+            raise _bad_request(f"Unsupported patch operation {op!r}")
+        return
+
+    if not isinstance(parent, dict):
+        raise _bad_request(f"Patch path {operation['path']} does not exist")
+
+    if op in ("add", "set"):
+        parent[key] = value
+    elif op == "replace":
+        if key not in parent:
+            raise _bad_request(f"Patch path {operation['path']} does not exist")
+        parent[key] = value
+    elif op == "remove":
+        if key not in parent:
+            raise _bad_request(f"Patch path {operation['path']} does not exist")
+        del parent[key]
+    elif op == "incr":
+        parent[key] = _increment(parent.get(key, 0), value)
+    else:
+        raise _bad_request(f"Unsupported patch operation {op!r}")
+
+
+def _increment(current: Any, delta: Any) -> Any:
+    numeric = (int, float)
+    if isinstance(current, bool) or isinstance(delta, bool) or not isinstance(current, numeric):
+        raise _bad_request("Increment target is not a number")
+    if not isinstance(delta, numeric):
+        raise _bad_request("Increment value is not a number")
+    return current + delta
+
+
+class MemoryQueryPager:
+    """Page iterator returned by MemoryQueryIterable.by_page()."""
+
+    def __init__(self, source: "MemoryQueryIterable", continuation_token: str | None) -> None:
+        self._source = source
+        self._offset = int(continuation_token) if continuation_token else 0
+        self._done = False
+        self.continuation_token: str | None = continuation_token
+
+    def __aiter__(self) -> "MemoryQueryPager":
+        return self
+
+    async def __anext__(self) -> AsyncIterator[Any]:
+        if self._done:
+            raise StopAsyncIteration
+
+        items, next_offset = await self._source.fetch(self._offset)
+        self._offset = next_offset or 0
+        self._done = next_offset is None
+        self.continuation_token = str(next_offset) if next_offset is not None else None
+        return _aiter_list(items)
+
+
+def _lsn_of(document: dict[str, Any]) -> int:
+    return int(document["_lsn"])
+
+
+async def _aiter_list(items: list[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+class MemoryQueryIterable:
+    """Result of MemoryContainer.query_items(): iterable item by item or page by page."""
+
+    def __init__(
+        self,
+        container: "MemoryContainer",
+        query: str,
+        parameters: list[dict[str, Any]] | None,
+        partition_key: str | None,
+        max_item_count: int | None,
+        response_hook: ResponseHook | None,
+    ) -> None:
+        self._container = container
+        self._query = query
+        self._parameters = parameters
+        self._partition_key = partition_key
+        self._page_size = max_item_count if max_item_count and max_item_count > 0 else DEFAULT_PAGE_SIZE
+        self._response_hook = response_hook
+
+    def by_page(self, continuation_token: str | None = None) -> MemoryQueryPager:
+        """Iterate result pages, resuming after continuation_token when given."""
+        return MemoryQueryPager(self, continuation_token)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        async for page in self.by_page():
+            async for item in page:
+                yield item
+
+    async def fetch(self, offset: int) -> tuple[list[Any], int | None]:
+        """
+        Run the query and return one page.
+
+        Returns:
+            Page items and the offset of the next page (None when exhausted)
+        """
+        await self._container.simulate_latency()
+
+        try:
+            parsed = parse_query(self._query)
+            if parsed.group_by and self._partition_key is None:
+                # The Python SDK cannot merge GROUP BY results across partitions
+                raise QuerySyntaxError("GROUP BY is only supported within a single partition")
+            params = bind_parameters(self._parameters)
+            documents, partitions = self._container.scan(self._partition_key)
+            results = parsed.execute(documents, params)
+        except QuerySyntaxError as e:
+            raise _bad_request(f"Query is not supported: {e}") from e
+
+        page = copy.deepcopy(results[offset : offset + self._page_size])
+        next_offset = offset + len(page) if offset + len(page) < len(results) else None
+
+        # The first page pays for the scan; every page pays the per-partition round trips
+        charge = QUERY_BASE_CHARGE * partitions + QUERY_RESULT_CHARGE_PER_KB * _document_kb(page) * bool(page)
+        if offset == 0:
+            charge += QUERY_SCAN_CHARGE * len(documents)
+
+        self._container.report(self._response_hook, charge, page, item_count=len(page))
+        return page, next_offset
+
+
+class MemoryChangeFeedPager:
+    """Page iterator over the change feed; the continuation token is the last LSN read."""
+
+    def __init__(
+        self, container: "MemoryContainer", position: int, page_size: int, response_hook: ResponseHook | None
+    ) -> None:
+        self._container = container
+        self._position = position
+        self._page_size = page_size
+        self._response_hook = response_hook
+        self.continuation_token: str | None = str(position)
+
+    def __aiter__(self) -> "MemoryChangeFeedPager":
+        return self
+
+    async def __anext__(self) -> AsyncIterator[Any]:
+        await self._container.simulate_latency()
+        documents, _ = self._container.scan(None)
+        changed = sorted((document for document in documents if document["_lsn"] > self._position), key=_lsn_of)
+        page = copy.deepcopy(changed[: self._page_size])
+
+        charge = QUERY_BASE_CHARGE * self._container.physical_partitions
+        charge += QUERY_RESULT_CHARGE_PER_KB * _document_kb(page) * bool(page)
+        self._container.report(self._response_hook, charge, page, item_count=len(page))
+
+        # Like the service, an empty page ends the iteration (no changes since the token)
+        if not page:
+            raise StopAsyncIteration
+        self._position = page[-1]["_lsn"]
+        self.continuation_token = str(self._position)
+        return _aiter_list(page)
+
+
+class MemoryChangeFeedIterable:
+    """Result of MemoryContainer.query_items_change_feed()."""
+
+    def __init__(
+        self, container: "MemoryContainer", start: int, page_size: int, response_hook: ResponseHook | None
+    ) -> None:
+        self._container = container
+        self._start = start
+        self._page_size = page_size
+        self._response_hook = response_hook
+
+    def by_page(self, continuation_token: str | None = None) -> MemoryChangeFeedPager:
+        """Iterate change pages, resuming after continuation_token when given."""
+        position = int(continuation_token) if continuation_token else self._start
+        return MemoryChangeFeedPager(self._container, position, self._page_size, self._response_hook)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        async for page in self.by_page():
+            async for item in page:
+                yield item
+
+
+class MemoryContainer:
+    """
+    In-process Cosmos DB container.
+
+    Documents are partitioned by the container's partition key path (the
+    top-level "pk" property, as in the deployed container).
+    """
+
+    def __init__(
+        self,
+        partition_key_field: str = "pk",
+        physical_partitions: int = DEFAULT_PHYSICAL_PARTITIONS,
+        latency_ms: float = 0.0,
+    ) -> None:
+        """
+        Args:
+            partition_key_field: Top-level property holding the partition key
+            physical_partitions: Number of physical partitions to model for fan-out costs
+            latency_ms: Simulated network round trip per call
+        """
+        self.partition_key_field = partition_key_field
+        self.physical_partitions = physical_partitions
+        self.latency_ms = latency_ms
+        self._partitions: dict[str, dict[str, dict[str, Any]]] = {}
+        # Logical sequence number of the last write, as carried in _lsn by the change feed
+        self._lsn = 0
+        # (expiry time, partition key, id) of documents written with a ttl
+        self._expiring: list[tuple[float, str, str]] = []
+
+    # Infrastructure
+
+    async def simulate_latency(self) -> None:
+        """Wait for the simulated round trip (always yields to the event loop); every call starts here."""
+        self.expire()
+        await asyncio.sleep(self.latency_ms / 1000 if self.latency_ms else 0)
+
+    def expire(self, now: float | None = None) -> int:
+        """
+        Delete documents whose ttl has run out, as Cosmos DB does in the background.
+
+        Args:
+            now: Current time in epoch seconds (defaults to the clock; tests pass a later time)
+
+        Returns:
+            Number of documents deleted
+        """
+        now = time.time() if now is None else now
+        expired = 0
+        while self._expiring and self._expiring[0][0] <= now:
+            _, partition_key, item = heapq.heappop(self._expiring)
+            document = self._partitions.get(partition_key, {}).get(item)
+            expires_at = _expires_at(document) if document is not None else None
+            # Rewritten since: its current ttl has its own entry
+            if expires_at is None or expires_at > now:
+                continue
+            del self._partitions[partition_key][item]
+            if not self._partitions[partition_key]:
+                del self._partitions[partition_key]
+            expired += 1
+        return expired
+
+    def report(
+        self,
+        response_hook: ResponseHook | None,
+        charge: float,
+        result: Any,
+        item_count: int | None = None,
+    ) -> None:
+        """Invoke the caller's response hook with synthetic response headers."""
+        if response_hook is None:
+            return
+        headers = {REQUEST_CHARGE_HEADER: f"{charge:.2f}", SESSION_TOKEN_HEADER: "0:-1#1"}
+        if item_count is not None:
+            headers[ITEM_COUNT_HEADER] = str(item_count)
+        response_hook(headers, result)
+
+    def scan(self, partition_key: str | None) -> tuple[list[dict[str, Any]], int]:
+        """
+        Collect the documents a query has to look at.
+
+        Returns:
+            Candidate documents and the number of physical partitions touched
+        """
+        if partition_key is not None:
+            return list(self._partitions.get(partition_key, {}).values()), 1
+
+        documents = [document for partition in self._partitions.values() for document in partition.values()]
+        return documents, self.physical_partitions
+
+    def physical_partition(self, partition_key: str) -> int:
+        """Physical partition a logical partition key hashes onto."""
+        return zlib.crc32(partition_key.encode()) % self.physical_partitions
+
+    def clear(self) -> None:
+        """Drop every document."""
+        self._partitions.clear()
+
+    def __len__(self) -> int:
+        return sum(len(partition) for partition in self._partitions.values())
+
+    async def read(self, **kwargs: Any) -> dict[str, Any]:
+        """Container properties."""
+        await self.simulate_latency()
+        return {"id": "memory", "partitionKey": {"paths": [f"/{self.partition_key_field}"], "kind": "Hash"}}
+
+    async def read_feed_ranges(self, **kwargs: Any) -> AsyncIterator[dict[str, Any]]:
+        """One feed range per modelled physical partition."""
+        await self.simulate_latency()
+        for partition in range(self.physical_partitions):
+            yield {"physical_partition": partition}
+
+    def _partition_key_of(self, body: dict[str, Any]) -> str:
+        partition_key = body.get(self.partition_key_field)
+        if not isinstance(partition_key, str) or not partition_key:
+            raise _bad_request(f"Document is missing partition key property {self.partition_key_field!r}")
+        if not isinstance(body.get("id"), str) or not body["id"]:
+            raise _bad_request("Document is missing an id")
+        return partition_key
+
+    def _stamp(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Copy a document and assign fresh system properties."""
+        stored = copy.deepcopy(body)
+        stored["_etag"] = f'"{uuid.uuid4()}"'
+        stored["_ts"] = int(time.time())
+        self._lsn += 1
+        stored["_lsn"] = self._lsn
+        expires_at = _expires_at(stored)
+        if expires_at is not None:
+            heapq.heappush(self._expiring, (expires_at, stored[self.partition_key_field], stored["id"]))
+        return stored
+
+    def _find(self, item: str, partition_key: str) -> dict[str, Any]:
+        document = self._partitions.get(partition_key, {}).get(item)
+        if document is None:
+            raise _error(
+                exceptions.CosmosResourceNotFoundError,
+                404,
+                f"Entity with the specified id does not exist: {item}",
+                NOT_FOUND_CHARGE,
+            )
+        return document
+
+    @staticmethod
+    def _check_etag(document: dict[str, Any], etag: str | None, match_condition: MatchConditions | None) -> None:
+        if etag and match_condition == MatchConditions.IfNotModified and document.get("_etag") != etag:
+            raise _error(
+                exceptions.CosmosAccessConditionFailedError,
+                412,
+                "Operation cannot be performed because one of the specified precondition is not met",
+                NOT_FOUND_CHARGE,
+            )
+
+    # Point operations
+
+    async def create_item(
+        self, body: dict[str, Any], response_hook: ResponseHook | None = None, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Create a document; 409 if the ID already exists in its partition."""
+        await self.simulate_latency()
+        partition_key = self._partition_key_of(body)
+        partition = self._partitions.setdefault(partition_key, {})
+        if body["id"] in partition:
+            raise _error(
+                exceptions.CosmosResourceExistsError,
+                409,
+                "Entity with the specified id already exists in the system",
+                CREATE_CHARGE_PER_KB,
+            )
+
+        stored = partition[body["id"]] = self._stamp(body)
+        self.report(response_hook, CREATE_CHARGE_PER_KB * _document_kb(stored), stored)
+        return copy.deepcopy(stored)
+
+    async def read_item(
+        self,
+        item: str,
+        partition_key: str,
+        etag: str | None = None,
+        match_condition: MatchConditions | None = None,
+        response_hook: ResponseHook | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Point-read a document; 404 if it does not exist.
+
+        With match_condition IfModified and the current ETag, answers like a 304:
+        an empty body, as the SDK returns for Not Modified.
+        """
+        await self.simulate_latency()
+        document = self._find(item, partition_key)
+        if etag and match_condition == MatchConditions.IfModified and document.get("_etag") == etag:
+            self.report(response_hook, NOT_MODIFIED_CHARGE, None)
+            return {}
+        self.report(response_hook, READ_CHARGE_PER_KB * _document_kb(document), document)
+        return copy.deepcopy(document)
+
+    async def read_items(
+        self, items: list[tuple[str, str]], response_hook: ResponseHook | None = None, **kwargs: Any
+    ) -> list[dict[str, Any]]:
+        """Read many (id, partition key) pairs in one call; missing documents are omitted."""
+        await self.simulate_latency()
+        found = []
+        for item, partition_key in items:
+            document = self._partitions.get(partition_key, {}).get(item)
+            if document is not None:
+                found.append(copy.deepcopy(document))
+
+        charge = sum(READ_CHARGE_PER_KB * _document_kb(document) for document in found) or NOT_FOUND_CHARGE
+        self.report(response_hook, charge, found, item_count=len(found))
+        return found
+
+    async def replace_item(
+        self,
+        item: str,
+        body: dict[str, Any],
+        etag: str | None = None,
+        match_condition: MatchConditions | None = None,
+        response_hook: ResponseHook | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Replace a document, optionally only if its ETag still matches."""
+        await self.simulate_latency()
+        partition_key = self._partition_key_of(body)
+        if body["id"] != item:
+            raise _bad_request("The id in the body does not match the item being replaced")
+        document = self._find(item, partition_key)
+        self._check_etag(document, etag, match_condition)
+
+        stored = self._partitions[partition_key][item] = self._stamp(body)
+        self.report(response_hook, REPLACE_CHARGE_PER_KB * _document_kb(stored), stored)
+        return copy.deepcopy(stored)
+
+    async def upsert_item(
+        self,
+        body: dict[str, Any],
+        etag: str | None = None,
+        match_condition: MatchConditions | None = None,
+        response_hook: ResponseHook | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Create or replace a document."""
+        await self.simulate_latency()
+        partition_key = self._partition_key_of(body)
+        partition = self._partitions.setdefault(partition_key, {})
+        existing = partition.get(body["id"])
+        if existing is not None:
+            self._check_etag(existing, etag, match_condition)
+
+        stored = partition[body["id"]] = self._stamp(body)
+        charge_per_kb = REPLACE_CHARGE_PER_KB if existing is not None else CREATE_CHARGE_PER_KB
+        self.report(response_hook, charge_per_kb * _document_kb(stored), stored)
+        return copy.deepcopy(stored)
+
+    async def delete_item(
+        self,
+        item: str,
+        partition_key: str,
+        etag: str | None = None,
+        match_condition: MatchConditions | None = None,
+        response_hook: ResponseHook | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Delete a document; 404 if it does not exist."""
+        await self.simulate_latency()
+        document = self._find(item, partition_key)
+        self._check_etag(document, etag, match_condition)
+
+        del self._partitions[partition_key][item]
+        if not self._partitions[partition_key]:
+            del self._partitions[partition_key]
+        self.report(response_hook, DELETE_CHARGE, None)
+
+    async def patch_item(
+        self,
+        item: str,
+        partition_key: str,
+        patch_operations: list[dict[str, Any]],
+        filter_predicate: str | None = None,
+        etag: str | None = None,
+        match_condition: MatchConditions | None = None,
+        response_hook: ResponseHook | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Apply patch operations atomically, subject to an optional predicate and ETag."""
+        await self.simulate_latency()
+        document = self._find(item, partition_key)
+        self._check_etag(document, etag, match_condition)
+
+        patched = self._patched(document, patch_operations, filter_predicate)
+        stored = self._partitions[partition_key][item] = self._stamp(patched)
+        self.report(response_hook, REPLACE_CHARGE_PER_KB * _document_kb(stored), stored)
+        return copy.deepcopy(stored)
+
+    def _patched(
+        self, document: dict[str, Any], patch_operations: list[dict[str, Any]], filter_predicate: str | None
+    ) -> dict[str, Any]:
+        if filter_predicate:
+            try:
+                alias, condition = parse_predicate(filter_predicate)
+            except QuerySyntaxError as e:
+                raise _bad_request(f"Filter predicate is not supported: {e}") from e
+            if condition.evaluate({alias: document}, {}) is not True:
+                raise _error(
+                    exceptions.CosmosAccessConditionFailedError,
+                    412,
+                    "Precondition failed: the filter predicate did not match",
+                    NOT_FOUND_CHARGE,
+                )
+
+        patched = copy.deepcopy(document)
+        for operation in patch_operations:
+            _apply_patch(patched, operation)
+        if patched.get("id") != document["id"] or patched.get(self.partition_key_field) != document.get(
+            self.partition_key_field
+        ):
+            raise _bad_request("Patch cannot change the id or partition key")
+        return patched
+
+    # Queries
+
+    def query_items(
+        self,
+        query: str,
+        parameters: list[dict[str, Any]] | None = None,
+        partition_key: str | None = None,
+        enable_cross_partition_query: bool | None = None,
+        max_item_count: int | None = None,
+        response_hook: ResponseHook | None = None,
+        **kwargs: Any,
+    ) -> MemoryQueryIterable:
+        """Start a query; results are produced lazily, page by page."""
+        if partition_key is None and not enable_cross_partition_query:
+            raise _bad_request("Cross partition query is required but disabled")
+        return MemoryQueryIterable(self, query, parameters, partition_key, max_item_count, response_hook)
+
+    def query_items_change_feed(
+        self,
+        start_time: str | None = None,
+        continuation: str | None = None,
+        max_item_count: int | None = None,
+        response_hook: ResponseHook | None = None,
+        **kwargs: Any,
+    ) -> MemoryChangeFeedIterable:
+        """Read the latest version of each changed document in write order ("Now" skips existing ones)."""
+        if continuation:
+            start = int(continuation)
+        else:
+            start = self._lsn if start_time == "Now" else 0
+        page_size = max_item_count if max_item_count and max_item_count > 0 else DEFAULT_PAGE_SIZE
+        return MemoryChangeFeedIterable(self, start, page_size, response_hook)
+
+    # Transactional batch
+
+    async def execute_item_batch(
+        self,
+        batch_operations: list[tuple[str, tuple[Any, ...]]],
+        partition_key: str,
+        response_hook: ResponseHook | None = None,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Run operations against one logical partition atomically.
+
+        Raises:
+            CosmosBatchOperationError: If any operation fails (nothing is committed)
+        """
+        await self.simulate_latency()
+        working = copy.deepcopy(self._partitions.get(partition_key, {}))
+        responses: list[dict[str, Any]] = []
+        charge = 0.0
+
+        for index, (kind, args) in enumerate(batch_operations):
+            try:
+                response, cost = self._batch_step(working, partition_key, kind, args)
+            except exceptions.CosmosHttpResponseError as e:
+                failed: list[dict[str, int | None]] = [{"statusCode": 424} for _ in batch_operations]
+                failed[index] = {"statusCode": e.status_code}
+                raise exceptions.CosmosBatchOperationError(
+                    error_index=index,
+                    headers={REQUEST_CHARGE_HEADER: f"{charge:.2f}"},
+                    status_code=e.status_code,
+                    message=f"There was an error in the transactional batch on index {index}. {e.message}",
+                    operation_responses=failed,
+                ) from e
+            responses.append(response)
+            charge += cost
+
+        if working:
+            self._partitions[partition_key] = working
+        else:
+            self._partitions.pop(partition_key, None)
+
+        self.report(response_hook, charge, responses)
+        return copy.deepcopy(responses)
+
+    def _batch_step(
+        self, partition: dict[str, dict[str, Any]], partition_key: str, kind: str, args: tuple[Any, ...]
+    ) -> tuple[dict[str, Any], float]:
+        """Apply one batch operation to the working copy of a partition."""
+        if kind in ("create", "upsert", "replace"):
+            body = args[-1]
+            if self._partition_key_of(body) != partition_key:
+                raise _bad_request("Batch operation targets a different partition")
+            existing = partition.get(body["id"])
+            if kind == "create" and existing is not None:
+                raise _error(exceptions.CosmosResourceExistsError, 409, "Conflict", 0)
+            if kind == "replace" and existing is None:
+                raise _error(exceptions.CosmosResourceNotFoundError, 404, "Not found", 0)
+            stored = partition[body["id"]] = self._stamp(body)
+            charge_per_kb = CREATE_CHARGE_PER_KB if existing is None else REPLACE_CHARGE_PER_KB
+            status = 201 if existing is None else 200
+            return {"statusCode": status, "resourceBody": copy.deepcopy(stored)}, charge_per_kb * _document_kb(stored)
+
+        item = args[0]
+        if item not in partition:
+            raise _error(exceptions.CosmosResourceNotFoundError, 404, "Not found", 0)
+        if kind == "read":
+            return {"statusCode": 200, "resourceBody": copy.deepcopy(partition[item])}, READ_CHARGE_PER_KB
+        if kind == "delete":
+            del partition[item]
+            return {"statusCode": 204}, DELETE_CHARGE
+        if kind == "patch":
+            stored = partition[item] = self._stamp(self._patched(partition[item], args[1], None))
+            return {"statusCode": 200, "resourceBody": copy.deepcopy(stored)}, REPLACE_CHARGE_PER_KB
+        raise _bad_request(f"Unsupported batch operation {kind!r}")
@@ -0,0 +1,756 @@
+"""
+In-Memory Cosmos SQL
+
+Parser and evaluator for the subset of the Cosmos DB SQL dialect used by the
+services, for the in-memory container. Follows Cosmos semantics where they
+matter for results: missing properties are undefined, comparisons across types
+are undefined, and WHERE keeps only rows that evaluate to true.
+
+Supported:
+    SELECT [DISTINCT] [TOP n] * | VALUE expr | expr [AS name], ...
+    FROM c [JOIN v IN expr ...] [WHERE expr] [GROUP BY expr, ...]
+    [ORDER BY expr [ASC|DESC], ...] [OFFSET n LIMIT m]
+    Aggregates COUNT, MIN, MAX, SUM, AVG; AND/OR/NOT; =, !=, <>, <, <=, >, >=;
+    IN (...); + and -; @parameters; property paths (c.a.b, c["a"], c.a[0]);
+    ARRAY_CONTAINS, ARRAY_LENGTH, IS_DEFINED, IS_NULL, LOWER, UPPER, CONCAT, CONTAINS,
+    STARTSWITH, ENDSWITH, ObjectToArray. Patch filter predicates ("FROM c WHERE expr").
+"""
+
+import functools
+import json
+import re
+from collections.abc import Callable
+from typing import Any
+
+
+class QuerySyntaxError(ValueError):
+    """The query uses syntax outside the supported subset."""
+
+
+class _Undefined:
+    """Cosmos 'undefined': the value of a missing property."""
+
+    _instance = None
+
+    def __new__(cls) -> "_Undefined":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __repr__(self) -> str:
+        return "undefined"
+
+
+UNDEFINED = _Undefined()
+
+AGGREGATES = frozenset({"COUNT", "MIN", "MAX", "SUM", "AVG"})
+
+KEYWORDS = frozenset(
+    {
+        "SELECT",
+        "DISTINCT",
+        "TOP",
+        "VALUE",
+        "AS",
+        "FROM",
+        "JOIN",
+        "WHERE",
+        "GROUP",
+        "AND",
+        "OR",
+        "NOT",
+        "IN",
+        "ORDER",
+        "BY",
+        "ASC",
+        "DESC",
+        "OFFSET",
+        "LIMIT",
+        "TRUE",
+        "FALSE",
+        "NULL",
+        "UNDEFINED",
+    }
+)
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>\s+)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<param>@\w+)
+  | (?P<ident>[A-Za-z_]\w*)
+  | (?P<op><=|>=|!=|<>|=|<|>|\(|\)|,|\.|\[|\]|\*|-|\+)
+    """,
+    re.VERBOSE,
+)
+
+_STRING_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "/": "/", "\\": "\\", "'": "'", '"': '"'}
+
+
+def _unescape(literal: str) -> str:
+    """Decode a quoted SQL string literal."""
+    body = literal[1:-1]
+    return re.sub(
+        r"\\(u[0-9a-fA-F]{4}|.)",
+        lambda m: chr(int(m.group(1)[1:], 16)) if m.group(1)[0] == "u" else _STRING_ESCAPES.get(m.group(1), m.group(1)),
+        body,
+    )
+
+
+def _tokenize(text: str) -> list[tuple[str, Any]]:
+    tokens: list[tuple[str, Any]] = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if not match:
+            raise QuerySyntaxError(f"Unexpected character {text[position]!r} at {position}")
+        position = match.end()
+        # Every alternative of the pattern is a named group
+        kind = match.lastgroup or ""
+        value = match.group()
+        if kind == "ws":
+            continue
+        if kind == "string":
+            tokens.append(("literal", _unescape(value)))
+        elif kind == "number":
+            number = float(value)
+            tokens.append(("literal", int(number) if number.is_integer() and "." not in value else number))
+        elif kind == "ident" and value.upper() in KEYWORDS:
+            tokens.append(("kw", value.upper()))
+        else:
+            tokens.append((kind, value))
+    tokens.append(("end", None))
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Value semantics
+# ---------------------------------------------------------------------------
+
+
+def _type_rank(value: Any) -> int:
+    """Cosmos cross-type ordering: undefined < null < boolean < number < string < array < object."""
+    if value is UNDEFINED:
+        return 0
+    if value is None:
+        return 1
+    if isinstance(value, bool):
+        return 2
+    if isinstance(value, int | float):
+        return 3
+    if isinstance(value, str):
+        return 4
+    if isinstance(value, list):
+        return 5
+    return 6
+
+
+def _comparable(left: Any, right: Any) -> bool:
+    rank = _type_rank(left)
+    return rank == _type_rank(right) and rank not in (0, 5, 6)
+
+
+def _compare(op: str, left: Any, right: Any) -> Any:
+    if op in ("=", "!=", "<>"):
+        if left is UNDEFINED or right is UNDEFINED or _type_rank(left) != _type_rank(right):
+            return UNDEFINED
+        return (left == right) if op == "=" else (left != right)
+    if not _comparable(left, right):
+        return UNDEFINED
+    if op == "<":
+        return left < right
+    if op == "<=":
+        return left <= right
+    if op == ">":
+        return left > right
+    return left >= right
+
+
+def _and(left: Any, right: Any) -> Any:
+    if left is False or right is False:
+        return False
+    if left is True and right is True:
+        return True
+    return UNDEFINED
+
+
+def _or(left: Any, right: Any) -> Any:
+    if left is True or right is True:
+        return True
+    if left is False and right is False:
+        return False
+    return UNDEFINED
+
+
+def _contains_partial(item: Any, value: Any) -> bool:
+    if isinstance(item, dict) and isinstance(value, dict):
+        return all(key in item and item[key] == expected for key, expected in value.items())
+    return item == value and _type_rank(item) == _type_rank(value)
+
+
+def _array_contains(array: Any, value: Any, partial: Any = False) -> Any:
+    if not isinstance(array, list) or value is UNDEFINED:
+        return UNDEFINED
+    if partial is True:
+        return any(_contains_partial(item, value) for item in array)
+    return any(item == value and _type_rank(item) == _type_rank(value) for item in array)
+
+
+def _string_fn(fn: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args: Any) -> Any:
+        if not all(isinstance(arg, str) for arg in args):
+            return UNDEFINED
+        return fn(*args)
+
+    return wrapper
+
+
+SCALAR_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "ARRAY_CONTAINS": _array_contains,
+    "ARRAY_LENGTH": lambda array: len(array) if isinstance(array, list) else UNDEFINED,
+    "IS_DEFINED": lambda value: value is not UNDEFINED,
+    "IS_NULL": lambda value: value is None,
+    "LOWER": _string_fn(str.lower),
+    "UPPER": _string_fn(str.upper),
+    "CONCAT": _string_fn(lambda *parts: "".join(parts)),
+    "CONTAINS": _string_fn(lambda text, sub: sub in text),
+    "STARTSWITH": _string_fn(lambda text, prefix: text.startswith(prefix)),
+    "ENDSWITH": _string_fn(lambda text, suffix: text.endswith(suffix)),
+    "OBJECTTOARRAY": lambda value: (
+        [{"k": key, "v": item} for key, item in value.items()] if isinstance(value, dict) else UNDEFINED
+    ),
+}
+
+
+def _aggregate(name: str, values: list[Any]) -> Any:
+    if name == "COUNT":
+        return sum(1 for value in values if value is not UNDEFINED)
+    if name in ("MIN", "MAX"):
+        candidates = [value for value in values if value is not UNDEFINED]
+        if not candidates:
+            return UNDEFINED
+        if any(not _comparable(candidates[0], value) for value in candidates):
+            return UNDEFINED
+        return min(candidates) if name == "MIN" else max(candidates)
+    numbers = [value for value in values if isinstance(value, int | float) and not isinstance(value, bool)]
+    if len(numbers) != len(values) or not numbers:
+        return UNDEFINED if name == "AVG" or len(numbers) != len(values) else 0
+    return sum(numbers) if name == "SUM" else sum(numbers) / len(numbers)
+
+
+# ---------------------------------------------------------------------------
+# Expression nodes
+# ---------------------------------------------------------------------------
+
+Env = dict[str, Any]
+Evaluator = Callable[[Env, dict[str, Any]], Any]
+
+
+class Expression:
+    """A compiled scalar expression."""
+
+    def __init__(self, evaluate: Evaluator, name: str | None = None, aggregate: tuple[str, Evaluator] | None = None):
+        self.evaluate = evaluate
+        self.name = name
+        self.aggregate = aggregate
+
+
+def _literal(value: Any) -> Expression:
+    return Expression(lambda env, params: value)
+
+
+def _param(name: str) -> Expression:
+    def evaluate(env: Env, params: dict[str, Any]) -> Any:
+        if name not in params:
+            raise QuerySyntaxError(f"Missing value for parameter {name}")
+        return params[name]
+
+    return Expression(evaluate)
+
+
+def _alias(alias: str) -> Expression:
+    return Expression(lambda env, params: env.get(alias, UNDEFINED), name=alias)
+
+
+def _member(base: Expression, key: Expression | str) -> Expression:
+    def evaluate(env: Env, params: dict[str, Any]) -> Any:
+        container = base.evaluate(env, params)
+        index = key if isinstance(key, str) else key.evaluate(env, params)
+        if isinstance(container, dict) and isinstance(index, str):
+            return container.get(index, UNDEFINED)
+        if isinstance(container, list) and isinstance(index, int) and not isinstance(index, bool):
+            return container[index] if 0 <= index < len(container) else UNDEFINED
+        return UNDEFINED
+
+    return Expression(evaluate, name=key if isinstance(key, str) else None)
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+
+class ParsedQuery:
+    """A compiled SELECT statement."""
+
+    def __init__(self) -> None:
+        self.alias = "c"
+        self.distinct = False
+        self.top: int | None = None
+        self.select_star = False
+        self.select_value: Expression | None = None
+        self.select_items: list[tuple[str, Expression]] = []
+        self.joins: list[tuple[str, Expression]] = []
+        self.where: Expression | None = None
+        self.group_by: list[Expression] = []
+        self.order_by: list[tuple[Expression, bool]] = []
+        self.offset: int | None = None
+        self.limit: int | None = None
+
+    @property
+    def is_aggregate(self) -> bool:
+        """Whether the select list is made of aggregates (one result row)."""
+        if self.select_value is not None:
+            return self.select_value.aggregate is not None
+        return bool(self.select_items) and all(expr.aggregate is not None for _, expr in self.select_items)
+
+    def matches(self, document: dict[str, Any], params: dict[str, Any]) -> bool:
+        """Whether a document passes the WHERE clause."""
+        return any(self._passes(row, params) for row in self._expand(document, params))
+
+    def _expand(self, document: dict[str, Any], params: dict[str, Any]) -> list[Env]:
+        """Rows of one document: itself, or its cross product with each JOIN array."""
+        rows = [{self.alias: document}]
+        for alias, source in self.joins:
+            joined: list[Env] = []
+            for row in rows:
+                items = source.evaluate(row, params)
+                if isinstance(items, list):
+                    joined.extend({**row, alias: item} for item in items)
+            rows = joined
+        return rows
+
+    def _passes(self, row: Env, params: dict[str, Any]) -> bool:
+        return self.where is None or self.where.evaluate(row, params) is True
+
+    def execute(self, documents: list[dict[str, Any]], params: dict[str, Any]) -> list[Any]:
+        """
+        Run the query over a set of documents.
+
+        Args:
+            documents: Candidate documents (already scoped to the target partitions)
+            params: Parameter values keyed by name (including the @)
+
+        Returns:
+            Result rows in order
+        """
+        rows = [row for document in documents for row in self._expand(document, params) if self._passes(row, params)]
+
+        if self.group_by:
+            return self._group_rows(rows, params)
+        if self.is_aggregate:
+            return self._aggregate_rows(rows, params)
+
+        for expression, descending in reversed(self.order_by):
+            rows.sort(key=functools.cmp_to_key(_order_comparator(expression, params)), reverse=descending)
+
+        results = [self._project(row, params) for row in rows]
+        results = [result for result in results if result is not UNDEFINED]
+
+        if self.distinct:
+            seen = set()
+            unique = []
+            for result in results:
+                fingerprint = json.dumps(result, sort_keys=True)
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    unique.append(result)
+            results = unique
+
+        if self.offset is not None:
+            results = results[self.offset :]
+        if self.limit is not None:
+            results = results[: self.limit]
+        if self.top is not None:
+            results = results[: self.top]
+        return results
+
+    def _project(self, row: Env, params: dict[str, Any]) -> Any:
+        if self.select_star:
+            return row[self.alias] if not self.joins else row
+        if self.select_value is not None:
+            return self.select_value.evaluate(row, params)
+        projected = {}
+        for name, expression in self.select_items:
+            value = expression.evaluate(row, params)
+            if value is not UNDEFINED:
+                projected[name] = value
+        return projected
+
+    def _aggregate_rows(self, rows: list[Env], params: dict[str, Any]) -> list[Any]:
+        def reduce(expression: Expression) -> Any:
+            if expression.aggregate is None:
+                # Group keys: every row of a group has the same value
+                return expression.evaluate(rows[0], params) if rows else UNDEFINED
+            name, argument = expression.aggregate
+            return _aggregate(name, [argument(row, params) for row in rows])
+
+        if self.select_value is not None:
+            value = reduce(self.select_value)
+            return [] if value is UNDEFINED else [value]
+
+        result = {}
+        for name, expression in self.select_items:
+            value = reduce(expression)
+            if value is not UNDEFINED:
+                result[name] = value
+        return [result]
+
+    def _group_rows(self, rows: list[Env], params: dict[str, Any]) -> list[Any]:
+        groups: dict[str, list[Env]] = {}
+        for row in rows:
+            key = json.dumps([_group_key(expression.evaluate(row, params)) for expression in self.group_by])
+            groups.setdefault(key, []).append(row)
+
+        results = []
+        for group in groups.values():
+            results.extend(self._aggregate_rows(group, params))
+        return results
+
+
+def _group_key(value: Any) -> Any:
+    # undefined forms its own group, distinct from null
+    return {"$undefined": True} if value is UNDEFINED else value
+
+
+def _order_comparator(expression: Expression, params: dict[str, Any]) -> Callable[[Env, Env], int]:
+    def compare(left: Env, right: Env) -> int:
+        a = expression.evaluate(left, params)
+        b = expression.evaluate(right, params)
+        rank_a, rank_b = _type_rank(a), _type_rank(b)
+        if rank_a != rank_b:
+            return -1 if rank_a < rank_b else 1
+        if rank_a in (0, 1, 5, 6) or a == b:
+            return 0
+        return -1 if a < b else 1
+
+    return compare
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.alias = "c"
+        self.aliases = {"c"}
+
+    # Token helpers
+
+    def peek(self, offset: int = 0) -> tuple[str, Any]:
+        return self.tokens[self.position + offset]
+
+    def advance(self) -> tuple[str, Any]:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def accept(self, kind: str, value: Any = None) -> bool:
+        token_kind, token_value = self.peek()
+        if token_kind == kind and (value is None or token_value == value):
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, kind: str, value: Any = None) -> Any:
+        token_kind, token_value = self.advance()
+        if token_kind != kind or (value is not None and token_value != value):
+            raise QuerySyntaxError(f"Expected {value or kind}, found {token_value!r}")
+        return token_value
+
+    def expect_integer(self) -> int:
+        value = self.expect("literal")
+        if not isinstance(value, int):
+            raise QuerySyntaxError(f"Expected an integer, found {value!r}")
+        return value
+
+    # Statements
+
+    def parse_query(self) -> ParsedQuery:
+        query = ParsedQuery()
+        self.expect("kw", "SELECT")
+        query.distinct = self.accept("kw", "DISTINCT")
+        if self.accept("kw", "TOP"):
+            query.top = self.expect_integer()
+
+        # The select list refers to the FROM alias, so parse FROM first and come back
+        select_start = self.position
+        self._skip_to_from()
+        self.expect("kw", "FROM")
+        self.alias = query.alias = self.expect("ident")
+        self.aliases = {self.alias}
+        while self.accept("kw", "JOIN"):
+            alias = self.expect("ident")
+            self.expect("kw", "IN")
+            query.joins.append((alias, self.parse_expression()))
+            self.aliases.add(alias)
+        after_from = self.position
+
+        self.position = select_start
+        if self.accept("op", "*"):
+            query.select_star = True
+        elif self.accept("kw", "VALUE"):
+            query.select_value = self.parse_expression()
+        else:
+            query.select_items = self._parse_select_items()
+        self.expect("kw", "FROM")
+        self.position = after_from
+
+        if self.accept("kw", "WHERE"):
+            query.where = self.parse_expression()
+        if self.accept("kw", "GROUP"):
+            self.expect("kw", "BY")
+            query.group_by = [self.parse_expression()]
+            while self.accept("op", ","):
+                query.group_by.append(self.parse_expression())
+        if self.accept("kw", "ORDER"):
+            self.expect("kw", "BY")
+            query.order_by = self._parse_order_by()
+        if self.accept("kw", "OFFSET"):
+            query.offset = self.expect_integer()
+            self.expect("kw", "LIMIT")
+            query.limit = self.expect_integer()
+        self.expect("end")
+        return query
+
+    def parse_predicate(self) -> tuple[str, Expression]:
+        self.expect("kw", "FROM")
+        self.alias = self.expect("ident")
+        self.aliases = {self.alias}
+        self.expect("kw", "WHERE")
+        expression = self.parse_expression()
+        self.expect("end")
+        return self.alias, expression
+
+    def _skip_to_from(self) -> None:
+        depth = 0
+        while True:
+            kind, value = self.peek()
+            if kind == "end":
+                raise QuerySyntaxError("Missing FROM clause")
+            if kind == "op" and value in ("(", "["):
+                depth += 1
+            elif kind == "op" and value in (")", "]"):
+                depth -= 1
+            elif kind == "kw" and value == "FROM" and depth == 0:
+                return
+            self.position += 1
+
+    def _parse_select_items(self) -> list[tuple[str, Expression]]:
+        items: list[tuple[str, Expression]] = []
+        while True:
+            expression = self.parse_expression()
+            if self.accept("kw", "AS"):
+                name = self.expect("ident")
+            elif self.peek()[0] == "ident":
+                name = self.advance()[1]
+            else:
+                name = expression.name if expression.name and expression.name not in self.aliases else None
+            items.append((name or f"${len(items) + 1}", expression))
+            if not self.accept("op", ","):
+                return items
+
+    def _parse_order_by(self) -> list[tuple[Expression, bool]]:
+        order = []
+        while True:
+            expression = self.parse_expression()
+            descending = False
+            if self.accept("kw", "DESC"):
+                descending = True
+            else:
+                self.accept("kw", "ASC")
+            order.append((expression, descending))
+            if not self.accept("op", ","):
+                return order
+
+    # Expressions (lowest to highest precedence)
+
+    def parse_expression(self) -> Expression:
+        return self._parse_or()
+
+    def _parse_or(self) -> Expression:
+        left = self._parse_and()
+        while self.accept("kw", "OR"):
+            right = self._parse_and()
+            left = self._binary(_or, left, right)
+        return left
+
+    def _parse_and(self) -> Expression:
+        left = self._parse_not()
+        while self.accept("kw", "AND"):
+            right = self._parse_not()
+            left = self._binary(_and, left, right)
+        return left
+
+    def _parse_not(self) -> Expression:
+        if self.accept("kw", "NOT"):
+            operand = self._parse_not()
+
+            def evaluate(env: Env, params: dict[str, Any]) -> Any:
+                value = operand.evaluate(env, params)
+                return (not value) if isinstance(value, bool) else UNDEFINED
+
+            return Expression(evaluate)
+        return self._parse_comparison()
+
+    def _parse_comparison(self) -> Expression:
+        left = self._parse_additive()
+        kind, value = self.peek()
+
+        if kind == "op" and value in ("=", "!=", "<>", "<", "<=", ">", ">="):
+            self.advance()
+            right = self._parse_additive()
+            return self._binary(lambda a, b: _compare(value, a, b), left, right)
+
+        negate = kind == "kw" and value == "NOT" and self.peek(1) == ("kw", "IN")
+        if negate:
+            self.advance()
+        if self.accept("kw", "IN"):
+            self.expect("op", "(")
+            candidates = [self.parse_expression()]
+            while self.accept("op", ","):
+                candidates.append(self.parse_expression())
+            self.expect("op", ")")
+
+            def evaluate(env: Env, params: dict[str, Any]) -> Any:
+                needle = left.evaluate(env, params)
+                if needle is UNDEFINED:
+                    return UNDEFINED
+                found = any(_compare("=", needle, c.evaluate(env, params)) is True for c in candidates)
+                return not found if negate else found
+
+            return Expression(evaluate)
+        return left
+
+    def _parse_additive(self) -> Expression:
+        left = self._parse_unary()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            op = self.advance()[1]
+            right = self._parse_unary()
+
+            def arithmetic(a: Any, b: Any, op: str = op) -> Any:
+                if _type_rank(a) != 3 or _type_rank(b) != 3:
+                    return UNDEFINED
+                return a + b if op == "+" else a - b
+
+            left = self._binary(arithmetic, left, right)
+        return left
+
+    def _parse_unary(self) -> Expression:
+        if self.accept("op", "-"):
+            operand = self._parse_unary()
+
+            def evaluate(env: Env, params: dict[str, Any]) -> Any:
+                value = operand.evaluate(env, params)
+                return -value if _type_rank(value) == 3 else UNDEFINED
+
+            return Expression(evaluate)
+        return self._parse_postfix(self._parse_primary())
+
+    def _parse_postfix(self, expression: Expression) -> Expression:
+        while True:
+            if self.accept("op", "."):
+                expression = _member(expression, self.expect("ident"))
+            elif self.accept("op", "["):
+                key = self.parse_expression()
+                self.expect("op", "]")
+                expression = _member(expression, key)
+            else:
+                return expression
+
+    def _parse_primary(self) -> Expression:
+        kind, value = self.advance()
+
+        if kind == "literal":
+            return _literal(value)
+        if kind == "param":
+            return _param(value)
+        if kind == "kw" and value in ("TRUE", "FALSE"):
+            return _literal(value == "TRUE")
+        if kind == "kw" and value == "NULL":
+            return _literal(None)
+        if kind == "kw" and value == "UNDEFINED":
+            return _literal(UNDEFINED)
+        if kind == "op" and value == "(":
+            expression = self.parse_expression()
+            self.expect("op", ")")
+            return expression
+        if kind == "op" and value == "[":
+            items = []
+            if not self.accept("op", "]"):
+                items.append(self.parse_expression())
+                while self.accept("op", ","):
+                    items.append(self.parse_expression())
+                self.expect("op", "]")
+            return Expression(lambda env, params: [item.evaluate(env, params) for item in items])
+        if kind == "ident" and self.peek() == ("op", "("):
+            return self._parse_call(value.upper())
+        if kind == "ident":
+            if value not in self.aliases:
+                raise QuerySyntaxError(f"Unknown identifier {value!r}")
+            return _alias(value)
+        raise QuerySyntaxError(f"Unexpected token {value!r}")
+
+    def _parse_call(self, name: str) -> Expression:
+        self.expect("op", "(")
+        arguments = []
+        if not self.accept("op", ")"):
+            arguments.append(self.parse_expression())
+            while self.accept("op", ","):
+                arguments.append(self.parse_expression())
+            self.expect("op", ")")
+
+        if name in AGGREGATES:
+            if len(arguments) != 1:
+                raise QuerySyntaxError(f"{name} takes one argument")
+            return Expression(lambda env, params: UNDEFINED, aggregate=(name, arguments[0].evaluate))
+
+        function = SCALAR_FUNCTIONS.get(name)
+        if function is None:
+            raise QuerySyntaxError(f"Unsupported function {name}")
+
+        def evaluate(env: Env, params: dict[str, Any]) -> Any:
+            return function(*(argument.evaluate(env, params) for argument in arguments))
+
+        return Expression(evaluate)
+
+    @staticmethod
+    def _binary(operator: Callable[[Any, Any], Any], left: Expression, right: Expression) -> Expression:
+        return Expression(lambda env, params: operator(left.evaluate(env, params), right.evaluate(env, params)))
+
+
+@functools.lru_cache(maxsize=512)
+def parse_query(text: str) -> ParsedQuery:
+    """
+    Parse a SELECT statement (cached by query text).
+
+    Raises:
+        QuerySyntaxError: If the query is outside the supported subset
+    """
+    return _Parser(text).parse_query()
+
+
+@functools.lru_cache(maxsize=512)
+def parse_predicate(text: str) -> tuple[str, Expression]:
+    """
+    Parse a patch filter predicate ("FROM c WHERE expr").
+
+    Returns:
+        The alias and the compiled condition
+    """
+    return _Parser(text).parse_predicate()
+
+
+def bind_parameters(parameters: list[dict[str, Any]] | None) -> dict[str, Any]:
+    """Convert SDK-style [{"name": "@x", "value": 1}] parameters to a lookup."""
+    return {parameter["name"]: parameter["value"] for parameter in parameters or []}
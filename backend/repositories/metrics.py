@@ -0,0 +1,228 @@
+"""
+Repository Metrics
+
+Request charge (RU), latency and throttling accounting for Cosmos DB calls.
+Every repository operation is recorded twice: in process-wide aggregates keyed
+by operation name, and in the summary of the request currently being served.
+"""
+
+import logging
+from contextvars import ContextVar, Token
+from datetime import UTC, datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+ITEM_COUNT_HEADER = "x-ms-item-count"
+
+
+class ChargeRecorder:
+    """
+    Response hook that accumulates the cost of one repository call.
+
+    Passed to the SDK as response_hook; queries invoke it once per page, so the
+    totals cover every round trip the call made.
+    """
+
+    def __init__(self) -> None:
+        self.request_charge = 0.0
+        self.item_count: int | None = None
+        self.throttled = 0
+        self.pages = 0
+
+    def __call__(self, headers: Any, result: Any) -> None:
+        self.pages += 1
+        self.request_charge += float(headers.get(REQUEST_CHARGE_HEADER) or 0)
+        if headers.get(ITEM_COUNT_HEADER) is not None:
+            self.item_count = (self.item_count or 0) + int(headers[ITEM_COUNT_HEADER])
+
+    def note_throttle(self) -> None:
+        """Count a 429 that was retried."""
+        self.throttled += 1
+
+
+class OperationStats:
+    """Running totals for one operation name."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.throttled = 0
+        self.cross_partition = 0
+        self.request_charge = 0.0
+        self.latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.items = 0
+        self.coalesced = 0
+
+    def add(
+        self, request_charge: float, latency_ms: float, items: int, cross_partition: bool, throttled: int, failed: bool
+    ) -> None:
+        """Add one call to the totals."""
+        self.count += 1
+        self.errors += int(failed)
+        self.throttled += throttled
+        self.cross_partition += int(cross_partition)
+        self.request_charge += request_charge
+        self.latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self.items += items
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize totals and per-call averages."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "cross_partition": self.cross_partition,
+            "request_charge": round(self.request_charge, 2),
+            "avg_request_charge": round(self.request_charge / self.count, 2) if self.count else 0.0,
+            "avg_latency_ms": round(self.latency_ms / self.count, 2) if self.count else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 2),
+            "items": self.items,
+            "coalesced": self.coalesced,
+        }
+
+
+class RequestSummary:
+    """Cosmos DB usage of one request (HTTP invocation or timer run)."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.operations: dict[str, OperationStats] = {}
+
+    def add(self, operation: str, **kwargs: Any) -> None:
+        """Add one repository call to the summary."""
+        self.operations.setdefault(operation, OperationStats()).add(**kwargs)
+
+    @property
+    def request_charge(self) -> float:
+        """Total RU consumed by the request."""
+        return sum(stats.request_charge for stats in self.operations.values())
+
+    @property
+    def operation_count(self) -> int:
+        """Number of repository calls made by the request."""
+        return sum(stats.count for stats in self.operations.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the summary."""
+        return {
+            "name": self.name,
+            "request_charge": round(self.request_charge, 2),
+            "operation_count": self.operation_count,
+            "operations": {name: stats.to_dict() for name, stats in self.operations.items()},
+        }
+
+
+_current_summary: ContextVar[RequestSummary | None] = ContextVar("cosmos_request_summary", default=None)
+
+
+def begin_request_summary(name: str) -> Token:
+    """
+    Start collecting a summary for the current request.
+
+    Args:
+        name: Request label (usually the function name)
+
+    Returns:
+        Token to pass to end_request_summary
+    """
+    return _current_summary.set(RequestSummary(name))
+
+
+def current_request_summary() -> RequestSummary | None:
+    """Get the summary of the request being served, if one was started."""
+    return _current_summary.get()
+
+
+def end_request_summary(token: Token) -> RequestSummary | None:
+    """
+    Stop collecting the current request summary and log it.
+
+    Args:
+        token: Token returned by begin_request_summary
+
+    Returns:
+        The finished summary
+    """
+    summary = _current_summary.get()
+    _current_summary.reset(token)
+
+    if summary is not None and summary.operation_count:
+        logger.info(
+            f"Cosmos usage for {summary.name}: {summary.request_charge:.2f} RU "
+            f"over {summary.operation_count} operations"
+        )
+    return summary
+
+
+class RepositoryMetrics:
+    """Process-wide Cosmos DB usage aggregated by operation name."""
+
+    def __init__(self) -> None:
+        self._operations: dict[str, OperationStats] = {}
+        self._since = datetime.now(UTC)
+
+    def record(
+        self,
+        operation: str,
+        request_charge: float,
+        latency_ms: float,
+        items: int,
+        cross_partition: bool = False,
+        throttled: int = 0,
+        failed: bool = False,
+    ) -> None:
+        """
+        Record one repository call.
+
+        Args:
+            operation: Operation name (e.g. "read.trip", "query.poll")
+            request_charge: RU consumed across all round trips
+            latency_ms: Wall-clock latency including throttling retries
+            items: Documents read or written
+            cross_partition: Whether the call fanned out across partitions
+            throttled: Number of 429 responses that were retried
+            failed: Whether the call ended in an unexpected error
+        """
+        stats: dict[str, Any] = {
+            "request_charge": request_charge,
+            "latency_ms": latency_ms,
+            "items": items,
+            "cross_partition": cross_partition,
+            "throttled": throttled,
+            "failed": failed,
+        }
+        self._operations.setdefault(operation, OperationStats()).add(**stats)
+
+        summary = _current_summary.get()
+        if summary is not None:
+            summary.add(operation, **stats)
+
+    def record_coalesced(self, operation: str) -> None:
+        """Record a call that joined an identical in-flight call instead of reaching Cosmos DB."""
+        self._operations.setdefault(operation, OperationStats()).coalesced += 1
+
+        summary = _current_summary.get()
+        if summary is not None:
+            summary.operations.setdefault(operation, OperationStats()).coalesced += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get aggregates for every operation, most expensive first."""
+        operations = sorted(self._operations.items(), key=lambda item: item[1].request_charge, reverse=True)
+        return {
+            "since": self._since.isoformat(),
+            "request_charge": round(sum(stats.request_charge for _, stats in operations), 2),
+            "operations": {name: stats.to_dict() for name, stats in operations},
+        }
+
+    def reset(self) -> None:
+        """Clear all aggregates."""
+        self._operations.clear()
+        self._since = datetime.now(UTC)
+
+
+# Singleton instance
+repository_metrics = RepositoryMetrics()
@@ -0,0 +1,191 @@
+"""
+Partition Migration
+
+Moves trip-scoped documents written under the legacy partition keys into
+their trip's partition (see repositories/partitioning.py). Cosmos DB cannot
+change a document's partition key in place, so each document is copied to the
+new key and the old copy is then deleted with an ETag precondition.
+
+Every run selects documents still at a legacy key, so the job needs no
+checkpoint: an interrupted run resumes where it stopped and a finished
+migration reduces to one empty query. A copy that already exists at the new
+key (from an interrupted run) is only overwritten when the legacy copy is
+newer and the copy is unchanged since it was read, and a legacy copy written to
+after it was read is left for the next run.
+Copies record the version they were moved at, so the change feed does not
+report a move as a change. The same stamp tells an untouched copy from one
+written at the new key since; when both copies have changed, the document is
+logged and skipped rather than one side overwriting the other.
+Each run stops early once it has spent its RU budget, so the migration can
+share the container's throughput with live traffic.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, cast
+
+from azure.cosmos import exceptions
+
+from models.documents import BaseDocument, ItineraryDocument, PollDocument, TripDocument
+from repositories.cosmos_repository import ConcurrencyConflictError, cosmos_repo
+from repositories.hydration import hydrator
+from repositories.metrics import (
+    RequestSummary,
+    begin_request_summary,
+    current_request_summary,
+    end_request_summary,
+)
+from repositories.partitioning import trip_partition_key
+
+logger = logging.getLogger(__name__)
+
+MIGRATED_MODELS: dict[str, type[BaseDocument]] = {
+    "trip": TripDocument,
+    "poll": PollDocument,
+    "itinerary": ItineraryDocument,
+}
+
+# Documents whose partition key is not yet their trip's partition
+LEGACY_DOCUMENTS_QUERY = """
+    SELECT * FROM c
+    WHERE (c.entity_type = 'trip' AND c.pk != CONCAT('trip_', c.id))
+    OR ((c.entity_type = 'poll' OR c.entity_type = 'itinerary') AND c.pk != CONCAT('trip_', c.trip_id))
+"""
+
+
+class MigrationRun:
+    """Outcome of one PartitionMigration.run_once call."""
+
+    def __init__(self) -> None:
+        self.batches = 0
+        self.moved = 0
+        self.conflicts = 0
+        self.diverged = 0
+        self.failed = 0
+        self.request_charge = 0.0
+        self.complete = False
+        self.duration_ms = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "batches": self.batches,
+            "moved": self.moved,
+            "conflicts": self.conflicts,
+            "diverged": self.diverged,
+            "failed": self.failed,
+            "request_charge": round(self.request_charge, 2),
+            "complete": self.complete,
+            "duration_ms": round(self.duration_ms, 2),
+        }
+
+
+class PartitionMigration:
+    """Copies legacy trip-scoped documents into their trip's partition, in throttled batches."""
+
+    def __init__(self, batch_size: int = 100, concurrency: int = 5, ru_budget: float = 2000.0) -> None:
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.ru_budget = ru_budget
+
+    @classmethod
+    def from_environment(cls) -> "PartitionMigration":
+        """Build the job from COSMOS_MIGRATION_BATCH_SIZE, _CONCURRENCY and _RU_PER_RUN."""
+        return cls(
+            batch_size=int(os.environ.get("COSMOS_MIGRATION_BATCH_SIZE", "100")),
+            concurrency=int(os.environ.get("COSMOS_MIGRATION_CONCURRENCY", "5")),
+            ru_budget=float(os.environ.get("COSMOS_MIGRATION_RU_PER_RUN", "2000")),
+        )
+
+    async def run_once(self) -> MigrationRun:
+        """
+        Move legacy documents until none are left or the RU budget is spent.
+
+        Returns:
+            Counts for the run; complete is True once no legacy documents remain
+        """
+        run = MigrationRun()
+        started = time.perf_counter()
+
+        # Budget against the invocation's usage summary, or our own outside one
+        summary = current_request_summary()
+        token = None
+        if summary is None:
+            token = begin_request_summary("partition_migration")
+            summary = cast(RequestSummary, current_request_summary())
+        baseline = summary.request_charge
+
+        try:
+            while summary.request_charge - baseline < self.ru_budget:
+                batch = await cosmos_repo.query(query=LEGACY_DOCUMENTS_QUERY, max_items=self.batch_size)
+                if not batch:
+                    run.complete = True
+                    break
+
+                run.batches += 1
+                moved_before = run.moved
+                for start in range(0, len(batch), self.concurrency):
+                    chunk = batch[start : start + self.concurrency]
+                    outcomes = await asyncio.gather(*(self._move(raw) for raw in chunk), return_exceptions=True)
+                    for raw, outcome in zip(chunk, outcomes, strict=True):
+                        if isinstance(outcome, ConcurrencyConflictError):
+                            run.conflicts += 1
+                        elif isinstance(outcome, Exception):
+                            run.failed += 1
+                            logger.error(f"Failed to migrate {raw.get('entity_type')} {raw.get('id')}: {outcome}")
+                        elif outcome:
+                            run.moved += 1
+                        else:
+                            run.diverged += 1
+
+                # Nothing moved: the same batch would be selected again, leave it to the next run
+                if run.moved == moved_before:
+                    break
+        finally:
+            run.request_charge = summary.request_charge - baseline
+            run.duration_ms = (time.perf_counter() - started) * 1000
+            if token is not None:
+                end_request_summary(token)
+
+        logger.info(f"Partition migration run: {run.to_dict()}")
+        return run
+
+    async def _move(self, raw: dict[str, Any]) -> bool:
+        """
+        Copy one document to its trip's partition and delete the legacy copy.
+
+        Returns:
+            False if the copy at the new key was written to since it was made, so both were left in place
+
+        Raises:
+            ConcurrencyConflictError: If the legacy copy changed after it was read
+        """
+        entity_type = raw["entity_type"]
+        document = hydrator.one(MIGRATED_MODELS[entity_type], raw)
+        trip_id = document.trip_id if isinstance(document, PollDocument | ItineraryDocument) else document.id
+        moved = document.model_copy(
+            update={"pk": trip_partition_key(trip_id), "etag": None, "moved_version": document.version}
+        )
+
+        try:
+            await cosmos_repo.create(moved)
+        except exceptions.CosmosResourceExistsError:
+            existing = await cosmos_repo.get_by_id(moved.id, moved.pk, type(moved))
+            if existing is None:
+                await cosmos_repo.create(moved)
+            elif existing.moved_version not in (existing.version, document.version):
+                # Both copies were written to since the interrupted copy was made
+                logger.warning(
+                    f"Skipping {entity_type} {document.id}: the copy at {moved.pk} (version {existing.version}) "
+                    f"diverged from the legacy copy at {document.pk} (version {document.version})"
+                )
+                return False
+            elif existing.version < moved.version:
+                # An interrupted run left an older copy; replace it only if nothing wrote to it since
+                await cosmos_repo.upsert(moved, etag=existing.etag)
+
+        # No entity_type: the pk_index entry now points at the new copy and must stay
+        await cosmos_repo.delete(document.id, document.pk, etag=raw["_etag"])
+        return True
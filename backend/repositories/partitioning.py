@@ -0,0 +1,50 @@
+"""
+Partition Keys
+
+A trip's working set (the trip, its polls and its itineraries) shares one
+logical partition, trip_{trip_id}, so trip-scoped point reads and queries
+stay within a single partition.
+
+Documents written before this scheme live at their legacy keys (trips at
+trip_{organizer_id}, polls at poll_{trip_id}, itineraries at
+itinerary_{trip_id}) until the partition migration moves them. While it runs,
+reads fall back to the legacy location and trip-scoped queries keep fanning
+out (see CosmosRepository.dual_read).
+"""
+
+from typing import Any
+
+# Entity types stored in their trip's partition
+TRIP_SCOPED_ENTITY_TYPES = ("trip", "poll", "itinerary")
+
+
+def trip_partition_key(trip_id: str) -> str:
+    """Partition key of a trip and everything scoped to it."""
+    return f"trip_{trip_id}"
+
+
+def legacy_partition_key(entity_type: str, trip_id: str) -> str | None:
+    """
+    Partition key a trip-scoped document had before colocation.
+
+    Args:
+        entity_type: Entity type of the document
+        trip_id: Owning trip ID
+
+    Returns:
+        The legacy partition key, or None when it cannot be derived from the trip
+        (trips were keyed by organizer; those are located through the pk_index)
+    """
+    if entity_type in ("poll", "itinerary"):
+        return f"{entity_type}_{trip_id}"
+    return None
+
+
+def is_partition_move(document: dict[str, Any]) -> bool:
+    """
+    Whether a stored document is the partition migration's copy, unchanged since it was moved.
+
+    Every later write bumps the version past moved_version.
+    """
+    moved_version = document.get("moved_version")
+    return moved_version is not None and moved_version == document.get("version")
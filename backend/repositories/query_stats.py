@@ -0,0 +1,227 @@
+"""
+Query Statistics
+
+Cost accounting per query shape. Each query text is reduced to a fingerprint
+(literals and IN-list lengths stripped, whitespace collapsed) so that queries
+differing only in their values aggregate together, and the most expensive
+shapes can be listed from the admin endpoint. Individual executions above the
+slow-query thresholds are logged as they happen.
+"""
+
+import hashlib
+import logging
+import os
+import re
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Distinct (operation, fingerprint) pairs tracked; the cheapest is dropped when full
+DEFAULT_MAX_FINGERPRINTS = 500
+
+SORT_KEYS = ("request_charge", "avg_request_charge", "count", "avg_latency_ms", "max_latency_ms", "pages")
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"(?<![\w@$.])-?\d+(?:\.\d+)?\b")
+_NUMBERED_PARAMETER_LIST = re.compile(r"\(\s*@[A-Za-z_]+\d+(?:\s*,\s*@[A-Za-z_]+\d+)*\s*\)")
+_LITERAL_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    """
+    Normalize a query to its shape.
+
+    String and number literals become ?, lists of numbered parameters
+    (IN (@id0, @id1, ...)) become (@...), and whitespace is collapsed.
+
+    Args:
+        query: Cosmos DB SQL query text
+
+    Returns:
+        Normalized query text
+    """
+    shape = _STRING_LITERAL.sub("?", query)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _NUMBERED_PARAMETER_LIST.sub("(@...)", shape)
+    shape = _LITERAL_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def fingerprint_id(shape: str) -> str:
+    """Short stable identifier of a fingerprint, for logs and reports."""
+    return hashlib.sha1(shape.encode("utf-8"), usedforsecurity=False).hexdigest()[:12]
+
+
+class QueryStats:
+    """Running totals for one query shape."""
+
+    def __init__(self, operation: str, shape: str) -> None:
+        self.operation = operation
+        self.shape = shape
+        self.id = fingerprint_id(shape)
+        self.count = 0
+        self.errors = 0
+        self.slow = 0
+        self.cross_partition = 0
+        self.request_charge = 0.0
+        self.max_request_charge = 0.0
+        self.latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.pages = 0
+        self.items = 0
+        self.last_seen: datetime | None = None
+
+    def add(
+        self,
+        request_charge: float,
+        latency_ms: float,
+        pages: int,
+        items: int,
+        cross_partition: bool,
+        failed: bool,
+        slow: bool,
+    ) -> None:
+        """Add one execution to the totals."""
+        self.count += 1
+        self.errors += int(failed)
+        self.slow += int(slow)
+        self.cross_partition += int(cross_partition)
+        self.request_charge += request_charge
+        self.max_request_charge = max(self.max_request_charge, request_charge)
+        self.latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self.pages += pages
+        self.items += items
+        self.last_seen = datetime.now(UTC)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize totals and per-execution averages."""
+        return {
+            "fingerprint": self.id,
+            "operation": self.operation,
+            "query": self.shape,
+            "count": self.count,
+            "errors": self.errors,
+            "slow": self.slow,
+            "cross_partition": self.cross_partition,
+            "request_charge": round(self.request_charge, 2),
+            "avg_request_charge": round(self.request_charge / self.count, 2) if self.count else 0.0,
+            "max_request_charge": round(self.max_request_charge, 2),
+            "avg_latency_ms": round(self.latency_ms / self.count, 2) if self.count else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 2),
+            "pages": self.pages,
+            "avg_pages": round(self.pages / self.count, 2) if self.count else 0.0,
+            "items": self.items,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+        }
+
+
+class QueryLog:
+    """Process-wide query cost table and slow-query log."""
+
+    def __init__(
+        self,
+        slow_query_ms: float,
+        slow_query_ru: float,
+        max_fingerprints: int = DEFAULT_MAX_FINGERPRINTS,
+    ) -> None:
+        self.slow_query_ms = slow_query_ms
+        self.slow_query_ru = slow_query_ru
+        self.max_fingerprints = max_fingerprints
+        self._stats: dict[tuple[str, str], QueryStats] = {}
+        self._since = datetime.now(UTC)
+
+    @classmethod
+    def from_environment(cls) -> "QueryLog":
+        """Build the log from COSMOS_SLOW_QUERY_MS and COSMOS_SLOW_QUERY_RU."""
+        return cls(
+            slow_query_ms=float(os.environ.get("COSMOS_SLOW_QUERY_MS", "500")),
+            slow_query_ru=float(os.environ.get("COSMOS_SLOW_QUERY_RU", "50")),
+        )
+
+    def record(
+        self,
+        operation: str,
+        query: str,
+        request_charge: float,
+        latency_ms: float,
+        pages: int,
+        items: int,
+        cross_partition: bool = False,
+        failed: bool = False,
+    ) -> None:
+        """
+        Record one query execution.
+
+        Args:
+            operation: Repository operation name (e.g. "query.trip")
+            query: Query text as sent
+            request_charge: RU consumed across all pages
+            latency_ms: Wall-clock latency including throttling retries
+            pages: Round trips made
+            items: Results returned
+            cross_partition: Whether the query fanned out across partitions
+            failed: Whether the query ended in an unexpected error
+        """
+        shape = fingerprint(query)
+        key = (operation, shape)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = QueryStats(operation, shape)
+            if len(self._stats) > self.max_fingerprints:
+                self._evict_cheapest(keep=key)
+
+        slow = latency_ms >= self.slow_query_ms or request_charge >= self.slow_query_ru
+        stats.add(request_charge, latency_ms, pages, items, cross_partition, failed, slow)
+
+        if slow:
+            logger.warning(
+                f"Slow query {stats.id} ({operation}): {latency_ms:.0f} ms, {request_charge:.2f} RU, "
+                f"{pages} pages, {items} items, cross-partition={cross_partition}: {shape}"
+            )
+
+    def _evict_cheapest(self, keep: tuple[str, str]) -> None:
+        cheapest = min((key for key in self._stats if key != keep), key=lambda key: self._stats[key].request_charge)
+        del self._stats[cheapest]
+
+    def top(self, limit: int = 10, sort: str = "request_charge") -> dict[str, Any]:
+        """
+        Get the most expensive query shapes.
+
+        Args:
+            limit: Number of shapes to return
+            sort: Field to rank by (one of SORT_KEYS)
+
+        Returns:
+            Report with the ranked shapes and totals
+
+        Raises:
+            ValueError: If sort is not a known field
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort field: {sort}")
+
+        rows = [stats.to_dict() for stats in self._stats.values()]
+        rows.sort(key=lambda row: row[sort], reverse=True)
+        return {
+            "since": self._since.isoformat(),
+            "fingerprints": len(rows),
+            "request_charge": round(sum(row["request_charge"] for row in rows), 2),
+            "slow_query_ms": self.slow_query_ms,
+            "slow_query_ru": self.slow_query_ru,
+            "sort": sort,
+            "queries": rows[:limit],
+        }
+
+    def reset(self) -> None:
+        """Clear all statistics."""
+        self._stats.clear()
+        self._since = datetime.now(UTC)
+
+
+# Singleton instance
+query_log = QueryLog.from_environment()
@@ -0,0 +1,112 @@
+"""
+Request Scope
+
+State shared by everything that runs while one request is served: the
+authenticated user and an identity map of the documents already loaded.
+
+Handlers and services often load the same document more than once (the
+handler checks access to a trip, then the service it calls loads the trip
+again). While a scope is active the repository answers repeat point reads
+from the identity map instead of Cosmos DB. Writes made through the
+repository update the map, and a conflicting write drops the document so a
+retry re-reads it from the store.
+
+Scopes are carried in a context variable, so they follow the request across
+awaits without any service signature changing.
+"""
+
+import copy
+from contextvars import ContextVar, Token
+from typing import Any
+
+from models.documents import UserDocument
+
+# Upper bound on documents remembered by one scope (long timer runs stop remembering past it)
+MAX_SCOPE_DOCUMENTS = 1000
+
+
+class RequestScope:
+    """Identity map of one request (HTTP invocation, queue message or timer run)."""
+
+    def __init__(self, name: str, max_documents: int = MAX_SCOPE_DOCUMENTS) -> None:
+        self.name = name
+        self.max_documents = max_documents
+        self.user: UserDocument | None = None
+        self._documents: dict[tuple[str, str], dict[str, Any]] = {}
+        # (entity type, document ID) -> partition key, for lookups by ID alone
+        self._locations: dict[tuple[str, str], str] = {}
+        self.hits = 0
+
+    def lookup(self, doc_id: str, partition_key: str) -> dict[str, Any] | None:
+        """
+        Get a document loaded earlier in this request.
+
+        Returns:
+            Copy of the raw document the caller is free to mutate, or None
+        """
+        document = self._documents.get((doc_id, partition_key))
+        if document is None:
+            return None
+        self.hits += 1
+        return copy.deepcopy(document)
+
+    def locate(self, entity_type: str, doc_id: str) -> str | None:
+        """Get the partition key of a document loaded earlier in this request."""
+        return self._locations.get((entity_type, doc_id))
+
+    def remember(self, document: dict[str, Any]) -> None:
+        """Record the current version of a full document (read or written by this request)."""
+        key = (document["id"], document["pk"])
+        if key not in self._documents and len(self._documents) >= self.max_documents:
+            return
+        self._documents[key] = copy.deepcopy(document)
+        if document.get("entity_type"):
+            self._locations[(document["entity_type"], document["id"])] = document["pk"]
+
+    def forget(self, doc_id: str, partition_key: str) -> None:
+        """Drop a document that was deleted or changed elsewhere."""
+        document = self._documents.pop((doc_id, partition_key), None)
+        if document is not None and document.get("entity_type"):
+            self._locations.pop((document["entity_type"], doc_id), None)
+
+
+_current_scope: ContextVar[RequestScope | None] = ContextVar("cosmos_request_scope", default=None)
+
+
+def begin_request_scope(name: str) -> Token:
+    """
+    Start a scope for the current request.
+
+    Args:
+        name: Request label (usually the function name)
+
+    Returns:
+        Token to pass to end_request_scope
+    """
+    return _current_scope.set(RequestScope(name))
+
+
+def current_request_scope() -> RequestScope | None:
+    """Get the scope of the request being served, if one was started."""
+    return _current_scope.get()
+
+
+def end_request_scope(token: Token) -> RequestScope | None:
+    """
+    Close the current request scope.
+
+    Args:
+        token: Token returned by begin_request_scope
+
+    Returns:
+        The closed scope
+    """
+    scope = _current_scope.get()
+    _current_scope.reset(token)
+    return scope
+
+
+def current_user() -> UserDocument | None:
+    """Get the user authenticated for the request being served, if any."""
+    scope = _current_scope.get()
+    return scope.user if scope else None
@@ -0,0 +1,79 @@
+"""
+Single-Flight Request Coalescing
+
+Concurrent identical reads share one in-flight Cosmos DB call. When a
+SignalR broadcast makes every client of a trip refetch at once, the first
+caller issues the read and everyone else arriving while it is in flight
+awaits the same result instead of sending their own request.
+
+Keys carry a write generation: any write through the repository advances it,
+so a read that starts after a write never joins a flight that began before
+it (read-your-writes holds within an instance).
+"""
+
+import asyncio
+import copy
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from repositories.metrics import repository_metrics
+
+
+class Flight:
+    """One in-flight call and the number of callers that joined it."""
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.followers = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, Flight] = {}
+        self.generation = 0
+
+    def advance(self) -> None:
+        """Start a new write generation (later calls never join earlier flights)."""
+        self.generation += 1
+
+    async def run(self, operation: str, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a call, or join the identical call already in flight.
+
+        The shared call runs as its own task, so a caller being cancelled does not
+        cancel it for the others. When a call was shared, every caller receives
+        its own deep copy of the result, so no two callers share mutable state.
+
+        Args:
+            operation: Operation name, for the coalescing metrics
+            key: Identity of the call (operation arguments)
+            call: Coroutine factory performing the call
+
+        Returns:
+            Result of the call
+        """
+        flight_key = (self.generation, operation, key)
+        flight = self._inflight.get(flight_key)
+
+        if flight is not None:
+            flight.followers += 1
+            repository_metrics.record_coalesced(operation)
+            return copy.deepcopy(await asyncio.shield(flight.future))
+
+        flight = self._inflight[flight_key] = Flight(asyncio.ensure_future(call()))
+        flight.future.add_done_callback(lambda done: self._finish(flight_key, flight))
+        result = await asyncio.shield(flight.future)
+        return copy.deepcopy(result) if flight.followers else result
+
+    def _finish(self, flight_key: Hashable, flight: Flight) -> None:
+        # Runs before any caller resumes, so no one can join a finished flight
+        if self._inflight.get(flight_key) is flight:
+            del self._inflight[flight_key]
+        # Mark the outcome as retrieved even if every caller was cancelled
+        if not flight.future.cancelled():
+            flight.future.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
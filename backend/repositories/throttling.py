@@ -0,0 +1,85 @@
+"""
+Throttling Retry Policy
+
+Central handling of Cosmos DB 429 (request rate too large) responses.
+The SDK's built-in throttle retries are disabled so that every retry goes
+through this policy and is visible in the repository metrics.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from azure.cosmos import exceptions
+
+logger = logging.getLogger(__name__)
+R = TypeVar("R")
+
+RETRY_AFTER_HEADER = "x-ms-retry-after-ms"
+TOO_MANY_REQUESTS = 429
+
+# Used when a 429 arrives without a retry-after hint (doubles per attempt)
+DEFAULT_RETRY_AFTER_SECONDS = 0.1
+
+
+class ThrottleRetryPolicy:
+    """Retry throttled calls after the server's retry-after delay, within a capped budget."""
+
+    def __init__(self, max_retries: int | None = None, max_wait_seconds: float | None = None) -> None:
+        self.max_retries = (
+            max_retries if max_retries is not None else int(os.environ.get("COSMOS_THROTTLE_MAX_RETRIES", "5"))
+        )
+        self.max_wait_seconds = (
+            max_wait_seconds
+            if max_wait_seconds is not None
+            else float(os.environ.get("COSMOS_THROTTLE_MAX_WAIT_SECONDS", "5"))
+        )
+
+    def retry_after(self, error: exceptions.CosmosHttpResponseError, attempt: int) -> float:
+        """Get the delay (seconds) requested by a 429 response."""
+        retry_after_ms = (error.headers or {}).get(RETRY_AFTER_HEADER)
+        if retry_after_ms is not None:
+            return float(retry_after_ms) / 1000
+        return DEFAULT_RETRY_AFTER_SECONDS * 2.0**attempt
+
+    async def run(self, call: Callable[[], Awaitable[R]], on_throttle: Callable[[], None] | None = None) -> R:
+        """
+        Run a Cosmos DB call, retrying 429 responses.
+
+        Args:
+            call: Coroutine factory performing the call (invoked once per attempt)
+            on_throttle: Optional callback invoked for every retried 429
+
+        Returns:
+            Result of the call
+
+        Raises:
+            CosmosHttpResponseError: The final 429 once the retry count or wait budget is spent,
+                or any other error immediately
+        """
+        attempt = 0
+        waited = 0.0
+
+        while True:
+            try:
+                return await call()
+            except exceptions.CosmosHttpResponseError as e:
+                if e.status_code != TOO_MANY_REQUESTS:
+                    raise
+
+                delay = self.retry_after(e, attempt)
+                if attempt >= self.max_retries or waited + delay > self.max_wait_seconds:
+                    logger.warning(f"Cosmos throttling budget exhausted after {attempt} retries ({waited:.2f}s waited)")
+                    raise
+
+                attempt += 1
+                waited += delay
+                if on_throttle:
+                    on_throttle()
+                await asyncio.sleep(delay)
+
+
+# Singleton instance
+throttle_policy = ThrottleRetryPolicy()
@@ -6,9 +6,11 @@ Provides conversational AI assistance for trip planning.
 
 import logging
 from datetime import UTC, datetime
+from typing import cast
 
 from models.documents import MessageDocument, TripDocument
-from repositories.cosmos_repository import cosmos_repo
+from repositories.cosmos_repository import BatchOperation, QueryPage, cosmos_repo
+from repositories.partitioning import trip_partition_key
 from services.llm.client import llm_client
 from services.llm.prompts import ASSISTANT_SYSTEM_PROMPT, build_assistant_prompt
 
@@ -41,14 +43,7 @@ class AssistantService:
         # Get trip context if provided
         trip: TripDocument | None = None
         if trip_id:
-            query = "SELECT * FROM c WHERE c.entity_type = 'trip' AND c.id = @tripId"
-            trips = await cosmos_repo.query(
-                query=query,
-                parameters=[{"name": "@tripId", "value": trip_id}],
-                model_class=TripDocument,
-                max_items=1,
-            )
-            trip = trips[0] if trips else None
+            trip = await cosmos_repo.get_by_id_or_legacy(trip_id, trip_partition_key(trip_id), TripDocument)
 
         # Get conversation history for context
         history = await self._get_conversation_history(user_id=user_id, trip_id=trip_id, limit=10)
@@ -71,7 +66,6 @@ class AssistantService:
             content=message,
             message_type="user",
         )
-        await cosmos_repo.create(user_msg)
 
         # Store AI response
         ai_msg = MessageDocument(
@@ -83,24 +77,29 @@ class AssistantService:
             message_type="assistant",
             metadata={"tokens_used": response.get("tokens_used", 0), "cost": response.get("cost", 0.0)},
         )
-        created_msg = await cosmos_repo.create(ai_msg)
 
-        return created_msg
+        # Both messages live in the user's partition, so they are written in one round trip
+        _, created_msg = await cosmos_repo.execute_batch(
+            f"message_{user_id}", [BatchOperation.create(user_msg), BatchOperation.create(ai_msg)]
+        )
+
+        # A create always echoes the written document
+        return cast(MessageDocument, created_msg)
 
     async def get_conversation(
-        self, user_id: str, trip_id: str | None = None, limit: int = 50, offset: int = 0
-    ) -> list[MessageDocument]:
+        self, user_id: str, trip_id: str | None = None, limit: int = 50, cursor: str | None = None
+    ) -> QueryPage:
         """
-        Get conversation history for a user.
+        Get one page of conversation history for a user, newest first.
 
         Args:
             user_id: User ID
             trip_id: Optional trip filter
-            limit: Maximum messages to return
-            offset: Pagination offset
+            limit: Page size
+            cursor: Cursor from the previous page
 
         Returns:
-            List of messages
+            Page of messages
         """
         query = """
             SELECT * FROM c
@@ -115,9 +114,16 @@ class AssistantService:
 
         query += " ORDER BY c.created_at DESC"
 
-        messages = await cosmos_repo.query(query=query, parameters=params, model_class=MessageDocument, max_items=limit)
-
-        return messages[offset:] if offset else messages
+        # A user's conversation (their messages and the replies to them) is private to
+        # their own partition, so the trip filter never needs to leave it
+        return await cosmos_repo.query_page(
+            query=query,
+            parameters=params,
+            model_class=MessageDocument,
+            partition_key=f"message_{user_id}",
+            page_size=limit,
+            cursor=cursor,
+        )
 
     async def _get_conversation_history(
         self, user_id: str, trip_id: str | None = None, limit: int = 10
@@ -133,11 +139,11 @@ class AssistantService:
         Returns:
             List of message dicts with role and content
         """
-        messages = await self.get_conversation(user_id=user_id, trip_id=trip_id, limit=limit)
+        page = await self.get_conversation(user_id=user_id, trip_id=trip_id, limit=limit)
 
         # Convert to LLM format (oldest first)
         history: list[dict[str, str]] = []
-        for msg in reversed(messages):
+        for msg in reversed(page.items):
             role = "assistant" if msg.message_type == "assistant" else "user"
             history.append({"role": role, "content": msg.content})
 
@@ -165,10 +171,8 @@ class AssistantService:
             query += " AND c.trip_id = @tripId"
             params.append({"name": "@tripId", "value": trip_id})
 
-        results = await cosmos_repo.query(query=query, parameters=params)
-
         deleted = 0
-        for msg in results:
+        async for msg in cosmos_repo.iter_query(query=query, parameters=params, partition_key=f"message_{user_id}"):
             await cosmos_repo.delete(msg["id"], msg["pk"])
             deleted += 1
 
@@ -0,0 +1,47 @@
+"""
+Change Handlers
+
+Side effects driven by the change feed rather than by the request that made
+the write. Each handler receives the latest version of a changed document.
+"""
+
+import logging
+from typing import Any
+
+from models.documents import PollDocument, TripDocument
+from repositories.change_feed import ChangeFeedProcessor
+from services.realtime_service import RealtimeEvents, get_realtime_service
+
+logger = logging.getLogger(__name__)
+
+# Processor behind the change feed trigger (functions/cosmos/change_feed.py)
+side_effects = ChangeFeedProcessor("side_effects")
+
+
+@side_effects.handler(PollDocument)
+async def push_poll_change(poll: PollDocument) -> None:
+    """Push poll creation, vote and close events to everyone viewing the trip."""
+    data: dict[str, Any] = {"poll_id": poll.id, "trip_id": poll.trip_id, "title": poll.title}
+
+    if poll.status == "closed":
+        expired = poll.expires_at is not None and poll.expires_at <= poll.updated_at
+        target = RealtimeEvents.POLL_CLOSED
+        data["closed_reason"] = "expired" if expired else "closed"
+        data["result"] = poll.result
+    elif poll.version == 1:
+        target = RealtimeEvents.POLL_CREATED
+    else:
+        target = RealtimeEvents.POLL_UPDATED
+        data["vote_count"] = len(poll.votes)
+
+    await get_realtime_service().send_to_group(group_name=poll.trip_id, target=target, data=data)
+
+
+@side_effects.handler(TripDocument)
+async def push_trip_change(trip: TripDocument) -> None:
+    """Push trip updates to everyone viewing the trip."""
+    await get_realtime_service().send_to_group(
+        group_name=trip.id,
+        target=RealtimeEvents.TRIP_UPDATED,
+        data={"trip_id": trip.id, "title": trip.title, "status": trip.status, "version": trip.version},
+    )
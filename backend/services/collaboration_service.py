@@ -4,13 +4,23 @@ Collaboration Service
 Business logic for polls, voting, and consensus building.
 """
 
+import asyncio
 import logging
 from datetime import UTC, datetime
 from typing import Any, Optional
 
+from models.aggregates import PollStatusCount
 from models.documents import PollDocument, UserDocument
+from models.projections import PollSummary
 from models.schemas import PollCreate, PollVote
-from repositories.cosmos_repository import cosmos_repo
+from repositories.cosmos_repository import (
+    MAX_PATCH_OPERATIONS,
+    PatchOperation,
+    cosmos_repo,
+    patch_path,
+    sql_literal,
+)
+from repositories.partitioning import legacy_partition_key, trip_partition_key
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +58,7 @@ class CollaborationService:
         ]
 
         poll = PollDocument(
-            pk=f"poll_{data.trip_id}",
+            pk=trip_partition_key(data.trip_id),
             trip_id=data.trip_id,
             creator_id=user.id,
             title=data.title,
@@ -64,23 +74,23 @@ class CollaborationService:
 
         return created
 
-    async def get_poll(self, poll_id: str) -> PollDocument | None:
+    async def get_poll(self, poll_id: str, trip_id: str | None = None) -> PollDocument | None:
         """
         Get a poll by ID.
 
         Args:
             poll_id: Poll ID
+            trip_id: Optional owning trip ID, used to derive the partition key
 
         Returns:
             Poll document if found
         """
-        query = "SELECT * FROM c WHERE c.entity_type = 'poll' AND c.id = @pollId"
-        polls = await cosmos_repo.query(
-            query=query, parameters=[{"name": "@pollId", "value": poll_id}], model_class=PollDocument, max_items=1
+        if not trip_id:
+            return await cosmos_repo.find_by_id(poll_id, PollDocument)
+        return await cosmos_repo.get_by_id_or_legacy(
+            poll_id, trip_partition_key(trip_id), PollDocument, legacy_partition_key("poll", trip_id)
         )
 
-        return polls[0] if polls else None
-
     async def get_trip_polls(self, trip_id: str, status: str | None = None, limit: int = 50) -> list[PollDocument]:
         """
         Get all polls for a trip.
@@ -106,9 +116,53 @@ class CollaborationService:
 
         query += " ORDER BY c.created_at DESC"
 
-        return await cosmos_repo.query(query=query, parameters=params, model_class=PollDocument, max_items=limit)
+        return await cosmos_repo.query(
+            query=query,
+            parameters=params,
+            model_class=PollDocument,
+            partition_key=cosmos_repo.partition_scope(trip_partition_key(trip_id)),
+            max_items=limit,
+        )
 
-    async def vote_on_poll(self, poll_id: str, vote: PollVote, user: UserDocument) -> PollDocument | None:
+    async def get_trip_poll_summaries(
+        self, trip_id: str, user_id: str, status: str | None = None, limit: int = 50
+    ) -> list[PollSummary]:
+        """
+        Get summaries of a trip's polls, for poll lists.
+
+        Args:
+            trip_id: Trip ID
+            user_id: Viewing user, for the user_voted flag
+            status: Optional status filter
+            limit: Maximum polls to return
+
+        Returns:
+            List of poll summaries, newest first
+        """
+        query = f"""
+            SELECT {PollSummary.select_list()} FROM c
+            WHERE c.entity_type = 'poll'
+            AND c.trip_id = @tripId
+        """
+        params = [{"name": "@tripId", "value": trip_id}, {"name": "@userId", "value": user_id}]
+
+        if status:
+            query += " AND c.status = @status"
+            params.append({"name": "@status", "value": status})
+
+        query += " ORDER BY c.created_at DESC"
+
+        return await cosmos_repo.query(
+            query=query,
+            parameters=params,
+            model_class=PollSummary,
+            partition_key=cosmos_repo.partition_scope(trip_partition_key(trip_id)),
+            max_items=limit,
+        )
+
+    async def vote_on_poll(
+        self, poll_id: str, vote: PollVote, user: UserDocument, trip_id: str | None = None
+    ) -> PollDocument | None:
         """
         Cast a vote on a poll.
 
@@ -116,11 +170,20 @@ class CollaborationService:
             poll_id: Poll ID
             vote: Vote data
             user: Authenticated user voting
+            trip_id: Optional owning trip ID, used to derive the partition key
 
         Returns:
             Updated poll or None
         """
-        poll = await self.get_poll(poll_id)
+        # Each attempt re-reads the poll, so a vote that races another write by the
+        # same user is recomputed against the latest state instead of overwriting it
+        return await cosmos_repo.retry_on_conflict(lambda: self._cast_vote(poll_id, vote, user, trip_id))
+
+    async def _cast_vote(
+        self, poll_id: str, vote: PollVote, user: UserDocument, trip_id: str | None
+    ) -> PollDocument | None:
+        """Read the poll and apply one vote conditionally (one attempt of vote_on_poll)."""
+        poll = await self.get_poll(poll_id, trip_id)
 
         if not poll:
             return None
@@ -132,8 +195,7 @@ class CollaborationService:
 
         # Check if poll expired
         if poll.expires_at and poll.expires_at < datetime.now(UTC):
-            poll.status = "expired"
-            await cosmos_repo.update(poll)
+            await cosmos_repo.patch(poll.id, poll.pk, [PatchOperation.set("/status", "expired")], PollDocument)
             return None
 
         # Validate option IDs
@@ -148,44 +210,62 @@ class CollaborationService:
             logger.warning("Single choice poll allows only one vote")
             return None
 
-        # Remove previous vote if exists
-        if user.id in poll.votes:
-            old_vote = poll.votes[user.id]
-            for option_id in old_vote.get("option_ids", []):
-                for opt in poll.options:
-                    if opt["id"] == option_id:
-                        opt["vote_count"] = max(0, opt.get("vote_count", 1) - 1)
-
-        # Record new vote
-        poll.votes[user.id] = {
+        # Net change in each option's vote count (previous vote out, new vote in)
+        count_deltas = [0] * len(poll.options)
+        for index, opt in enumerate(poll.options):
+            if user.id in poll.votes and opt["id"] in poll.votes[user.id].get("option_ids", []):
+                count_deltas[index] -= 1
+            if opt["id"] in vote.option_ids:
+                count_deltas[index] += 1
+
+        # Only this user's vote entry and the touched counters are sent; counters are
+        # incremented server-side so concurrent voters do not overwrite each other
+        new_vote = {
             "option_ids": vote.option_ids,
             "comment": vote.comment,
             "voted_at": datetime.now(UTC).isoformat(),
         }
+        operations = [PatchOperation.set(patch_path("votes", user.id), new_vote)]
+        operations += [
+            PatchOperation.incr(patch_path("options", index, "vote_count"), delta)
+            for index, delta in enumerate(count_deltas)
+            if delta
+        ]
 
-        # Update vote counts
-        for option_id in vote.option_ids:
-            for opt in poll.options:
-                if opt["id"] == option_id:
-                    opt["vote_count"] = opt.get("vote_count", 0) + 1
+        if len(operations) <= MAX_PATCH_OPERATIONS:
+            # Conflict only with a concurrent change to this user's own vote (or a close),
+            # so votes from different users never retry against each other
+            user_vote = f"c.votes[{sql_literal(user.id)}]"
+            if user.id in poll.votes:
+                vote_unchanged = f"{user_vote}.voted_at = {sql_literal(poll.votes[user.id].get('voted_at'))}"
+            else:
+                vote_unchanged = f"NOT IS_DEFINED({user_vote})"
+            predicate = f"FROM c WHERE c.status = 'active' AND {vote_unchanged}"
+            updated = await cosmos_repo.patch(poll.id, poll.pk, operations, PollDocument, filter_predicate=predicate)
+        else:
+            # Large multi-choice changes exceed the patch operation limit
+            poll.votes[user.id] = new_vote
+            for index, delta in enumerate(count_deltas):
+                poll.options[index]["vote_count"] = max(0, poll.options[index].get("vote_count", 0) + delta)
+            updated = await cosmos_repo.update(poll, conditional=True)
 
-        updated = await cosmos_repo.update(poll)
         logger.info(f"User {user.id} voted on poll {poll_id}")
 
         return updated
 
-    async def close_poll(self, poll_id: str, user: UserDocument) -> PollDocument | None:
+    async def close_poll(self, poll_id: str, user: UserDocument, trip_id: str | None = None) -> PollDocument | None:
         """
         Close a poll and calculate results.
 
         Args:
             poll_id: Poll ID
             user: Authenticated user (must be creator)
+            trip_id: Optional owning trip ID, used to derive the partition key
 
         Returns:
             Closed poll with results
         """
-        poll = await self.get_poll(poll_id)
+        poll = await self.get_poll(poll_id, trip_id)
 
         if not poll:
             return None
@@ -194,11 +274,12 @@ class CollaborationService:
             logger.warning(f"User {user.id} cannot close poll {poll_id}")
             return None
 
-        # Calculate results
-        poll.status = "closed"
-        poll.result = self._calculate_results(poll)
+        def close(current: PollDocument) -> None:
+            current.status = "closed"
+            current.result = self._calculate_results(current)
 
-        updated = await cosmos_repo.update(poll)
+        # Results are recomputed if a vote lands between the read and the write
+        updated = await cosmos_repo.read_modify_write(poll, close)
         logger.info(f"Closed poll {poll_id}")
 
         return updated
@@ -222,7 +303,7 @@ class CollaborationService:
         if poll.creator_id != user.id:
             return False
 
-        return await cosmos_repo.delete(poll_id, poll.pk)
+        return await cosmos_repo.delete(poll_id, poll.pk, entity_type="poll")
 
     def _calculate_results(self, poll: PollDocument) -> dict[str, Any]:
         """Calculate poll results."""
@@ -257,23 +338,38 @@ class CollaborationService:
         Returns:
             Consensus summary
         """
-        polls = await self.get_trip_polls(trip_id)
-
-        active_polls = [p for p in polls if p.status == "active"]
-        closed_polls = [p for p in polls if p.status == "closed"]
+        where = "c.entity_type = 'poll' AND c.trip_id = @tripId"
+        params = [{"name": "@tripId", "value": trip_id}]
+        partition_key = trip_partition_key(trip_id)
+
+        # Counted in Cosmos DB: cost follows the number of polls and voters, not votes loaded
+        groups, voters = await asyncio.gather(
+            cosmos_repo.count_by(PollStatusCount, where, params, partition_keys=self._poll_partitions(trip_id)),
+            cosmos_repo.distinct_values(
+                "v.k",
+                where,
+                params,
+                partition_key=cosmos_repo.partition_scope(partition_key),
+                join="JOIN v IN ObjectToArray(c.votes)",
+            ),
+        )
 
-        # Calculate participation rate
-        all_voters = set()
-        for poll in polls:
-            all_voters.update(poll.votes.keys())
+        closed_polls = sum(g.count for g in groups if g.status == "closed")
+        decided_polls = sum(g.count for g in groups if g.status == "closed" and g.decided)
 
         return {
             "trip_id": trip_id,
-            "total_polls": len(polls),
-            "active_polls": len(active_polls),
-            "closed_polls": len(closed_polls),
-            "unique_voters": len(all_voters),
-            "consensus_reached": all(p.result and not p.result.get("is_tie", True) for p in closed_polls)
-            if closed_polls
-            else False,
+            "total_polls": sum(g.count for g in groups),
+            "active_polls": sum(g.count for g in groups if g.status == "active"),
+            "closed_polls": closed_polls,
+            "unique_voters": len(voters),
+            "consensus_reached": closed_polls > 0 and decided_polls == closed_polls,
         }
+
+    def _poll_partitions(self, trip_id: str) -> list[str]:
+        """Partitions a trip's polls can be in (its own, plus the legacy one during migration)."""
+        partition_keys = [trip_partition_key(trip_id)]
+        legacy = legacy_partition_key("poll", trip_id)
+        if cosmos_repo.dual_read and legacy:
+            partition_keys.append(legacy)
+        return partition_keys
@@ -4,13 +4,17 @@ Family Service
 Business logic for family management operations.
 """
 
+import asyncio
 import logging
 from datetime import UTC, datetime, timedelta
 from typing import Optional
 
+from core.identity_cache import forget_user
 from models.documents import FamilyDocument, InvitationDocument, UserDocument
+from models.projections import FamilySummary
 from models.schemas import FamilyCreate, FamilyUpdate
-from repositories.cosmos_repository import cosmos_repo
+from repositories.cosmos_repository import ConcurrencyConflictError, PatchOperation, cosmos_repo
+from services.membership_service import get_membership_service
 
 logger = logging.getLogger(__name__)
 
@@ -54,8 +58,10 @@ class FamilyService:
 
         # Add family to user's family_ids
         if created.id not in user.family_ids:
+            await cosmos_repo.patch_array_add(user, "family_ids", created.id)
             user.family_ids.append(created.id)
-            await cosmos_repo.update(user)
+            forget_user(user)
+            await get_membership_service().index_family(user.id, created.id)
 
         logger.info(f"Created family '{created.name}' by user {user.id}")
         return created
@@ -70,12 +76,7 @@ class FamilyService:
         Returns:
             Family document if found
         """
-        query = "SELECT * FROM c WHERE c.entity_type = 'family' AND c.id = @familyId"
-        families = await cosmos_repo.query(
-            query=query, parameters=[{"name": "@familyId", "value": family_id}], model_class=FamilyDocument, max_items=1
-        )
-
-        return families[0] if families else None
+        return await cosmos_repo.find_by_id(family_id, FamilyDocument)
 
     async def get_user_families(self, user_id: str, limit: int = 20) -> list[FamilyDocument]:
         """
@@ -99,6 +100,28 @@ class FamilyService:
             query=query, parameters=[{"name": "@userId", "value": user_id}], model_class=FamilyDocument, max_items=limit
         )
 
+    async def get_user_family_summaries(self, user_id: str, limit: int = 20) -> list[FamilySummary]:
+        """
+        Get summaries of the families a user belongs to, for family lists.
+
+        Args:
+            user_id: User ID
+            limit: Maximum families to return
+
+        Returns:
+            List of family summaries, newest first
+        """
+        query = f"""
+            SELECT {FamilySummary.select_list()} FROM c
+            WHERE c.entity_type = 'family'
+            AND ARRAY_CONTAINS(c.member_ids, @userId)
+            ORDER BY c.created_at DESC
+        """
+
+        return await cosmos_repo.query(
+            query=query, parameters=[{"name": "@userId", "value": user_id}], model_class=FamilySummary, max_items=limit
+        )
+
     async def update_family(self, family_id: str, data: FamilyUpdate, user: UserDocument) -> FamilyDocument | None:
         """
         Update a family.
@@ -157,7 +180,7 @@ class FamilyService:
         for member_id in family.member_ids:
             await self._remove_family_from_user(member_id, family_id)
 
-        deleted = await cosmos_repo.delete(family_id, family.pk)
+        deleted = await cosmos_repo.delete(family_id, family.pk, entity_type="family")
 
         if deleted:
             logger.info(f"Deleted family {family_id} by user {user.id}")
@@ -249,22 +272,41 @@ class FamilyService:
         if not family:
             return None
 
-        if user.id not in family.member_ids:
-            family.member_ids.append(user.id)
-            family.member_count = len(family.member_ids)
-            await cosmos_repo.update(family)
+        # Membership is written before the invitation is consumed, so a failed write
+        # leaves the token pending for a retry. Both writes are array adds guarded by
+        # a predicate, so a retry does not add the member (or count it) twice. Family
+        # and user live in different partitions, so they are sent concurrently.
+        updated_family, updated_user = await asyncio.gather(
+            cosmos_repo.patch_array_add(
+                family, "member_ids", user.id, operations=[PatchOperation.incr("/member_count")]
+            ),
+            cosmos_repo.patch_array_add(user, "family_ids", family.id),
+        )
 
-        # Add family to user
         if family.id not in user.family_ids:
             user.family_ids.append(family.id)
-            await cosmos_repo.update(user)
-
-        # Mark invitation as accepted
-        invitation.status = "accepted"
-        await cosmos_repo.update(invitation)
+        forget_user(user)
+        # The family's trips become visible to the new member. The caller's copy may
+        # come from the identity cache and miss families joined on other instances,
+        # so the index is built from the stored family_ids (re-read if the patch was a no-op)
+        await get_membership_service().rebuild(user.id, family_ids=updated_user.family_ids if updated_user else None)
+
+        # Consume the invitation against the copy we validated; a concurrent accept or
+        # expiry of the same token makes this conditional write fail
+        try:
+            await cosmos_repo.patch(
+                invitation.id,
+                invitation.pk,
+                [PatchOperation.set("/status", "accepted")],
+                InvitationDocument,
+                etag=invitation.etag,
+            )
+        except ConcurrencyConflictError:
+            logger.warning(f"Invitation {invitation.id} was consumed concurrently")
+            return None
 
         logger.info(f"User {user.id} joined family {family.id}")
-        return family
+        return updated_family or family
 
     async def remove_member(self, family_id: str, member_id: str, user: UserDocument) -> bool:
         """
@@ -292,10 +334,10 @@ class FamilyService:
             logger.warning("Cannot remove family admin")
             return False
 
-        if member_id in family.member_ids:
-            family.member_ids.remove(member_id)
-            family.member_count = len(family.member_ids)
-            await cosmos_repo.update(family)
+        removed = await cosmos_repo.patch_array_remove(
+            family, "member_ids", member_id, operations=[PatchOperation.incr("/member_count", -1)]
+        )
+        if removed:
             await self._remove_family_from_user(member_id, family_id)
             logger.info(f"Removed {member_id} from family {family_id}")
             return True
@@ -312,19 +354,48 @@ class FamilyService:
         Returns:
             List of user documents
         """
-        family = await self.get_family(family_id)
-        if not family:
-            return []
+        return await self.get_members_of_families([family_id])
+
+    async def get_members_of_families(self, family_ids: list[str]) -> list[UserDocument]:
+        """
+        Get the members of several families, each user once.
+
+        Args:
+            family_ids: Family IDs
+
+        Returns:
+            List of user documents
+        """
+        families = await asyncio.gather(*(self.get_family(family_id) for family_id in family_ids))
+        member_ids = [member_id for family in families if family for member_id in family.member_ids]
+        return await self.get_users(member_ids)
+
+    async def get_users(self, user_ids: list[str]) -> list[UserDocument]:
+        """
+        Get users by ID with one batched point read.
+
+        Users are keyed by their Entra ID (pk ``user_{id}``). Accounts created
+        before that convention have a random ID and are located through the
+        partition key index instead.
+
+        Args:
+            user_ids: User IDs
 
-        if not family.member_ids:
-            return []
+        Returns:
+            Found users in the order of their IDs
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        users = await cosmos_repo.get_many([(user_id, f"user_{user_id}") for user_id in user_ids], UserDocument)
 
-        # Query users by IDs
-        placeholders = ", ".join(f"@id{i}" for i in range(len(family.member_ids)))
-        query = f"SELECT * FROM c WHERE c.entity_type = 'user' AND c.id IN ({placeholders})"
-        params = [{"name": f"@id{i}", "value": mid} for i, mid in enumerate(family.member_ids)]
+        found = {user.id for user in users}
+        legacy = [user_id for user_id in user_ids if user_id not in found]
+        if legacy:
+            located = await asyncio.gather(*(cosmos_repo.find_by_id(user_id, UserDocument) for user_id in legacy))
+            users.extend(user for user in located if user)
+            order = {user_id: position for position, user_id in enumerate(user_ids)}
+            users.sort(key=lambda user: order[user.id])
 
-        return await cosmos_repo.query(query=query, parameters=params, model_class=UserDocument)
+        return users
 
     def user_is_member(self, family: FamilyDocument, user_id: str) -> bool:
         """Check if user is a member of the family."""
@@ -336,11 +407,11 @@ class FamilyService:
 
     async def _remove_family_from_user(self, user_id: str, family_id: str) -> None:
         """Remove family from user's family_ids list."""
-        query = "SELECT * FROM c WHERE c.entity_type = 'user' AND c.id = @userId"
-        users = await cosmos_repo.query(
-            query=query, parameters=[{"name": "@userId", "value": user_id}], model_class=UserDocument, max_items=1
-        )
-
-        if users and family_id in users[0].family_ids:
-            users[0].family_ids.remove(family_id)
-            await cosmos_repo.update(users[0])
+        member = await cosmos_repo.find_by_id(user_id, UserDocument)
+
+        if member:
+            await cosmos_repo.patch_array_remove(member, "family_ids", family_id)
+            forget_user(member)
+            await get_membership_service().rebuild(
+                member.id, family_ids=[other for other in member.family_ids if other != family_id]
+            )
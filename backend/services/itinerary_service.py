@@ -9,6 +9,8 @@ from typing import Any, Optional
 
 from models.documents import ItineraryDocument, TripDocument, UserDocument
 from repositories.cosmos_repository import cosmos_repo
+from repositories.partitioning import legacy_partition_key, trip_partition_key
+from services.llm.cache import prompt_cache
 from services.llm.client import llm_client
 from services.llm.prompts import ITINERARY_SYSTEM_PROMPT, build_itinerary_prompt
 
@@ -31,15 +33,22 @@ class ItineraryService:
     """Service for itinerary-related operations."""
 
     async def generate_itinerary(
-        self, trip_id: str, preferences: dict[str, Any] | None = None, user: UserDocument | None = None
+        self,
+        trip_id: str,
+        preferences: dict[str, Any] | None = None,
+        user: UserDocument | None = None,
+        fresh: bool = False,
     ) -> ItineraryDocument | None:
         """
         Generate an AI-powered itinerary for a trip.
 
+        Identical prompts are answered from the prompt cache unless fresh is set.
+
         Args:
             trip_id: Trip ID
             preferences: Optional generation preferences
             user: Optional user for context
+            fresh: Call the model even if an identical prompt was answered before
 
         Returns:
             Generated itinerary document
@@ -55,9 +64,14 @@ class ItineraryService:
 
         try:
             # Generate itinerary using LLM
-            response = await llm_client.complete(
-                prompt=prompt, system_prompt=ITINERARY_SYSTEM_PROMPT, max_tokens=3000, temperature=0.7
-            )
+            if prompt_cache:
+                response = await prompt_cache.complete(
+                    prompt=prompt, system_prompt=ITINERARY_SYSTEM_PROMPT, max_tokens=3000, temperature=0.7, fresh=fresh
+                )
+            else:
+                response = await llm_client.complete(
+                    prompt=prompt, system_prompt=ITINERARY_SYSTEM_PROMPT, max_tokens=3000, temperature=0.7
+                )
 
             # Parse response into itinerary structure
             itinerary_data = self._parse_itinerary_response(response["content"])
@@ -67,7 +81,7 @@ class ItineraryService:
 
             # Create itinerary document
             itinerary = ItineraryDocument(
-                pk=f"itinerary_{trip_id}",
+                pk=trip_partition_key(trip_id),
                 trip_id=trip_id,
                 version_number=version,
                 title=f"Itinerary v{version} - {trip.destination or 'Trip'}",
@@ -89,23 +103,23 @@ class ItineraryService:
             logger.exception(f"Failed to generate itinerary: {e}")
             raise
 
-    async def get_itinerary(self, itinerary_id: str) -> ItineraryDocument | None:
+    async def get_itinerary(self, itinerary_id: str, trip_id: str | None = None) -> ItineraryDocument | None:
         """
         Get an itinerary by ID.
 
         Args:
             itinerary_id: Itinerary ID
+            trip_id: Optional owning trip ID, used to derive the partition key
 
         Returns:
             Itinerary document if found
         """
-        query = "SELECT * FROM c WHERE c.entity_type = 'itinerary' AND c.id = @id"
-        itineraries = await cosmos_repo.query(
-            query=query, parameters=[{"name": "@id", "value": itinerary_id}], model_class=ItineraryDocument, max_items=1
+        if not trip_id:
+            return await cosmos_repo.find_by_id(itinerary_id, ItineraryDocument)
+        return await cosmos_repo.get_by_id_or_legacy(
+            itinerary_id, trip_partition_key(trip_id), ItineraryDocument, legacy_partition_key("itinerary", trip_id)
         )
 
-        return itineraries[0] if itineraries else None
-
     async def get_trip_itineraries(self, trip_id: str, limit: int = 10) -> list[ItineraryDocument]:
         """
         Get all itineraries for a trip.
@@ -128,6 +142,7 @@ class ItineraryService:
             query=query,
             parameters=[{"name": "@tripId", "value": trip_id}],
             model_class=ItineraryDocument,
+            partition_key=cosmos_repo.partition_scope(trip_partition_key(trip_id)),
             max_items=limit,
         )
 
@@ -151,7 +166,11 @@ class ItineraryService:
         """
 
         approved = await cosmos_repo.query(
-            query=query, parameters=[{"name": "@tripId", "value": trip_id}], model_class=ItineraryDocument, max_items=1
+            query=query,
+            parameters=[{"name": "@tripId", "value": trip_id}],
+            model_class=ItineraryDocument,
+            partition_key=cosmos_repo.partition_scope(trip_partition_key(trip_id)),
+            max_items=1,
         )
 
         if approved:
@@ -235,15 +254,11 @@ class ItineraryService:
         if not itinerary:
             return False
 
-        return await cosmos_repo.delete(itinerary_id, itinerary.pk)
+        return await cosmos_repo.delete(itinerary_id, itinerary.pk, entity_type="itinerary")
 
     async def _get_trip(self, trip_id: str) -> TripDocument | None:
         """Get trip by ID."""
-        query = "SELECT * FROM c WHERE c.entity_type = 'trip' AND c.id = @id"
-        trips = await cosmos_repo.query(
-            query=query, parameters=[{"name": "@id", "value": trip_id}], model_class=TripDocument, max_items=1
-        )
-        return trips[0] if trips else None
+        return await cosmos_repo.get_by_id_or_legacy(trip_id, trip_partition_key(trip_id), TripDocument)
 
     async def _get_next_version(self, trip_id: str) -> int:
         """Get next version number for a trip's itinerary."""
@@ -252,7 +267,11 @@ class ItineraryService:
             WHERE c.entity_type = 'itinerary'
             AND c.trip_id = @tripId
         """
-        result = await cosmos_repo.query(query=query, parameters=[{"name": "@tripId", "value": trip_id}])
+        result = await cosmos_repo.query(
+            query=query,
+            parameters=[{"name": "@tripId", "value": trip_id}],
+            partition_key=cosmos_repo.partition_scope(trip_partition_key(trip_id)),
+        )
 
         current_max = result[0] if result and result[0] else 0
         return current_max + 1
@@ -1,5 +1,6 @@
 """LLM module initialization."""
 
+from services.llm.cache import PromptCache, prompt_cache
 from services.llm.client import LLMClient, llm_client
 from services.llm.prompts import (
     ASSISTANT_SYSTEM_PROMPT,
@@ -11,6 +12,8 @@ from services.llm.prompts import (
 __all__ = [
     "LLMClient",
     "llm_client",
+    "PromptCache",
+    "prompt_cache",
     "ITINERARY_SYSTEM_PROMPT",
     "ASSISTANT_SYSTEM_PROMPT",
     "build_itinerary_prompt",
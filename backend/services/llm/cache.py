@@ -0,0 +1,297 @@
+"""
+Prompt Cache
+
+Content-addressed cache of LLM responses. Identical generations (a double
+clicked regenerate, a retried itinerary-requests message, trips cloned from
+the same template) build identical prompts, so the response of the first
+request is stored under a hash of the normalised prompt and the model
+parameters and served to the others without calling the model.
+
+Entries live in Cosmos DB (pk prompt_cache_{key}) so they survive instance
+recycling, and expire through per-document ttl. Each instance keeps recently
+used entries in memory too, in an LRU bounded by entry count and response
+bytes. Concurrent identical requests on one instance share a single model
+call. Callers pass fresh=True to skip the lookup; the new response then
+replaces the cached one. A fresh request still joins an identical request
+that is already calling the model, as that answer is new as well.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any
+
+from models.documents import PromptCacheDocument, utc_now
+from repositories.cosmos_repository import cosmos_repo
+from services.llm.client import llm_client
+
+logger = logging.getLogger(__name__)
+
+# Responses larger than this are not cached (well under the 2 MB Cosmos DB item limit)
+MAX_CACHED_RESPONSE_BYTES = 256 * 1024
+
+
+def prompt_partition_key(key: str) -> str:
+    """Partition key of a cached response."""
+    return f"prompt_cache_{key}"
+
+
+def _normalise(text: str | None) -> str:
+    # Whitespace differences do not change what the model is asked
+    return " ".join((text or "").split())
+
+
+class PromptCache:
+    """Cosmos DB backed cache of LLM responses by prompt key, with an in-process LRU in front."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, max_bytes: int) -> None:
+        """
+        Args:
+            ttl_seconds: How long a response is served after it was generated
+            max_entries: Responses kept in memory per instance
+            max_bytes: Response bytes kept in memory per instance
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, PromptCacheDocument] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._bytes = 0
+        # Prompt key -> (flight, whether it is calling the model rather than looking up)
+        self._inflight: dict[str, tuple[asyncio.Future, bool]] = {}
+        self.reset_stats()
+
+    @classmethod
+    def from_environment(cls) -> "PromptCache | None":
+        """
+        Build the cache from LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES and LLM_CACHE_MAX_BYTES.
+
+        Returns:
+            The cache, or None when disabled (TTL of 0)
+        """
+        ttl_seconds = float(os.environ.get("LLM_CACHE_TTL_SECONDS", "86400"))
+        max_entries = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "200"))
+        max_bytes = int(os.environ.get("LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+        if ttl_seconds <= 0:
+            return None
+        return cls(ttl_seconds=ttl_seconds, max_entries=max_entries, max_bytes=max_bytes)
+
+    @staticmethod
+    def key(
+        prompt: str, system_prompt: str | None, model: str, max_tokens: int, temperature: float, json_mode: bool
+    ) -> str:
+        """
+        Compute the content address of a completion request.
+
+        Returns:
+            SHA-256 hex digest of the normalised prompts and model parameters
+        """
+        request = {
+            "prompt": _normalise(prompt),
+            "system_prompt": _normalise(system_prompt),
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": round(float(temperature), 4),
+            "json_mode": json_mode,
+        }
+        encoded = json.dumps(request, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    async def complete(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        max_tokens: int = 2000,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+        fresh: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Generate a completion, or serve the cached response of an identical request.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0-2)
+            json_mode: Whether to request JSON output
+            fresh: Skip the lookup and replace any cached response (an identical
+                request already calling the model is still joined)
+
+        Returns:
+            Dict with content, tokens_used, cost, model and cached. Cached
+            responses report no tokens or cost, as none were spent.
+        """
+        key = self.key(prompt, system_prompt, llm_client.model, max_tokens, temperature, json_mode)
+
+        flight = self._inflight.get(key)
+        if flight is not None and (flight[1] or not fresh):
+            self.coalesced += 1
+            return self._served(await asyncio.shield(flight[0]))
+        if fresh:
+            self.bypasses += 1
+
+        # Registered before the lookup, so identical requests arriving meanwhile join this one
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (future, fresh)
+        try:
+            entry = None if fresh else await self.get(key)
+            if entry is not None:
+                result = self._served(entry)
+            else:
+                if not fresh:
+                    self.misses += 1
+                    if self._inflight.get(key) == (future, False):
+                        self._inflight[key] = (future, True)
+                response = await llm_client.complete(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    json_mode=json_mode,
+                )
+                entry = await self.put(key, response)
+                result = {**response, "cached": False}
+            future.set_result(entry)
+        except Exception as e:
+            future.set_exception(e)
+            # Followers see the failure; retrieve it so an unjoined flight is not reported
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            if key in self._inflight and self._inflight[key][0] is future:
+                del self._inflight[key]
+
+        return result
+
+    async def get(self, key: str) -> PromptCacheDocument | None:
+        """
+        Get the unexpired cached response for a prompt key, from memory or Cosmos DB.
+
+        Returns:
+            The cached response, or None
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > utc_now():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+            self._drop(key)
+
+        try:
+            entry = await cosmos_repo.get_by_id(key, prompt_partition_key(key), PromptCacheDocument)
+        except Exception as e:
+            logger.warning(f"Prompt cache read failed for {key}: {e}")
+            return None
+
+        # ttl deletion runs in the background, so expired documents can still be read
+        if entry is None or entry.expires_at <= utc_now():
+            return None
+        self.store_hits += 1
+        self._remember(key, entry)
+        return entry
+
+    async def put(self, key: str, response: dict[str, Any]) -> PromptCacheDocument:
+        """
+        Store the response of a completion request.
+
+        Responses over MAX_CACHED_RESPONSE_BYTES are not stored. A failed write
+        is logged; the response is still returned to the caller.
+
+        Args:
+            key: Prompt key
+            response: Completion returned by the LLM client
+
+        Returns:
+            The entry for the response
+        """
+        entry = PromptCacheDocument(
+            id=key,
+            pk=prompt_partition_key(key),
+            model=response.get("model", ""),
+            content=response["content"],
+            tokens_used=response.get("tokens_used", 0),
+            cost=response.get("cost", 0.0),
+            expires_at=utc_now() + timedelta(seconds=self.ttl_seconds),
+        )
+        if len(entry.content.encode("utf-8")) > MAX_CACHED_RESPONSE_BYTES:
+            self.oversized += 1
+            return entry
+
+        try:
+            entry = await cosmos_repo.upsert(entry)
+        except Exception as e:
+            logger.warning(f"Prompt cache write failed for {key}: {e}")
+        self.stores += 1
+        self._remember(key, entry)
+        return entry
+
+    def _served(self, entry: PromptCacheDocument) -> dict[str, Any]:
+        """Count a served entry's savings and build its response."""
+        self.tokens_saved += entry.tokens_used
+        self.cost_saved_usd += entry.cost
+        logger.info(f"Served LLM response from cache: saved {entry.tokens_used} tokens, ${entry.cost:.6f}")
+        return {"content": entry.content, "tokens_used": 0, "cost": 0.0, "model": entry.model, "cached": True}
+
+    def _remember(self, key: str, entry: PromptCacheDocument) -> None:
+        self._drop(key)
+        size = len(entry.content.encode("utf-8"))
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._sizes[key] = size
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._bytes -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        """Drop every entry held in memory (stored entries are kept)."""
+        self._entries.clear()
+        self._sizes.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        hits = self.memory_hits + self.store_hits + self.coalesced
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "stores": self.stores,
+            "oversized": self.oversized,
+            "evictions": self.evictions,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "cost_saved_usd": round(self.cost_saved_usd, 6),
+        }
+
+    def reset_stats(self) -> None:
+        """Zero the counters (entries are kept)."""
+        self.memory_hits = self.store_hits = self.coalesced = self.misses = self.bypasses = 0
+        self.stores = self.oversized = self.evictions = self.tokens_saved = 0
+        self.cost_saved_usd = 0.0
+
+
+# Singleton instance (None when disabled)
+prompt_cache = PromptCache.from_environment()
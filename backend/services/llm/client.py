@@ -45,6 +45,11 @@ class LLMClient:
 
         return self._client
 
+    @property
+    def model(self) -> str:
+        """Model requests are sent to (OPENAI_MODEL)."""
+        return os.environ.get("OPENAI_MODEL", "gpt-5-mini")
+
     async def complete(
         self,
         prompt: str,
@@ -66,7 +71,7 @@ class LLMClient:
         Returns:
             Dict with content, tokens_used, cost, and model
         """
-        model = os.environ.get("OPENAI_MODEL", "gpt-5-mini")
+        model = self.model
         client = self._get_client()
 
         messages = []
@@ -126,7 +131,7 @@ class LLMClient:
         Returns:
             Dict with content, tokens_used, cost, and model
         """
-        model = os.environ.get("OPENAI_MODEL", "gpt-5-mini")
+        model = self.model
         client = self._get_client()
 
         full_messages = []
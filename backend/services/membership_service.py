@@ -0,0 +1,281 @@
+"""
+Membership Service
+
+Maintains the membership index used for trip authorization: one compact
+document per user (pk membership_{user_id}) listing the families they belong
+to and the trips they can see, either as organizer or through a
+participating family.
+
+The index is updated by the services that change memberships (family
+creation, invitations, member removal) and trip families (trip creation,
+adding and removing families). A user without an index document, e.g. one
+who signed up before the index existed, gets it built on first use. Access
+sets are cached per instance for a short TTL; a check that fails against the
+cache is repeated against the store before access is denied, so new
+memberships made on other instances are honoured immediately. Revocations
+are not: the instance that removes a member drops its cached set at once,
+but other instances keep granting from theirs until it expires. That window
+is MEMBERSHIP_CACHE_TTL_SECONDS (5s by default, the same bound the document
+cache puts on every cached read); set it to 0 to check every grant against
+the store. Trips of deleted families or deleted trips may linger in an
+index; they grant access to nothing that still exists.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Optional
+
+from models.documents import FamilyDocument, MembershipDocument, TripDocument, UserDocument
+from repositories.cosmos_repository import cosmos_repo
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on trips listed in one index document
+MAX_INDEXED_TRIPS = 1000
+
+# Index documents written at once when a trip's families change
+MAX_CONCURRENT_INDEX_WRITES = 10
+
+
+def membership_partition_key(user_id: str) -> str:
+    """Partition key of a user's membership index document."""
+    return f"membership_{user_id}"
+
+
+class AccessSet:
+    """Families and trips a user can access, as sets."""
+
+    def __init__(self, family_ids: frozenset[str], trip_ids: frozenset[str]) -> None:
+        self.family_ids = family_ids
+        self.trip_ids = trip_ids
+
+    @classmethod
+    def from_document(cls, document: MembershipDocument) -> "AccessSet":
+        """Build the access set of an index document."""
+        return cls(frozenset(document.family_ids), frozenset(document.trip_ids))
+
+
+# Service singleton
+_membership_service: Optional["MembershipService"] = None
+
+
+def get_membership_service() -> "MembershipService":
+    """Get or create membership service singleton."""
+    global _membership_service
+    if _membership_service is None:
+        _membership_service = MembershipService(
+            max_entries=int(os.environ.get("MEMBERSHIP_CACHE_MAX_ENTRIES", "1000")),
+            ttl_seconds=float(os.environ.get("MEMBERSHIP_CACHE_TTL_SECONDS", "5")),
+        )
+    return _membership_service
+
+
+class MembershipService:
+    """Service for the per-user membership index."""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 5) -> None:
+        """
+        Args:
+            max_entries: Access sets cached per instance (0 disables the cache)
+            ttl_seconds: How long a cached access set is trusted, and so how long a
+                membership revoked on another instance can still grant access
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._cache: OrderedDict[str, tuple[AccessSet, float]] = OrderedDict()
+
+    async def user_has_access(self, trip: TripDocument, user_id: str) -> bool:
+        """
+        Check if user has access to a trip.
+
+        Args:
+            trip: Trip document
+            user_id: User ID to check
+
+        Returns:
+            True if the user organizes the trip or is in one of its families (as of
+            the cached access set, which may lag a revocation by up to ttl_seconds)
+        """
+        # Organizer always has access
+        if trip.organizer_user_id == user_id:
+            return True
+
+        if trip.id in (await self.get_access(user_id)).trip_ids:
+            return True
+
+        # The cached set may predate a membership made on another instance
+        access = await self.get_access(user_id, fresh=True)
+        if trip.id in access.trip_ids:
+            return True
+
+        # A trip indexed concurrently with a rebuild can be missing from trip_ids;
+        # the user's families still grant access, and the index is repaired
+        if not access.family_ids.isdisjoint(trip.participating_family_ids):
+            await self._add_value(user_id, "trip_ids", trip.id)
+            return True
+        return False
+
+    async def get_access(self, user_id: str, fresh: bool = False) -> AccessSet:
+        """
+        Get the families and trips a user can access.
+
+        Args:
+            user_id: User ID
+            fresh: Bypass the in-process cache
+
+        Returns:
+            Access set of the user
+        """
+        entry = self._cache.get(user_id)
+        if entry is not None and not fresh and time.monotonic() < entry[1]:
+            self._cache.move_to_end(user_id)
+            return entry[0]
+
+        document = await cosmos_repo.get_by_id(user_id, membership_partition_key(user_id), MembershipDocument)
+        if document is None:
+            document = await self.rebuild(user_id)
+
+        access = AccessSet.from_document(document)
+        self._remember(user_id, access)
+        return access
+
+    async def rebuild(self, user_id: str, family_ids: list[str] | None = None) -> MembershipDocument:
+        """
+        Rebuild a user's index from their family memberships and the trips of those families.
+
+        Args:
+            user_id: User ID
+            family_ids: Current families of the user; read from the user document when not given
+
+        Returns:
+            The rebuilt index document
+        """
+        if family_ids is None:
+            user = await cosmos_repo.find_by_id(user_id, UserDocument)
+            family_ids = user.family_ids if user else []
+
+        conditions = ["c.organizer_user_id = @userId"]
+        params = [{"name": "@userId", "value": user_id}]
+        for index, family_id in enumerate(family_ids):
+            conditions.append(f"ARRAY_CONTAINS(c.participating_family_ids, @family{index})")
+            params.append({"name": f"@family{index}", "value": family_id})
+
+        trip_ids = await cosmos_repo.query(
+            query=f"SELECT VALUE c.id FROM c WHERE c.entity_type = 'trip' AND ({' OR '.join(conditions)})",
+            parameters=params,
+            max_items=MAX_INDEXED_TRIPS,
+        )
+
+        document = await cosmos_repo.upsert(
+            MembershipDocument(
+                id=user_id,
+                pk=membership_partition_key(user_id),
+                user_id=user_id,
+                family_ids=list(dict.fromkeys(family_ids)),
+                trip_ids=list(dict.fromkeys(trip_ids)),
+            )
+        )
+        logger.info(f"Rebuilt membership index of user {user_id}: {len(family_ids)} families, {len(trip_ids)} trips")
+        self.invalidate(user_id)
+        return document
+
+    async def index_family(self, user_id: str, family_id: str) -> None:
+        """
+        Index a family the user just created (a new family has no trips yet).
+
+        Args:
+            user_id: User ID
+            family_id: Family ID
+        """
+        await self._add_value(user_id, "family_ids", family_id)
+
+    async def index_trip(self, trip: TripDocument, family_ids: list[str]) -> None:
+        """
+        Grant the organizer and the members of some of a trip's families access to it.
+
+        Args:
+            trip: Trip document
+            family_ids: Families that were added to the trip
+        """
+        member_ids = {trip.organizer_user_id}
+        families = await asyncio.gather(
+            *(cosmos_repo.find_by_id(family_id, FamilyDocument) for family_id in family_ids)
+        )
+        for family in families:
+            if family:
+                member_ids.update(family.member_ids)
+
+        await self._for_each(member_ids, lambda user_id: self._add_value(user_id, "trip_ids", trip.id))
+
+    async def unindex_trip_family(self, trip: TripDocument, family_id: str) -> None:
+        """
+        Revoke a family's members' access to a trip the family just left.
+
+        Members who still reach the trip as its organizer or through another of its
+        participating families keep it in their index.
+
+        Args:
+            trip: Trip document, without the removed family
+            family_id: Family that was removed from the trip
+        """
+        families = await asyncio.gather(
+            *(
+                cosmos_repo.find_by_id(other_id, FamilyDocument)
+                for other_id in [family_id, *trip.participating_family_ids]
+            )
+        )
+        family, remaining = families[0], families[1:]
+        if family is None:
+            return
+
+        still_reached = {trip.organizer_user_id}
+        for other in remaining:
+            if other:
+                still_reached.update(other.member_ids)
+
+        revoked = [user_id for user_id in family.member_ids if user_id not in still_reached]
+        await self._for_each(revoked, lambda user_id: self._remove_value(user_id, "trip_ids", trip.id))
+
+    async def _add_value(self, user_id: str, field: str, value: str) -> None:
+        """Append a value to an index list; users without an index get it built on first use instead."""
+        stub = MembershipDocument(id=user_id, pk=membership_partition_key(user_id), user_id=user_id)
+        await cosmos_repo.patch_array_add(stub, field, value, missing_ok=True)
+        self.invalidate(user_id)
+
+    async def _remove_value(self, user_id: str, field: str, value: str) -> None:
+        """Remove a value from an index list; users without an index have nothing to remove."""
+        document = await cosmos_repo.get_by_id(user_id, membership_partition_key(user_id), MembershipDocument)
+        if document is not None:
+            await cosmos_repo.patch_array_remove(document, field, value)
+        self.invalidate(user_id)
+
+    @staticmethod
+    async def _for_each(user_ids: Iterable[str], update: Callable[[str], Awaitable[None]]) -> None:
+        """Run an index update for each user, at most MAX_CONCURRENT_INDEX_WRITES at a time."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_INDEX_WRITES)
+
+        async def run(user_id: str) -> None:
+            async with semaphore:
+                await update(user_id)
+
+        await asyncio.gather(*(run(user_id) for user_id in user_ids))
+
+    def _remember(self, user_id: str, access: AccessSet) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        self._cache[user_id] = (access, time.monotonic() + self.ttl_seconds)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop the cached access set of a user whose index changed."""
+        self._cache.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached access set."""
+        self._cache.clear()
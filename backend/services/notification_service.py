@@ -9,8 +9,17 @@ from datetime import UTC, datetime
 from enum import StrEnum
 from typing import Any
 
+from models.aggregates import NotificationCount
 from models.documents import NotificationDocument
-from repositories.cosmos_repository import cosmos_repo
+from repositories.cosmos_repository import (
+    MAX_BATCH_OPERATIONS,
+    BatchOperation,
+    ConcurrencyConflictError,
+    PatchOperation,
+    QueryPage,
+    cosmos_repo,
+    sql_literal,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -130,19 +139,19 @@ class NotificationService:
         return notifications
 
     async def get_user_notifications(
-        self, user_id: str, unread_only: bool = False, limit: int = 50, offset: int = 0
-    ) -> list[NotificationDocument]:
+        self, user_id: str, unread_only: bool = False, limit: int = 50, cursor: str | None = None
+    ) -> QueryPage:
         """
-        Get notifications for a user.
+        Get one page of notifications for a user, newest first.
 
         Args:
             user_id: Target user ID
             unread_only: Only return unread notifications
-            limit: Maximum notifications to return
-            offset: Pagination offset
+            limit: Page size
+            cursor: Cursor from the previous page
 
         Returns:
-            List of notifications
+            Page of notifications
         """
         query = """
             SELECT * FROM c
@@ -156,12 +165,15 @@ class NotificationService:
 
         query += " ORDER BY c.created_at DESC"
 
-        results = await cosmos_repo.query(
-            query=query, parameters=params, model_class=NotificationDocument, max_items=limit
+        return await cosmos_repo.query_page(
+            query=query,
+            parameters=params,
+            model_class=NotificationDocument,
+            partition_key=f"notification_{user_id}",
+            page_size=limit,
+            cursor=cursor,
         )
 
-        return results[offset:] if offset else results
-
     async def get_unread_count(self, user_id: str) -> int:
         """
         Get count of unread notifications.
@@ -180,7 +192,35 @@ class NotificationService:
         """
         params = [{"name": "@userId", "value": user_id}]
 
-        return await cosmos_repo.count(query=query, parameters=params)
+        return await cosmos_repo.count(query=query, parameters=params, partition_key=f"notification_{user_id}")
+
+    async def get_inbox_summary(self, user_id: str) -> dict[str, Any]:
+        """
+        Get notification totals for a user's inbox, counted in one grouped query.
+
+        Args:
+            user_id: Target user ID
+
+        Returns:
+            Total and unread counts, with unread counts per notification type
+        """
+        groups = await cosmos_repo.count_by(
+            NotificationCount,
+            "c.entity_type = 'notification' AND c.user_id = @userId",
+            [{"name": "@userId", "value": user_id}],
+            partition_keys=[f"notification_{user_id}"],
+        )
+
+        unread_by_type: dict[str, int] = {}
+        for group in groups:
+            if not group.is_read and group.notification_type:
+                unread_by_type[group.notification_type] = unread_by_type.get(group.notification_type, 0) + group.count
+
+        return {
+            "total": sum(group.count for group in groups),
+            "unread": sum(group.count for group in groups if not group.is_read),
+            "unread_by_type": unread_by_type,
+        }
 
     async def mark_as_read(self, notification_id: str, user_id: str) -> NotificationDocument | None:
         """
@@ -194,20 +234,20 @@ class NotificationService:
             Updated notification or None
         """
         pk = f"notification_{user_id}"
-        notification = await cosmos_repo.get_by_id(notification_id, pk, NotificationDocument)
-
-        if not notification:
-            return None
-
-        # Verify ownership
-        if notification.user_id != user_id:
+        operations = [PatchOperation.set("/is_read", True), PatchOperation.set("/read_at", utc_now())]
+
+        # Ownership is verified server-side, so no read is needed before the write
+        try:
+            return await cosmos_repo.patch(
+                notification_id,
+                pk,
+                operations,
+                NotificationDocument,
+                filter_predicate=f"FROM c WHERE c.user_id = {sql_literal(user_id)}",
+            )
+        except ConcurrencyConflictError:
             return None
 
-        notification.is_read = True
-        notification.read_at = utc_now()
-
-        return await cosmos_repo.update(notification)
-
     async def mark_all_as_read(self, user_id: str) -> int:
         """
         Mark all notifications as read for a user.
@@ -226,16 +266,29 @@ class NotificationService:
         """
         params = [{"name": "@userId", "value": user_id}]
 
-        results = await cosmos_repo.query(query=query, parameters=params, model_class=NotificationDocument)
-
-        marked = 0
+        partition_key = f"notification_{user_id}"
         now = utc_now()
-
-        for notification in results:
+        marked = 0
+        operations: list[BatchOperation] = []
+
+        async for notification in cosmos_repo.iter_query(
+            query=query,
+            parameters=params,
+            model_class=NotificationDocument,
+            partition_key=partition_key,
+        ):
             notification.is_read = True
             notification.read_at = now
-            await cosmos_repo.update(notification)
-            marked += 1
+            operations.append(BatchOperation.replace(notification))
+            # Written one transactional batch at a time while the results stream in
+            if len(operations) == MAX_BATCH_OPERATIONS:
+                await cosmos_repo.execute_batch(partition_key, operations)
+                marked += len(operations)
+                operations = []
+
+        if operations:
+            await cosmos_repo.execute_batch(partition_key, operations)
+            marked += len(operations)
 
         return marked
 
@@ -5,11 +5,15 @@ Business logic for trip management operations.
 """
 
 import logging
-from typing import Optional
+from typing import Any, Optional
+from uuid import uuid4
 
 from models.documents import TripDocument, UserDocument
+from models.projections import TripSummary
 from models.schemas import TripCreate, TripUpdate
-from repositories.cosmos_repository import cosmos_repo
+from repositories.cosmos_repository import QueryPage, cosmos_repo
+from repositories.partitioning import trip_partition_key
+from services.membership_service import get_membership_service
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +44,10 @@ class TripService:
         Returns:
             Created trip document
         """
+        trip_id = str(uuid4())
         trip = TripDocument(
-            pk=f"trip_{user.id}",
+            id=trip_id,
+            pk=trip_partition_key(trip_id),
             title=data.title,
             description=data.description,
             destination=data.destination,
@@ -55,6 +61,7 @@ class TripService:
         )
 
         created = await cosmos_repo.create(trip)
+        await get_membership_service().index_trip(created, created.participating_family_ids)
         logger.info(f"Created trip '{created.title}' by user {user.id}")
 
         return created
@@ -69,13 +76,7 @@ class TripService:
         Returns:
             Trip document if found
         """
-        # Query by ID across partitions
-        query = "SELECT * FROM c WHERE c.entity_type = 'trip' AND c.id = @tripId"
-        trips = await cosmos_repo.query(
-            query=query, parameters=[{"name": "@tripId", "value": trip_id}], model_class=TripDocument, max_items=1
-        )
-
-        return trips[0] if trips else None
+        return await cosmos_repo.get_by_id_or_legacy(trip_id, trip_partition_key(trip_id), TripDocument)
 
     async def get_user_trips(self, user_id: str, status: str | None = None, limit: int = 50) -> list[TripDocument]:
         """
@@ -89,23 +90,28 @@ class TripService:
         Returns:
             List of trip documents
         """
-        # Get trips where user is organizer
-        query = """
-            SELECT * FROM c
-            WHERE c.entity_type = 'trip'
-            AND c.organizer_user_id = @userId
-        """
-        params = [{"name": "@userId", "value": user_id}]
-
-        if status:
-            query += " AND c.status = @status"
-            params.append({"name": "@status", "value": status})
+        query, params = self._user_trips_query(user_id, status)
+        return await cosmos_repo.query(query=query, parameters=params, model_class=TripDocument, max_items=limit)
 
-        query += " ORDER BY c.created_at DESC"
+    async def get_user_trips_page(
+        self, user_id: str, status: str | None = None, limit: int = 50, cursor: str | None = None
+    ) -> QueryPage:
+        """
+        Get one page of a user's trips, as summaries.
 
-        trips = await cosmos_repo.query(query=query, parameters=params, model_class=TripDocument, max_items=limit)
+        Args:
+            user_id: User ID
+            status: Optional status filter
+            limit: Page size
+            cursor: Cursor from the previous page
 
-        return trips
+        Returns:
+            Page of trip summaries
+        """
+        query, params = self._user_trips_query(user_id, status, select=TripSummary.select_list())
+        return await cosmos_repo.query_page(
+            query=query, parameters=params, model_class=TripSummary, page_size=limit, cursor=cursor
+        )
 
     async def get_family_trips(self, family_id: str, status: str | None = None, limit: int = 50) -> list[TripDocument]:
         """
@@ -119,20 +125,64 @@ class TripService:
         Returns:
             List of trip documents
         """
-        query = """
-            SELECT * FROM c
+        query, params = self._family_trips_query(family_id, status)
+        return await cosmos_repo.query(query=query, parameters=params, model_class=TripDocument, max_items=limit)
+
+    async def get_family_trips_page(
+        self, family_id: str, status: str | None = None, limit: int = 50, cursor: str | None = None
+    ) -> QueryPage:
+        """
+        Get one page of a family's trips, as summaries.
+
+        Args:
+            family_id: Family ID
+            status: Optional status filter
+            limit: Page size
+            cursor: Cursor from the previous page
+
+        Returns:
+            Page of trip summaries
+        """
+        query, params = self._family_trips_query(family_id, status, select=TripSummary.select_list())
+        return await cosmos_repo.query_page(
+            query=query, parameters=params, model_class=TripSummary, page_size=limit, cursor=cursor
+        )
+
+    def _user_trips_query(
+        self, user_id: str, status: str | None, select: str = "*"
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Build the query for trips organized by a user, selecting full documents unless a SELECT list is given."""
+        query = f"""
+            SELECT {select} FROM c
             WHERE c.entity_type = 'trip'
-            AND ARRAY_CONTAINS(c.participating_family_ids, @familyId)
+            AND c.organizer_user_id = @userId
         """
-        params = [{"name": "@familyId", "value": family_id}]
+        params: list[dict[str, Any]] = [{"name": "@userId", "value": user_id}]
 
         if status:
             query += " AND c.status = @status"
             params.append({"name": "@status", "value": status})
 
         query += " ORDER BY c.created_at DESC"
+        return query, params
+
+    def _family_trips_query(
+        self, family_id: str, status: str | None, select: str = "*"
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Build the query for trips a family participates in, selecting full documents unless a SELECT list is given."""
+        query = f"""
+            SELECT {select} FROM c
+            WHERE c.entity_type = 'trip'
+            AND ARRAY_CONTAINS(c.participating_family_ids, @familyId)
+        """
+        params: list[dict[str, Any]] = [{"name": "@familyId", "value": family_id}]
 
-        return await cosmos_repo.query(query=query, parameters=params, model_class=TripDocument, max_items=limit)
+        if status:
+            query += " AND c.status = @status"
+            params.append({"name": "@status", "value": status})
+
+        query += " ORDER BY c.created_at DESC"
+        return query, params
 
     async def update_trip(self, trip_id: str, data: TripUpdate, user: UserDocument) -> TripDocument | None:
         """
@@ -151,7 +201,7 @@ class TripService:
         if not trip:
             return None
 
-        if not self.user_has_access(trip, user.id):
+        if not await self.user_has_access(trip, user.id):
             logger.warning(f"User {user.id} denied access to trip {trip_id}")
             return None
 
@@ -187,16 +237,18 @@ class TripService:
             logger.warning(f"User {user.id} cannot delete trip {trip_id}")
             return False
 
-        deleted = await cosmos_repo.delete(trip_id, trip.pk)
+        deleted = await cosmos_repo.delete(trip_id, trip.pk, entity_type="trip")
 
         if deleted:
             logger.info(f"Deleted trip {trip_id} by user {user.id}")
 
         return deleted
 
-    def user_has_access(self, trip: TripDocument, user_id: str) -> bool:
+    async def user_has_access(self, trip: TripDocument, user_id: str) -> bool:
         """
-        Check if user has access to a trip.
+        Check if user has access to a trip (organizer or member of a participating family).
+
+        Answered from the cached membership index of the user.
 
         Args:
             trip: Trip document
@@ -205,13 +257,7 @@ class TripService:
         Returns:
             True if user has access
         """
-        # Organizer always has access
-        if trip.organizer_user_id == user_id:
-            return True
-
-        # TODO: Check if user is in any participating family
-        # For now, return True for simplicity
-        return True
+        return await get_membership_service().user_has_access(trip, user_id)
 
     async def add_family_to_trip(self, trip_id: str, family_id: str, user: UserDocument) -> TripDocument | None:
         """
@@ -230,11 +276,10 @@ class TripService:
         if not trip or trip.organizer_user_id != user.id:
             return None
 
-        if family_id not in trip.participating_family_ids:
-            trip.participating_family_ids.append(family_id)
-            return await cosmos_repo.update(trip)
-
-        return trip
+        updated = await cosmos_repo.patch_array_add(trip, "participating_family_ids", family_id)
+        if updated:
+            await get_membership_service().index_trip(updated, [family_id])
+        return updated or trip
 
     async def remove_family_from_trip(self, trip_id: str, family_id: str, user: UserDocument) -> TripDocument | None:
         """
@@ -253,11 +298,10 @@ class TripService:
         if not trip or trip.organizer_user_id != user.id:
             return None
 
-        if family_id in trip.participating_family_ids:
-            trip.participating_family_ids.remove(family_id)
-            return await cosmos_repo.update(trip)
-
-        return trip
+        updated = await cosmos_repo.patch_array_remove(trip, "participating_family_ids", family_id)
+        if updated:
+            await get_membership_service().unindex_trip_family(updated, family_id)
+        return updated or trip
 
     async def update_trip_status(self, trip_id: str, status: str, user: UserDocument) -> TripDocument | None:
         """
@@ -278,7 +322,7 @@ class TripService:
 
         trip = await self.get_trip(trip_id)
 
-        if not trip or not self.user_has_access(trip, user.id):
+        if not trip or not await self.user_has_access(trip, user.id):
             return None
 
         trip.status = status
@@ -31,6 +31,21 @@ def event_loop():
     loop.close()
 
 
+class AsyncIteratorMock:
+    """Mock async iterator for query results."""
+
+    def __init__(self, items):
+        self.items = list(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.items:
+            raise StopAsyncIteration
+        return self.items.pop(0)
+
+
 @pytest.fixture
 def mock_cosmos_container():
     """Create a mock Cosmos DB container."""
@@ -44,6 +59,38 @@ def mock_cosmos_container():
     return container
 
 
+@pytest.fixture
+def cosmos_repository(mock_cosmos_container):
+    """Create a fresh CosmosRepository bound to the mock container."""
+    from repositories.cosmos_repository import CosmosRepository
+
+    previous = CosmosRepository._instance
+    CosmosRepository._instance = None
+    repo = CosmosRepository()
+    repo._container = mock_cosmos_container
+    yield repo
+    CosmosRepository._instance = previous
+
+
+@pytest.fixture
+def bind_memory_repository(cosmos_repository, monkeypatch):
+    """
+    Back the repository with an in-memory container and share it with the given modules.
+
+    Call it with the modules whose cosmos_repo should be the test repository,
+    and optionally the container to use (a fresh MemoryContainer by default).
+    """
+    from repositories.memory_container import MemoryContainer
+
+    def bind(*modules, container=None):
+        cosmos_repository.use_container(container if container is not None else MemoryContainer())
+        for module in modules:
+            monkeypatch.setattr(f"{module}.cosmos_repo", cosmos_repository)
+        return cosmos_repository
+
+    return bind
+
+
 @pytest.fixture
 def mock_cosmos_client(mock_cosmos_container):
     """Create a mock Cosmos DB client."""
@@ -0,0 +1,97 @@
+"""Unit tests for server-side aggregation helpers and the summaries built on them."""
+
+import pytest
+
+from models.aggregates import PollStatusCount
+from models.documents import NotificationDocument, PollDocument
+from services.collaboration_service import CollaborationService
+from services.notification_service import NotificationService
+
+
+@pytest.fixture
+def memory_repository(bind_memory_repository):
+    """Repository backed by an in-memory container, shared with the services."""
+    return bind_memory_repository("services.collaboration_service", "services.notification_service")
+
+
+def poll(pk, status="active", votes=None, result=None):
+    """Build a poll of trip_1."""
+    return PollDocument(
+        pk=pk, trip_id="trip_1", creator_id="u1", title="Where?", status=status, votes=votes or {}, result=result
+    )
+
+
+class TestCountBy:
+    """Test cases for CosmosRepository.count_by."""
+
+    @pytest.mark.asyncio
+    async def test_merges_groups_across_partitions(self, memory_repository):
+        """Groups with the same key in different partitions are summed."""
+        await memory_repository.create(poll("trip_trip_1"))
+        await memory_repository.create(poll("poll_trip_1"))
+        await memory_repository.create(poll("poll_trip_1", status="closed"))
+
+        groups = await memory_repository.count_by(
+            PollStatusCount, "c.entity_type = 'poll'", partition_keys=["trip_trip_1", "poll_trip_1"]
+        )
+
+        assert {(g.status, g.count) for g in groups} == {("active", 2), ("closed", 1)}
+
+    @pytest.mark.asyncio
+    async def test_requires_partition_keys(self, memory_repository):
+        """GROUP BY never fans out across the container."""
+        with pytest.raises(ValueError):
+            await memory_repository.count_by(PollStatusCount, "c.entity_type = 'poll'")
+
+
+class TestSummaries:
+    """Test cases for summaries computed in Cosmos DB."""
+
+    @pytest.mark.asyncio
+    async def test_consensus_status(self, memory_repository):
+        """Counts statuses and distinct voters across migrated and legacy polls."""
+        await memory_repository.create(poll("trip_trip_1", votes={"u1": {}, "u2": {}}))
+        await memory_repository.create(
+            poll("poll_trip_1", status="closed", votes={"u2": {}, "u3": {}}, result={"is_tie": False})
+        )
+
+        status = await CollaborationService().get_consensus_status("trip_1")
+
+        assert status == {
+            "trip_id": "trip_1",
+            "total_polls": 2,
+            "active_polls": 1,
+            "closed_polls": 1,
+            "unique_voters": 3,
+            "consensus_reached": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_tied_poll_blocks_consensus(self, memory_repository):
+        """A closed poll without a clear winner means no consensus."""
+        await memory_repository.create(poll("trip_trip_1", status="closed", result={"is_tie": False}))
+        await memory_repository.create(poll("trip_trip_1", status="closed", result={"is_tie": True}))
+
+        status = await CollaborationService().get_consensus_status("trip_1")
+
+        assert status["consensus_reached"] is False
+
+    @pytest.mark.asyncio
+    async def test_inbox_summary(self, memory_repository):
+        """Totals and unread counts per type come from one grouped query."""
+        for notification_type, is_read in (("poll_created", False), ("poll_created", False), ("trip_updated", True)):
+            await memory_repository.create(
+                NotificationDocument(
+                    pk="notification_u1",
+                    user_id="u1",
+                    title="Update",
+                    body="Something changed",
+                    notification_type=notification_type,
+                    is_read=is_read,
+                )
+            )
+
+        summary = await NotificationService().get_inbox_summary("u1")
+
+        assert summary == {"total": 3, "unread": 2, "unread_by_type": {"poll_created": 2}}
+        assert await NotificationService().get_unread_count("u1") == 2
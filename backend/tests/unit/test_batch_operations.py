@@ -0,0 +1,75 @@
+"""Unit tests for transactional batch and bulk operations in CosmosRepository."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+
+from models.documents import MessageDocument
+from repositories.cosmos_repository import BatchOperation
+
+
+def message(msg_id, user_id="user_1"):
+    """Build a message document in the user's partition."""
+    return MessageDocument(
+        id=msg_id, pk=f"message_{user_id}", trip_id="", user_id=user_id, user_name="User", content="hi"
+    )
+
+
+class TestExecuteBatch:
+    """Test cases for execute_batch."""
+
+    @pytest.mark.asyncio
+    async def test_sends_one_batch_and_hydrates_results(self, cosmos_repository, mock_cosmos_container):
+        """Operations go out as a single SDK batch and results come back in order."""
+        first, second = message("m1"), message("m2")
+        mock_cosmos_container.execute_item_batch = AsyncMock(
+            return_value=[
+                {"statusCode": 201, "resourceBody": first.model_dump(mode="json")},
+                {"statusCode": 201, "resourceBody": second.model_dump(mode="json")},
+                {"statusCode": 204},
+            ]
+        )
+
+        results = await cosmos_repository.execute_batch(
+            "message_user_1",
+            [
+                BatchOperation.create(first),
+                BatchOperation.create(second),
+                BatchOperation.delete("m0", "message_user_1"),
+            ],
+        )
+
+        kwargs = mock_cosmos_container.execute_item_batch.call_args.kwargs
+        assert [entry[0] for entry in kwargs["batch_operations"]] == ["create", "create", "delete"]
+        assert kwargs["partition_key"] == "message_user_1"
+        assert [result.id if result else None for result in results] == ["m1", "m2", None]
+
+    @pytest.mark.asyncio
+    async def test_rejects_operations_from_other_partitions(self, cosmos_repository, mock_cosmos_container):
+        """A transactional batch cannot span logical partitions."""
+        mock_cosmos_container.execute_item_batch = AsyncMock()
+
+        with pytest.raises(ValueError):
+            await cosmos_repository.execute_batch(
+                "message_user_1", [BatchOperation.create(message("m1")), BatchOperation.create(message("m2", "user_2"))]
+            )
+
+        mock_cosmos_container.execute_item_batch.assert_not_called()
+
+
+class TestBulk:
+    """Test cases for bulk."""
+
+    @pytest.mark.asyncio
+    async def test_reports_failures_per_item(self, cosmos_repository, mock_cosmos_container):
+        """One failed operation does not abort the others."""
+        mock_cosmos_container.delete_item = AsyncMock(side_effect=[None, CosmosResourceNotFoundError(), None])
+
+        results = await cosmos_repository.bulk(
+            [BatchOperation.delete(f"m{i}", f"message_user_{i}") for i in range(3)], concurrency=2
+        )
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert isinstance(results[1].error, CosmosResourceNotFoundError)
+        assert mock_cosmos_container.delete_item.await_count == 3
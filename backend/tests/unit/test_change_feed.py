@@ -0,0 +1,161 @@
+"""Unit tests for the change feed processor."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from models.documents import LeaseDocument, NotificationDocument, PollDocument, TripDocument, utc_now
+from repositories.change_feed import ChangeFeedProcessor
+from services.change_handlers import push_poll_change
+from services.realtime_service import RealtimeEvents
+
+
+@pytest.fixture
+def memory_repository(bind_memory_repository):
+    """Repository backed by an in-memory container, shared with the processor."""
+    return bind_memory_repository("repositories.change_feed")
+
+
+def trip(title="Lake Week"):
+    """Build a trip document."""
+    return TripDocument(pk="trip_user_1", title=title, organizer_user_id="user_1")
+
+
+class TestChangeFeedProcessor:
+    """Test cases for ChangeFeedProcessor."""
+
+    @pytest.mark.asyncio
+    async def test_dispatches_typed_changes_once(self, memory_repository):
+        """Each change reaches its handler as a model, and a checkpointed change is not redelivered."""
+        processor = ChangeFeedProcessor("test")
+        seen = []
+
+        @processor.handler(TripDocument)
+        async def on_trip(changed: TripDocument) -> None:
+            seen.append(changed)
+
+        await processor.run_once()
+        created = await memory_repository.create(trip())
+        first = await processor.run_once()
+        second = await processor.run_once()
+
+        assert [t.id for t in seen] == [created.id]
+        assert isinstance(seen[0], TripDocument)
+        assert first.checkpointed is True
+        assert second.handled == 0
+        assert second.checkpointed is False
+
+    @pytest.mark.asyncio
+    async def test_delivers_latest_version(self, memory_repository):
+        """Writes between runs arrive as the latest version of the document."""
+        processor = ChangeFeedProcessor("test")
+        handler = AsyncMock()
+        processor.handler(TripDocument)(handler)
+
+        await processor.run_once()
+        created = await memory_repository.create(trip())
+        await processor.run_once()
+        created.title = "Renamed"
+        await memory_repository.update(created)
+        created.title = "Renamed again"
+        await memory_repository.update(created)
+        await processor.run_once()
+
+        assert handler.await_count == 2
+        assert handler.await_args.args[0].title == "Renamed again"
+
+    @pytest.mark.asyncio
+    async def test_failed_handler_does_not_block_the_feed(self, memory_repository):
+        """A handler error is counted and the checkpoint still advances."""
+        processor = ChangeFeedProcessor("test")
+        processor.handler(TripDocument)(AsyncMock(side_effect=RuntimeError("push failed"), __name__="push"))
+
+        await processor.run_once()
+        await memory_repository.create(trip())
+        first = await processor.run_once()
+        second = await processor.run_once()
+
+        assert first.failed == 1
+        assert first.checkpointed is True
+        assert second.handled == 0
+
+    @pytest.mark.asyncio
+    async def test_new_lease_starts_at_the_end_of_the_feed(self, memory_repository):
+        """Changes written before the first run are not replayed; later ones are delivered."""
+        processor = ChangeFeedProcessor("test")
+        handler = AsyncMock()
+        processor.handler(TripDocument)(handler)
+
+        await memory_repository.create(trip("Before"))
+        first = await processor.run_once()
+        await memory_repository.create(trip("After"))
+        await processor.run_once()
+
+        assert first.checkpointed is True
+        assert [call.args[0].title for call in handler.await_args_list] == ["After"]
+
+    @pytest.mark.asyncio
+    async def test_unhandled_changes_move_the_checkpoint(self, memory_repository):
+        """Runs made only of unhandled changes still advance, so a handled change behind them arrives."""
+        processor = ChangeFeedProcessor("test", page_size=10, max_pages=3)
+        handler = AsyncMock()
+        processor.handler(TripDocument)(handler)
+
+        await processor.run_once()
+        for _ in range(40):
+            await memory_repository.create(
+                NotificationDocument(
+                    pk="notification_u1", user_id="u1", title="Hi", body="Hello", notification_type="x"
+                )
+            )
+        await memory_repository.create(trip())
+        first = await processor.run_once()
+        second = await processor.run_once()
+        idle = await processor.run_once()
+
+        assert (first.handled, first.checkpointed) == (0, True)
+        assert second.handled == 1
+        assert handler.await_count == 1
+        assert idle.checkpointed is False
+
+    @pytest.mark.asyncio
+    async def test_dispatches_trigger_batches_without_a_lease(self, memory_repository):
+        """A batch delivered by the Cosmos DB trigger reaches its handlers and writes no lease."""
+        processor = ChangeFeedProcessor("test")
+        handler = AsyncMock()
+        processor.handler(TripDocument)(handler)
+        created = await memory_repository.create(trip())
+        unhandled = {"id": "n1", "entity_type": "notification"}
+
+        run = await processor.dispatch([created.model_dump(mode="json"), unhandled])
+
+        assert (run.changes, run.handled) == (2, 1)
+        assert handler.await_args.args[0].id == created.id
+        assert await memory_repository.get_by_id(processor.lease_id, processor.lease_id, LeaseDocument) is None
+
+
+class TestChangeHandlers:
+    """Test cases for the side-effect handlers."""
+
+    @pytest.mark.asyncio
+    async def test_expired_poll_pushes_close(self, monkeypatch):
+        """A poll closed after its expiry is announced as expired."""
+        realtime = MagicMock(send_to_group=AsyncMock())
+        monkeypatch.setattr("services.change_handlers.get_realtime_service", lambda: realtime)
+        poll = PollDocument(
+            pk="poll_trip_1",
+            trip_id="trip_1",
+            creator_id="user_1",
+            title="Where?",
+            status="closed",
+            expires_at=utc_now() - timedelta(hours=1),
+            version=2,
+        )
+
+        await push_poll_change(poll)
+
+        kwargs = realtime.send_to_group.await_args.kwargs
+        assert kwargs["group_name"] == "trip_1"
+        assert kwargs["target"] == RealtimeEvents.POLL_CLOSED
+        assert kwargs["data"]["closed_reason"] == "expired"
@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from repositories.cosmos_repository import CosmosRepository
+from tests.conftest import AsyncIteratorMock
 
 # Skip all tests in this module - Phase 4 rewrite needed
 # Tests pass raw dicts to repository.create() but it now expects Pydantic models
@@ -153,21 +154,3 @@ class TestCosmosRepository:
 
         assert result["name"] == "Upserted Trip"
         mock_container.upsert_item.assert_called_once()
-
-
-class AsyncIteratorMock:
-    """Mock async iterator for query results."""
-
-    def __init__(self, items):
-        self.items = items
-        self.index = 0
-
-    def __aiter__(self):
-        return self
-
-    async def __anext__(self):
-        if self.index >= len(self.items):
-            raise StopAsyncIteration
-        item = self.items[self.index]
-        self.index += 1
-        return item
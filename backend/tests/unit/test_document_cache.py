@@ -0,0 +1,106 @@
+"""Unit tests for the read-through document cache."""
+
+import pytest
+
+from models.documents import TripDocument
+from repositories.cosmos_repository import ConcurrencyConflictError, PatchOperation
+from repositories.document_cache import DocumentCache
+from repositories.memory_container import MemoryContainer
+
+
+class CountingContainer(MemoryContainer):
+    """In-memory container that records point-read outcomes."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+
+    async def read_item(self, item, partition_key, **kwargs):
+        result = await super().read_item(item, partition_key, **kwargs)
+        self.reads.append("304" if not result else "200")
+        return result
+
+
+@pytest.fixture
+def container(cosmos_repository):
+    """Bind the repository to a counting in-memory container."""
+    container = CountingContainer()
+    cosmos_repository.use_container(container)
+    return container
+
+
+async def create_trip(repo):
+    """Create a trip through the repository."""
+    return await repo.create(TripDocument(pk="trip_user_1", title="Lake Week", organizer_user_id="user_1"))
+
+
+class TestDocumentCache:
+    """Test cases for DocumentCache."""
+
+    def test_evicts_least_recently_used(self):
+        """The oldest untouched entry goes first once the cache is full."""
+        cache = DocumentCache(max_entries=2, ttl_seconds=60)
+        cache.put(("a", "pk"), {"id": "a"})
+        cache.put(("b", "pk"), {"id": "b"})
+        cache.lookup(("a", "pk"))
+        cache.put(("c", "pk"), {"id": "c"})
+
+        assert cache.lookup(("b", "pk")) is None
+        assert cache.lookup(("a", "pk")) is not None
+        assert cache.evictions == 1
+
+
+class TestRepositoryReadThrough:
+    """Test cases for cached point reads in CosmosRepository."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served_from_memory(self, cosmos_repository, container):
+        """A second read within the TTL does not reach the container."""
+        cosmos_repository._document_cache = DocumentCache(max_entries=10, ttl_seconds=60)
+        trip = await create_trip(cosmos_repository)
+
+        first = await cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument)
+        first.title = "Mutated by caller"
+        second = await cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument)
+
+        assert container.reads == ["200"]
+        assert second.title == "Lake Week"
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_revalidated_with_etag(self, cosmos_repository, container):
+        """After the TTL an unchanged document is confirmed with a 304."""
+        cosmos_repository._document_cache = DocumentCache(max_entries=10, ttl_seconds=0)
+        trip = await create_trip(cosmos_repository)
+
+        await cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument)
+        cached = await cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument)
+
+        assert container.reads == ["200", "304"]
+        assert cached.etag == trip.etag
+
+    @pytest.mark.asyncio
+    async def test_writes_refresh_the_entry(self, cosmos_repository, container):
+        """A write through this instance is visible to the next cached read."""
+        cosmos_repository._document_cache = DocumentCache(max_entries=10, ttl_seconds=60)
+        trip = await create_trip(cosmos_repository)
+        await cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument)
+
+        await cosmos_repository.patch(trip.id, trip.pk, [PatchOperation.set("/status", "active")], TripDocument)
+        reread = await cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument)
+
+        assert reread.status == "active"
+        assert container.reads == ["200"]
+
+    @pytest.mark.asyncio
+    async def test_conflict_evicts_the_entry(self, cosmos_repository, container):
+        """A lost conditional write drops the stale copy so a retry re-reads the store."""
+        cosmos_repository._document_cache = DocumentCache(max_entries=10, ttl_seconds=60)
+        trip = await create_trip(cosmos_repository)
+        stale = await cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument)
+        await container.patch_item(trip.id, trip.pk, [{"op": "set", "path": "/title", "value": "Changed elsewhere"}])
+
+        with pytest.raises(ConcurrencyConflictError):
+            await cosmos_repository.update(stale, conditional=True)
+        reread = await cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument)
+
+        assert reread.title == "Changed elsewhere"
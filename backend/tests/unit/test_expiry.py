@@ -0,0 +1,79 @@
+"""Unit tests for per-document TTL stamping."""
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from models.documents import InvitationDocument, MessageDocument, NotificationDocument, utc_now
+from repositories.cosmos_repository import BatchOperation
+from repositories.expiry import DAY_SECONDS, INVITATION_GRACE_DAYS, MESSAGE_RETENTION_DAYS
+from repositories.memory_container import MemoryContainer
+from services.notification_service import NotificationService
+
+
+@pytest.fixture
+def container():
+    """Create an empty in-memory container."""
+    return MemoryContainer()
+
+
+@pytest.fixture
+def memory_repository(bind_memory_repository, container):
+    """Repository backed by an in-memory container, shared with the notification service."""
+    return bind_memory_repository("services.notification_service", container=container)
+
+
+def notification(user_id="u1"):
+    """Build an unread notification."""
+    return NotificationDocument(
+        pk=f"notification_{user_id}", user_id=user_id, title="Hi", body="Hello", notification_type="poll_created"
+    )
+
+
+class TestExpiry:
+    """Test cases for ttl stamping and expiry."""
+
+    @pytest.mark.asyncio
+    async def test_read_notification_expires(self, memory_repository, container):
+        """Unread notifications stay; marking one read starts its retention period."""
+        created = await memory_repository.create(notification())
+        assert created.ttl is None
+
+        read = await NotificationService().mark_as_read(created.id, "u1")
+        container.expire(now=time.time() + 29 * DAY_SECONDS)
+        still_there = await memory_repository.get_by_id(created.id, created.pk, NotificationDocument)
+        container.expire(now=time.time() + 31 * DAY_SECONDS)
+
+        assert read.ttl == 30 * DAY_SECONDS
+        assert still_there is not None
+        assert len(container) == 0
+
+    @pytest.mark.asyncio
+    async def test_messages_written_in_batches_carry_ttl(self, memory_repository):
+        """The ttl is stamped on batch writes too."""
+        message = MessageDocument(
+            pk="message_u1", trip_id="", user_id="u1", user_name="User", content="Hi", message_type="user"
+        )
+
+        (created,) = await memory_repository.execute_batch("message_u1", [BatchOperation.create(message)])
+
+        assert created.ttl == MESSAGE_RETENTION_DAYS * DAY_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_invitation_expires_after_grace_period(self, memory_repository):
+        """Invitations live until their grace period past expiry has run out."""
+        invitation = InvitationDocument(
+            pk="invitation_f1",
+            family_id="f1",
+            family_name="Family",
+            inviter_id="u1",
+            inviter_name="User",
+            email="guest@example.com",
+            expires_at=utc_now() + timedelta(days=7),
+        )
+
+        created = await memory_repository.create(invitation)
+
+        expected = (7 + INVITATION_GRACE_DAYS) * DAY_SECONDS
+        assert expected - 5 <= created.ttl <= expected
@@ -0,0 +1,68 @@
+"""Unit tests for trusted document hydration."""
+
+import pytest
+from pydantic import ValidationError
+
+from models.documents import ItineraryDocument, PollDocument, TripDocument
+from models.projections import PollSummary
+from repositories.hydration import Hydrator
+
+
+def stored(document):
+    """Serialize a document as Cosmos DB returns it."""
+    return document.model_dump(mode="json") | {"_etag": '"etag-1"', "_ts": 1_700_000_000, "_rid": "abc"}
+
+
+class TestHydrator:
+    """Test cases for Hydrator."""
+
+    @pytest.mark.parametrize(
+        "document",
+        [
+            TripDocument(pk="trip_user_1", title="Lake Week", organizer_user_id="user_1", budget=100),
+            PollDocument(pk="poll_trip_1", trip_id="trip_1", creator_id="user_1", title="Where?", votes={"u": {}}),
+            ItineraryDocument(pk="itinerary_trip_1", trip_id="trip_1", title="Plan", days=[{"day": 1}]),
+        ],
+    )
+    def test_trusted_matches_validated(self, document):
+        """Trusted hydration builds the same model validation would."""
+        raw = stored(document)
+
+        trusted = Hydrator(trusted=True).one(type(document), raw)
+
+        assert trusted == type(document).model_validate(raw)
+        assert trusted.etag == '"etag-1"'
+        assert trusted.created_at == document.created_at
+
+    def test_projections_fill_defaults(self):
+        """Fields missing from a projection row take their defaults."""
+        raw = {"id": "p1", "entity_type": "poll", "trip_id": "t1", "creator_id": "u1", "title": "Where?"}
+        raw["created_at"] = "2026-01-01T00:00:00Z"
+
+        summary = Hydrator(trusted=True).one(PollSummary, raw)
+
+        assert summary.vote_count == 0
+        assert summary.options == []
+
+    def test_missing_required_field_still_fails(self):
+        """Documents that could not have come from a model are rejected."""
+        with pytest.raises(ValidationError):
+            Hydrator(trusted=True).one(TripDocument, {"id": "t1", "pk": "trip_user_1", "entity_type": "trip"})
+
+    def test_untrusted_pages_are_validated_in_one_batch(self):
+        """With trust disabled, a page is validated through the list adapter."""
+        raws = [stored(TripDocument(pk="trip_user_1", title=f"Trip {i}", organizer_user_id="u")) for i in range(3)]
+        raws[1]["budget"] = "not a number"
+
+        with pytest.raises(ValidationError):
+            Hydrator(trusted=False).many(TripDocument, raws)
+
+    def test_echo_reuses_sent_document(self):
+        """A write echo carries the new ETag without rebuilding the document."""
+        trip = TripDocument(pk="trip_user_1", title="Lake Week", organizer_user_id="user_1")
+
+        echoed = Hydrator(trusted=True).echo(trip, stored(trip) | {"_etag": '"etag-2"'})
+
+        assert echoed.etag == '"etag-2"'
+        assert echoed.title == trip.title
+        assert echoed is not trip
@@ -0,0 +1,98 @@
+"""Unit tests for identity caching in get_or_create_user."""
+
+import pytest
+
+from core.identity_cache import IdentityCache
+from core.security import get_or_create_user
+from models.documents import UserDocument
+from models.schemas import FamilyCreate
+from repositories.memory_container import MemoryContainer
+from repositories.metrics import begin_request_summary, end_request_summary
+from services.family_service import FamilyService
+
+
+@pytest.fixture
+def container():
+    """Create an empty in-memory container."""
+    return MemoryContainer()
+
+
+@pytest.fixture
+def identity_cache(bind_memory_repository, container, monkeypatch):
+    """Fresh identity cache in front of a memory-backed repository."""
+    bind_memory_repository(
+        "core.security", "services.family_service", "services.membership_service", container=container
+    )
+    cache = IdentityCache(max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr("core.security.identity_cache", cache)
+    monkeypatch.setattr("core.identity_cache.identity_cache", cache)
+    return cache
+
+
+def claims(subject="entra-1", name="One"):
+    """Build validated token claims."""
+    return {"sub": subject, "email": f"{subject}@example.com", "name": name}
+
+
+class TestIdentityCache:
+    """Test cases for identity resolution."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_requests_skip_the_database(self, identity_cache, cosmos_repository):
+        """A known subject is point-read once and then served from the cache."""
+        await cosmos_repository.create(
+            UserDocument(id="entra-1", pk="user_entra-1", entra_id="entra-1", email="entra-1@example.com", name="One")
+        )
+
+        token = begin_request_summary("sign_in")
+        first = await get_or_create_user(claims())
+        second = await get_or_create_user(claims())
+        summary = end_request_summary(token)
+
+        assert first.id == second.id == "entra-1"
+        assert list(summary.operations) == ["read.user"]
+        assert summary.operation_count == 1
+        assert identity_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_legacy_user_is_found_by_entra_id(self, identity_cache, cosmos_repository):
+        """Accounts with a random ID are still resolved, from their own partition."""
+        await cosmos_repository.create(
+            UserDocument(id="random-id", pk="user_entra-2", entra_id="entra-2", email="entra-2@example.com")
+        )
+
+        token = begin_request_summary("sign_in")
+        user = await get_or_create_user(claims("entra-2", name=""))
+        summary = end_request_summary(token)
+
+        assert user.id == "random-id"
+        assert summary.operations["query.user"].cross_partition == 0
+
+    @pytest.mark.asyncio
+    async def test_profile_writes_invalidate_the_entry(self, identity_cache):
+        """Joining a family and a changed name are visible on the next request."""
+        user = await get_or_create_user(claims())
+        family = await FamilyService().create_family(FamilyCreate(name="Family"), user)
+
+        member = await get_or_create_user(claims())
+        renamed = await get_or_create_user(claims(name="Renamed"))
+
+        assert member.family_ids == [family.id]
+        assert renamed.name == "Renamed"
+        assert (await get_or_create_user(claims(name="Renamed"))).name == "Renamed"
+        assert identity_cache.stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_claim_change_keeps_writes_made_elsewhere(self, identity_cache, cosmos_repository):
+        """A renamed user is written over the stored copy, not over the cached one."""
+        user = await get_or_create_user(claims())
+        # Another instance adds the user to a family while this one still caches the old copy
+        stored = await cosmos_repository.get_by_id(user.id, user.pk, UserDocument)
+        stored.family_ids.append("family-1")
+        await cosmos_repository.update(stored)
+
+        renamed = await get_or_create_user(claims(name="Renamed"))
+
+        assert renamed.name == "Renamed"
+        assert renamed.family_ids == ["family-1"]
+        assert (await cosmos_repository.get_by_id(user.id, user.pk, UserDocument)).family_ids == ["family-1"]
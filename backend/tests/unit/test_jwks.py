@@ -0,0 +1,127 @@
+"""Unit tests for the async JWKS provider."""
+
+import asyncio
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from core.jwks import JwksProvider
+
+JWKS_URL = "https://login.example.com/keys"
+
+
+def public_jwk(kid):
+    """Build the public JWK of a fresh RSA key."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key(), as_dict=True)
+    return {**jwk, "kid": kid, "use": "sig", "alg": "RS256"}
+
+
+class StandInEndpoint:
+    """Local JWKS endpoint served through an httpx transport."""
+
+    def __init__(self, *kids):
+        self.keys = [public_jwk(kid) for kid in kids]
+        self.requests = 0
+        self.failing = False
+
+    async def handle(self, request):
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        if self.failing:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"keys": self.keys})
+
+    def provider(self, **kwargs):
+        return JwksProvider(JWKS_URL, transport=httpx.MockTransport(self.handle), **kwargs)
+
+
+class TestJwksProvider:
+    """Test cases for JwksProvider."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_fetch(self):
+        """Keys are indexed by kid and a cold start fetches the key set once."""
+        endpoint = StandInEndpoint("k1", "k2")
+        provider = endpoint.provider()
+
+        keys = await asyncio.gather(*(provider.get_signing_key(kid) for kid in ["k1", "k2"] * 5))
+
+        assert endpoint.requests == 1
+        assert {key.key_id for key in keys} == {"k1", "k2"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refreshes_once_per_interval(self):
+        """A rotated-in key is picked up; unknown kids cannot force fetches back to back."""
+        endpoint = StandInEndpoint("k1")
+        provider = endpoint.provider(min_refresh_interval=0)
+        await provider.get_signing_key("k1")
+        endpoint.keys.append(public_jwk("k2"))
+
+        rotated = await provider.get_signing_key("k2")
+        provider.min_refresh_interval = 60
+        with pytest.raises(jwt.PyJWKClientError):
+            await provider.get_signing_key("unknown")
+
+        assert rotated.key_id == "k2"
+        assert endpoint.requests == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_last_known_good_keys(self):
+        """Keys keep being served while the endpoint is down."""
+        endpoint = StandInEndpoint("k1")
+        provider = endpoint.provider(refresh_interval=0, min_refresh_interval=0)
+        await provider.get_signing_key("k1")
+        endpoint.failing = True
+
+        key = await provider.get_signing_key("k1")
+        await asyncio.sleep(0.05)
+
+        assert key.key_id == "k1"
+        assert endpoint.requests == 2
+        assert provider.stats()["failures"] == 1
+        assert (await provider.get_signing_key("k1")).key_id == "k1"
+
+    @pytest.mark.asyncio
+    async def test_stale_keys_refresh_in_background(self):
+        """Stale keys are served immediately while a refresh runs behind them."""
+        endpoint = StandInEndpoint("k1")
+        provider = endpoint.provider(refresh_interval=0, min_refresh_interval=0)
+        await provider.get_signing_key("k1")
+        endpoint.keys = [public_jwk("k1"), public_jwk("k2")]
+
+        await provider.get_signing_key("k1")
+        assert provider.stats()["keys"] == 1
+        await asyncio.sleep(0.05)
+
+        assert provider.stats()["keys"] == 2
+        assert endpoint.requests == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_background_refresh_backs_off(self):
+        """After a failed refresh, stale lookups do not start another fetch within the minimum interval."""
+        endpoint = StandInEndpoint("k1")
+        provider = endpoint.provider(refresh_interval=0, min_refresh_interval=0)
+        await provider.get_signing_key("k1")
+        endpoint.failing = True
+
+        await provider.get_signing_key("k1")
+        await asyncio.sleep(0.05)
+        provider.min_refresh_interval = 60
+        for _ in range(5):
+            assert (await provider.get_signing_key("k1")).key_id == "k1"
+            await asyncio.sleep(0.02)
+
+        assert endpoint.requests == 2
+        assert provider.stats()["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cold_start_failure_raises(self):
+        """Without any last known good keys a failed fetch is an error."""
+        endpoint = StandInEndpoint("k1")
+        endpoint.failing = True
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await endpoint.provider().get_signing_key("k1")
@@ -0,0 +1,167 @@
+"""Unit tests for the prompt-response cache behind itinerary generation."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from models.documents import PromptCacheDocument, TripDocument, utc_now
+from repositories.partitioning import trip_partition_key
+from services.itinerary_service import ItineraryService
+from services.llm.cache import PromptCache, prompt_partition_key
+from services.llm.client import LLMClient
+
+RESPONSE = {"content": '{"summary": "Beaches", "days": []}', "tokens_used": 1200, "cost": 0.0004, "model": "m"}
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """LLM client stand-in answering every prompt with the same itinerary."""
+    complete = AsyncMock(return_value=dict(RESPONSE))
+    monkeypatch.setattr(LLMClient, "complete", complete)
+    return complete
+
+
+@pytest.fixture
+def prompt_cache(bind_memory_repository, monkeypatch, llm):
+    """Fresh prompt cache over a memory-backed repository shared with the itinerary service."""
+    bind_memory_repository("services.itinerary_service", "services.llm.cache")
+    cache = PromptCache(ttl_seconds=3600, max_entries=10, max_bytes=1024)
+    monkeypatch.setattr("services.itinerary_service.prompt_cache", cache)
+    return cache
+
+
+async def seed_trip(repository, trip_id="t1"):
+    """Create a trip to generate itineraries for."""
+    await repository.create(
+        TripDocument(
+            id=trip_id, pk=trip_partition_key(trip_id), title="Trip", destination="Goa", organizer_user_id="u1"
+        )
+    )
+
+
+class TestPromptCache:
+    """Test cases for cached itinerary generation."""
+
+    @pytest.mark.asyncio
+    async def test_identical_generation_is_served_from_cache(self, prompt_cache, cosmos_repository, llm):
+        """A second generation with the same prompt skips the model and records no spend."""
+        await seed_trip(cosmos_repository)
+        service = ItineraryService()
+
+        first = await service.generate_itinerary("t1", {"interests": ["food"]})
+        second = await service.generate_itinerary("t1", {"interests": ["food"]})
+
+        assert llm.await_count == 1
+        assert second.summary == first.summary == "Beaches"
+        assert (first.ai_cost_usd, second.ai_cost_usd) == (0.0004, 0.0)
+        stats = prompt_cache.stats()
+        assert (stats["hits"], stats["misses"], stats["tokens_saved"]) == (1, 1, 1200)
+        assert stats["cost_saved_usd"] == 0.0004
+
+    @pytest.mark.asyncio
+    async def test_entries_survive_instance_recycling(self, prompt_cache, llm):
+        """A new instance with an empty memory tier finds the response in Cosmos DB."""
+        await prompt_cache.complete(prompt="p", system_prompt="s")
+
+        recycled = PromptCache(ttl_seconds=3600, max_entries=10, max_bytes=1024)
+        response = await recycled.complete(prompt="  p\n", system_prompt="s ")
+        await recycled.complete(prompt="p", system_prompt="s")
+
+        assert llm.await_count == 1
+        assert response["cached"] is True
+        assert (recycled.stats()["store_hits"], recycled.stats()["memory_hits"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_fresh_bypasses_and_replaces_the_entry(self, prompt_cache, llm):
+        """fresh calls the model again and later lookups get the new response."""
+        await prompt_cache.complete(prompt="p")
+        llm.return_value = {**RESPONSE, "content": "new"}
+
+        refreshed = await prompt_cache.complete(prompt="p", fresh=True)
+        prompt_cache.clear()
+        cached = await prompt_cache.complete(prompt="p")
+
+        assert llm.await_count == 2
+        assert refreshed["content"] == cached["content"] == "new"
+        assert prompt_cache.stats()["bypasses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_model_parameters_are_part_of_the_key(self, prompt_cache, llm):
+        """A different temperature or model is a different request."""
+        await prompt_cache.complete(prompt="p", temperature=0.7)
+        await prompt_cache.complete(prompt="p", temperature=0.2)
+
+        assert llm.await_count == 2
+        assert PromptCache.key("a  b", None, "m", 10, 0.7, False) == PromptCache.key("a b\n", "", "m", 10, 0.7, False)
+        assert PromptCache.key("a", None, "m", 10, 0.7, False) != PromptCache.key("a", None, "n", 10, 0.7, False)
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_not_served(self, prompt_cache, cosmos_repository, llm):
+        """Entries past their expiry are regenerated even before ttl deletion removes them."""
+        key = PromptCache.key("p", None, LLMClient().model, 2000, 0.7, False)
+        document = await cosmos_repository.upsert(
+            PromptCacheDocument(
+                id=key,
+                pk=prompt_partition_key(key),
+                model="m",
+                content="old",
+                expires_at=utc_now() - timedelta(seconds=1),
+            )
+        )
+
+        response = await prompt_cache.complete(prompt="p")
+
+        assert document.ttl == 1
+        assert response["content"] == RESPONSE["content"]
+        assert llm.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_tier_is_bounded_by_bytes(self, prompt_cache, llm):
+        """The least recently used responses are evicted once the byte budget is exceeded."""
+        llm.return_value = {**RESPONSE, "content": "x" * 400}
+        for prompt in ("a", "b", "c"):
+            await prompt_cache.complete(prompt=prompt)
+
+        stats = prompt_cache.stats()
+        assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 800, 1)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self, prompt_cache, llm):
+        """Requests arriving while the model is answering wait for that answer."""
+        release = asyncio.Event()
+
+        async def slow_complete(**kwargs):
+            await release.wait()
+            return dict(RESPONSE)
+
+        llm.side_effect = slow_complete
+        calls = [asyncio.create_task(prompt_cache.complete(prompt="p")) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(*calls)
+
+        assert llm.await_count == 1
+        assert [response["cached"] for response in responses] == [False, True, True]
+        assert prompt_cache.stats()["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fresh_requests_share_one_call(self, prompt_cache, llm):
+        """A double-clicked regenerate skips the stored entry but still makes one model call."""
+        await prompt_cache.complete(prompt="p")
+        release = asyncio.Event()
+
+        async def slow_complete(**kwargs):
+            await release.wait()
+            return {**RESPONSE, "content": "new"}
+
+        llm.side_effect = slow_complete
+        calls = [asyncio.create_task(prompt_cache.complete(prompt="p", fresh=True)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(*calls)
+
+        assert llm.await_count == 2
+        assert [response["content"] for response in responses] == ["new", "new"]
+        assert prompt_cache.stats()["coalesced"] == 1
@@ -0,0 +1,213 @@
+"""Unit tests for the membership index behind trip authorization."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from models.documents import InvitationDocument, MembershipDocument, UserDocument, utc_now
+from models.schemas import FamilyCreate, TripCreate
+from repositories.metrics import begin_request_summary, end_request_summary
+from services.family_service import FamilyService
+from services.membership_service import MembershipService
+from services.trip_service import TripService
+
+
+@pytest.fixture
+def membership(bind_memory_repository, monkeypatch):
+    """Fresh membership service over a memory-backed repository shared with the services."""
+    bind_memory_repository("services.family_service", "services.trip_service", "services.membership_service")
+    service = MembershipService(max_entries=10, ttl_seconds=60)
+    for target in ("services.family_service", "services.trip_service"):
+        monkeypatch.setattr(f"{target}.get_membership_service", lambda: service)
+    return service
+
+
+async def create_user(repository, user_id):
+    """Create a user keyed by its Entra ID."""
+    return await repository.create(
+        UserDocument(id=user_id, pk=f"user_{user_id}", entra_id=user_id, email=f"{user_id}@example.com")
+    )
+
+
+async def invite(repository, family, user):
+    """Invite a user to a family."""
+    return await repository.create(
+        InvitationDocument(
+            pk=f"invitation_{family.id}",
+            family_id=family.id,
+            family_name=family.name,
+            inviter_id=family.admin_user_id,
+            inviter_name="Admin",
+            email=user.email,
+            expires_at=utc_now() + timedelta(days=7),
+        )
+    )
+
+
+async def join(repository, family, user):
+    """Invite a user to a family and accept the invitation."""
+    invitation = await invite(repository, family, user)
+    return await FamilyService().accept_invitation(invitation.token, user)
+
+
+class TestMembership:
+    """Test cases for trip access through the membership index."""
+
+    @pytest.mark.asyncio
+    async def test_family_membership_grants_and_revokes_access(self, membership, cosmos_repository):
+        """Members of a participating family have access, others do not."""
+        organizer = await create_user(cosmos_repository, "u1")
+        guest = await create_user(cosmos_repository, "u2")
+        family = await FamilyService().create_family(FamilyCreate(name="Family"), organizer)
+        trip = await TripService().create_trip(
+            TripCreate(title="Trip", participating_family_ids=[family.id]), organizer
+        )
+
+        assert await TripService().user_has_access(trip, organizer.id)
+        assert not await TripService().user_has_access(trip, guest.id)
+
+        await join(cosmos_repository, family, guest)
+        assert await TripService().user_has_access(trip, guest.id)
+
+        trip = await TripService().remove_family_from_trip(trip.id, family.id, organizer)
+        assert not await TripService().user_has_access(trip, guest.id)
+
+    @pytest.mark.asyncio
+    async def test_removing_a_family_keeps_members_of_another(self, membership, cosmos_repository):
+        """Only members who no longer reach the trip through any participating family lose it."""
+        organizer = await create_user(cosmos_repository, "u1")
+        both = await create_user(cosmos_repository, "u2")
+        leaving = await create_user(cosmos_repository, "u3")
+        first = await FamilyService().create_family(FamilyCreate(name="First"), organizer)
+        second = await FamilyService().create_family(FamilyCreate(name="Second"), organizer)
+        await join(cosmos_repository, first, both)
+        await join(cosmos_repository, second, both)
+        await join(cosmos_repository, first, leaving)
+        trip = await TripService().create_trip(
+            TripCreate(title="Trip", participating_family_ids=[first.id, second.id]), organizer
+        )
+
+        await TripService().remove_family_from_trip(trip.id, first.id, organizer)
+
+        assert trip.id in (await membership.get_access(organizer.id, fresh=True)).trip_ids
+        assert trip.id in (await membership.get_access(both.id, fresh=True)).trip_ids
+        assert trip.id not in (await membership.get_access(leaving.id, fresh=True)).trip_ids
+
+    @pytest.mark.asyncio
+    async def test_revocation_reaches_other_instances_within_the_ttl(self, membership, cosmos_repository):
+        """Another instance grants from its cached set until it expires, then sees the revocation."""
+        other_instance = MembershipService(max_entries=10, ttl_seconds=0.05)
+        organizer = await create_user(cosmos_repository, "u1")
+        guest = await create_user(cosmos_repository, "u2")
+        family = await FamilyService().create_family(FamilyCreate(name="Family"), organizer)
+        trip = await TripService().create_trip(
+            TripCreate(title="Trip", participating_family_ids=[family.id]), organizer
+        )
+        await join(cosmos_repository, family, guest)
+        assert await other_instance.user_has_access(trip, guest.id)
+
+        trip = await TripService().remove_family_from_trip(trip.id, family.id, organizer)
+        assert await other_instance.user_has_access(trip, guest.id)
+
+        await asyncio.sleep(0.06)
+        assert not await other_instance.user_has_access(trip, guest.id)
+
+    @pytest.mark.asyncio
+    async def test_trip_created_for_a_family_is_indexed_for_its_members(self, membership, cosmos_repository):
+        """Existing members see a new trip of their family from the cached index, with no reads."""
+        organizer = await create_user(cosmos_repository, "u1")
+        member = await create_user(cosmos_repository, "u2")
+        family = await FamilyService().create_family(FamilyCreate(name="Family"), organizer)
+        await join(cosmos_repository, family, member)
+        trip = await TripService().create_trip(
+            TripCreate(title="Trip", participating_family_ids=[family.id]), organizer
+        )
+
+        assert trip.id in (await membership.get_access(member.id, fresh=True)).trip_ids
+
+        token = begin_request_summary("get_trip")
+        allowed = await TripService().user_has_access(trip, member.id)
+        summary = end_request_summary(token)
+
+        assert allowed
+        assert summary.operation_count == 0
+
+    @pytest.mark.asyncio
+    async def test_missing_trip_is_repaired_from_families(self, membership, cosmos_repository):
+        """A trip missing from the index is still allowed through the user's families, and indexed."""
+        organizer = await create_user(cosmos_repository, "u1")
+        member = await create_user(cosmos_repository, "u2")
+        family = await FamilyService().create_family(FamilyCreate(name="Family"), organizer)
+        await join(cosmos_repository, family, member)
+        trip = await TripService().create_trip(
+            TripCreate(title="Trip", participating_family_ids=[family.id]), organizer
+        )
+        # An index written by a rebuild that raced the trip's creation
+        await cosmos_repository.upsert(
+            MembershipDocument(id=member.id, pk=f"membership_{member.id}", user_id=member.id, family_ids=[family.id])
+        )
+        membership.invalidate(member.id)
+
+        allowed = await membership.user_has_access(trip, member.id)
+
+        assert allowed
+        assert trip.id in (await membership.get_access(member.id)).trip_ids
+
+    @pytest.mark.asyncio
+    async def test_join_with_stale_user_copy_keeps_earlier_families(self, membership, cosmos_repository):
+        """The index is built from the stored families, not from an outdated copy of the user."""
+        organizer = await create_user(cosmos_repository, "u1")
+        member = await create_user(cosmos_repository, "u2")
+        first = await FamilyService().create_family(FamilyCreate(name="First"), organizer)
+        second = await FamilyService().create_family(FamilyCreate(name="Second"), organizer)
+        trip = await TripService().create_trip(TripCreate(title="Trip", participating_family_ids=[first.id]), organizer)
+        # A copy taken before the first join, as another instance's identity cache would hold it
+        stale = member.model_copy(deep=True)
+
+        await join(cosmos_repository, first, member)
+        await join(cosmos_repository, second, stale)
+
+        access = await membership.get_access(member.id, fresh=True)
+        assert access.family_ids == {first.id, second.id}
+        assert await TripService().user_has_access(trip, member.id)
+
+    @pytest.mark.asyncio
+    async def test_users_without_an_index_are_not_reported_as_missing(self, membership, cosmos_repository, caplog):
+        """Indexing a family for a user with no index yet is an expected no-op, not a warning."""
+        organizer = await create_user(cosmos_repository, "u1")
+
+        with caplog.at_level("WARNING"):
+            family = await FamilyService().create_family(FamilyCreate(name="Family"), organizer)
+
+        assert not [record for record in caplog.records if "not found" in record.getMessage()]
+        assert (await membership.get_access(organizer.id)).family_ids == {family.id}
+
+    @pytest.mark.asyncio
+    async def test_failed_join_leaves_the_invitation_pending(self, membership, cosmos_repository, monkeypatch):
+        """A membership write that fails does not spend the token, and the retry joins once."""
+        organizer = await create_user(cosmos_repository, "u1")
+        member = await create_user(cosmos_repository, "u2")
+        family = await FamilyService().create_family(FamilyCreate(name="Family"), organizer)
+        invitation = await invite(cosmos_repository, family, member)
+        patch_array_add = cosmos_repository.patch_array_add
+
+        async def failing_user_patch(document, field, value, **kwargs):
+            if field == "family_ids":
+                raise RuntimeError("user write failed")
+            return await patch_array_add(document, field, value, **kwargs)
+
+        monkeypatch.setattr(cosmos_repository, "patch_array_add", failing_user_patch)
+        with pytest.raises(RuntimeError):
+            await FamilyService().accept_invitation(invitation.token, member)
+        stored = await cosmos_repository.get_by_id(invitation.id, invitation.pk, InvitationDocument)
+        assert stored.status == "pending"
+
+        monkeypatch.setattr(cosmos_repository, "patch_array_add", patch_array_add)
+        joined = await FamilyService().accept_invitation(invitation.token, member)
+
+        assert joined.member_ids.count(member.id) == 1
+        assert joined.member_count == 2
+        assert (await membership.get_access(member.id, fresh=True)).family_ids == {family.id}
+        stored = await cosmos_repository.get_by_id(invitation.id, invitation.pk, InvitationDocument)
+        assert stored.status == "accepted"
@@ -0,0 +1,208 @@
+"""Unit tests for the in-memory Cosmos container and its SQL engine."""
+
+import pytest
+from azure.core import MatchConditions
+from azure.cosmos import exceptions
+
+from models.documents import TripDocument
+from repositories.cosmos_repository import BatchOperation, ConcurrencyConflictError, PatchOperation
+from repositories.memory_container import MemoryContainer
+
+
+def doc(doc_id, pk, **fields):
+    """Build a raw document."""
+    return {"id": doc_id, "pk": pk, "entity_type": "trip", **fields}
+
+
+async def collect(iterable):
+    """Drain an async iterable."""
+    return [item async for item in iterable]
+
+
+@pytest.fixture
+def container():
+    """Create an empty in-memory container."""
+    return MemoryContainer()
+
+
+class TestMemoryContainerQueries:
+    """Test cases for query evaluation."""
+
+    @pytest.mark.asyncio
+    async def test_filters_orders_and_scopes_to_partition(self, container):
+        """WHERE, IN, ARRAY_CONTAINS and ORDER BY follow Cosmos semantics within a partition."""
+        await container.create_item(doc("t1", "trip_a", status="planning", rank=2, family_ids=["f1"]))
+        await container.create_item(doc("t2", "trip_a", status="active", rank=1, family_ids=["f1", "f2"]))
+        await container.create_item(doc("t3", "trip_a", status="done", rank=3, family_ids=["f1"]))
+        await container.create_item(doc("t4", "trip_b", status="active", rank=0, family_ids=["f1"]))
+
+        results = await collect(
+            container.query_items(
+                query=(
+                    "SELECT * FROM c WHERE c.entity_type = 'trip' AND c.status IN ('planning', 'active') "
+                    "AND ARRAY_CONTAINS(c.family_ids, @familyId) ORDER BY c.rank DESC"
+                ),
+                parameters=[{"name": "@familyId", "value": "f1"}],
+                partition_key="trip_a",
+            )
+        )
+
+        assert [item["id"] for item in results] == ["t1", "t2"]
+
+    @pytest.mark.asyncio
+    async def test_aggregates_and_undefined_properties(self, container):
+        """VALUE COUNT/MAX aggregate, and missing properties never match a comparison."""
+        await container.create_item(doc("t1", "trip_a", budget=100))
+        await container.create_item(doc("t2", "trip_b", budget=250))
+        await container.create_item(doc("t3", "trip_c"))
+
+        count = await collect(
+            container.query_items(
+                query="SELECT VALUE COUNT(1) FROM c WHERE c.budget > 50", enable_cross_partition_query=True
+            )
+        )
+        maximum = await collect(
+            container.query_items(query="SELECT VALUE MAX(c.budget) FROM c", enable_cross_partition_query=True)
+        )
+
+        assert count == [2]
+        assert maximum == [250]
+
+    @pytest.mark.asyncio
+    async def test_join_and_group_by(self, container):
+        """JOIN expands arrays into rows, and GROUP BY counts per key within a partition only."""
+        await container.create_item(doc("t1", "trip_a", status="active", votes={"u1": 1, "u2": 1}))
+        await container.create_item(doc("t2", "trip_a", status="active", votes={"u2": 1}))
+        await container.create_item(doc("t3", "trip_a", status="closed"))
+
+        voters = await collect(
+            container.query_items(
+                query="SELECT DISTINCT VALUE v.k FROM c JOIN v IN ObjectToArray(c.votes)", partition_key="trip_a"
+            )
+        )
+        groups = await collect(
+            container.query_items(
+                query="SELECT c.status AS status, COUNT(1) AS count FROM c GROUP BY c.status", partition_key="trip_a"
+            )
+        )
+
+        assert sorted(voters) == ["u1", "u2"]
+        assert sorted(groups, key=lambda g: g["status"]) == [
+            {"status": "active", "count": 2},
+            {"status": "closed", "count": 1},
+        ]
+        with pytest.raises(exceptions.CosmosHttpResponseError):
+            await collect(
+                container.query_items(
+                    query="SELECT COUNT(1) AS count FROM c GROUP BY c.status", enable_cross_partition_query=True
+                )
+            )
+
+    @pytest.mark.asyncio
+    async def test_pages_resume_from_continuation_token(self, container):
+        """by_page() resumes where the previous page stopped."""
+        for index in range(5):
+            await container.create_item(doc(f"t{index}", "trip_a", rank=index))
+        query = {"query": "SELECT * FROM c ORDER BY c.rank", "partition_key": "trip_a", "max_item_count": 2}
+
+        pager = container.query_items(**query).by_page()
+        first = await collect(await pager.__anext__())
+        resumed = container.query_items(**query).by_page(pager.continuation_token)
+        second = await collect(await resumed.__anext__())
+
+        assert [item["rank"] for item in first] == [0, 1]
+        assert [item["rank"] for item in second] == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_unsupported_syntax_is_a_bad_request(self, container):
+        """Queries outside the supported subset fail like an invalid query would."""
+        with pytest.raises(exceptions.CosmosHttpResponseError) as error:
+            await collect(
+                container.query_items(
+                    query="SELECT * FROM c WHERE ST_DISTANCE(c.location, @here) < 10", partition_key="trip_a"
+                )
+            )
+
+        assert error.value.status_code == 400
+
+
+class TestMemoryContainerWrites:
+    """Test cases for write semantics."""
+
+    @pytest.mark.asyncio
+    async def test_ids_are_unique_per_partition(self, container):
+        """The same ID may exist in two partitions but not twice in one."""
+        await container.create_item(doc("t1", "trip_a"))
+        await container.create_item(doc("t1", "trip_b"))
+
+        with pytest.raises(exceptions.CosmosResourceExistsError):
+            await container.create_item(doc("t1", "trip_a"))
+
+    @pytest.mark.asyncio
+    async def test_stale_etag_is_rejected(self, container):
+        """A replace carrying an outdated ETag fails with 412."""
+        created = await container.create_item(doc("t1", "trip_a", title="Old"))
+        await container.replace_item(item="t1", body={**created, "title": "New"})
+
+        with pytest.raises(exceptions.CosmosAccessConditionFailedError):
+            await container.replace_item(
+                item="t1",
+                body={**created, "title": "Stale"},
+                etag=created["_etag"],
+                match_condition=MatchConditions.IfNotModified,
+            )
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_commits_nothing(self, container):
+        """A failing operation rolls back the whole batch."""
+        await container.create_item(doc("t1", "trip_a"))
+
+        with pytest.raises(exceptions.CosmosBatchOperationError) as error:
+            await container.execute_item_batch(
+                batch_operations=[("create", (doc("t2", "trip_a"),)), ("create", (doc("t1", "trip_a"),))],
+                partition_key="trip_a",
+            )
+
+        assert error.value.error_index == 1
+        assert len(container) == 1
+
+    @pytest.mark.asyncio
+    async def test_reports_request_charge(self, container):
+        """Every call reports a synthetic request charge through response_hook."""
+        calls = []
+        await container.create_item(doc("t1", "trip_a"), response_hook=lambda headers, result: calls.append(headers))
+
+        assert float(calls[0]["x-ms-request-charge"]) > 0
+
+
+class TestRepositoryOnMemoryContainer:
+    """Test cases running the repository against the in-memory container."""
+
+    @pytest.mark.asyncio
+    async def test_patch_predicate_and_batch_round_trip(self, cosmos_repository, container):
+        """Patches, predicates and batches behave end to end."""
+        cosmos_repository.use_container(container)
+        trip = TripDocument(pk="trip_user_1", title="Lake Week", organizer_user_id="user_1")
+        created = await cosmos_repository.create(trip)
+
+        patched = await cosmos_repository.patch(
+            created.id,
+            created.pk,
+            [PatchOperation.set("/status", "active")],
+            TripDocument,
+            filter_predicate="FROM c WHERE c.status = 'planning'",
+        )
+        with pytest.raises(ConcurrencyConflictError):
+            await cosmos_repository.patch(
+                created.id,
+                created.pk,
+                [PatchOperation.set("/status", "completed")],
+                TripDocument,
+                filter_predicate="FROM c WHERE c.status = 'planning'",
+            )
+        await cosmos_repository.execute_batch(created.pk, [BatchOperation.delete(created.id, created.pk, "trip")])
+
+        assert patched.status == "active"
+        assert patched.version == created.version + 1
+        assert patched.etag != created.etag
+        assert await cosmos_repository.get_by_id(created.id, created.pk, TripDocument) is None
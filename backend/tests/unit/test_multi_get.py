@@ -0,0 +1,75 @@
+"""Unit tests for read-many lookups."""
+
+import pytest
+
+from core.security import get_or_create_user
+from models.documents import FamilyDocument, UserDocument
+from services.family_service import FamilyService
+
+
+@pytest.fixture
+def memory_repository(bind_memory_repository):
+    """Repository backed by an in-memory container, shared with the services."""
+    return bind_memory_repository("services.family_service", "core.security")
+
+
+def user(user_id, pk=None):
+    """Build a user document."""
+    return UserDocument(id=user_id, pk=pk or f"user_{user_id}", entra_id=user_id, email=f"{user_id}@example.com")
+
+
+class TestGetMany:
+    """Test cases for CosmosRepository.get_many."""
+
+    @pytest.mark.asyncio
+    async def test_reads_in_key_order_and_skips_missing(self, memory_repository):
+        """Found documents come back in key order; missing ones are left out."""
+        for user_id in ("a", "b", "c"):
+            await memory_repository.create(user(user_id))
+
+        users = await memory_repository.get_many(
+            [("c", "user_c"), ("missing", "user_missing"), ("a", "user_a"), ("c", "user_c")], UserDocument
+        )
+
+        assert [u.id for u in users] == ["c", "a"]
+
+    @pytest.mark.asyncio
+    async def test_fresh_cache_entries_skip_the_store(self, memory_repository):
+        """Documents already in the document cache are not read again."""
+        await memory_repository.create(user("a"))
+        await memory_repository.get_by_id("a", "user_a", UserDocument)
+        memory_repository.document_cache.reset_stats()
+
+        await memory_repository.get_many([("a", "user_a")], UserDocument)
+
+        assert memory_repository.document_cache.hits == 1
+        assert memory_repository.document_cache.misses == 0
+
+
+class TestFamilyMembers:
+    """Test cases for member lookups built on get_many."""
+
+    @pytest.mark.asyncio
+    async def test_new_users_are_keyed_by_entra_id(self, memory_repository):
+        """Signing up creates the user with a point-readable ID."""
+        created = await get_or_create_user({"sub": "entra-1", "email": "one@example.com", "name": "One"})
+
+        assert created.id == "entra-1"
+        assert created.pk == "user_entra-1"
+
+    @pytest.mark.asyncio
+    async def test_members_across_families_include_legacy_users(self, memory_repository):
+        """Members of several families are returned once each, legacy IDs included."""
+        await memory_repository.create(user("a"))
+        await memory_repository.create(user("b"))
+        await memory_repository.create(user("legacy-id", pk="user_entra-legacy"))
+        await memory_repository.create(
+            FamilyDocument(id="f1", pk="family_a", name="One", admin_user_id="a", member_ids=["a", "legacy-id"])
+        )
+        await memory_repository.create(
+            FamilyDocument(id="f2", pk="family_b", name="Two", admin_user_id="b", member_ids=["b", "a"])
+        )
+
+        members = await FamilyService().get_members_of_families(["f1", "f2"])
+
+        assert [member.id for member in members] == ["a", "legacy-id", "b"]
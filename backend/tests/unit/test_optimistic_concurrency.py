@@ -0,0 +1,76 @@
+"""Unit tests for ETag-based optimistic concurrency in CosmosRepository."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError
+
+from models.documents import PollDocument
+from repositories.cosmos_repository import ConcurrencyConflictError
+
+
+def poll_body(etag, status="active"):
+    """Build a raw poll document as returned by Cosmos."""
+    body = PollDocument(id="poll_1", pk="poll_trip_1", trip_id="trip_1", creator_id="u1", title="Dinner?").model_dump(
+        mode="json"
+    )
+    body.update({"_etag": etag, "status": status})
+    return body
+
+
+class TestConditionalWrites:
+    """Test cases for conditional replace."""
+
+    def test_etag_is_read_but_never_written(self):
+        """The _etag system property hydrates the model and stays out of write payloads."""
+        poll = PollDocument(**poll_body('"e1"'))
+
+        assert poll.etag == '"e1"'
+        assert "_etag" not in poll.model_dump(mode="json")
+
+    @pytest.mark.asyncio
+    async def test_conditional_update_sends_if_match(self, cosmos_repository, mock_cosmos_container):
+        """A conditional update is sent with the document's ETag."""
+        mock_cosmos_container.replace_item = AsyncMock(return_value=poll_body('"e2"'))
+
+        updated = await cosmos_repository.update(PollDocument(**poll_body('"e1"')), conditional=True)
+
+        kwargs = mock_cosmos_container.replace_item.call_args.kwargs
+        assert kwargs["etag"] == '"e1"'
+        assert kwargs["match_condition"] == MatchConditions.IfNotModified
+        assert updated.etag == '"e2"'
+
+
+class TestReadModifyWrite:
+    """Test cases for read_modify_write and retry_on_conflict."""
+
+    @pytest.mark.asyncio
+    async def test_reloads_and_retries_after_conflict(self, cosmos_repository, mock_cosmos_container):
+        """A lost race re-reads the document and reapplies the change to the fresh copy."""
+        mock_cosmos_container.replace_item = AsyncMock(
+            side_effect=[CosmosAccessConditionFailedError(), poll_body('"e3"', status="closed")]
+        )
+        mock_cosmos_container.read_item = AsyncMock(return_value=poll_body('"e2"'))
+
+        def close(poll):
+            poll.status = "closed"
+
+        with patch("repositories.cosmos_repository.asyncio.sleep", new=AsyncMock()) as sleep:
+            updated = await cosmos_repository.read_modify_write(PollDocument(**poll_body('"e1"')), close)
+
+        assert updated.status == "closed"
+        etags = [call.kwargs["etag"] for call in mock_cosmos_container.replace_item.call_args_list]
+        assert etags == ['"e1"', '"e2"']
+        sleep.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, cosmos_repository):
+        """Persistent conflicts are surfaced once the retry budget is spent."""
+        operation = AsyncMock(side_effect=ConcurrencyConflictError("conflict"))
+
+        with patch("repositories.cosmos_repository.asyncio.sleep", new=AsyncMock()):
+            with pytest.raises(ConcurrencyConflictError):
+                await cosmos_repository.retry_on_conflict(operation, max_attempts=3)
+
+        assert operation.await_count == 3
@@ -0,0 +1,199 @@
+"""Unit tests for the trip partition scheme and its migration job."""
+
+import pytest
+
+from models.documents import ItineraryDocument, PollDocument, TripDocument, UserDocument
+from models.schemas import PollCreate, TripCreate
+from repositories.change_feed import ChangeFeedProcessor
+from repositories.partition_migration import PartitionMigration
+from services.collaboration_service import CollaborationService
+from services.itinerary_service import ItineraryService
+from services.trip_service import TripService
+
+
+@pytest.fixture
+def memory_repository(bind_memory_repository):
+    """Repository backed by an in-memory container, shared with the services and the job."""
+    return bind_memory_repository(
+        "repositories.change_feed",
+        "repositories.partition_migration",
+        "services.collaboration_service",
+        "services.itinerary_service",
+        "services.membership_service",
+        "services.trip_service",
+    )
+
+
+async def create_legacy_trip(repository):
+    """Write a trip, a poll and an itinerary at their pre-colocation partition keys."""
+    trip = await repository.create(TripDocument(pk="trip_user_1", title="Lake Week", organizer_user_id="user_1"))
+    poll = await repository.create(
+        PollDocument(
+            pk=f"poll_{trip.id}", trip_id=trip.id, creator_id="user_1", title="Where?", poll_type="destination"
+        )
+    )
+    itinerary = await repository.create(
+        ItineraryDocument(pk=f"itinerary_{trip.id}", trip_id=trip.id, version_number=1, title="Draft")
+    )
+    return trip, poll, itinerary
+
+
+class TestPartitionMigration:
+    """Test cases for PartitionMigration."""
+
+    @pytest.mark.asyncio
+    async def test_moves_trip_scoped_documents_into_trip_partition(self, memory_repository):
+        """Legacy documents end up in trip_{trip_id} and the legacy copies are gone."""
+        trip, poll, itinerary = await create_legacy_trip(memory_repository)
+
+        run = await PartitionMigration(batch_size=2, concurrency=2).run_once()
+
+        assert run.moved == 3
+        assert run.complete is True
+        for doc_id, model_class in (
+            (trip.id, TripDocument),
+            (poll.id, PollDocument),
+            (itinerary.id, ItineraryDocument),
+        ):
+            moved = await memory_repository.get_by_id(doc_id, f"trip_{trip.id}", model_class)
+            assert moved is not None
+            assert moved.version == 1
+        assert await memory_repository.get_by_id(poll.id, f"poll_{trip.id}", PollDocument) is None
+        assert await memory_repository.find_by_id(trip.id, TripDocument) is not None
+
+    @pytest.mark.asyncio
+    async def test_rerun_is_a_no_op(self, memory_repository):
+        """A finished migration finds nothing left to move."""
+        await create_legacy_trip(memory_repository)
+        migration = PartitionMigration()
+        await migration.run_once()
+
+        rerun = await migration.run_once()
+
+        assert rerun.moved == 0
+        assert rerun.complete is True
+
+    @pytest.mark.asyncio
+    async def test_interrupted_copy_keeps_newer_legacy_version(self, memory_repository):
+        """A stale copy left at the new key by an interrupted run is replaced by the newer legacy document."""
+        trip, poll, _ = await create_legacy_trip(memory_repository)
+        stale = poll.model_copy(update={"pk": f"trip_{trip.id}", "etag": None, "moved_version": poll.version})
+        await memory_repository.create(stale)
+        poll.title = "Where to?"
+        await memory_repository.update(poll)
+
+        await PartitionMigration().run_once()
+
+        moved = await memory_repository.get_by_id(poll.id, f"trip_{trip.id}", PollDocument)
+        assert moved.title == "Where to?"
+
+    @pytest.mark.asyncio
+    async def test_interrupted_copy_written_since_is_kept(self, memory_repository):
+        """A copy edited at the new key wins over an untouched legacy copy."""
+        trip, poll, _ = await create_legacy_trip(memory_repository)
+        copy = poll.model_copy(update={"pk": f"trip_{trip.id}", "etag": None, "moved_version": poll.version})
+        copy = await memory_repository.create(copy)
+        copy.title = "Edited at the new key"
+        await memory_repository.update(copy)
+
+        run = await PartitionMigration().run_once()
+
+        assert run.complete is True
+        moved = await memory_repository.get_by_id(poll.id, f"trip_{trip.id}", PollDocument)
+        assert moved.title == "Edited at the new key"
+        assert await memory_repository.get_by_id(poll.id, f"poll_{trip.id}", PollDocument) is None
+
+    @pytest.mark.asyncio
+    async def test_diverged_copies_are_skipped(self, memory_repository):
+        """When both copies were written to since the interrupted copy, neither overwrites the other."""
+        trip, poll, _ = await create_legacy_trip(memory_repository)
+        copy = poll.model_copy(update={"pk": f"trip_{trip.id}", "etag": None, "moved_version": poll.version})
+        copy = await memory_repository.create(copy)
+        copy.title = "Edited at the new key"
+        await memory_repository.update(copy)
+        poll.title = "Edited at the legacy key"
+        await memory_repository.update(poll)
+
+        run = await PartitionMigration().run_once()
+
+        assert run.moved == 2
+        assert run.diverged > 0
+        assert run.complete is False
+        moved = await memory_repository.get_by_id(poll.id, f"trip_{trip.id}", PollDocument)
+        assert moved.title == "Edited at the new key"
+        legacy = await memory_repository.get_by_id(poll.id, f"poll_{trip.id}", PollDocument)
+        assert legacy.title == "Edited at the legacy key"
+
+    @pytest.mark.asyncio
+    async def test_stale_route_is_resolved_again(self, memory_repository):
+        """An instance that remembers the legacy key still finds the moved copy, and the index is kept."""
+        trip, poll, _ = await create_legacy_trip(memory_repository)
+        await PartitionMigration().run_once()
+        # Another instance resolved the poll before it moved
+        memory_repository._remember_partition_key(("poll", poll.id), f"poll_{trip.id}")
+
+        found = await memory_repository.find_by_id(poll.id, PollDocument)
+
+        assert found.pk == f"trip_{trip.id}"
+        memory_repository._pk_cache.clear()
+        assert await memory_repository.resolve_partition_key("poll", poll.id) == f"trip_{trip.id}"
+
+
+class TestDualRead:
+    """Test cases for reads during the migration window."""
+
+    @pytest.mark.asyncio
+    async def test_services_read_legacy_documents(self, memory_repository):
+        """Point reads fall back to legacy keys and trip queries still find unmigrated documents."""
+        trip, poll, itinerary = await create_legacy_trip(memory_repository)
+
+        assert (await TripService().get_trip(trip.id)).id == trip.id
+        assert (await CollaborationService().get_poll(poll.id, trip_id=trip.id)).id == poll.id
+        assert (await ItineraryService().get_itinerary(itinerary.id, trip_id=trip.id)).id == itinerary.id
+        assert [p.id for p in await CollaborationService().get_trip_polls(trip.id)] == [poll.id]
+
+    @pytest.mark.asyncio
+    async def test_queries_are_single_partition_after_migration(self, memory_repository):
+        """With dual reads off, trip-scoped queries stay within the trip's partition."""
+        trip, _, itinerary = await create_legacy_trip(memory_repository)
+        await PartitionMigration().run_once()
+        memory_repository.dual_read = False
+
+        assert memory_repository.partition_scope(f"trip_{trip.id}") == f"trip_{trip.id}"
+        current = await ItineraryService().get_current_itinerary(trip.id)
+        assert current.id == itinerary.id
+
+    @pytest.mark.asyncio
+    async def test_new_trips_are_colocated(self, memory_repository):
+        """New trips get their own ID as partition, shared with their polls."""
+        user = UserDocument(id="user_1", pk="user_user_1", entra_id="user_1", email="user_1@example.com")
+        trip = await TripService().create_trip(TripCreate(title="Coast"), user)
+        poll = await CollaborationService().create_poll(
+            PollCreate(trip_id=trip.id, title="When?", poll_type="date", options=[]), user
+        )
+
+        assert trip.pk == f"trip_{trip.id}"
+        assert poll.pk == trip.pk
+
+    @pytest.mark.asyncio
+    async def test_moves_are_not_reported_as_changes(self, memory_repository):
+        """The change feed skips migrated copies until they are written again."""
+        trip, poll, _ = await create_legacy_trip(memory_repository)
+        processor = ChangeFeedProcessor("test")
+        seen = []
+
+        @processor.handler(PollDocument)
+        @processor.handler(TripDocument)
+        async def on_change(changed) -> None:
+            seen.append(changed.id)
+
+        await processor.run_once()
+        await PartitionMigration().run_once()
+        await processor.run_once()
+        assert seen == []
+
+        moved = await memory_repository.get_by_id(trip.id, f"trip_{trip.id}", TripDocument)
+        moved.title = "Renamed"
+        await memory_repository.update(moved)
+        await processor.run_once()
+        assert seen == [trip.id]
@@ -0,0 +1,104 @@
+"""Unit tests for by-ID partition key routing in CosmosRepository."""
+
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+import pytest
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+
+from models.documents import TripDocument
+from repositories.cosmos_repository import pk_index_id
+from tests.conftest import AsyncIteratorMock
+
+
+def trip_body(trip_id="trip_1", pk="trip_user_1"):
+    """Build a raw trip document as returned by Cosmos."""
+    return TripDocument(id=trip_id, pk=pk, title="Lake Week", organizer_user_id="user_1").model_dump(mode="json")
+
+
+def not_found():
+    """Build the SDK error raised for a missing item."""
+    return CosmosResourceNotFoundError(status_code=404, message="Not found")
+
+
+class TestPartitionRouting:
+    """Test cases for find_by_id and the pk_index."""
+
+    @pytest.mark.asyncio
+    async def test_find_by_id_uses_index_entry(self, cosmos_repository, mock_cosmos_container):
+        """A pk_index hit resolves the partition key and point-reads the document."""
+        index_id = pk_index_id("trip", "trip_1")
+        mock_cosmos_container.read_item = AsyncMock(side_effect=[{"target_pk": "trip_user_1"}, trip_body()])
+
+        trip = await cosmos_repository.find_by_id("trip_1", TripDocument)
+
+        assert trip is not None
+        assert trip.pk == "trip_user_1"
+        calls = mock_cosmos_container.read_item.await_args_list
+        assert calls[0].kwargs == {"item": index_id, "partition_key": index_id, "response_hook": ANY}
+        assert calls[1].kwargs == {"item": "trip_1", "partition_key": "trip_user_1", "response_hook": ANY}
+        mock_cosmos_container.query_items.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resolved_partition_key_is_memoized(self, cosmos_repository, mock_cosmos_container):
+        """Repeated lookups skip the index read."""
+        mock_cosmos_container.read_item = AsyncMock(
+            side_effect=[{"target_pk": "trip_user_1"}, trip_body(), trip_body()]
+        )
+
+        await cosmos_repository.find_by_id("trip_1", TripDocument)
+        await cosmos_repository.find_by_id("trip_1", TripDocument)
+
+        index_reads = [
+            call
+            for call in mock_cosmos_container.read_item.await_args_list
+            if call.kwargs["partition_key"].startswith("pkindex_")
+        ]
+        assert len(index_reads) == 1
+
+    @pytest.mark.asyncio
+    async def test_legacy_document_backfills_index(self, cosmos_repository, mock_cosmos_container):
+        """Documents without an index entry are located once and the index is backfilled."""
+        mock_cosmos_container.read_item = AsyncMock(side_effect=[not_found(), trip_body()])
+        mock_cosmos_container.query_items = MagicMock(return_value=AsyncIteratorMock(["trip_user_1"]))
+
+        trip = await cosmos_repository.find_by_id("trip_1", TripDocument)
+
+        assert trip is not None
+        backfilled = mock_cosmos_container.upsert_item.await_args.kwargs["body"]
+        assert backfilled["entity_type"] == "pk_index"
+        assert backfilled["target_pk"] == "trip_user_1"
+
+    @pytest.mark.asyncio
+    async def test_unknown_document_returns_none(self, cosmos_repository, mock_cosmos_container):
+        """Missing documents resolve to None without a document read."""
+        mock_cosmos_container.read_item = AsyncMock(side_effect=[not_found()])
+        mock_cosmos_container.query_items = MagicMock(return_value=AsyncIteratorMock([]))
+
+        assert await cosmos_repository.find_by_id("missing", TripDocument) is None
+        mock_cosmos_container.upsert_item.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_registers_index_entry(self, cosmos_repository, mock_cosmos_container):
+        """Creating a routed document writes its pk_index entry."""
+        body = trip_body()
+        mock_cosmos_container.create_item = AsyncMock(return_value=body)
+
+        await cosmos_repository.create(TripDocument(**body))
+        mock_cosmos_container.read_item = AsyncMock(return_value=body)
+        await cosmos_repository.find_by_id("trip_1", TripDocument)
+
+        entry = mock_cosmos_container.upsert_item.await_args.kwargs["body"]
+        assert entry["id"] == pk_index_id("trip", "trip_1")
+        mock_cosmos_container.read_item.assert_awaited_once_with(
+            item="trip_1", partition_key="trip_user_1", response_hook=ANY
+        )
+
+    @pytest.mark.asyncio
+    async def test_delete_drops_index_entry(self, cosmos_repository, mock_cosmos_container):
+        """Deleting a routed document removes its pk_index entry."""
+        index_id = pk_index_id("trip", "trip_1")
+
+        assert await cosmos_repository.delete("trip_1", "trip_user_1", entity_type="trip")
+
+        deleted = [call.kwargs for call in mock_cosmos_container.delete_item.await_args_list]
+        assert {"item": index_id, "partition_key": index_id, "response_hook": ANY} in deleted
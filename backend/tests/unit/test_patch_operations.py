@@ -0,0 +1,64 @@
+"""Unit tests for partial document updates in CosmosRepository."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError
+
+from models.documents import FamilyDocument
+from repositories.cosmos_repository import PatchOperation, patch_path
+
+
+def family(member_ids):
+    """Build a family document with the given members."""
+    return FamilyDocument(
+        id="family_1",
+        pk="family_admin",
+        name="Smiths",
+        admin_user_id="admin",
+        member_ids=list(member_ids),
+        member_count=len(member_ids),
+    )
+
+
+class TestPatch:
+    """Test cases for patch."""
+
+    @pytest.mark.asyncio
+    async def test_sends_operations_with_version_bump(self, cosmos_repository, mock_cosmos_container):
+        """Only the listed operations are sent, plus the server-side version bump."""
+        mock_cosmos_container.patch_item = AsyncMock(return_value=family(["admin"]).model_dump(mode="json"))
+
+        await cosmos_repository.patch(
+            "family_1", "family_admin", [PatchOperation.set("/name", "Smiths")], FamilyDocument
+        )
+
+        operations = mock_cosmos_container.patch_item.call_args.kwargs["patch_operations"]
+        assert operations[0] == {"op": "set", "path": "/name", "value": "Smiths"}
+        assert operations[1] == {"op": "incr", "path": "/version", "value": 1}
+        assert operations[2]["path"] == "/updated_at"
+
+    def test_patch_path_escapes_segments(self):
+        """Keys containing JSON Pointer metacharacters are escaped."""
+        assert patch_path("votes", "a/b~c") == "/votes/a~1b~0c"
+        assert patch_path("options", 2, "vote_count") == "/options/2/vote_count"
+
+
+class TestPatchArrayRemove:
+    """Test cases for patch_array_remove."""
+
+    @pytest.mark.asyncio
+    async def test_retries_when_element_shifted(self, cosmos_repository, mock_cosmos_container):
+        """A concurrent write that moves the element triggers a re-read and retry at the new index."""
+        mock_cosmos_container.patch_item = AsyncMock(
+            side_effect=[CosmosAccessConditionFailedError(), family(["admin"]).model_dump(mode="json")]
+        )
+        mock_cosmos_container.read_item = AsyncMock(return_value=family(["admin", "u2"]).model_dump(mode="json"))
+
+        updated = await cosmos_repository.patch_array_remove(family(["admin", "x", "u2"]), "member_ids", "u2")
+
+        assert updated.member_ids == ["admin"]
+        calls = mock_cosmos_container.patch_item.call_args_list
+        assert calls[0].kwargs["patch_operations"][0] == {"op": "remove", "path": "/member_ids/2"}
+        assert calls[1].kwargs["patch_operations"][0] == {"op": "remove", "path": "/member_ids/1"}
+        assert calls[1].kwargs["filter_predicate"] == 'FROM c WHERE c.member_ids[1] = "u2"'
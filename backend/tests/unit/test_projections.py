@@ -0,0 +1,71 @@
+"""Unit tests for projection models and the list queries that use them."""
+
+import pytest
+
+from models.documents import PollDocument, TripDocument
+from models.projections import FamilySummary, PollSummary, TripSummary
+from repositories.memory_container import MemoryContainer
+from services.collaboration_service import CollaborationService
+
+
+class TestProjection:
+    """Test cases for Projection.select_list."""
+
+    def test_selects_declared_fields_only(self):
+        """Large fields are left out of the SELECT list."""
+        select_list = TripSummary.select_list()
+
+        assert "c.title" in select_list
+        assert "itinerary" not in select_list
+        assert "expenses" not in select_list
+
+    def test_computed_fields_are_aliased(self):
+        """Fields backed by an expression are selected under the field name."""
+        assert "ARRAY_LENGTH(c.member_ids) AS member_count" in FamilySummary.select_list()
+
+
+class TestProjectedQueries:
+    """Test cases for projected list queries."""
+
+    @pytest.mark.asyncio
+    async def test_poll_summaries_reduce_votes_to_counts(self, bind_memory_repository):
+        """Poll summaries carry the vote count and the viewer's flag, not the voter map."""
+        cosmos_repository = bind_memory_repository("services.collaboration_service")
+        poll = PollDocument(
+            pk="poll_trip_1",
+            trip_id="trip_1",
+            creator_id="user_1",
+            title="Where to stay?",
+            votes={"user_1": {"option_ids": ["a"]}, "user_2": {"option_ids": ["b"]}},
+        )
+        await cosmos_repository.create(poll)
+
+        summaries = await CollaborationService().get_trip_poll_summaries("trip_1", "user_2")
+
+        assert len(summaries) == 1
+        assert isinstance(summaries[0], PollSummary)
+        assert summaries[0].vote_count == 2
+        assert summaries[0].user_voted is True
+        assert "votes" not in summaries[0].model_dump()
+
+    @pytest.mark.asyncio
+    async def test_trip_summary_round_trip(self, cosmos_repository):
+        """A projected trip parses into a TripSummary without its content fields."""
+        cosmos_repository.use_container(MemoryContainer())
+        trip = TripDocument(
+            pk="trip_user_1",
+            title="Lake Week",
+            organizer_user_id="user_1",
+            itinerary={"days": [{"day": 1}]},
+            expenses=[{"amount": 10}],
+        )
+        await cosmos_repository.create(trip)
+
+        page = await cosmos_repository.query_page(
+            query=f"SELECT {TripSummary.select_list()} FROM c WHERE c.entity_type = 'trip'",
+            model_class=TripSummary,
+            partition_key="trip_user_1",
+        )
+
+        assert page.items[0].id == trip.id
+        assert page.items[0].title == "Lake Week"
@@ -0,0 +1,124 @@
+"""Unit tests for continuation-token pagination in CosmosRepository."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from models.documents import NotificationDocument
+from repositories.cosmos_repository import decode_cursor, encode_cursor
+from tests.conftest import AsyncIteratorMock
+
+
+class PagerMock(AsyncIteratorMock):
+    """Mock of the SDK page iterator returned by by_page()."""
+
+    def __init__(self, pages):
+        super().__init__([(AsyncIteratorMock(items), token) for items, token in pages])
+        self.continuation_token = None
+
+    async def __anext__(self):
+        page, token = await super().__anext__()
+        self.continuation_token = token
+        return page
+
+
+def paged_results(pages):
+    """Build a query_items return value whose by_page() yields the given pages."""
+    result = MagicMock()
+    result.by_page = MagicMock(return_value=PagerMock(pages))
+    return result
+
+
+class TestQueryPage:
+    """Test cases for query_page."""
+
+    @pytest.mark.asyncio
+    async def test_returns_first_page_and_cursor(self, cosmos_repository, mock_cosmos_container):
+        """A page carries its items and an opaque cursor for the next one."""
+        mock_cosmos_container.query_items = MagicMock(
+            return_value=paged_results([([{"id": "1"}, {"id": "2"}], "token-2"), ([{"id": "3"}], None)])
+        )
+
+        page = await cosmos_repository.query_page("SELECT * FROM c", page_size=2)
+
+        assert [item["id"] for item in page.items] == ["1", "2"]
+        assert page.has_more
+        assert decode_cursor(page.next_cursor) == "token-2"
+        assert mock_cosmos_container.query_items.call_args.kwargs["max_item_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_cursor(self, cosmos_repository, mock_cosmos_container):
+        """The cursor is unwrapped and handed back to the SDK pager."""
+        results = paged_results([([{"id": "3"}], None)])
+        mock_cosmos_container.query_items = MagicMock(return_value=results)
+
+        page = await cosmos_repository.query_page("SELECT * FROM c", cursor=encode_cursor("token-2"))
+
+        results.by_page.assert_called_once_with("token-2")
+        assert not page.has_more
+
+    @pytest.mark.asyncio
+    async def test_skips_empty_pages(self, cosmos_repository, mock_cosmos_container):
+        """Empty cross-partition pages are not surfaced to callers."""
+        mock_cosmos_container.query_items = MagicMock(
+            return_value=paged_results([([], "token-1"), ([{"id": "1"}], "token-2")])
+        )
+
+        page = await cosmos_repository.query_page("SELECT * FROM c")
+
+        assert [item["id"] for item in page.items] == ["1"]
+        assert decode_cursor(page.next_cursor) == "token-2"
+
+    @pytest.mark.asyncio
+    async def test_rejects_malformed_cursor(self, cosmos_repository):
+        """Cursors that were not issued by the API are rejected."""
+        with pytest.raises(ValueError):
+            await cosmos_repository.query_page("SELECT * FROM c", cursor="not a cursor!")
+
+
+class TestIterQuery:
+    """Test cases for iter_query."""
+
+    @pytest.mark.asyncio
+    async def test_streams_every_page(self, cosmos_repository, mock_cosmos_container):
+        """All pages are walked and items are hydrated into the model class."""
+        mock_cosmos_container.query_items = MagicMock(
+            return_value=paged_results(
+                [
+                    (
+                        [
+                            {
+                                "id": "n1",
+                                "pk": "notification_u1",
+                                "user_id": "u1",
+                                "title": "a",
+                                "body": "",
+                                "notification_type": "x",
+                            }
+                        ],
+                        "t1",
+                    ),
+                    ([], "t2"),
+                    (
+                        [
+                            {
+                                "id": "n2",
+                                "pk": "notification_u1",
+                                "user_id": "u1",
+                                "title": "b",
+                                "body": "",
+                                "notification_type": "x",
+                            }
+                        ],
+                        None,
+                    ),
+                ]
+            )
+        )
+
+        ids = [
+            doc.id async for doc in cosmos_repository.iter_query("SELECT * FROM c", model_class=NotificationDocument)
+        ]
+
+        assert ids == ["n1", "n2"]
+        assert mock_cosmos_container.query_items.call_args.kwargs["enable_cross_partition_query"] is True
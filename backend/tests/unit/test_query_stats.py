@@ -0,0 +1,105 @@
+"""Unit tests for query fingerprinting and the query cost report."""
+
+import logging
+
+import pytest
+
+from models.documents import TripDocument
+from repositories.memory_container import MemoryContainer
+from repositories.query_stats import QueryLog, fingerprint
+
+
+class TestFingerprint:
+    """Test cases for fingerprint."""
+
+    def test_literals_are_stripped(self):
+        """Queries differing only in literal values share a fingerprint."""
+        first = fingerprint("SELECT * FROM c WHERE c.status = 'planning' OFFSET 0 LIMIT 10")
+        second = fingerprint("SELECT *  FROM c\n WHERE c.status = 'active' OFFSET 20 LIMIT 10")
+
+        assert first == second == "SELECT * FROM c WHERE c.status = ? OFFSET ? LIMIT ?"
+
+    def test_in_lists_collapse_regardless_of_length(self):
+        """Generated IN lists of any length share a fingerprint."""
+        two = fingerprint("SELECT * FROM c WHERE c.id IN (@id0, @id1)")
+        three = fingerprint("SELECT * FROM c WHERE c.id IN (@id0, @id1, @id2)")
+        literals = fingerprint("SELECT * FROM c WHERE c.type IN ('user', 'assistant')")
+
+        assert two == three == "SELECT * FROM c WHERE c.id IN (@...)"
+        assert literals == "SELECT * FROM c WHERE c.type IN (?)"
+
+    def test_identifiers_keep_their_digits(self):
+        """Digits inside names, parameters and aliases are not literals."""
+        assert fingerprint("SELECT VALUE c.field1 FROM c WHERE c.x = @p1") == (
+            "SELECT VALUE c.field1 FROM c WHERE c.x = @p1"
+        )
+
+
+class TestQueryLog:
+    """Test cases for QueryLog."""
+
+    def test_top_ranks_by_total_charge(self):
+        """The report lists the most expensive shapes first."""
+        log = QueryLog(slow_query_ms=1000, slow_query_ru=1000)
+        for user in ("a", "b", "c"):
+            log.record("query.trip", f"SELECT * FROM c WHERE c.owner = '{user}'", 40.0, 5.0, pages=4, items=2)
+        log.record("query.poll", "SELECT * FROM c WHERE c.pk = @pk", 3.0, 1.0, pages=1, items=5)
+
+        report = log.top(limit=1)
+
+        assert report["fingerprints"] == 2
+        assert report["queries"][0]["operation"] == "query.trip"
+        assert report["queries"][0]["count"] == 3
+        assert report["queries"][0]["avg_pages"] == 4
+
+    def test_cheapest_shape_is_evicted_when_full(self):
+        """The table stays bounded by dropping the cheapest shape."""
+        log = QueryLog(slow_query_ms=1000, slow_query_ru=1000, max_fingerprints=2)
+        log.record("query", "SELECT * FROM c WHERE c.a = @a", 10.0, 1.0, pages=1, items=1)
+        log.record("query", "SELECT * FROM c WHERE c.b = @b", 1.0, 1.0, pages=1, items=1)
+        log.record("query", "SELECT * FROM c WHERE c.c = @c", 5.0, 1.0, pages=1, items=1)
+
+        shapes = [row["query"] for row in log.top()["queries"]]
+
+        assert shapes == ["SELECT * FROM c WHERE c.a = @a", "SELECT * FROM c WHERE c.c = @c"]
+
+    def test_slow_query_is_logged(self, caplog):
+        """Executions over a threshold are logged with their fingerprint."""
+        log = QueryLog(slow_query_ms=1000, slow_query_ru=50)
+
+        with caplog.at_level(logging.WARNING, logger="repositories.query_stats"):
+            log.record("query.trip", "SELECT * FROM c", 75.0, 12.0, pages=3, items=100, cross_partition=True)
+
+        assert "Slow query" in caplog.text
+        assert log.top()["queries"][0]["slow"] == 1
+
+    def test_unknown_sort_is_rejected(self):
+        """Only report fields can be sorted on."""
+        with pytest.raises(ValueError):
+            QueryLog(slow_query_ms=1, slow_query_ru=1).top(sort="query")
+
+
+class TestRepositoryInstrumentation:
+    """Test cases for query recording in CosmosRepository."""
+
+    @pytest.mark.asyncio
+    async def test_queries_are_recorded_per_page(self, cosmos_repository, monkeypatch):
+        """Each query execution is recorded with its pages and fan-out."""
+        log = QueryLog(slow_query_ms=10_000, slow_query_ru=10_000)
+        monkeypatch.setattr("repositories.cosmos_repository.query_log", log)
+        cosmos_repository.use_container(MemoryContainer())
+        for number in range(5):
+            await cosmos_repository.create(TripDocument(pk="trip_u", title=f"Trip {number}", organizer_user_id="u"))
+
+        await cosmos_repository.query_page(
+            "SELECT * FROM c WHERE c.entity_type = 'trip'", model_class=TripDocument, page_size=2
+        )
+        await cosmos_repository.count(
+            "SELECT VALUE COUNT(1) FROM c WHERE c.pk = @pk", [{"name": "@pk", "value": "x"}], partition_key="x"
+        )
+
+        rows = {row["operation"]: row for row in log.top()["queries"]}
+        assert rows["query_page.trip"]["query"] == "SELECT * FROM c WHERE c.entity_type = ?"
+        assert rows["query_page.trip"]["cross_partition"] == 1
+        assert rows["query_page.trip"]["pages"] == 1
+        assert rows["count"]["cross_partition"] == 0
@@ -0,0 +1,93 @@
+"""Unit tests for throttling retries and RU accounting in the repository layer."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+from models.documents import TripDocument
+from repositories.metrics import begin_request_summary, end_request_summary, repository_metrics
+from repositories.throttling import ThrottleRetryPolicy
+
+
+def throttled(retry_after_ms="50"):
+    """Build a 429 error as raised by the SDK."""
+    error = CosmosHttpResponseError(status_code=429, message="Request rate is large")
+    error.headers = {"x-ms-retry-after-ms": retry_after_ms}
+    return error
+
+
+def trip_body():
+    """Build a raw trip document as returned by Cosmos."""
+    return TripDocument(id="trip_1", pk="trip_user_1", title="Lake Week", organizer_user_id="user_1").model_dump(
+        mode="json"
+    )
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Start every test with empty aggregates."""
+    repository_metrics.reset()
+    yield
+    repository_metrics.reset()
+
+
+class TestThrottleRetryPolicy:
+    """Test cases for ThrottleRetryPolicy."""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_retry_after(self):
+        """A 429 is retried after the delay the server asked for."""
+        call = AsyncMock(side_effect=[throttled("250"), "ok"])
+
+        with patch("repositories.throttling.asyncio.sleep", new=AsyncMock()) as sleep:
+            result = await ThrottleRetryPolicy(max_retries=3, max_wait_seconds=5).run(call)
+
+        assert result == "ok"
+        sleep.assert_awaited_once_with(0.25)
+
+    @pytest.mark.asyncio
+    async def test_stops_when_wait_budget_is_spent(self):
+        """The 429 is surfaced once waiting longer would exceed the budget."""
+        call = AsyncMock(side_effect=[throttled("400"), throttled("400"), "ok"])
+
+        with patch("repositories.throttling.asyncio.sleep", new=AsyncMock()):
+            with pytest.raises(CosmosHttpResponseError):
+                await ThrottleRetryPolicy(max_retries=5, max_wait_seconds=0.5).run(call)
+
+        assert call.await_count == 2
+
+
+class TestRequestAccounting:
+    """Test cases for per-operation RU accounting."""
+
+    @pytest.mark.asyncio
+    async def test_records_charge_in_aggregates_and_request_summary(self, cosmos_repository, mock_cosmos_container):
+        """The request charge reported through response_hook lands in both views."""
+
+        async def read_item(**kwargs):
+            kwargs["response_hook"]({"x-ms-request-charge": "1.5"}, None)
+            return trip_body()
+
+        mock_cosmos_container.read_item = AsyncMock(side_effect=read_item)
+
+        token = begin_request_summary("get_trip")
+        await cosmos_repository.get_by_id("trip_1", "trip_user_1", TripDocument)
+        summary = end_request_summary(token)
+
+        assert summary.request_charge == 1.5
+        stats = repository_metrics.snapshot()["operations"]["read.trip"]
+        assert stats["count"] == 1
+        assert stats["request_charge"] == 1.5
+        assert stats["cross_partition"] == 0
+
+    @pytest.mark.asyncio
+    async def test_marks_cross_partition_queries(self, cosmos_repository, mock_cosmos_container):
+        """Queries without a partition key are flagged as fan-out."""
+        results = MagicMock()
+        results.__aiter__.return_value = []
+        mock_cosmos_container.query_items = MagicMock(return_value=results)
+
+        await cosmos_repository.query("SELECT * FROM c", model_class=TripDocument)
+
+        assert repository_metrics.snapshot()["operations"]["query.trip"]["cross_partition"] == 1
@@ -0,0 +1,116 @@
+"""Unit tests for request scopes (identity map)."""
+
+import pytest
+
+from core.telemetry import track_cosmos_usage
+from models.documents import ItineraryDocument, NotificationDocument, TripDocument, UserDocument
+from repositories.metrics import begin_request_summary, end_request_summary, repository_metrics
+from repositories.partitioning import trip_partition_key
+from repositories.request_scope import begin_request_scope, end_request_scope
+from services.itinerary_service import ItineraryService
+from services.notification_service import NotificationService
+
+
+@pytest.fixture
+def memory_repository(bind_memory_repository):
+    """Repository backed by an in-memory container, without the document cache."""
+    repository = bind_memory_repository("services.itinerary_service", "services.notification_service")
+    repository._document_cache = None
+    return repository
+
+
+async def seed_trip(repository):
+    """Create a trip with one itinerary in the trip partition."""
+    pk = trip_partition_key("t1")
+    await repository.create(TripDocument(id="t1", pk=pk, title="Trip", organizer_user_id="u1"))
+    itinerary = await repository.create(ItineraryDocument(pk=pk, trip_id="t1", title="Plan"))
+    return pk, itinerary
+
+
+def notification(user_id="u1"):
+    """Build an unread notification."""
+    return NotificationDocument(
+        pk=f"notification_{user_id}", user_id=user_id, title="Hi", body="Hello", notification_type="poll_created"
+    )
+
+
+class TestIdentityMap:
+    """Test cases for repeat reads within a request."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_reads_are_served_from_the_scope(self, memory_repository):
+        """A document is read from the store once per request, by key or by ID."""
+        pk, _ = await seed_trip(memory_repository)
+
+        summary_token = begin_request_summary("get_trip")
+        scope_token = begin_request_scope("get_trip")
+        first = await memory_repository.get_by_id("t1", pk, TripDocument)
+        first.title = "Changed locally"
+        second = await memory_repository.get_by_id("t1", pk, TripDocument)
+        by_id = await memory_repository.find_by_id("t1", TripDocument)
+        scope = end_request_scope(scope_token)
+        summary = end_request_summary(summary_token)
+
+        assert second.title == by_id.title == "Trip"
+        assert summary.operation_count == 1
+        assert scope.hits == 2
+
+    @pytest.mark.asyncio
+    async def test_queried_documents_are_not_read_again(self, memory_repository):
+        """Approving the current itinerary reuses the copy the lookup query returned and sees its own write."""
+        pk, itinerary = await seed_trip(memory_repository)
+        service = ItineraryService()
+        user = UserDocument(id="u1", pk="user_u1", entra_id="u1", email="u1@example.com")
+
+        summary_token = begin_request_summary("approve_itinerary")
+        scope_token = begin_request_scope("approve_itinerary")
+        current = await service.get_current_itinerary("t1")
+        approved = await service.approve_itinerary(current.id, user=user)
+        reread = await memory_repository.get_by_id(itinerary.id, pk, ItineraryDocument)
+        end_request_scope(scope_token)
+        summary = end_request_summary(summary_token)
+
+        assert approved.status == reread.status == "approved"
+        assert not any(name.startswith("read") for name in summary.operations)
+
+    @pytest.mark.asyncio
+    async def test_no_scope_reads_the_store(self, memory_repository):
+        """Outside a request scope every read goes to the store."""
+        pk, _ = await seed_trip(memory_repository)
+
+        summary_token = begin_request_summary("timer")
+        await memory_repository.get_by_id("t1", pk, TripDocument)
+        await memory_repository.get_by_id("t1", pk, TripDocument)
+        summary = end_request_summary(summary_token)
+
+        assert summary.operation_count == 2
+
+
+class TestScopedWrites:
+    """Test cases for writes made inside a request scope."""
+
+    @pytest.mark.asyncio
+    async def test_mark_all_as_read_commits_before_returning(self, memory_repository):
+        """The count returned by mark_all_as_read only covers writes already committed."""
+        for _ in range(3):
+            await memory_repository.create(notification())
+        service = NotificationService()
+
+        @track_cosmos_usage
+        async def handler():
+            return await service.mark_all_as_read("u1"), await service.get_unread_count("u1")
+
+        assert await handler() == (3, 0)
+
+    @pytest.mark.asyncio
+    async def test_mark_all_as_read_writes_full_batches_while_streaming(self, memory_repository, monkeypatch):
+        """Each full batch is written as soon as it is built, then the remainder."""
+        monkeypatch.setattr("services.notification_service.MAX_BATCH_OPERATIONS", 2)
+        for _ in range(5):
+            await memory_repository.create(notification())
+        service = NotificationService()
+        repository_metrics.reset()
+
+        assert await service.mark_all_as_read("u1") == 5
+        assert repository_metrics.snapshot()["operations"]["batch"]["count"] == 3
+        assert await service.get_unread_count("u1") == 0
@@ -0,0 +1,119 @@
+"""Unit tests for single-flight coalescing of concurrent reads."""
+
+import asyncio
+
+import pytest
+
+from models.documents import ItineraryDocument, TripDocument
+from repositories.memory_container import MemoryContainer
+from repositories.metrics import repository_metrics
+from repositories.single_flight import SingleFlight
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Start every test with empty aggregates."""
+    repository_metrics.reset()
+    yield
+    repository_metrics.reset()
+
+
+@pytest.fixture
+def container(cosmos_repository):
+    """Bind the repository to an in-memory container with network-like latency and no document cache."""
+    container = MemoryContainer(latency_ms=5)
+    cosmos_repository.use_container(container)
+    cosmos_repository._document_cache = None
+    return container
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Callers arriving while a call is in flight await it instead of calling again."""
+        flight = SingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"days": [{"activities": []}]}
+
+        results = await asyncio.gather(*(flight.run("read.trip", "key", call) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert all(result == results[0] for result in results)
+        assert len({id(result) for result in results}) == 5
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_flight(self):
+        """The shared call completes for the others when the first caller goes away."""
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        first = asyncio.ensure_future(flight.run("read.trip", "key", call))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.run("read.trip", "key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "ok"
+
+
+class TestRepositoryCoalescing:
+    """Test cases for coalesced repository reads."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_point_reads_are_coalesced(self, cosmos_repository, container):
+        """Ten simultaneous reads of a trip cost one Cosmos DB read."""
+        trip = await cosmos_repository.create(
+            TripDocument(pk="trip_user_1", title="Lake Week", organizer_user_id="user_1")
+        )
+
+        trips = await asyncio.gather(*(cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument) for _ in range(10)))
+
+        stats = repository_metrics.snapshot()["operations"]["read.trip"]
+        assert stats["count"] == 1
+        assert stats["coalesced"] == 9
+        assert all(t.id == trip.id for t in trips)
+
+    @pytest.mark.asyncio
+    async def test_followers_get_independent_documents(self, cosmos_repository, container):
+        """Nested data is never shared between callers of one flight."""
+        itinerary = await cosmos_repository.create(
+            ItineraryDocument(
+                pk="itinerary_trip_1", trip_id="trip_1", title="Plan", days=[{"day": 1, "activities": ["hike"]}]
+            )
+        )
+        query = "SELECT * FROM c WHERE c.entity_type = 'itinerary' AND c.trip_id = @tripId"
+        params = [{"name": "@tripId", "value": "trip_1"}]
+
+        first, second = await asyncio.gather(
+            *(cosmos_repository.query(query, params, ItineraryDocument, partition_key=itinerary.pk) for _ in range(2))
+        )
+        first[0].days[0]["activities"].append("swim")
+
+        assert second[0].days[0]["activities"] == ["hike"]
+        assert repository_metrics.snapshot()["operations"]["query.itinerary"]["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reads_after_a_write_do_not_join_older_flights(self, cosmos_repository, container):
+        """A read issued after a write sees the write even if an older read is still in flight."""
+        trip = await cosmos_repository.create(
+            TripDocument(pk="trip_user_1", title="Lake Week", organizer_user_id="user_1")
+        )
+
+        before = asyncio.ensure_future(cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument))
+        await asyncio.sleep(0)
+        trip.title = "Renamed"
+        await cosmos_repository.update(trip)
+        after = await cosmos_repository.get_by_id(trip.id, trip.pk, TripDocument)
+        await before
+
+        assert after.title == "Renamed"
@@ -0,0 +1,103 @@
+"""Unit tests for the validated-token cache."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from core import security
+from core.token_cache import TokenCache
+
+TENANT = "vedid.onmicrosoft.com"
+
+
+@pytest.fixture
+def signing_key():
+    """Generate an RSA key pair for signing test tokens."""
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def issue_token(signing_key, monkeypatch):
+    """Issue RS256 tokens accepted by validate_token."""
+    monkeypatch.setenv("ENTRA_CLIENT_ID", "client-1")
+    monkeypatch.setenv("ENTRA_TENANT_ID", TENANT)
+
+    def issue(subject="user-1", lifetime=3600):
+        claims = {
+            "sub": subject,
+            "aud": "client-1",
+            "iss": f"https://login.microsoftonline.com/{TENANT}/v2.0",
+            "exp": int(time.time()) + lifetime,
+        }
+        return jwt.encode(claims, signing_key, algorithm="RS256")
+
+    return issue
+
+
+@pytest.fixture
+def jwks_provider(signing_key, monkeypatch):
+    """JWKS provider resolving every token to the test public key."""
+    provider = MagicMock()
+    provider.get_signing_key = AsyncMock(return_value=MagicMock(key=signing_key.public_key()))
+    monkeypatch.setattr(security, "get_jwks_provider", lambda: provider)
+    monkeypatch.setattr(security, "token_cache", TokenCache(max_entries=2, expiry_margin_seconds=30))
+    return provider
+
+
+class TestTokenCache:
+    """Test cases for TokenCache."""
+
+    def test_lru_eviction_and_expiry_margin(self):
+        """The least recently used token is evicted, and tokens near exp are not cached."""
+        cache = TokenCache(max_entries=2, expiry_margin_seconds=30)
+        exp = int(time.time()) + 600
+        cache.put("a", {"sub": "a", "exp": exp})
+        cache.put("b", {"sub": "b", "exp": exp})
+        cache.get("a")
+        cache.put("c", {"sub": "c", "exp": exp})
+        cache.put("d", {"sub": "d", "exp": int(time.time()) + 10})
+
+        assert cache.get("b") is None
+        assert cache.get("a")["sub"] == "a"
+        assert cache.get("d") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_entry_expires_before_token(self, monkeypatch):
+        """An entry stops being served expiry_margin_seconds before exp."""
+        cache = TokenCache(max_entries=10, expiry_margin_seconds=30)
+        now = time.time()
+        cache.put("a", {"sub": "a", "exp": now + 100})
+
+        monkeypatch.setattr("core.token_cache.time.time", lambda: now + 71)
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+
+class TestValidateToken:
+    """Test cases for validate_token with the cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_token_is_verified_once(self, issue_token, jwks_provider):
+        """The second validation of a token is served from the cache."""
+        token = issue_token()
+
+        with patch("core.security.jwt.decode", wraps=jwt.decode) as decode:
+            first = await security.validate_token(token)
+            second = await security.validate_token(token)
+
+        assert first["sub"] == second["sub"] == "user-1"
+        assert decode.call_count == 1
+        assert security.token_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_tokens_are_not_cached(self, issue_token, jwks_provider):
+        """A token that fails validation is checked again every time."""
+        token = issue_token(lifetime=-10)
+
+        assert await security.validate_token(token) is None
+        assert await security.validate_token(token) is None
+        assert security.token_cache.stats()["entries"] == 0
@@ -0,0 +1,79 @@
+"""Unit tests for instance warm-up."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.warmup import Warmup
+from repositories.memory_container import MemoryContainer
+from repositories.metrics import begin_request_summary, current_request_summary, end_request_summary
+from repositories.request_scope import begin_request_scope, current_request_scope, end_request_scope
+
+
+@pytest.fixture
+def warm_dependencies(bind_memory_repository, monkeypatch):
+    """Memory-backed repository and a JWKS provider that needs no network."""
+    bind_memory_repository("core.warmup", container=MemoryContainer(physical_partitions=3))
+    jwks = MagicMock()
+    jwks.refresh = AsyncMock(return_value={"k1": object(), "k2": object()})
+    monkeypatch.setattr("core.warmup.get_jwks_provider", lambda: jwks)
+    return jwks
+
+
+class TestWarmup:
+    """Test cases for Warmup."""
+
+    @pytest.mark.asyncio
+    async def test_reports_each_step(self, warm_dependencies):
+        """Every connection setup step is timed and reported."""
+        report = await Warmup().ensure("test")
+
+        steps = {step.name: step for step in report.steps}
+        assert report.ok
+        assert set(steps) == {"cosmos_client", "container_metadata", "partition_routing", "jwks"}
+        assert steps["partition_routing"].detail == "3 feed ranges"
+        assert steps["jwks"].detail == "2 signing keys"
+
+    @pytest.mark.asyncio
+    async def test_runs_once_per_process(self, warm_dependencies):
+        """Later triggers reuse the finished report."""
+        instance = Warmup()
+
+        first = await instance.ensure("warmup_trigger")
+        second = await instance.ensure("health_probe")
+
+        assert second is first
+        assert warm_dependencies.refresh.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_steps_are_retried(self, warm_dependencies):
+        """A degraded warm-up runs again on the next trigger."""
+        warm_dependencies.refresh.side_effect = [OSError("network down"), {"k1": object()}]
+        instance = Warmup()
+
+        first = await instance.ensure("health_probe")
+        second = await instance.ensure("health_probe")
+
+        assert not first.ok
+        assert first.to_dict()["status"] == "degraded"
+        assert second.ok
+
+    @pytest.mark.asyncio
+    async def test_runs_outside_the_caller_request(self, warm_dependencies):
+        """A warm-up started by a probe does not run in the probe's usage summary or request scope."""
+        seen = {}
+
+        async def refresh():
+            seen["scope"] = current_request_scope()
+            seen["summary"] = current_request_summary()
+            return {"k1": object()}
+
+        warm_dependencies.refresh.side_effect = refresh
+        summary_token = begin_request_summary("warmup_check")
+        scope_token = begin_request_scope("warmup_check")
+        report = await Warmup().ensure("warmup_endpoint")
+        end_request_scope(scope_token)
+        end_request_summary(summary_token)
+
+        assert report.ok
+        assert seen == {"scope": None, "summary": None}